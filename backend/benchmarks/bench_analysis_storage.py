@@ -0,0 +1,92 @@
+"""
+Storage size of compliance analyses: full documents versus the compact format
+(cookie table + policy version reference), for repeated re-analyses of sites.
+
+Runs offline: results come from the real ComplianceComparator on synthetic sites
+and sizes are BSON bytes. The shared policy versions are counted once per site.
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_analysis_storage [sites] [analyses_per_site] [cookies]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import bson
+
+from src.schemas.cookie import ActualCookie, PolicyCookie
+from src.services.comparator_service.components.compliance_comparator import ComplianceComparator
+from src.services.comparator_service.components.compliance_result import ComplianceResultBuilder
+from src.utils.analysis_storage import compact_analysis, rehydrate_analysis
+
+DOMAINS = [".example.com", "shop.example.com", ".doubleclick.net", ".facebook.com", "cdn.partner.io", ".hotjar.com"]
+RETENTIONS = ["session", "2 years", "30 days", "1 month", "persistent", None, "6 months"]
+PURPOSES = ["Strictly Necessary", "Analytical", "Targeting/Advertising/Marketing", None]
+
+
+def build_site(site: int, cookie_count: int):
+    rng = random.Random(site)
+    policy = [
+        PolicyCookie(
+            cookie_name=f"cookie_{i}", declared_purpose=rng.choice(PURPOSES), declared_retention=rng.choice(RETENTIONS),
+            declared_third_parties=rng.choice([[], ["First Party"], ["doubleclick.net"], ["Google", "Facebook"]]),
+            declared_description=rng.choice([None, "Used to track visits across sessions", "Stores preferences"])
+        )
+        for i in range(cookie_count)
+    ]
+    return rng, policy
+
+
+def collect_cookies(rng: random.Random, cookie_count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        ActualCookie(
+            name=f"cookie_{rng.randrange(cookie_count * 2)}", value="".join(rng.choices("abcdef0123456789", k=rng.choice([8, 40, 160]))),
+            domain=rng.choice(DOMAINS), secure=True, httpOnly=rng.random() < 0.3, sameSite=rng.choice([None, "Lax"]),
+            expirationDate=rng.choice([None, (now + timedelta(days=rng.randrange(1, 1200))).isoformat()])
+        )
+        for _ in range(cookie_count)
+    ]
+
+
+def main(sites: int, analyses: int, cookie_count: int) -> None:
+    comparator, builder = ComplianceComparator(), ComplianceResultBuilder()
+    full_bytes = compact_bytes = version_bytes = 0
+    compact_seconds = rehydrate_seconds = 0.0
+
+    for site in range(sites):
+        rng, policy = build_site(site, cookie_count)
+        versions = {}
+        for _ in range(analyses):
+            report = comparator.analyze_compliance(policy, collect_cookies(rng, cookie_count), "shop.example.com")
+            document = builder.build_success_result(f"https://site-{site}.example.com/", report).model_dump()
+            full_bytes += len(bson.encode(document))
+
+            started = time.perf_counter()
+            compact, version = compact_analysis(document)
+            compact_seconds += time.perf_counter() - started
+            compact_bytes += len(bson.encode(compact))
+            versions[version["_id"]] = version
+
+            started = time.perf_counter()
+            rehydrate_analysis(compact, version["cookies"])
+            rehydrate_seconds += time.perf_counter() - started
+        version_bytes += sum(len(bson.encode(version)) for version in versions.values())
+
+    documents = sites * analyses
+    stored = compact_bytes + version_bytes
+    print(f"{documents} analyses ({sites} sites x {analyses}), {cookie_count} cookies each")
+    print(f"full documents   : {full_bytes / 1e6:8.2f} MB ({full_bytes / documents / 1024:6.1f} KiB each)")
+    print(f"compact + policy : {stored / 1e6:8.2f} MB ({stored / documents / 1024:6.1f} KiB each), "
+          f"{100 * (1 - stored / full_bytes):.1f}% smaller")
+    print(f"compact {compact_seconds / documents * 1000:.2f} ms, rehydrate {rehydrate_seconds / documents * 1000:.2f} ms per analysis")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 20,
+        int(args[1]) if len(args) > 1 else 10,
+        int(args[2]) if len(args) > 2 else 80,
+    )
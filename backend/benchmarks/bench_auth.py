@@ -0,0 +1,106 @@
+"""
+Authentication overhead, offline.
+
+1. Event-loop stall while logins verify bcrypt hashes: inline pwd_context.verify
+   versus the bounded bcrypt executor (max loop lag seen by a 5 ms ticker).
+2. Per-request cost of get_current_user's principal lookup (JWT decode + users
+   read, simulated with a fixed round trip) with and without the principal cache.
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_auth [logins] [requests] [mongo_rtt_ms]
+"""
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("JWT_SECRET", "bench-secret-bench-secret-bench-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+
+from bson import ObjectId
+
+from src.services.auth_service.auth_service import AuthService, pwd_context, verify_password
+from src.services.auth_service.principal_cache import PrincipalCache
+from src.utils.jwt_handler import create_access_token, decode_access_token
+
+TOKENS = 50
+
+
+class FakeUserRepository:
+    def __init__(self, users, rtt_seconds):
+        self.users = users
+        self.rtt_seconds = rtt_seconds
+        self.reads = 0
+
+    async def get_user_by_id(self, user_id):
+        self.reads += 1
+        await asyncio.sleep(self.rtt_seconds)
+        return self.users.get(user_id)
+
+
+async def max_loop_lag(work) -> tuple:
+    lags, done = [], asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - started - 0.005)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    return max(lags, default=0.0), elapsed
+
+
+async def bench_bcrypt(logins: int) -> None:
+    hashed = pwd_context.hash("correct horse battery staple")
+    # Chỉ backend "bcrypt" nhả GIL trong lúc băm; os_crypt/builtin vẫn chặn loop dù chạy trên luồng khác
+    print(f"bcrypt backend: {pwd_context.handler('bcrypt').get_backend()}")
+
+    async def inline():
+        for _ in range(logins):
+            pwd_context.verify("correct horse battery staple", hashed)
+            await asyncio.sleep(0)
+
+    async def offloaded():
+        await asyncio.gather(*(verify_password("correct horse battery staple", hashed) for _ in range(logins)))
+
+    for name, work in (("inline", inline), ("executor", offloaded)):
+        lag, elapsed = await max_loop_lag(work)
+        print(f"bcrypt {name:<9}: {logins} logins in {elapsed * 1000:7.1f} ms, max event-loop lag {lag * 1000:7.1f} ms")
+
+
+async def bench_principals(requests: int, rtt_seconds: float) -> None:
+    users = {}
+    for i in range(TOKENS):
+        user_id = str(ObjectId())
+        users[user_id] = {"_id": user_id, "email": f"user{i}@example.com", "name": f"User {i}", "role": "provider", "approved_by_admin": True}
+    tokens = [create_access_token({"sub": user_id}) for user_id in users]
+
+    for name, cache in (("no cache", None), ("principal cache", PrincipalCache(ttl_seconds=60))):
+        repository = FakeUserRepository(users, rtt_seconds)
+        service = AuthService(repository, None, cache)
+        started = time.perf_counter()
+        for i in range(requests):
+            token = tokens[i % len(tokens)]
+            await service.authenticate(decode_access_token(token), token)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<16}: {elapsed / requests * 1e6:8.1f} us per request, {repository.reads} users reads")
+
+
+def main(logins: int, requests: int, rtt_ms: float) -> None:
+    asyncio.run(bench_bcrypt(logins))
+    asyncio.run(bench_principals(requests, rtt_ms / 1000))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 20,
+        int(args[1]) if len(args) > 1 else 2000,
+        float(args[2]) if len(args) > 2 else 1.0,
+    )
@@ -0,0 +1,60 @@
+"""
+Microbenchmark for cookie date and retention parsing: the memoised retention
+parser against the uncached one, and per-call expiration parsing.
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_cookie_utils [iterations]
+"""
+import sys
+import time
+from datetime import datetime
+
+from src.utils import cookie_utils
+from src.utils.cookie_utils import parse_expiration_date, parse_retention_to_days, retention_days_until
+from tests.unit.test_services.test_compliance_comparator import RETENTIONS, build_site
+
+RETENTION_SAMPLES = [r for r in RETENTIONS if r] + ["13 months", "1 year", "90 days", "until you log out"]
+
+
+def timed(label: str, func, iterations: int) -> None:
+    started = time.perf_counter()
+    func(iterations)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<30} {elapsed * 1000:9.1f} ms  ({elapsed / iterations * 1e9:7.0f} ns/op)")
+
+
+def retention_uncached(iterations: int) -> None:
+    parse = cookie_utils._parse_normalized_retention.__wrapped__
+    for i in range(iterations):
+        parse(RETENTION_SAMPLES[i % len(RETENTION_SAMPLES)].lower().strip())
+
+
+def retention_cached(iterations: int) -> None:
+    for i in range(iterations):
+        parse_retention_to_days(RETENTION_SAMPLES[i % len(RETENTION_SAMPLES)])
+
+
+def main(iterations: int) -> None:
+    _, actual_cookies = build_site(actual_count=1000, policy_count=100)
+    expirations = [c.expirationDate for c in actual_cookies]
+    parsed = [parse_expiration_date(e) for e in expirations]
+    now = datetime.now()
+
+    def expiration_parse(n: int) -> None:
+        for i in range(n):
+            retention_days_until(parse_expiration_date(expirations[i % len(expirations)]), now)
+
+    def expiration_reuse(n: int) -> None:
+        for i in range(n):
+            retention_days_until(parsed[i % len(parsed)], now)
+
+    print(f"{iterations} iterations")
+    timed("retention (uncached)", retention_uncached, iterations)
+    timed("retention (lru cached)", retention_cached, iterations)
+    timed("expiration (parse + days)", expiration_parse, iterations)
+    timed("expiration (days only)", expiration_reuse, iterations)
+    print(f"retention cache: {cookie_utils._parse_normalized_retention.cache_info()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
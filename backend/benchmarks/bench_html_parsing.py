@@ -0,0 +1,76 @@
+"""
+Compare the per-page cost of the old HTML pipeline (one BeautifulSoup parse per
+consumer) with a single shared parse.
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_html_parsing [rows] [repeat]
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from src.utils.dom_parser_utils import DOMParserService
+from src.utils.html_document import parse_html
+from src.utils.table_extractor import TableExtractor
+from src.utils.text_processing import TextProcessor
+
+
+def build_policy_page(rows: int) -> str:
+    paragraphs = "".join(
+        f"<p>Section {i}: we use cookies and similar technologies to improve <b>your</b> experience.</p>"
+        for i in range(rows)
+    )
+    table_rows = "".join(
+        f"<tr><td>cookie_{i}</td><td>example.com</td><td>Analytics</td><td>{i % 24 + 1} months</td></tr>"
+        for i in range(rows)
+    )
+    return (
+        "<html><head><link rel='cookie-policy' href='/cookies'><script>var x = 1;</script></head><body>"
+        "<nav><a href='/privacy'>Privacy Policy</a></nav>"
+        f"<main><h1>Cookie Policy</h1>{paragraphs}"
+        "<table><thead><tr><th>Name</th><th>Domain</th><th>Purpose</th><th>Duration</th></tr></thead>"
+        f"<tbody>{table_rows}</tbody></table></main>"
+        "<footer><a href='/cookie-policy'>Cookie settings</a></footer></body></html>"
+    )
+
+
+def old_pipeline(html: str) -> None:
+    # Baseline behaviour: link discovery, text cleaning and table extraction each built their own tree
+    for _ in range(3):
+        soup = BeautifulSoup(html, "lxml")
+        soup.find_all("a", href=True)
+
+
+async def new_pipeline(html: str, backend: str, text_processor, table_extractor, dom_parser) -> None:
+    document = parse_html(html, backend=backend)
+    dom_parser.parse_policy_links_from_dom(document)
+    await text_processor.extract_clean_text(document)
+    table_extractor.extract_tables_from_html(document)
+
+
+async def main(rows: int, repeat: int) -> None:
+    logger.remove()
+    html = build_policy_page(rows)
+    text_processor, table_extractor, dom_parser = TextProcessor(ThreadPoolExecutor(max_workers=1)), TableExtractor(), DOMParserService()
+    print(f"page size: {len(html) / 1024:.1f} KiB, {rows} table rows, {repeat} iterations")
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        old_pipeline(html)
+    print(f"3x BeautifulSoup parse only : {(time.perf_counter() - started) / repeat * 1000:8.2f} ms/page")
+
+    for backend in ("bs4", "lxml"):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await new_pipeline(html, backend, text_processor, table_extractor, dom_parser)
+        print(f"1x {backend:<4} parse + all queries: {(time.perf_counter() - started) / repeat * 1000:8.2f} ms/page")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    asyncio.run(main(rows, repeat))
@@ -0,0 +1,118 @@
+"""
+Compare the old Playwright fetch (every resource, networkidle + 2 s sleep) with
+resource blocking + readiness detection, against a local fixture site.
+
+The fixture policy page renders its text from an inline script and references
+slow images, fonts, a stylesheet and a "tracker" script served from a second
+host name (localhost vs 127.0.0.1), like a typical heavy site.
+
+Requires the Playwright Chromium build (`playwright install chromium`).
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_playwright_fetch [pages] [resource_delay_ms]
+"""
+import asyncio
+import sys
+import time
+
+from aiohttp import web
+from loguru import logger
+
+from src.services.policy_crawler_service.components.browser_pool import BrowserPool
+from src.services.policy_crawler_service.components.page_readiness import PageReadiness
+from src.services.policy_crawler_service.components.resource_blocker import ResourceBlocker
+from src.services.policy_crawler_service.content_extractors.playwright_content_extractor import PlaywrightContentExtractor
+
+
+def build_policy_page(port: int) -> str:
+    images = "".join(f"<img src='/static/img_{i}.png'>" for i in range(20))
+    text = "We use cookies and similar technologies to measure traffic and remember preferences. " * 40
+    return (
+        "<html><head><link rel='stylesheet' href='/static/site.css'>"
+        "<style>@font-face { font-family: f; src: url('/static/font.woff2'); }</style>"
+        f"<script src='http://localhost:{port}/tracker.js'></script></head><body><main id='root'></main>{images}"
+        "<script>setTimeout(() => { document.getElementById('root').innerHTML ="
+        f" '<h1>Cookie Policy</h1><p>{text}</p>'; }}, 150);</script>"
+        # Trình theo dõi định kỳ gửi beacon: networkidle đến muộn
+        f"<script>let n = 0; const t = setInterval(() => {{ fetch('http://localhost:{port}/beacon'); if (++n > 3) clearInterval(t); }}, 400);</script>"
+        "</body></html>"
+    )
+
+
+async def start_fixture_site(resource_delay: float):
+    async def page(request):
+        return web.Response(text=build_policy_page(request.app["port"]), content_type="text/html")
+
+    async def slow_resource(request):
+        await asyncio.sleep(resource_delay)
+        return web.Response(body=b"\0" * 20_000, content_type="application/octet-stream")
+
+    async def tracker(request):
+        await asyncio.sleep(resource_delay * 2)
+        return web.Response(text="window.tracked = true;", content_type="application/javascript")
+
+    app = web.Application()
+    app.router.add_get("/cookie-policy", page)
+    app.router.add_get("/static/{name}", slow_resource)
+    app.router.add_get("/tracker.js", tracker)
+    app.router.add_get("/beacon", slow_resource)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    app["port"] = site._server.sockets[0].getsockname()[1]
+    return runner, app["port"]
+
+
+class LegacyPlaywrightExtractor(PlaywrightContentExtractor):
+    """Baseline behaviour before route interception and readiness detection"""
+
+    async def extract_content(self, url: str) -> str:
+        async with self.browser_pool.lease() as context:
+            page = await context.new_page()
+            try:
+                await page.goto(url, wait_until="networkidle", timeout=self.timeout * 1000)
+                await asyncio.sleep(2)
+                return await page.content()
+            finally:
+                await page.close()
+
+
+async def measure(name: str, extractor: PlaywrightContentExtractor, url: str, pages: int) -> None:
+    started = time.perf_counter()
+    for _ in range(pages):
+        html = await extractor.extract_content(url)
+        assert "Cookie Policy" in html, f"{name}: policy text missing"
+    print(f"{name:<28}: {(time.perf_counter() - started) / pages:6.2f} s/page")
+
+
+async def main(pages: int, resource_delay: float) -> None:
+    logger.remove()
+    runner, port = await start_fixture_site(resource_delay)
+    pool = BrowserPool(size=1, contexts_per_browser=1, health_check_interval=0)
+    await pool.start()
+    url = f"http://127.0.0.1:{port}/cookie-policy"
+    print(f"{pages} page(s), sub-resource delay {resource_delay * 1000:.0f} ms")
+    try:
+        await measure("networkidle + sleep(2)", LegacyPlaywrightExtractor(pool, timeout=30), url, pages)
+        await measure(
+            "readiness only",
+            PlaywrightContentExtractor(pool, timeout=30, resource_blocker=ResourceBlocker(resource_types=(), blocked_hosts=())),
+            url, pages
+        )
+        optimized = PlaywrightContentExtractor(
+            pool, timeout=30,
+            resource_blocker=ResourceBlocker(blocked_hosts=["localhost"]),
+            readiness=PageReadiness()
+        )
+        await measure("blocking + readiness", optimized, url, pages)
+        print(f"optimized extractor metrics : {optimized.get_metrics()}")
+    finally:
+        await pool.stop()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    resource_delay = int(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.5
+    asyncio.run(main(pages, resource_delay))
@@ -0,0 +1,33 @@
+"""
+Compare the precompiled rule engine with per-cookie rule evaluation on a
+synthetic site with thousands of cookies.
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_rule_engine [actual_cookies] [policy_cookies]
+"""
+import sys
+import time
+
+from src.services.comparator_service.components.compliance_comparator import ComplianceComparator
+from tests.unit.test_services.test_compliance_comparator import MAIN_DOMAIN, build_site
+
+
+def run(precompiled: bool, policy_cookies, actual_cookies) -> float:
+    comparator = ComplianceComparator(precompiled=precompiled)
+    started = time.perf_counter()
+    comparator.analyze_compliance(policy_cookies, actual_cookies, MAIN_DOMAIN)
+    return time.perf_counter() - started
+
+
+def main(actual_count: int, policy_count: int) -> None:
+    policy_cookies, actual_cookies = build_site(actual_count, policy_count)
+    print(f"{actual_count} actual cookies, {policy_count} policy cookies")
+    for precompiled in (False, True):
+        label = "precompiled" if precompiled else "per-cookie "
+        print(f"{label}: {run(precompiled, policy_cookies, actual_cookies) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    actual_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    policy_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    main(actual_count, policy_count)
@@ -0,0 +1,37 @@
+"""
+Compare the rule 8 similarity backends: pairwise difflib (reference) against
+the vectorised n-gram backend, scoring every cookie name against every label.
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_similarity [names] [labels]
+"""
+import random
+import string
+import sys
+import time
+
+from src.configs.settings import settings
+from src.utils.similarity import DifflibSimilarityBackend, NgramSimilarityBackend
+
+
+def random_words(count: int, rng: random.Random):
+    return ["_".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(rng.randint(1, 3)))
+            for _ in range(count)]
+
+
+def main(name_count: int, label_count: int) -> None:
+    rng = random.Random(3)
+    names = random_words(name_count, rng)
+    labels = settings.violation.STANDARD_PURPOSE_LABELS + random_words(max(0, label_count - 6), rng)
+    print(f"{len(names)} names x {len(labels)} labels")
+
+    for backend in (DifflibSimilarityBackend(), NgramSimilarityBackend(settings.violation.SEMANTIC_SIMILARITY_NGRAM_SIZE)):
+        started = time.perf_counter()
+        backend.max_scores(backend.prepare(labels), names)
+        print(f"{backend.name:<8}: {(time.perf_counter() - started) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    name_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    label_count = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    main(name_count, label_count)
@@ -0,0 +1,140 @@
+"""
+Compare full Website documents with the projected read views (analysis lookup,
+listing row, detail) on a synthetic 10k-site collection.
+
+Offline mode (default) measures the BSON bytes each read would transfer and the
+Pydantic validation time, applying the projections in Python. With --mongo it
+seeds the `bench_websites` collection of the configured database and times the
+real queries, including the $size listing aggregation.
+
+Usage (from backend/):
+    DB_NAME=bench MONGODB_PWD=x python -m benchmarks.bench_website_reads [sites] [--mongo]
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import bson
+from bson import ObjectId
+
+from src.models.website import Website, WebsiteAnalysisView, WebsiteDetailView, WebsiteListRow
+
+PAGE_SIZE = 100
+COLLECTION = "bench_websites"
+
+
+def build_site(index: int, rng: random.Random) -> dict:
+    paragraph = "We use cookies and similar technologies to remember your preferences and measure traffic. "
+    cookies = [
+        {"cookie_name": f"cookie_{index}_{i}", "declared_purpose": "Analytical", "declared_retention": "2 years",
+         "declared_third_parties": ["Google"], "declared_description": "Distinguishes users."}
+        for i in range(rng.randint(5, 60))
+    ]
+    content = paragraph * rng.randint(100, 800)
+    return {
+        "_id": ObjectId(),
+        "domain": f"https://site-{index}.example.com/",
+        "user_id": ObjectId(),
+        "is_approved": index % 3 == 0,
+        "last_checked_at": datetime(2024, 1, 1) + timedelta(minutes=index),
+        "policy_url": f"https://site-{index}.example.com/cookie-policy",
+        "detected_language": "en",
+        "original_content": content,
+        "translated_content": content,
+        "table_content": [{"headers": ["Name", "Purpose"], "rows": [[c["cookie_name"], "Analytical"] for c in cookies]}],
+        "translated_table_content": None,
+        "is_specific": 1,
+        "policy_cookies": cookies,
+        "policy_content_hash": f"{index:064x}",
+    }
+
+
+def project(document: dict, projection: dict) -> dict:
+    return {field: document[field] for field in projection if field in document}
+
+
+def timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def report(name: str, full_bytes: int, slim_bytes: int, full_seconds: float, slim_seconds: float) -> None:
+    print(f"{name:<16}: {full_bytes / 1e6:9.1f} MB -> {slim_bytes / 1e6:7.2f} MB"
+          f"   validate {full_seconds * 1000:8.1f} ms -> {slim_seconds * 1000:7.1f} ms")
+
+
+def run_offline(sites: list) -> None:
+    size = lambda docs: sum(len(bson.encode(doc)) for doc in docs)
+
+    analysis = [project(doc, WebsiteAnalysisView.projection()) for doc in sites]
+    report(
+        "analysis lookup", size(sites), size(analysis),
+        timed(lambda: [Website.model_validate(doc) for doc in sites]),
+        timed(lambda: [WebsiteAnalysisView.model_validate(doc) for doc in analysis]),
+    )
+
+    page = sites[:PAGE_SIZE]
+    rows = [{**project(doc, WebsiteListRow.projection()), "num_specified_cookies": len(doc["policy_cookies"])} for doc in page]
+    report(
+        f"listing ({PAGE_SIZE} rows)", size(page), size(rows),
+        timed(lambda: [len(Website.model_validate(doc).policy_cookies) for doc in page]),
+        timed(lambda: [WebsiteListRow.model_validate(row) for row in rows]),
+    )
+
+    details = [project(doc, WebsiteDetailView.projection()) for doc in sites]
+    report(
+        "detail", size(sites), size(details),
+        timed(lambda: [Website.model_validate(doc) for doc in sites]),
+        timed(lambda: [WebsiteDetailView.model_validate(doc) for doc in details]),
+    )
+
+
+async def run_mongo(sites: list) -> None:
+    from src.repositories.website_repository import WebsiteRepository
+
+    repository = WebsiteRepository()
+    repository.collection = repository.collection.database[COLLECTION]
+    await repository.collection.drop()
+    await repository.collection.insert_many(sites)
+    await repository.ensure_indexes()
+    sample = random.Random(1).sample(sites, min(500, len(sites)))
+
+    async def each(read):
+        started = time.perf_counter()
+        for doc in sample:
+            await read(doc)
+        return (time.perf_counter() - started) / len(sample)
+
+    full = await each(lambda doc: repository.get_website_by_root_url(doc["domain"]))
+    slim = await each(lambda doc: repository.get_view_by_root_url(doc["domain"], WebsiteAnalysisView))
+    print(f"analysis lookup : {full * 1000:7.2f} ms -> {slim * 1000:6.2f} ms per read")
+
+    started = time.perf_counter()
+    for skip in range(0, len(sites), PAGE_SIZE * 10):
+        await repository.get_all_websites({}, skip=skip, limit=PAGE_SIZE)
+    full = time.perf_counter() - started
+    started = time.perf_counter()
+    for skip in range(0, len(sites), PAGE_SIZE * 10):
+        await repository.list_rows({}, skip=skip, limit=PAGE_SIZE)
+    slim = time.perf_counter() - started
+    print(f"listing pages   : {full * 1000:7.1f} ms -> {slim * 1000:6.1f} ms")
+
+    await repository.collection.drop()
+
+
+def main(count: int, use_mongo: bool) -> None:
+    rng = random.Random(42)
+    sites = [build_site(i, rng) for i in range(count)]
+    print(f"{count} sites")
+    if use_mongo:
+        asyncio.run(run_mongo(sites))
+    else:
+        run_offline(sites)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    main(int(args[0]) if args else 10_000, "--mongo" in sys.argv)
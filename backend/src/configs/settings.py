@@ -13,6 +13,9 @@ class AppSettings(BaseSettings):
     CORS_ORIGINS: str = ""
     JWT_EXP_DELTA_MINUTES: int = 30
     RESET_TOKEN_EXPIRE_MINUTES: int = 60 # New setting for password reset token expiration
+    PASSWORD_HASH_WORKERS: int = 2 # bcrypt hash/verify threads, off the event loop
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60 # authenticated users cached by token id, 0 = disabled
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
 
 class DatabaseSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
@@ -25,6 +28,13 @@ class DatabaseSettings(BaseSettings):
     COOKIE_FEATURES_COLLECTION: str = "cookie_features"
     VIOLATIONS_COLLECTION: str = "cookie_violations"
     DOMAIN_REQUESTS_COLLECTION: str = "domain_requests" # Added for clarity and separation
+    LLM_EXTRACTION_CACHE_COLLECTION: str = "llm_extraction_cache"
+    ANALYSIS_JOBS_COLLECTION: str = "analysis_jobs"
+    TRANSLATION_CACHE_COLLECTION: str = "translation_cache"
+    SITE_LEASES_COLLECTION: str = "site_analysis_leases"
+    POLICY_MISSES_COLLECTION: str = "policy_misses"
+    POLICY_VERSIONS_COLLECTION: str = "policy_versions"
+    ENSURE_INDEXES_ON_STARTUP: bool = True # create the indexes declared by each repository (src/repositories/indexes.py)
     MONGODB_PWD: str
     MONGODB_USER: str = "username"
     MONGODB_CLUSTER: str = "cluster.mongodb.net"
@@ -49,12 +59,50 @@ class ExternalServicesSettings(BaseSettings):
     LLAMA_API_KEY: str = ""
     LLAMA_API_ENDPOINT: str = ""
 
+    # Long-lived LLM HTTP clients (created in the FastAPI lifespan)
+    GEMINI_MAX_CONCURRENCY: int = 4 # in-flight requests per provider instance
+    LLAMA_MAX_CONCURRENCY: int = 4
+    LLM_REQUEST_TIMEOUT_SECONDS: int = 300
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_SECONDS: int = 60
+
 class InternalAPISettings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
     REQUEST_TIMEOUT: int = 100
     MAX_RETRIES: int = 3
-    MAX_CONCURRENT_REQUESTS: int = 10
+    MAX_CONCURRENT_REQUESTS: int = 10 # sites analysed in parallel within a batch
+
+    # Per-stage concurrency limits shared by all analyses in the process, 0 = MAX_CONCURRENT_REQUESTS
+    DISCOVERY_CONCURRENCY: int = 0
+    EXTRACTION_CONCURRENCY: int = 0
+    LLM_CONCURRENCY: int = 4
+    COMPARISON_CONCURRENCY: int = 0
+    BATCH_MAX_SUBMISSIONS: int = 500
+
+    # Background analysis jobs
+    JOB_QUEUE_BACKEND: str = "mongo" # "mongo" or "memory" (single process / tests)
+    JOB_WORKERS: int = 2 # workers started in the FastAPI lifespan, 0 = enqueue only
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_DELAY: float = 5.0 # seconds, doubled on every retry
+    JOB_LEASE_SECONDS: int = 600 # a running job is reclaimed once its lease expires
+    JOB_HEARTBEAT_INTERVAL: float = 60.0 # seconds between lease renewals of a running job, well below JOB_LEASE_SECONDS
+    JOB_POLL_INTERVAL: float = 1.0 # seconds
+
+    # Single-flight for concurrent cache-miss analyses of the same site (in-process + Mongo lease across workers)
+    SITE_LEASE_ENABLED: bool = True
+    SITE_LEASE_SECONDS: int = 300 # an abandoned lease blocks other workers at most this long
+    SITE_LEASE_WAIT_SECONDS: int = 240 # give up waiting on another worker and analyse the site ourselves
+    SITE_LEASE_POLL_INTERVAL: float = 1.0 # seconds between checks for the other worker's website record
+
+    # Freshness of stored website analyses, by age of last_checked_at (per-site override on the website document)
+    POLICY_CACHE_SOFT_TTL_SECONDS: int = 7 * 24 * 3600 # older: serve stored data and revalidate in the background
+    POLICY_CACHE_HARD_TTL_SECONDS: int = 30 * 24 * 3600 # older: revalidate before answering, 0 = never
+    POLICY_REFRESH_RETRY_BASE_SECONDS: int = 3600 # after a failed revalidation, doubled on every consecutive failure
+    POLICY_REFRESH_RETRY_MAX_SECONDS: int = 24 * 3600
+
+    # Totals of unfiltered admin listings when requested with total=cached
+    LISTING_TOTAL_CACHE_TTL_SECONDS: int = 60
 
 class CrawlerSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
@@ -74,6 +122,60 @@ class CrawlerSettings(BaseSettings):
         'Accept-Encoding': 'gzip, deflate, br',
     }
 
+    # Shared browser pool (started in the FastAPI lifespan)
+    BROWSER_POOL_SIZE: int = 2
+    BROWSER_POOL_CONTEXTS_PER_BROWSER: int = 2
+    BROWSER_POOL_MAX_PAGES_PER_BROWSER: int = 200 # recycle a browser after this many pages, 0 = never
+    BROWSER_POOL_LEASE_TIMEOUT: int = 60 # seconds
+    BROWSER_POOL_HEALTH_CHECK_INTERVAL: int = 30 # seconds, 0 = disabled
+
+    # Route interception for policy fetches in the browser
+    BROWSER_BLOCK_RESOURCE_TYPES: list[str] = ["image", "media", "font", "stylesheet"]
+    # Ad/analytics hosts (and subdomains) aborted unless they belong to the page's own site.
+    # Consent platforms (OneTrust, Cookiebot, ...) are not listed: they often render the cookie tables.
+    BROWSER_BLOCKED_HOSTS: list[str] = [
+        'doubleclick.net', 'googlesyndication.com', 'google-analytics.com', 'googletagmanager.com',
+        'googleadservices.com', 'connect.facebook.net', 'amazon-adsystem.com', 'adnxs.com', 'criteo.com',
+        'criteo.net', 'taboola.com', 'outbrain.com', 'scorecardresearch.com', 'hotjar.com', 'segment.com',
+        'mixpanel.com', 'newrelic.com', 'nr-data.net', 'clarity.ms', 'bat.bing.com', 'ads.linkedin.com',
+    ]
+    # Readiness: return once the DOM text stops changing and contains policy text, instead of networkidle + sleep
+    BROWSER_READINESS_MAX_WAIT_SECONDS: float = 8.0
+    BROWSER_READINESS_POLL_SECONDS: float = 0.25
+    BROWSER_READINESS_STABLE_POLLS: int = 2 # consecutive polls with unchanged text length
+    BROWSER_READINESS_MIN_TEXT_CHARS: int = 300
+
+    # Tiered fetching: pooled async HTTP first, the browser only for JS-rendered pages
+    FETCH_TIERED_ENABLED: bool = True
+    HTTP_FETCH_TIMEOUT_SECONDS: int = 15
+    HTTP_FETCH_MAX_CONNECTIONS: int = 100
+    HTTP_FETCH_MAX_CONNECTIONS_PER_HOST: int = 4
+    HTTP_FETCH_DNS_CACHE_SECONDS: int = 300
+    HTTP_FETCH_KEEPALIVE_SECONDS: int = 30
+    HTTP_FETCH_MAX_BYTES: int = 5 * 1024 * 1024
+    # A page with less visible text than this (or a framework shell / policy page without policy keywords) goes to the browser
+    JS_SHELL_MIN_TEXT_CHARS: int = 300
+    JS_SHELL_MARKERS: list[str] = [
+        r'<div[^>]+id=["\'](?:root|app|__next|__nuxt|___gatsby)["\'][^>]*>\s*</div>',
+        r'<app-root[^>]*>\s*</app-root>',
+        r'\bng-version=', r'window\.__NUXT__', r'__NEXT_DATA__', r'data-reactroot',
+        r'<noscript>[^<]*(?:enable|activate|turn on)\s+javascript',
+    ]
+
+    # HTML parsing backend shared by link discovery, text cleaning and table extraction: "lxml" or "bs4"
+    HTML_PARSER_BACKEND: str = "lxml"
+
+    # Translation of non-English policies (process-wide TranslationManager)
+    TRANSLATION_CHUNK_SIZE: int = 4000 # characters per translator request, split on paragraph/sentence boundaries
+    TRANSLATION_MAX_CONCURRENCY: int = 4 # translator requests in flight (own thread pool)
+    TRANSLATION_RATE_PER_SECOND: float = 5.0 # translator requests started per second, 0 = unlimited
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 2048 # in-process LRU of documents and chunks
+    TRANSLATION_CACHE_TTL_SECONDS: int = 30 * 24 * 3600 # Mongo tier, 0 = never expires
+    # Translation is off the analysis path: materialised on demand (API/dashboard) or by a background worker
+    TRANSLATION_DEFERRED: bool = True
+    TRANSLATION_BACKGROUND_WORKERS: int = 1 # 0 = only translate on demand
+    TRANSLATION_QUEUE_MAX_SIZE: int = 1000 # pending websites; further schedules are dropped and translated on demand
+
 class PolicyDiscoverySettings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
@@ -91,6 +193,29 @@ class PolicyDiscoverySettings(BaseSettings):
     FOOTER_SELECTORS: list[str] = ['footer', '.footer', '.site-footer']
     NAV_SELECTORS: list[str] = ['nav', '.navigation', '.nav', '.menu']
 
+    # Concurrent discovery: landing-page DOM, well-known paths, sitemaps and search race each other
+    CONFIDENCE_THRESHOLD: float = 0.8 # the first candidate at or above this wins and the other strategies are cancelled
+    DOM_LINK_SCORE: float = 0.85 # the landing page links to the policy
+    WELL_KNOWN_PATH_SCORE: float = 0.9 # a probed path that serves policy text
+    SEARCH_RESULT_SCORE: float = 0.75
+    WELL_KNOWN_PATHS: list[str] = [
+        '/cookie-policy', '/cookies', '/cookie-notice', '/cookies-policy', '/legal/cookies', '/privacy/cookies',
+    ]
+    PROBE_MIN_KEYWORD_HITS: int = 5 # "cookie" mentions needed to accept a probed page (filters soft 404s)
+    SITEMAP_MAX_FETCHES: int = 4 # robots.txt-referenced sitemaps, /sitemap.xml and child sitemaps
+    # Search is expensive (browser + rate limits): start it after this delay, or as soon as the cheap strategies fail
+    SEARCH_DELAY_SECONDS: float = 3.0
+    # Search engine queries: results cached per (engine, domain, query), queries of one search run concurrently
+    SEARCH_CACHE_MAX_ENTRIES: int = 4096
+    SEARCH_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    SEARCH_NEGATIVE_CACHE_TTL_SECONDS: int = 24 * 3600 # queries that completed without a policy URL
+    SEARCH_RATE_PER_SECOND: float = 1.0 # queries started per second and engine, shared by all searches, 0 = unlimited
+    SEARCH_RATE_BURST: int = 2
+    # Negative cache: sites without a discoverable policy are not crawled again until their backoff expires
+    NEGATIVE_CACHE_ENABLED: bool = True
+    NEGATIVE_CACHE_BASE_TTL_SECONDS: int = 6 * 3600 # doubled on every consecutive miss
+    NEGATIVE_CACHE_MAX_TTL_SECONDS: int = 14 * 24 * 3600
+
 class LLMSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
     SYSTEM_PROMPT_LLAMA: str = """
@@ -217,15 +342,33 @@ If no specific cookies are described, return:
 }
 """
 
+    # Content-addressed cache of cookie extraction results (bump PROMPT_VERSION to invalidate)
+    PROMPT_VERSION: str = "v1"
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 1024 # in-process LRU tier
+    EXTRACTION_CACHE_MEMORY_TTL_SECONDS: int = 3600
+    EXTRACTION_CACHE_PERSISTENT_TTL_SECONDS: int = 30 * 24 * 3600 # Mongo tier, 0 = never expires
+
+    # Map-reduce extraction: content over the budget is split on section/table boundaries and the chunks run concurrently
+    EXTRACTION_CHUNKING_ENABLED: bool = True
+    EXTRACTION_CHUNK_MAX_TOKENS: int = 6000 # per chunk, excluding the system prompt
+    EXTRACTION_CHARS_PER_TOKEN: float = 4.0 # rough estimate used for the budget
+    EXTRACTION_CHUNK_CONCURRENCY: int = 4 # chunks of one document in flight at once
+
 class ViolationSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
     RETENTION_THRESHOLD_PERCENTAGE: float = 30.0
     SEMANTIC_SIMILARITY_THRESHOLD: float = 0.5
+    SEMANTIC_SIMILARITY_BACKEND: str = "ngram" # ngram (NumPy, vectorised) | difflib (reference)
+    SEMANTIC_SIMILARITY_NGRAM_SIZE: int = 2
+    SEMANTIC_SIMILARITY_INDEX_CACHE_SIZE: int = 128 # vectorised purpose-label sets kept across analyses
+    SEMANTIC_SIMILARITY_NAME_CACHE_SIZE: int = 4096 # cookie name -> max score, per label set
     LONG_TERM_RETENTION_DAYS: int = 365
     SESSION_THRESHOLD_HOURS: int = 24
     ISSUE_PENALTY_POINTS: int = 5
     MAX_COMPLIANCE_SCORE: int = 100
+    RETENTION_PARSE_CACHE_SIZE: int = 1024 # LRU of parsed declared retention strings ("2 years", "session", ...)
     KNOWN_AD_TRACKERS: list[str] = [
         'doubleclick.net', 'google-analytics.com', 'googletagmanager.com',
         'facebook.com', 'connect.facebook.net', 'twitter.com', 'linkedin.com',
@@ -1,5 +1,5 @@
+from typing import Optional
 from concurrent.futures import ThreadPoolExecutor
-from playwright.async_api import async_playwright
 from fastapi import Depends, HTTPException, status, Header
 from loguru import logger
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,31 +10,114 @@ from src.repositories.policy_content_repository import PolicyContentRepository
 from src.repositories.cookie_feature_repository import CookieFeatureRepository
 from src.repositories.violation_repository import ViolationRepository
 from src.repositories.website_repository import WebsiteRepository
+from src.repositories.llm_extraction_cache_repository import LLMExtractionCacheRepository
+from src.repositories.translation_cache_repository import TranslationCacheRepository
+from src.repositories.analysis_job_repository import AnalysisJobRepository
+from src.repositories.site_lease_repository import SiteLeaseRepository
 
 from src.configs.settings import settings
 
 from src.services.auth_service.auth_service import AuthService
+from src.services.auth_service.principal_cache import PrincipalCache
 from src.services.cookie_extractor_service.policy_cookie_extractor_service import CookieExtractorService
 from src.services.cookie_extractor_service.interfaces.llm_provider import ILLMProvider
 from src.services.cookie_extractor_service.factories.cookie_extractor_factory import CookieExtractorFactory, LLMProviderType
 from src.services.cookie_extractor_service.processors.content_analyzer import ContentAnalyzer
 from src.services.cookie_extractor_service.processors.prompt_builder import PromptBuilder
 from src.services.cookie_extractor_service.processors.response_processor import LLMResponseProcessor
+from src.services.cookie_extractor_service.processors.content_chunker import ContentChunker
+from src.services.cookie_extractor_service.processors.extraction_cache import ExtractionCache
 from src.services.policy_crawler_service.policy_crawler_service import PolicyCrawlerService
 from src.services.policy_crawler_service.crawler_factory import CrawlerFactory
+from src.services.policy_crawler_service.components.browser_pool import BrowserPool
+from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
+from src.services.policy_crawler_service.content_extractors.http_content_extractor import HttpContentExtractor
+from src.services.policy_crawler_service.content_extractors.playwright_content_extractor import PlaywrightContentExtractor
+from src.services.policy_crawler_service.content_extractors.tiered_content_extractor import TieredContentExtractor
 from src.services.comparator_service.comparator_factory import ComparatorFactory
 from src.services.comparator_service.components.compliance_comparator import ComplianceComparator
 from src.services.comparator_service.comparator_service import ComparatorService
 from src.services.violation_analyzer_service.violation_analyzer_service import ViolationAnalyzerService
+from src.services.violation_analyzer_service.site_analysis_coalescer import SiteAnalysisCoalescer
+from src.services.violation_analyzer_service.policy_cache_freshness import PolicyCacheFreshness
+from src.services.analysis_job_service.analysis_job_service import AnalysisJobService
+from src.services.analysis_job_service.interfaces.job_queue import IJobQueue
+from src.services.analysis_job_service.queues.mongo_job_queue import MongoJobQueue
+from src.services.analysis_job_service.queues.in_memory_job_queue import InMemoryJobQueue
 from src.services.domain_request_service import DomainRequestService
+from src.services.user_identity_map import UserIdentityMap
 from src.services.website_management_service.website_management_service import WebsiteManagementService
+from src.services.policy_translation_service.policy_translation_service import PolicyTranslationService
 
 from src.utils.jwt_handler import decode_access_token
+from src.utils.concurrency_utils import StageLimiter
+from src.utils.translation_utils import TranslationManager
 from src.schemas.user import User, UserRole
 from src.exceptions.custom_exceptions import UnauthorizedError, UserNotFoundError
 
 oauth2_scheme = HTTPBearer()
 
+# Process-wide browser pool, started/stopped in the FastAPI lifespan (see main.py)
+browser_pool = BrowserPool()
+
+def get_browser_pool() -> BrowserPool:
+    return browser_pool
+
+# Process-wide fetcher: pooled async HTTP first, the browser pool only for JS-rendered pages.
+# The HTTP session is opened/closed in the FastAPI lifespan (see main.py)
+http_content_extractor = HttpContentExtractor()
+content_extractor = TieredContentExtractor(
+    http_content_extractor, PlaywrightContentExtractor(browser_pool, timeout=30)
+) if settings.crawler.FETCH_TIERED_ENABLED else None
+
+def get_content_extractor() -> Optional[IContentExtractor]:
+    return content_extractor
+
+def get_http_content_extractor() -> HttpContentExtractor:
+    return http_content_extractor
+
+# Process-wide LLM extraction cache; its in-memory tier must outlive a single request
+extraction_cache = ExtractionCache(repository=LLMExtractionCacheRepository()) if settings.llm.EXTRACTION_CACHE_ENABLED else None
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    return extraction_cache
+
+# Process-wide translator: shared LRU + Mongo cache, rate limit and request coalescing
+translation_manager = TranslationManager(repository=TranslationCacheRepository())
+
+def get_translation_manager() -> TranslationManager:
+    return translation_manager
+
+# Deferred policy translation; background workers are started in the FastAPI lifespan (see main.py)
+policy_translation_service = PolicyTranslationService(translation_manager, PolicyContentRepository(), WebsiteRepository())
+
+def get_policy_translation_service() -> PolicyTranslationService:
+    return policy_translation_service
+
+# Per-stage concurrency limits shared by single and batch analyses
+stage_limiter = StageLimiter.from_settings()
+
+def get_stage_limiter() -> StageLimiter:
+    return stage_limiter
+
+# Single-flight for cache-miss analyses of the same site, across workers through a Mongo lease
+site_analysis_coalescer = SiteAnalysisCoalescer(SiteLeaseRepository() if settings.internal_api.SITE_LEASE_ENABLED else None)
+
+def get_site_analysis_coalescer() -> SiteAnalysisCoalescer:
+    return site_analysis_coalescer
+
+# Soft/hard TTL of stored analyses; background revalidations are cancelled in the FastAPI lifespan (see main.py)
+policy_cache_freshness = PolicyCacheFreshness()
+
+def get_policy_cache_freshness() -> PolicyCacheFreshness:
+    return policy_cache_freshness
+
+# Người dùng đã xác thực theo token id, dùng chung cho mọi request của process
+principal_cache = PrincipalCache()
+
+def get_principal_cache() -> PrincipalCache:
+    return principal_cache
+
 def get_user_repository() -> UserRepository:
     return UserRepository()
 
@@ -50,16 +133,38 @@ def get_cookie_feature_repository() -> CookieFeatureRepository:
 def get_violation_repository() -> ViolationRepository:
     return ViolationRepository()
 
+# Process-wide LLM provider: it owns a long-lived client / connection pool, opened and
+# closed in the FastAPI lifespan (see main.py). Created on first use so that a missing
+# API key only fails the requests that need the LLM.
+_llm_provider: Optional[ILLMProvider] = None
+
 def get_llm_provider() -> ILLMProvider:
-    return CookieExtractorFactory.create_provider(
-        provider_type=LLMProviderType.GEMINI,
-        # provider_type=LLMProviderType.LLAMA,
-        api_key=settings.external.GEMINI_API_KEY,
-        # api_endpoint=settings.external.LLAMA_API_ENDPOINT,
-        model=settings.external.GEMINI_MODEL,
-        temperature=settings.external.TEMPERATURE,
-        max_tokens=settings.external.MAX_OUTPUT_TOKENS
-    )
+    global _llm_provider
+    if _llm_provider is None:
+        _llm_provider = CookieExtractorFactory.create_provider(
+            provider_type=LLMProviderType.GEMINI,
+            # provider_type=LLMProviderType.LLAMA,
+            api_key=settings.external.GEMINI_API_KEY,
+            # api_endpoint=settings.external.LLAMA_API_ENDPOINT,
+            model=settings.external.GEMINI_MODEL,
+            temperature=settings.external.TEMPERATURE,
+            max_tokens=settings.external.MAX_OUTPUT_TOKENS
+        )
+    return _llm_provider
+
+async def start_llm_provider() -> None:
+    try:
+        provider = get_llm_provider()
+    except (ValueError, TypeError) as e:
+        logger.warning(f"LLM provider is not configured, skipping client startup: {e}")
+        return
+    await provider.start()
+
+async def close_llm_provider() -> None:
+    global _llm_provider
+    provider, _llm_provider = _llm_provider, None
+    if provider is not None:
+        await provider.close()
 
 # def get_llm_provider() -> ILLMProvider:
 #     return CookieExtractorFactory.create_provider(
@@ -86,36 +191,42 @@ def get_policy_cookie_extractor_service(
     content_analyzer: ContentAnalyzer = Depends(get_content_analyzer),
     prompt_builder: PromptBuilder = Depends(get_prompt_builder),
     response_processor: LLMResponseProcessor = Depends(get_response_processor),
-    cookie_feature_repository: CookieFeatureRepository = Depends(get_cookie_feature_repository)
+    cookie_feature_repository: CookieFeatureRepository = Depends(get_cookie_feature_repository),
+    extraction_cache: Optional[ExtractionCache] = Depends(get_extraction_cache)
 ) -> CookieExtractorService:
     return CookieExtractorService(
         llm_provider=llm_provider,
         content_analyzer=content_analyzer,
         prompt_builder=prompt_builder,
         response_processor=response_processor,
-        cookie_feature_repository=cookie_feature_repository
+        cookie_feature_repository=cookie_feature_repository,
+        extraction_cache=extraction_cache,
+        content_chunker=ContentChunker() if settings.llm.EXTRACTION_CHUNKING_ENABLED else None
     )
 
-async def create_playwright_bing_extractor(
-    policy_content_repo: PolicyContentRepository = Depends(get_policy_content_repository)
+def create_playwright_bing_extractor(
+    policy_content_repo: PolicyContentRepository = Depends(get_policy_content_repository),
+    browser_pool: BrowserPool = Depends(get_browser_pool),
+    stage_limiter: StageLimiter = Depends(get_stage_limiter),
+    translation_manager: TranslationManager = Depends(get_translation_manager),
+    translation_service: PolicyTranslationService = Depends(get_policy_translation_service),
+    content_extractor: Optional[IContentExtractor] = Depends(get_content_extractor),
+    http_extractor: HttpContentExtractor = Depends(get_http_content_extractor)
 ) -> PolicyCrawlerService:
     """
     Provides a PolicyCrawlerService instance with a Playwright-based content extractor.
-    Manages the Playwright browser and context lifecycle.
+    Browser contexts are leased from the shared pool instead of launching Chromium per request.
     """
-    p = await async_playwright().start()
-    browser = await p.chromium.launch(headless=True)
-    context = await browser.new_context()
-    try:
-        yield CrawlerFactory.create_playwright_bing_extractor(
-            policy_content_repo=policy_content_repo,
-            browser_context=context,
-            timeout=30
-        )
-    finally:
-        await context.close()
-        await browser.close()
-        await p.stop()
+    return CrawlerFactory.create_playwright_bing_extractor(
+        policy_content_repo=policy_content_repo,
+        browser_pool=browser_pool,
+        timeout=30,
+        stage_limiter=stage_limiter,
+        translation_manager=translation_manager,
+        translation_service=translation_service,
+        content_extractor=content_extractor,
+        http_extractor=http_extractor
+    )
 
 def get_compliance_comparator() -> ComplianceComparator:
     return ComplianceComparator()
@@ -132,28 +243,73 @@ def get_website_repository() -> WebsiteRepository:
 def get_domain_request_repository() -> DomainRequestRepository:
     return DomainRequestRepository()
 
+def get_user_identity_map(user_repo: UserRepository = Depends(get_user_repository)) -> UserIdentityMap:
+    # FastAPI caches a dependency per request, so every service of the request shares this map
+    return UserIdentityMap(user_repo)
+
 def get_domain_request_service(
     domain_request_repo: DomainRequestRepository = Depends(get_domain_request_repository),
     website_repo: WebsiteRepository = Depends(get_website_repository),
-    user_repo: UserRepository = Depends(get_user_repository) # Add UserRepository dependency
+    user_repo: UserRepository = Depends(get_user_repository), # Add UserRepository dependency
+    user_identity_map: UserIdentityMap = Depends(get_user_identity_map)
 ) -> DomainRequestService:
-    return DomainRequestService(domain_request_repo, website_repo, user_repo)
+    return DomainRequestService(domain_request_repo, website_repo, user_repo, user_identity_map, principal_cache)
 
 def get_violation_analyzer_service(
     policy_crawler: PolicyCrawlerService = Depends(create_playwright_bing_extractor),
     policy_cookie_extractor_service: CookieExtractorService = Depends(get_policy_cookie_extractor_service),
     comparator_service: ComparatorService = Depends(get_comparator_service),
     violation_repository: ViolationRepository = Depends(get_violation_repository),
-    website_repository: WebsiteRepository = Depends(get_website_repository)
+    website_repository: WebsiteRepository = Depends(get_website_repository),
+    stage_limiter: StageLimiter = Depends(get_stage_limiter),
+    translation_service: PolicyTranslationService = Depends(get_policy_translation_service),
+    coalescer: SiteAnalysisCoalescer = Depends(get_site_analysis_coalescer),
+    freshness: PolicyCacheFreshness = Depends(get_policy_cache_freshness)
 ) -> ViolationAnalyzerService:
     return ViolationAnalyzerService(
         policy_crawler=policy_crawler,
         policy_cookie_extractor_service=policy_cookie_extractor_service,
         comparator_service=comparator_service,
         violation_repository=violation_repository,
-        website_repository=website_repository
+        website_repository=website_repository,
+        stage_limiter=stage_limiter,
+        translation_service=translation_service,
+        coalescer=coalescer,
+        freshness=freshness
+    )
+
+def build_violation_analyzer_service() -> ViolationAnalyzerService:
+    """Wire a ViolationAnalyzerService outside of a request, for background job workers"""
+    violation_repository = get_violation_repository()
+    return get_violation_analyzer_service(
+        policy_crawler=create_playwright_bing_extractor(
+            get_policy_content_repository(), browser_pool, stage_limiter,
+            translation_manager, policy_translation_service, content_extractor, http_content_extractor
+        ),
+        policy_cookie_extractor_service=get_policy_cookie_extractor_service(
+            get_llm_provider(), get_content_analyzer(), get_prompt_builder(),
+            get_response_processor(), get_cookie_feature_repository(), extraction_cache
+        ),
+        comparator_service=get_comparator_service(violation_repository, get_compliance_comparator()),
+        violation_repository=violation_repository,
+        website_repository=get_website_repository(),
+        stage_limiter=stage_limiter,
+        translation_service=policy_translation_service,
+        coalescer=site_analysis_coalescer,
+        freshness=policy_cache_freshness
     )
 
+def _create_job_queue() -> IJobQueue:
+    if settings.internal_api.JOB_QUEUE_BACKEND == "memory":
+        return InMemoryJobQueue()
+    return MongoJobQueue(AnalysisJobRepository())
+
+# Process-wide background analysis jobs; workers are started in the FastAPI lifespan (see main.py)
+analysis_job_service = AnalysisJobService(_create_job_queue(), build_violation_analyzer_service)
+
+def get_analysis_job_service() -> AnalysisJobService:
+    return analysis_job_service
+
 def get_website_management_service(
     website_repo: WebsiteRepository = Depends(get_website_repository),
     violation_repo: ViolationRepository = Depends(get_violation_repository),
@@ -165,7 +321,7 @@ def get_auth_service(
     user_repo: UserRepository = Depends(get_user_repository),
     role_change_request_repo: DomainRequestRepository = Depends(get_role_change_request_repository)
 ) -> AuthService:
-    return AuthService(user_repo, role_change_request_repo)
+    return AuthService(user_repo, role_change_request_repo, principal_cache)
 
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
@@ -175,10 +331,7 @@ async def get_current_user(
         payload = decode_access_token(token.credentials)
         if payload is None:
             raise UnauthorizedError("Invalid token")
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise UnauthorizedError("Invalid token payload")
-        user_data = await auth_service.get_current_user(user_id)
+        user_data = await auth_service.authenticate(payload, token.credentials)
         if not user_data:
             raise UserNotFoundError()
         return User(**user_data.model_dump()) # Convert to dict then to User
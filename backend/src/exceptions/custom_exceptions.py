@@ -53,6 +53,18 @@ class PolicyAnalysisError(Exception):
 class RetryableError(Exception):
     pass
 
+class LLMResponseError(Exception):
+    """The LLM provider failed or returned a response that could not be parsed"""
+    pass
+
+class SearchError(Exception):
+    """A policy search could not be completed (queries failed or the browser was unavailable)"""
+    pass
+
+class TranslationError(Exception):
+    """The translator failed; raised by TranslationManager.translate(strict=True)"""
+    pass
+
 class DomainRequestNotFoundError(Exception):
     pass
 
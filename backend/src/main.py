@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import HTTPException
 from fastapi import FastAPI
 import traceback
@@ -5,13 +6,41 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.routes import auth, policies, users, violations, domain_requests, websites #, reports
 from src.configs.settings import settings
+from src.dependencies.dependencies import (
+    browser_pool, extraction_cache, stage_limiter, analysis_job_service, translation_manager,
+    policy_translation_service, http_content_extractor, content_extractor, site_analysis_coalescer,
+    policy_cache_freshness, principal_cache, start_llm_provider, close_llm_provider
+)
+from src.repositories.indexes import ensure_all_indexes
+from src.utils.search_utils import get_search_metrics
 import uvicorn
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start long-lived resources once per process"""
+    if settings.db.ENSURE_INDEXES_ON_STARTUP:
+        await ensure_all_indexes()
+    await browser_pool.start()
+    await http_content_extractor.start()
+    await start_llm_provider()
+    await analysis_job_service.start()
+    await policy_translation_service.start()
+    try:
+        yield
+    finally:
+        await policy_cache_freshness.stop()
+        await policy_translation_service.stop()
+        await analysis_job_service.stop()
+        await close_llm_provider()
+        await http_content_extractor.close()
+        await browser_pool.stop()
+
 app = FastAPI(
     title=settings.app.API_TITLE,
     description=settings.app.API_DESCRIPTION,
     version=settings.app.API_VERSION,
-    debug=settings.app.APP_DEBUG
+    debug=settings.app.APP_DEBUG,
+    lifespan=lifespan
 )
 
 origins = settings.app.CORS_ORIGINS.split(",") if settings.app.CORS_ORIGINS else [
@@ -56,6 +85,67 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+@app.get("/health/browser-pool")
+async def browser_pool_health():
+    """Browser pool health and saturation metrics"""
+    return {
+        "browsers": await browser_pool.health_check(),
+        "metrics": browser_pool.get_metrics()
+    }
+
+@app.get("/health/llm-cache")
+async def llm_cache_health():
+    """LLM extraction cache hit/miss counters"""
+    if extraction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "metrics": extraction_cache.get_metrics()}
+
+@app.get("/health/fetch-tiers")
+async def fetch_tiers_health():
+    """Share of pages served by plain HTTP vs the browser, why pages were escalated, and browser blocking/readiness"""
+    if content_extractor is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "metrics": content_extractor.get_metrics(),
+        "browser": content_extractor.browser_extractor.get_metrics(),
+    }
+
+@app.get("/health/translation")
+async def translation_health():
+    """Translation cache, coalescing and rate-limit counters, plus the deferred translation queue"""
+    return {**translation_manager.get_metrics(), "deferred": policy_translation_service.get_metrics()}
+
+@app.get("/health/search")
+async def search_health():
+    """Search result cache hit/miss counters and rate-limit waits per engine"""
+    return get_search_metrics()
+
+@app.get("/health/analysis-stages")
+async def analysis_stages_health():
+    """Per-stage concurrency limits and saturation of the analysis pipeline"""
+    return stage_limiter.get_metrics()
+
+@app.get("/health/site-analysis")
+async def site_analysis_health():
+    """How many cache-miss analyses were coalesced onto an in-flight analysis of the same site"""
+    return site_analysis_coalescer.get_metrics()
+
+@app.get("/health/policy-cache")
+async def policy_cache_health():
+    """Freshness (fresh / stale / expired) and age of stored analyses served, and background revalidations"""
+    return policy_cache_freshness.get_metrics()
+
+@app.get("/health/auth")
+async def auth_health():
+    """Principal cache hit ratio and invalidations (authenticated requests served without a users lookup)"""
+    return principal_cache.get_stats()
+
+@app.get("/health/analysis-jobs")
+async def analysis_jobs_health():
+    """Background analysis job counters"""
+    return await analysis_job_service.get_metrics()
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+from enum import Enum
+from pydantic import Field
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+from src.models.base import BaseMongoDBModel
+
+class AnalysisJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD_LETTERED = "dead_lettered"
+
+ACTIVE_JOB_STATUSES = (AnalysisJobStatus.QUEUED, AnalysisJobStatus.RUNNING)
+
+class AnalysisJob(BaseMongoDBModel):
+    root_url: str = Field(..., description="Root URL of the analysed website")
+    dedupe_key: str = Field(..., description="Digest of root URL and submission; identical in-flight jobs are coalesced")
+    active_key: Optional[str] = Field(default=None, description="Equals dedupe_key while the job is queued or running (unique index)")
+    payload: Dict[str, Any] = Field(..., description="The CookieSubmissionRequest to analyse")
+    request_id: str = Field(...)
+    status: AnalysisJobStatus = Field(default=AnalysisJobStatus.QUEUED)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    available_at: datetime = Field(..., description="Earliest time a worker may claim the job (retry backoff)")
+    lease_expires_at: Optional[datetime] = Field(default=None, description="A running job whose lease expired is reclaimed")
+    worker_id: Optional[str] = Field(default=None)
+    coalesced_count: int = Field(default=0, description="Number of duplicate submissions folded into this job")
+    result: Optional[Dict[str, Any]] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+    started_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, Optional, Any
 from datetime import datetime, timezone
 from bson import ObjectId
 from pydantic_core import core_schema
@@ -43,3 +43,14 @@ class BaseMongoDBModel(BaseModel):
         validate_by_name = True
         arbitrary_types_allowed = True
         from_attributes = True
+
+class ReadView(BaseModel):
+    """
+    Typed subset of a collection document for one use case. Read it with
+    `projection()` so Mongo only returns (and Pydantic only validates) these fields.
+    """
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    @classmethod
+    def projection(cls) -> Dict[str, int]:
+        return {field.alias or name: 1 for name, field in cls.model_fields.items()}
@@ -3,7 +3,7 @@ from pydantic import Field, HttpUrl
 from typing import Optional, List
 from enum import Enum
 
-from src.models.base import BaseMongoDBModel, PyObjectId
+from src.models.base import BaseMongoDBModel, PyObjectId, ReadView
 from src.models.cookie import PolicyCookie
 
 class Website(BaseMongoDBModel):
@@ -19,3 +19,49 @@ class Website(BaseMongoDBModel):
     translated_table_content: Optional[str] = Field(default=None)
     is_specific: int = Field(...)
     policy_cookies: List[PolicyCookie] = Field(default_factory=list)
+    policy_content_hash: Optional[str] = Field(default=None, description="Digest of the policy text and tables the cookies were extracted from")
+    cache_soft_ttl_seconds: Optional[int] = Field(default=None, description="Per-site override of the soft cache TTL")
+    cache_hard_ttl_seconds: Optional[int] = Field(default=None, description="Per-site override of the hard cache TTL")
+    refresh_failures: int = Field(default=0, description="Consecutive failed policy revalidations")
+    refresh_retry_at: Optional[datetime] = Field(default=None, description="No revalidation before this time after a failure")
+
+
+class WebsiteAnalysisView(ReadView):
+    """What an analysis needs from a stored website: extracted cookies and freshness, no policy text"""
+    id: PyObjectId = Field(alias="_id")
+    domain: str
+    last_checked_at: datetime
+    policy_url: Optional[str] = None
+    is_specific: int = 0
+    policy_cookies: List[PolicyCookie] = Field(default_factory=list)
+    policy_content_hash: Optional[str] = None
+    cache_soft_ttl_seconds: Optional[int] = None
+    cache_hard_ttl_seconds: Optional[int] = None
+    refresh_failures: int = 0
+    refresh_retry_at: Optional[datetime] = None
+
+
+class WebsiteListRow(ReadView):
+    """One row of the website listing; the cookie count is computed by Mongo ($size)"""
+    id: PyObjectId = Field(alias="_id")
+    domain: str
+    policy_url: Optional[str] = None
+    is_specific: Optional[int] = None
+    last_checked_at: Optional[datetime] = None
+    num_specified_cookies: int = 0
+
+
+class WebsiteDetailView(ReadView):
+    """Website detail page: the stored policy without the extracted cookie list"""
+    id: PyObjectId = Field(alias="_id")
+    domain: str
+    user_id: Optional[PyObjectId] = None
+    is_approved: bool = False
+    last_checked_at: Optional[datetime] = None
+    policy_url: Optional[str] = None
+    detected_language: Optional[str] = None
+    original_content: str = ""
+    translated_content: Optional[str] = None
+    table_content: List[dict] = Field(default_factory=list)
+    translated_table_content: Optional[str] = None
+    is_specific: int = 0
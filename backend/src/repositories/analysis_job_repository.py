@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.repositories.base import BaseRepository
+from src.configs.settings import settings
+from src.models.analysis_job import AnalysisJobStatus
+
+class AnalysisJobRepository(BaseRepository):
+    """Mongo storage for background analysis jobs"""
+
+    indexes = [
+        # active_key only exists while a job is queued/running, so at most one active job per dedupe key
+        IndexModel([("active_key", ASCENDING)], unique=True, sparse=True),
+        IndexModel([("status", ASCENDING), ("available_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)]),
+    ]
+    query_shapes = {
+        "insert_or_get_active": {"filter": {"active_key": "digest"}},
+        "claim_next": {
+            "filter": {"$or": [
+                {"status": AnalysisJobStatus.QUEUED.value, "available_at": {"$lte": datetime(2024, 1, 1)}},
+                {"status": AnalysisJobStatus.RUNNING.value, "lease_expires_at": {"$lte": datetime(2024, 1, 1)},
+                 "$expr": {"$lt": ["$attempts", "$max_attempts"]}},
+            ]},
+            "sort": [("available_at", ASCENDING)],
+        },
+        "dead_letter_expired": {
+            "filter": {"status": AnalysisJobStatus.RUNNING.value, "lease_expires_at": {"$lte": datetime(2024, 1, 1)},
+                       "$expr": {"$gte": ["$attempts", "$max_attempts"]}},
+        },
+    }
+
+    def __init__(self):
+        super().__init__(settings.db.ANALYSIS_JOBS_COLLECTION)
+
+    async def insert_or_get_active(self, job: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Insert the job unless an active job with the same dedupe key exists.
+        Returns (job, coalesced).
+        """
+        try:
+            await self.collection.insert_one({**job, "active_key": job["dedupe_key"]})
+            return job, False
+        except DuplicateKeyError:
+            existing = await self.collection.find_one_and_update(
+                {"active_key": job["dedupe_key"]},
+                {"$inc": {"coalesced_count": 1}},
+                return_document=ReturnDocument.AFTER
+            )
+            if existing is None:
+                # The active job finished between the insert and the lookup
+                return await self.insert_or_get_active(job)
+            return existing, True
+
+    async def claim_next(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim the oldest available job, including running jobs whose lease expired
+        while they still have attempts left
+        """
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": AnalysisJobStatus.QUEUED.value, "available_at": {"$lte": now}},
+                {"status": AnalysisJobStatus.RUNNING.value, "lease_expires_at": {"$lte": now},
+                 "$expr": {"$lt": ["$attempts", "$max_attempts"]}},
+            ]},
+            {
+                "$set": {
+                    "status": AnalysisJobStatus.RUNNING.value,
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def dead_letter_expired(self) -> int:
+        """Dead-letter running jobs whose lease expired on their last attempt (the worker died mid-run)"""
+        now = datetime.utcnow()
+        result = await self.collection.update_many(
+            {"status": AnalysisJobStatus.RUNNING.value, "lease_expires_at": {"$lte": now},
+             "$expr": {"$gte": ["$attempts", "$max_attempts"]}},
+            {
+                "$set": {"status": AnalysisJobStatus.DEAD_LETTERED.value, "error": "Lease expired on the last attempt",
+                         "finished_at": now, "updated_at": now, "lease_expires_at": None},
+                "$unset": {"active_key": ""},
+            }
+        )
+        return result.modified_count
+
+    async def renew_lease(self, job: Dict[str, Any], lease_seconds: int) -> bool:
+        """Extend the lease of a job still held by the claim in `job`; False once the lease was lost"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            _lease_filter(job),
+            {"$set": {"lease_expires_at": now + timedelta(seconds=lease_seconds), "updated_at": now}}
+        )
+        return result.matched_count == 1
+
+    # Các lần ghi kết thúc chỉ áp dụng khi worker vẫn giữ lượt nhận job (đang chạy, cùng worker_id và attempts)
+
+    async def mark_succeeded(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        now = datetime.utcnow()
+        outcome = await self.collection.update_one(
+            _lease_filter(job),
+            {
+                "$set": {"status": AnalysisJobStatus.SUCCEEDED.value, "result": result, "error": None,
+                         "finished_at": now, "updated_at": now, "lease_expires_at": None},
+                "$unset": {"active_key": ""},
+            }
+        )
+        return outcome.matched_count == 1
+
+    async def mark_retry(self, job: Dict[str, Any], error: str, available_at: datetime) -> bool:
+        outcome = await self.collection.update_one(
+            _lease_filter(job),
+            {"$set": {"status": AnalysisJobStatus.QUEUED.value, "error": error, "available_at": available_at,
+                      "lease_expires_at": None, "worker_id": None, "updated_at": datetime.utcnow()}}
+        )
+        return outcome.matched_count == 1
+
+    async def mark_dead_lettered(self, job: Dict[str, Any], error: str) -> bool:
+        now = datetime.utcnow()
+        outcome = await self.collection.update_one(
+            _lease_filter(job),
+            {
+                "$set": {"status": AnalysisJobStatus.DEAD_LETTERED.value, "error": error,
+                         "finished_at": now, "updated_at": now, "lease_expires_at": None},
+                "$unset": {"active_key": ""},
+            }
+        )
+        return outcome.matched_count == 1
+
+    async def count_by_status(self) -> Dict[str, int]:
+        pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+        return {row["_id"]: row["count"] async for row in self.collection.aggregate(pipeline)}
+
+
+def _lease_filter(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {"_id": job["_id"], "status": AnalysisJobStatus.RUNNING.value,
+            "worker_id": job["worker_id"], "attempts": job["attempts"]}
@@ -1,12 +1,36 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 from bson import ObjectId
-from pymongo import ReturnDocument # Import ReturnDocument
+from loguru import logger
+from pymongo import DESCENDING, IndexModel, ReturnDocument # Import ReturnDocument
+from pymongo.errors import OperationFailure
 from src.configs.database import get_collection
+from src.utils.pagination_utils import CACHED, ESTIMATED, EXACT, KeysetPage, encode_cursor, get_cached_total, keyset_filter, set_cached_total
 
 class BaseRepository:
+    # Index mà các truy vấn của repository cần; được tạo khi khởi động (xem src/repositories/indexes.py)
+    indexes: List[IndexModel] = []
+    # Dạng truy vấn tiêu biểu {tên: {"filter": ..., "sort": ...}} dùng để kiểm tra explain plan
+    query_shapes: Dict[str, Dict[str, Any]] = {}
+
     def __init__(self, collection_name: str):
         self.collection = get_collection(collection_name)
 
+    async def ensure_indexes(self) -> List[str]:
+        """
+        Create the declared indexes (no-op for indexes that already exist).
+        Each index is built on its own: one that cannot be built (e.g. a unique index over duplicate data) is logged
+        and does not block the others of the collection.
+        """
+        created: List[str] = []
+        for index in self.indexes:
+            try:
+                created.extend(await self.collection.create_indexes([index]))
+            except OperationFailure as e:
+                logger.error("index_creation_failed", collection=self.collection.name,
+                             index=index.document["name"], error=str(e))
+        return created
+
     async def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return await self.collection.find_one(query)
 
@@ -58,3 +82,53 @@ class BaseRepository:
     async def delete_one(self, query: Dict[str, Any]) -> int:
         result = await self.collection.delete_one(query)
         return result.deleted_count
+
+    async def keyset_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_field: str = "_id",
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        projection: Optional[Dict[str, Any]] = None,
+        total_mode: str = EXACT,
+    ) -> KeysetPage:
+        """
+        One page in (sort_field desc, _id desc) order, read as an index-backed seek from the
+        cursor, and the total matching `filters`, counted concurrently. Unfiltered listings may
+        use the cached or estimated total instead of counting. `skip` is only applied without
+        a cursor (legacy offset paging).
+        """
+        query = filters or {}
+        match = query
+        if cursor:
+            keyset = keyset_filter(sort_field, cursor)
+            match = {"$and": [query, keyset]} if query else keyset
+        pipeline: List[Dict[str, Any]] = [{"$match": match}, {"$sort": {sort_field: DESCENDING, "_id": DESCENDING}}]
+        if skip and not cursor:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": limit + 1})
+        if projection:
+            pipeline.append({"$project": projection})
+
+        async def read_total() -> Tuple[int, bool]:
+            if not query and total_mode == CACHED:
+                cached = get_cached_total(self.collection.name)
+                if cached is not None:
+                    return cached, True
+                total = await self.collection.count_documents(query)
+                set_cached_total(self.collection.name, total)
+                return total, False
+            if not query and total_mode == ESTIMATED:
+                return await self.collection.estimated_document_count(), True
+            return await self.collection.count_documents(query), False
+
+        rows, (total, is_estimate) = await asyncio.gather(
+            self.collection.aggregate(pipeline).to_list(length=limit + 1), read_total()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].get(sort_field), rows[-1]["_id"])
+        return KeysetPage(rows=rows, next_cursor=next_cursor, total=total, total_is_estimate=is_estimate)
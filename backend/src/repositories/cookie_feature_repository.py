@@ -1,11 +1,21 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from loguru import logger
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from src.repositories.base import BaseRepository
 from src.configs.settings import settings
 
 class CookieFeatureRepository(BaseRepository):
+    indexes = [
+        IndexModel([("website_url", ASCENDING), ("feature_type", ASCENDING), ("name", ASCENDING)]),
+        IndexModel([("feature_type", ASCENDING), ("created_at", DESCENDING)]),
+    ]
+    query_shapes = {
+        "get_features_by_website": {"filter": {"website_url": "https://example.com/"}, "sort": [("feature_type", 1), ("name", 1)]},
+        "get_features_by_type": {"filter": {"feature_type": "cookie"}, "sort": [("created_at", -1)]},
+    }
+
     """Repository for cookie feature operations"""
 
     def __init__(self):
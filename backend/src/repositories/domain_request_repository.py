@@ -1,18 +1,43 @@
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from src.repositories.base import BaseRepository
 from src.configs.settings import settings
 from src.models.domain_request import DomainRequest # Import DomainRequest model
+from src.utils.pagination_utils import EXACT, KeysetPage
 
 class DomainRequestRepository(BaseRepository):
+    indexes = [
+        IndexModel([("requester_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("requester_id", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("domains", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("requester_id", ASCENDING), ("_id", DESCENDING)]),
+    ]
+    query_shapes = {
+        "get_domain_requests_by_requester_id": {"filter": {"requester_id": ObjectId(), "status": "pending"}},
+        "get_latest_domain_request_by_user": {"filter": {"requester_id": ObjectId()}, "sort": [("created_at", -1)]},
+        "get_domain_request_by_domain_and_status": {
+            "filter": {"domains": "example.com", "status": {"$in": ["pending", "approved"]}, "_id": {"$ne": ObjectId()}},
+        },
+        "get_all_domain_requests_by_status": {"filter": {"status": "pending"}, "sort": [("_id", -1)]},
+        "get_all_domain_requests_by_requester": {"filter": {"requester_id": ObjectId()}, "sort": [("_id", -1)]},
+    }
+
     def __init__(self):
         super().__init__(settings.db.DOMAIN_REQUESTS_COLLECTION)
 
-    async def get_all_domain_requests(self, filters: Optional[Dict] = None, skip: int = 0, limit: int = 100) -> List[DomainRequest]:
-        query = filters if filters is not None else {}
-        requests_data = await self.collection.find(query).skip(skip).limit(limit).to_list(length=limit)
+    async def get_all_domain_requests(self, filters: Optional[Dict] = None, cursor: Optional[str] = None, skip: int = 0,
+                                      limit: int = 100, total_mode: str = EXACT) -> KeysetPage:
+        """
+        Newest requests first, keyset-paginated on _id, with the total counted concurrently
+        in a separate count_documents (or cached / estimated, per `total_mode`).
+        """
+        page = await self.keyset_page(filters, cursor=cursor, skip=skip, limit=limit, total_mode=total_mode)
+        requests_data = page.rows
         domain_requests = []
         for data in requests_data:
             # Ensure 'created_at' is present for older documents that might not have it
@@ -33,7 +58,7 @@ class DomainRequestRepository(BaseRepository):
                 # Depending on desired behavior, you might re-raise, skip, or return partial results
                 # For now, we'll re-raise to ensure the error is caught
                 raise
-        return domain_requests
+        return page._replace(rows=domain_requests)
 
     async def get_domain_requests_by_requester_id(self, requester_id: str, status: Optional[str] = None) -> List[DomainRequest]:
         """
@@ -0,0 +1,147 @@
+"""
+Quản lý index MongoDB cho mọi repository.
+
+Mỗi repository khai báo `indexes` (các IndexModel cần cho truy vấn của nó) và
+`query_shapes` (dạng truy vấn tiêu biểu). `ensure_all_indexes` tạo index khi ứng
+dụng khởi động; `audit_query_shapes` chạy explain cho từng dạng truy vấn và báo
+những truy vấn rơi về COLLSCAN. `find_unindexed_query_shapes` làm cùng việc đó mà
+không cần server (mô phỏng quy tắc tiền tố của query planner) để chạy trong unit test.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from loguru import logger
+from pymongo import IndexModel
+
+from src.repositories.analysis_job_repository import AnalysisJobRepository
+from src.repositories.base import BaseRepository
+from src.repositories.cookie_feature_repository import CookieFeatureRepository
+from src.repositories.domain_request_repository import DomainRequestRepository
+from src.repositories.llm_extraction_cache_repository import LLMExtractionCacheRepository
+from src.repositories.policy_content_repository import PolicyContentRepository
+from src.repositories.policy_miss_repository import PolicyMissRepository
+from src.repositories.policy_version_repository import PolicyVersionRepository
+from src.repositories.site_lease_repository import SiteLeaseRepository
+from src.repositories.translation_cache_repository import TranslationCacheRepository
+from src.repositories.user_repository import UserRepository
+from src.repositories.violation_repository import ViolationRepository
+from src.repositories.website_repository import WebsiteRepository
+
+INDEXED_REPOSITORIES: List[Type[BaseRepository]] = [
+    UserRepository,
+    WebsiteRepository,
+    PolicyContentRepository,
+    ViolationRepository,
+    CookieFeatureRepository,
+    DomainRequestRepository,
+    LLMExtractionCacheRepository,
+    TranslationCacheRepository,
+    AnalysisJobRepository,
+    SiteLeaseRepository,
+    PolicyMissRepository,
+    PolicyVersionRepository,
+]
+
+# Toán tử không thể dùng làm cận quét chỉ mục
+_NON_SARGABLE_OPERATORS = {"$ne", "$nin", "$not", "$exists", "$where", "$expr"}
+
+
+async def ensure_all_indexes(repositories: Optional[Iterable[BaseRepository]] = None) -> Dict[str, List[str]]:
+    """
+    Create the declared indexes of every repository.
+    A failure on one collection (e.g. duplicate data blocking a unique index) is logged and does not stop the others.
+    """
+    repositories = list(repositories) if repositories is not None else [cls() for cls in INDEXED_REPOSITORIES]
+    created: Dict[str, List[str]] = {}
+    for repository in repositories:
+        collection_name = repository.collection.name
+        try:
+            created[collection_name] = await repository.ensure_indexes()
+        except Exception as e:
+            logger.error("index_bootstrap_failed", collection=collection_name, error=str(e))
+            continue
+        if created[collection_name]:
+            logger.info("indexes_ensured", collection=collection_name, indexes=created[collection_name])
+    return created
+
+# ================= STATIC CHECK =================
+
+def _index_keys(index: IndexModel) -> List[str]:
+    return [field for field, _ in index.document["key"].items()]
+
+
+def _sargable_fields(query_filter: Dict[str, Any]) -> set:
+    fields = set()
+    for field, condition in query_filter.items():
+        if field.startswith("$"):
+            continue
+        if isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            if set(condition) <= _NON_SARGABLE_OPERATORS:
+                continue
+        fields.add(field)
+    return fields
+
+
+def _branch_uses_index(query_filter: Dict[str, Any], sort: List[tuple], indexes: List[IndexModel]) -> bool:
+    fields = _sargable_fields(query_filter)
+    if "_id" in fields:
+        return True
+    for index in indexes:
+        keys = _index_keys(index)
+        if keys[0] in fields:
+            return True
+        # Không có điều kiện lọc dùng được: planner vẫn có thể quét index theo thứ tự sort
+        if not fields and sort and [field for field, _ in sort] == keys[:len(sort)]:
+            return True
+    return False
+
+
+def query_shape_uses_index(shape: Dict[str, Any], indexes: List[IndexModel]) -> bool:
+    """Approximate the planner: an $or needs an index for every branch, otherwise a leading index key must be filtered on"""
+    query_filter = shape.get("filter", {})
+    sort = shape.get("sort") or []
+    if "$or" in query_filter:
+        rest = {k: v for k, v in query_filter.items() if k != "$or"}
+        if rest and _branch_uses_index(rest, sort, indexes):
+            return True
+        return all(_branch_uses_index({**rest, **branch}, [], indexes) for branch in query_filter["$or"])
+    return _branch_uses_index(query_filter, sort, indexes)
+
+
+def find_unindexed_query_shapes(repository_classes: Iterable[Type[BaseRepository]] = INDEXED_REPOSITORIES) -> List[str]:
+    return [
+        f"{cls.__name__}.{name}"
+        for cls in repository_classes
+        for name, shape in cls.query_shapes.items()
+        if not query_shape_uses_index(shape, cls.indexes)
+    ]
+
+# ================= EXPLAIN AUDIT =================
+
+def winning_plan_stages(explain: Dict[str, Any]) -> List[str]:
+    """Flatten the stages of the winning plan (classic and slot-based engine layouts)"""
+    plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)
+    stages, pending = [], [plan]
+    while pending:
+        node = pending.pop()
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "inputStage" in node:
+            pending.append(node["inputStage"])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+async def audit_query_shapes(repositories: Optional[Iterable[BaseRepository]] = None) -> List[Dict[str, Any]]:
+    """Explain every declared query shape; returns the shapes whose winning plan contains a COLLSCAN"""
+    repositories = list(repositories) if repositories is not None else [cls() for cls in INDEXED_REPOSITORIES]
+    offenders = []
+    for repository in repositories:
+        for name, shape in repository.query_shapes.items():
+            cursor = repository.collection.find(shape.get("filter", {}))
+            if shape.get("sort"):
+                cursor = cursor.sort(shape["sort"])
+            stages = winning_plan_stages(await cursor.explain())
+            if "COLLSCAN" in stages:
+                offenders.append({"repository": type(repository).__name__, "query": name, "stages": stages})
+    return offenders
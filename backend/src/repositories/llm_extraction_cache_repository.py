@@ -0,0 +1,48 @@
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, IndexModel
+
+from src.repositories.base import BaseRepository
+from src.configs.settings import settings
+
+class LLMExtractionCacheRepository(BaseRepository):
+    """Persistent tier of the content-addressed LLM extraction cache"""
+
+    # Mongo tự xoá các mục đã quá expires_at (mục không hết hạn có expires_at = None)
+    indexes = [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]
+
+    def __init__(self):
+        super().__init__(settings.db.LLM_EXTRACTION_CACHE_COLLECTION)
+
+    async def get_entry(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a non-expired cache entry by key"""
+        return await self.find_one({
+            "_id": cache_key,
+            "$or": [{"expires_at": None}, {"expires_at": {"$gt": datetime.utcnow()}}]
+        })
+
+    async def save_entry(self, cache_key: str, result: Dict[str, Any], metadata: Dict[str, Any], ttl_seconds: int = 0) -> None:
+        """Insert or replace a cache entry"""
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": cache_key},
+            {
+                "$set": {
+                    "result": result,
+                    **metadata,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(seconds=ttl_seconds) if ttl_seconds > 0 else None,
+                },
+                "$setOnInsert": {"created_at": now},
+                "$inc": {"store_count": 1},
+            },
+            upsert=True
+        )
+
+    async def record_hit(self, cache_key: str) -> None:
+        await self.collection.update_one(
+            {"_id": cache_key},
+            {"$inc": {"hit_count": 1}, "$set": {"last_hit_at": datetime.utcnow()}}
+        )
@@ -1,11 +1,22 @@
 from typing import Dict, Any, List, Optional
+from bson import ObjectId
 from loguru import logger
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from src.repositories.base import BaseRepository
 from src.configs.settings import settings
 from src.models.policy import PolicyContent
 
 class PolicyContentRepository(BaseRepository):
+    indexes = [
+        IndexModel([("website_url", ASCENDING), ("created_at", DESCENDING)]),
+    ]
+    query_shapes = {
+        "get_by_website_url": {"filter": {"website_url": "https://example.com/"}},
+        "get_latest_by_website_url": {"filter": {"website_url": "https://example.com/"}, "sort": [("created_at", -1)]},
+        "set_translation": {"filter": {"_id": ObjectId(), "translated_content": None}},
+    }
+
     def __init__(self):
         super().__init__(settings.db.POLICY_CONTENTS_COLLECTION)
 
@@ -44,3 +55,11 @@ class PolicyContentRepository(BaseRepository):
             update_data["translated_table_content"] = translated_table_content
 
         return await self.update_one({"website_url": website_url}, update_data)
+
+    async def set_translation(self, policy_id: str, translated_content: Optional[str],
+                              translated_table_content: Optional[str]) -> int:
+        """Store the translation of one policy content record unless it already has one"""
+        return await self.update_one(
+            {"_id": ObjectId(policy_id), "translated_content": None},
+            {"translated_content": translated_content, "translated_table_content": translated_table_content}
+        )
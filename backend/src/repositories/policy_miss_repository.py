@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+
+from src.repositories.base import BaseRepository
+from src.configs.settings import settings
+
+class PolicyMissRepository(BaseRepository):
+    """Negative cache of sites where no cookie policy could be found, with exponential backoff per site"""
+
+    # Mongo xoá hẳn bản ghi (và bộ đếm backoff) khi site lâu không bị hỏi lại
+    indexes = [
+        IndexModel([("forget_at", ASCENDING)], expireAfterSeconds=0),
+    ]
+    query_shapes = {
+        "get_active_miss": {"filter": {"_id": "https://example.com/", "retry_at": {"$gt": datetime(2024, 1, 1)}}},
+    }
+
+    def __init__(self):
+        super().__init__(settings.db.POLICY_MISSES_COLLECTION)
+
+    async def get_active_miss(self, root_url: str) -> Optional[Dict[str, Any]]:
+        """The recorded miss of a site while its backoff has not expired"""
+        return await self.find_one({"_id": root_url, "retry_at": {"$gt": datetime.utcnow()}})
+
+    async def record_miss(self, root_url: str, reason: str, base_ttl_seconds: int, max_ttl_seconds: int) -> Dict[str, Any]:
+        """Count one more miss and back off for base_ttl * 2^(misses - 1), capped at max_ttl"""
+        now = datetime.utcnow()
+        miss = await self.collection.find_one_and_update(
+            {"_id": root_url},
+            {
+                "$set": {"reason": reason, "last_checked_at": now},
+                "$inc": {"miss_count": 1},
+                "$setOnInsert": {"first_seen_at": now},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        ttl_seconds = min(max_ttl_seconds, base_ttl_seconds * 2 ** (miss["miss_count"] - 1))
+        retry_at = now + timedelta(seconds=ttl_seconds)
+        await self.collection.update_one(
+            {"_id": root_url},
+            {"$set": {"retry_at": retry_at, "forget_at": retry_at + timedelta(seconds=max_ttl_seconds)}}
+        )
+        return {**miss, "retry_at": retry_at, "ttl_seconds": ttl_seconds}
+
+    async def clear_miss(self, root_url: str) -> int:
+        return await self.delete_one({"_id": root_url})
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from pymongo.errors import DuplicateKeyError
+
+from src.repositories.base import BaseRepository
+from src.configs.settings import settings
+
+class PolicyVersionRepository(BaseRepository):
+    """Cookie declarations of a policy version, keyed by their content hash and shared by every analysis against it"""
+
+    query_shapes = {
+        "get_versions": {"filter": {"_id": {"$in": ["policy-version-hash"]}}},
+    }
+
+    def __init__(self):
+        super().__init__(settings.db.POLICY_VERSIONS_COLLECTION)
+
+    async def save_version(self, version: Dict[str, Any]) -> None:
+        """Store a policy version once; later analyses against the same declarations only reference it"""
+        try:
+            await self.collection.update_one(
+                {"_id": version["_id"]},
+                {"$setOnInsert": {"cookies": version["cookies"], "created_at": datetime.utcnow()}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Một lần lưu đồng thời khác đã tạo phiên bản này
+            pass
+
+    async def get_versions(self, version_hashes: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Cookie declarations of several policy versions in one $in query"""
+        version_hashes = list(version_hashes)
+        if not version_hashes:
+            return {}
+        versions = await self.find_all({"_id": {"$in": version_hashes}})
+        return {version["_id"]: version["cookies"] for version in versions}
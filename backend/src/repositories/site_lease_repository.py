@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+
+from src.repositories.base import BaseRepository
+from src.configs.settings import settings
+
+class SiteLeaseRepository(BaseRepository):
+    """Short-lived per-site leases so only one worker crawls and extracts an uncached site at a time"""
+
+    # Lease bị bỏ rơi (worker chết) được Mongo tự xoá sau khi hết hạn
+    indexes = [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]
+    query_shapes = {
+        "try_acquire": {"filter": {"_id": "https://example.com/", "expires_at": {"$lte": datetime(2024, 1, 1)}}},
+        "renew": {"filter": {"_id": "https://example.com/", "owner": "host:1"}},
+        "release": {"filter": {"_id": "https://example.com/", "owner": "host:1"}},
+    }
+
+    def __init__(self):
+        super().__init__(settings.db.SITE_LEASES_COLLECTION)
+
+    async def try_acquire(self, key: str, owner: str, lease_seconds: int) -> bool:
+        """Take the lease unless another owner holds an unexpired one"""
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"_id": key, "expires_at": {"$lte": now}},
+                {"$set": {"owner": owner, "acquired_at": now, "expires_at": now + timedelta(seconds=lease_seconds)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # Lease còn hạn của worker khác: upsert va chạm với _id đã có
+            return False
+
+    async def renew(self, key: str, owner: str, lease_seconds: int) -> bool:
+        """Extend a lease still held by `owner`; False once it expired and was taken over"""
+        result = await self.collection.update_one(
+            {"_id": key, "owner": owner},
+            {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}}
+        )
+        return result.matched_count > 0
+
+    async def release(self, key: str, owner: str) -> None:
+        await self.collection.delete_one({"_id": key, "owner": owner})
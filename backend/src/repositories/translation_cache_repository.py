@@ -0,0 +1,42 @@
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, IndexModel
+
+from src.repositories.base import BaseRepository
+from src.configs.settings import settings
+
+class TranslationCacheRepository(BaseRepository):
+    """Persistent tier of the translation cache, keyed by content digest and language pair"""
+
+    # Mongo tự xoá các bản dịch đã quá expires_at
+    indexes = [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ]
+
+    def __init__(self):
+        super().__init__(settings.db.TRANSLATION_CACHE_COLLECTION)
+
+    async def get_translation(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a non-expired translation by key"""
+        return await self.find_one({
+            "_id": cache_key,
+            "$or": [{"expires_at": None}, {"expires_at": {"$gt": datetime.utcnow()}}]
+        })
+
+    async def save_translation(self, cache_key: str, translated: str, source_lang: str, target_lang: str, ttl_seconds: int = 0) -> None:
+        """Insert or replace a translation"""
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": cache_key},
+            {
+                "$set": {
+                    "translated": translated,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(seconds=ttl_seconds) if ttl_seconds > 0 else None,
+                },
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True
+        )
@@ -1,11 +1,21 @@
 from typing import Dict, Any, List, Optional
 from bson.objectid import ObjectId
 from datetime import datetime
+from pymongo import ASCENDING, IndexModel
 
 from src.repositories.base import BaseRepository
 from src.configs.settings import settings
 
 class UserRepository(BaseRepository):
+    indexes = [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("reset_token", ASCENDING)], sparse=True),
+    ]
+    query_shapes = {
+        "get_user_by_email": {"filter": {"email": "user@example.com"}},
+        "get_user_by_reset_token": {"filter": {"reset_token": "token"}},
+    }
+
     def __init__(self):
         super().__init__(settings.db.USERS_COLLECTION)
 
@@ -16,6 +26,11 @@ class UserRepository(BaseRepository):
         """Get user information by user ID."""
         return await self.find_by_id(user_id)
 
+    async def get_users_by_ids(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several users in one $in query, keyed by their string ID."""
+        users = await self.find_all({"_id": {"$in": [ObjectId(user_id) for user_id in user_ids]}})
+        return {str(user["_id"]): user for user in users}
+
     async def create_user(self, user_data: Dict[str, Any]) -> str:
         """Create a new user."""
         return await self.insert_one(user_data)
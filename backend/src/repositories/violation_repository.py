@@ -1,23 +1,53 @@
 import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+from loguru import logger
+from pymongo import ASCENDING, IndexModel
 
 from src.repositories.base import BaseRepository
+from src.repositories.policy_version_repository import PolicyVersionRepository
 from src.configs.settings import settings
+from src.utils.analysis_storage import compact_analysis, rehydrate_analysis
 
 class ViolationRepository(BaseRepository):
     """Repository for violation operations"""
 
-    def __init__(self):
+    # website_url dẫn đầu để $regex neo đầu chuỗi ("^https://site") thành một khoảng quét chỉ mục
+    indexes = [
+        IndexModel([("website_url", ASCENDING), ("severity", ASCENDING), ("violation_type", ASCENDING), ("cookie_name", ASCENDING)]),
+    ]
+    query_shapes = {
+        "get_violations_by_website": {
+            "filter": {"website_url": {"$regex": "^https://example\\.com/"}},
+            "sort": [("severity", 1), ("violation_type", 1), ("cookie_name", 1)],
+        },
+    }
+
+    def __init__(self, policy_versions: Optional[PolicyVersionRepository] = None):
         super().__init__(settings.db.VIOLATIONS_COLLECTION)
+        self.policy_versions = policy_versions or PolicyVersionRepository()
 
     async def create_violation(self, document: Dict[str, Any]) -> str:
-        """Create a new violation record"""
-        return await self.insert_one(document)
+        """Create a new violation record, stored in the compact format (see src/utils/analysis_storage.py)"""
+        compact, policy_version = compact_analysis(document)
+        if policy_version is not None:
+            await self.policy_versions.save_version(policy_version)
+        return await self.insert_one(compact)
 
     async def get_violations_by_website(self, website_url: str) -> List[Dict[str, Any]]:
         regex_pattern = f"^{re.escape(website_url)}"
-        return await self.find_many(
+        documents = await self.find_many(
             query={"website_url": {"$regex": regex_pattern}},
             sort=[("severity", 1), ("violation_type", 1), ("cookie_name", 1)]
         )
+        # Nạp các phiên bản policy được tham chiếu bằng một truy vấn rồi dựng lại dạng đầy đủ
+        versions = await self.policy_versions.get_versions({doc["policy_version"] for doc in documents if doc.get("policy_version")})
+        analyses = []
+        for doc in documents:
+            version = doc.get("policy_version")
+            if version and version not in versions:
+                # Thiếu phiên bản policy thì không dựng lại được các tham chiếu: bỏ qua thay vì trả lỗi 500
+                logger.error("policy_version_missing", violation_id=str(doc.get("_id")), policy_version=version)
+                continue
+            analyses.append(rehydrate_analysis(doc, versions.get(version)))
+        return analyses
@@ -1,10 +1,35 @@
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Type, TypeVar
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from src.repositories.base import BaseRepository
-from src.models.website import Website
+from src.models.base import ReadView
+from src.models.website import Website, WebsiteListRow
 from src.configs.settings import settings
+from src.utils.pagination_utils import EXACT, KeysetPage
+
+V = TypeVar("V", bound=ReadView)
 
 class WebsiteRepository(BaseRepository):
+    indexes = [
+        IndexModel([("domain", ASCENDING), ("user_id", ASCENDING)], unique=True),
+        # Tra cứu theo domain vẫn dùng index khi dữ liệu trùng lặp chặn việc tạo index unique ở trên
+        IndexModel([("domain", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("is_approved", ASCENDING)]),
+        IndexModel([("is_approved", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("last_checked_at", DESCENDING), ("_id", DESCENDING)]),
+    ]
+    query_shapes = {
+        "get_website_by_root_url": {"filter": {"domain": "https://example.com/"}},
+        "get_by_domain_and_user": {"filter": {"domain": "https://example.com/", "user_id": ObjectId()}},
+        "get_all_websites_by_user": {"filter": {"user_id": ObjectId(), "is_approved": True}},
+        "get_all_websites_by_approval": {"filter": {"is_approved": False}},
+        "list_rows_by_approval": {"filter": {"is_approved": False}, "sort": [("_id", -1)]},
+        "list_rows_by_last_checked": {"filter": {}, "sort": [("last_checked_at", -1), ("_id", -1)]},
+        "set_translation_by_domain": {
+            "filter": {"domain": "https://example.com/", "original_content": "policy", "translated_content": None}
+        },
+    }
+
     def __init__(self):
         super().__init__(settings.db.WEBSITES_COLLECTION)
 
@@ -22,6 +47,36 @@ class WebsiteRepository(BaseRepository):
             return Website(**website_data)
         return None
 
+    async def get_view_by_root_url(self, root_url: str, view: Type[V]) -> Optional[V]:
+        """
+        Retrieves only the fields of `view` for a website by its root URL (domain).
+        """
+        website_data = await self.collection.find_one({"domain": str(root_url)}, view.projection())
+        return view.model_validate(website_data) if website_data else None
+
+    async def get_view_by_id(self, website_id: str, view: Type[V]) -> Optional[V]:
+        """
+        Retrieves only the fields of `view` for a website by its ID.
+        """
+        website_data = await self.collection.find_one({"_id": ObjectId(website_id)}, view.projection())
+        return view.model_validate(website_data) if website_data else None
+
+    async def list_rows(self, filters: Optional[Dict] = None, sort_field: str = "_id", cursor: Optional[str] = None,
+                        skip: int = 0, limit: int = 100, total_mode: str = EXACT) -> KeysetPage:
+        """
+        Keyset-paginated listing rows, with the total counted concurrently by a separate
+        count_documents (or cached / estimated, per `total_mode`): the policy text is never
+        read and the cookie list is only counted, server-side.
+        """
+        page = await self.keyset_page(
+            filters, sort_field=sort_field, cursor=cursor, skip=skip, limit=limit, total_mode=total_mode,
+            projection={
+                **WebsiteListRow.projection(),
+                "num_specified_cookies": {"$size": {"$ifNull": ["$policy_cookies", []]}},
+            },
+        )
+        return page._replace(rows=[WebsiteListRow.model_validate(row) for row in page.rows])
+
     async def get_by_domain_and_user(self, domain: str, user_id: str) -> Optional[Website]:
         """
         Retrieves a website by its domain and user ID.
@@ -44,6 +99,18 @@ class WebsiteRepository(BaseRepository):
             return Website(**updated_website_data)
         return None
 
+    async def set_translation_by_domain(self, domain: str, original_content: str, translated_content: Optional[str],
+                                        translated_table_content: Optional[str]) -> int:
+        """
+        Fill in the deferred translation of every website document of a domain that does not have it yet
+        and still holds the policy text it was translated from.
+        """
+        result = await self.collection.update_many(
+            {"domain": str(domain), "original_content": original_content, "translated_content": None},
+            {"$set": {"translated_content": translated_content, "translated_table_content": translated_table_content}}
+        )
+        return result.modified_count
+
     async def delete_website(self, website_id: str) -> int:
         """
         Deletes a website by its ID.
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, status, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Response, status, Query
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 from src.schemas.domain_request import DomainRequestCreateSchema, DomainRequestResponseSchema, DomainRequestStatus, DomainRequestUpdateSchema
 from src.schemas.user import User
@@ -44,9 +44,14 @@ async def get_my_latest_domain_request(
 
 @router.get("/domain-requests", response_model=List[DomainRequestResponseSchema])
 async def get_all_domain_requests(
+    response: Response,
     current_user: User = Depends(get_current_user), # Changed dependency
     status: Optional[DomainRequestStatus] = None,
     requester_id: Optional[str] = Query(None), # New parameter
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    skip: int = Query(0, ge=0, description="Number of items to skip (ignored when a cursor is given)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    total: Literal["exact", "estimated", "cached"] = Query("exact", description="Total count mode; estimated/cached only apply to unfiltered listings"),
     domain_request_service: DomainRequestService = Depends(get_domain_request_service)
 ):
     """
@@ -60,7 +65,16 @@ async def get_all_domain_requests(
     elif current_user.role not in ["admin", "manager"]:
         raise UnauthorizedError("Only admins, managers, or providers can view domain requests.")
 
-    return await domain_request_service.get_all_domain_requests(status=status, requester_id=requester_id) # Pass requester_id
+    page = await domain_request_service.get_all_domain_requests(
+        status=status, requester_id=requester_id, cursor=cursor, skip=skip, limit=limit, total_mode=total
+    )
+    # Phản hồi vẫn là một danh sách; thông tin phân trang nằm ở header
+    response.headers["X-Total-Count"] = str(page.total)
+    if page.total_is_estimate:
+        response.headers["X-Total-Is-Estimate"] = "true"
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.rows
 
 @router.patch("/domain-requests/{request_id}/approve", response_model=DomainRequestResponseSchema)
 async def approve_domain_request(
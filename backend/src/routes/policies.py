@@ -2,12 +2,14 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from pydantic import BaseModel
 
-from src.schemas.policy import PolicyExtractResponse, PolicyExtractRequest
+from src.schemas.policy import PolicyExtractResponse, PolicyExtractRequest, PolicyTranslationResponse
 
 from src.services.policy_crawler_service.policy_crawler_service import PolicyCrawlerService
 from src.services.policy_crawler_service.crawler_factory import CrawlerFactory
-from src.dependencies.dependencies import create_playwright_bing_extractor, get_policy_content_repository
+from src.services.policy_translation_service.policy_translation_service import PolicyTranslationService
+from src.dependencies.dependencies import create_playwright_bing_extractor, get_policy_content_repository, get_policy_translation_service
 from src.repositories.policy_content_repository import PolicyContentRepository
+from src.utils.url_utils import get_base_url, normalize_url
 
 router = APIRouter(prefix="/policy", tags=["policy"])
 
@@ -15,12 +17,20 @@ router = APIRouter(prefix="/policy", tags=["policy"])
 async def analyze_website_policy(
     website_url: str,
     force_refresh: bool = False,
+    translate: bool = False,
     policy_content_repo: PolicyContentRepository = Depends(get_policy_content_repository),
-    extractor: PolicyCrawlerService = Depends(create_playwright_bing_extractor)
+    extractor: PolicyCrawlerService = Depends(create_playwright_bing_extractor),
+    translation_service: PolicyTranslationService = Depends(get_policy_translation_service)
 ):
-    """Analyze and extract cookie policy for a given website URL."""
+    """Analyze and extract cookie policy for a given website URL.
+    The translation is deferred; pass translate=true to wait for it."""
     try:
         result = await extractor.extract_policy(website_url, force_refresh)
+        if result and translate and result.translated_content is None and not result.error:
+            translation = await translation_service.materialize(result.website_url)
+            if translation:
+                result.translated_content = translation["translated_content"]
+                result.translated_table_content = translation["translated_table_content"]
         if result:
             return PolicyExtractResponse(
                 website_url=result.website_url,
@@ -38,3 +48,14 @@ async def analyze_website_policy(
         # Assuming logger is defined elsewhere or needs to be imported
         # For now, I'll just raise the HTTPException
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
+
+@router.get("/translation", response_model=PolicyTranslationResponse)
+async def get_policy_translation(
+    website_url: str,
+    translation_service: PolicyTranslationService = Depends(get_policy_translation_service)
+):
+    """Return the English translation of a stored policy, translating it now if it is not materialised yet."""
+    translation = await translation_service.materialize(get_base_url(normalize_url(website_url)))
+    if translation is None:
+        raise HTTPException(status_code=404, detail="Policy not found.")
+    return PolicyTranslationResponse(**translation)
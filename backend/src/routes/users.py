@@ -3,7 +3,8 @@ from datetime import datetime # Import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from src.repositories.user_repository import UserRepository
 from src.schemas.user import User, UserRole, UserUpdate
-from src.dependencies.dependencies import get_current_admin_user, get_current_user
+from src.dependencies.dependencies import get_current_admin_user, get_current_user, get_principal_cache
+from src.services.auth_service.principal_cache import PrincipalCache
 from src.models.domain_request import DomainRequestStatus
 from src.schemas.domain_request import DomainRequestPublic
 from src.repositories.domain_request_repository import DomainRequestRepository
@@ -78,7 +79,8 @@ async def read_users_me(
 async def update_users_me(
     user_update: UserUpdate,
     user_repo: UserRepository = Depends(UserRepository),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     """
     Update the current authenticated user's profile.
@@ -99,6 +101,7 @@ async def update_users_me(
         del update_data["status"]
 
     updated_user = await user_repo.update_user(current_user.id, update_data)
+    principal_cache.invalidate_user(current_user.id)
     if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
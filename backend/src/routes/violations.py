@@ -1,23 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
-from src.schemas.cookie import CookieSubmissionRequest
+import json
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from src.configs.settings import settings
+from src.schemas.cookie import CookieSubmissionRequest, BatchCookieSubmissionRequest
 from src.schemas.violation import ComplianceAnalysisResponse
+from src.schemas.analysis_job import AnalysisJobResponse
+from src.models.analysis_job import AnalysisJobStatus
+from src.services.analysis_job_service.analysis_job_service import AnalysisJobService
 from src.services.violation_analyzer_service.violation_analyzer_service import ViolationAnalyzerService
 from src.exceptions.custom_exceptions import PolicyAnalysisError
 from loguru import logger
 import time
 import uuid
-from src.dependencies.dependencies import get_violation_analyzer_service
+from src.dependencies.dependencies import get_violation_analyzer_service, get_analysis_job_service
 
 router = APIRouter(prefix="/violations", tags=["Violations"])
 
-@router.post("/analyze", response_model=ComplianceAnalysisResponse)
+def _job_response(job: Dict[str, Any], coalesced: bool = False) -> AnalysisJobResponse:
+    job_id = str(job["_id"])
+    return AnalysisJobResponse(
+      job_id=job_id,
+      website_url=job["payload"]["website_url"],
+      root_url=job["root_url"],
+      status=job["status"],
+      attempts=job["attempts"],
+      max_attempts=job["max_attempts"],
+      coalesced=coalesced,
+      coalesced_count=job.get("coalesced_count", 0),
+      error=job.get("error"),
+      created_at=job["created_at"],
+      started_at=job.get("started_at"),
+      finished_at=job.get("finished_at"),
+      status_url=f"{router.prefix}/jobs/{job_id}",
+      result_url=f"{router.prefix}/jobs/{job_id}/result"
+    )
+
+@router.post("/analyze", response_model=ComplianceAnalysisResponse, responses={202: {"model": AnalysisJobResponse}})
 async def analyze_policy(
     payload: CookieSubmissionRequest,
-    service: ViolationAnalyzerService = Depends(get_violation_analyzer_service)
+    background: bool = Query(False, description="Enqueue the analysis and return a job instead of waiting for it"),
+    service: ViolationAnalyzerService = Depends(get_violation_analyzer_service),
+    job_service: AnalysisJobService = Depends(get_analysis_job_service)
 ) -> ComplianceAnalysisResponse:
     """
     Endpoint to receive and analyze cookies from a browser extension,
     orchestrating the entire policy compliance analysis process.
+    With `background=true` the analysis runs on a job worker and a job id is returned.
     """
     start_time = time.time()
     request_id = str(uuid.uuid4())
@@ -26,10 +55,15 @@ async def analyze_policy(
       extra={
         "request_id": request_id,
         "website_url": payload.website_url,
-        "cookies_count": len(payload.cookies)
+        "cookies_count": len(payload.cookies),
+        "background": background
       }
     )
 
+    if background:
+      job, coalesced = await job_service.submit(payload, request_id)
+      return JSONResponse(status_code=202, content=_job_response(job, coalesced).model_dump(mode="json"))
+
     try:
       analysis_result = await service.orchestrate_analysis(payload, request_id)
       return analysis_result
@@ -56,3 +90,60 @@ async def analyze_policy(
         }
       )
       raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@router.post("/analyze/batch")
+async def analyze_policy_batch(
+    payload: BatchCookieSubmissionRequest,
+    service: ViolationAnalyzerService = Depends(get_violation_analyzer_service)
+) -> StreamingResponse:
+    """
+    Analyze many site submissions concurrently. Results are streamed back as
+    NDJSON, one line per submission in completion order, then a summary line.
+    """
+    if len(payload.submissions) > settings.internal_api.BATCH_MAX_SUBMISSIONS:
+      raise HTTPException(
+        status_code=413,
+        detail=f"Batch exceeds {settings.internal_api.BATCH_MAX_SUBMISSIONS} submissions"
+      )
+
+    request_id = str(uuid.uuid4())
+    logger.info(
+      "Batch analysis request received",
+      extra={"request_id": request_id, "submissions": len(payload.submissions)}
+    )
+
+    async def stream_lines():
+      async for line in service.orchestrate_batch_analysis(payload.submissions, request_id):
+        yield json.dumps(line, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(
+      stream_lines(),
+      media_type="application/x-ndjson",
+      headers={"X-Request-ID": request_id}
+    )
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(
+    job_id: str,
+    job_service: AnalysisJobService = Depends(get_analysis_job_service)
+) -> AnalysisJobResponse:
+    """Status of a background analysis job"""
+    job = await job_service.get_job(job_id)
+    if not job:
+      raise HTTPException(status_code=404, detail="Analysis job not found")
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}/result", response_model=ComplianceAnalysisResponse, responses={202: {"model": AnalysisJobResponse}})
+async def get_analysis_job_result(
+    job_id: str,
+    job_service: AnalysisJobService = Depends(get_analysis_job_service)
+) -> ComplianceAnalysisResponse:
+    """Result of a finished background analysis job; 202 with the job status while it is still pending"""
+    job = await job_service.get_job(job_id)
+    if not job:
+      raise HTTPException(status_code=404, detail="Analysis job not found")
+    if job["status"] == AnalysisJobStatus.SUCCEEDED.value:
+      return ComplianceAnalysisResponse(**job["result"])
+    if job["status"] == AnalysisJobStatus.DEAD_LETTERED.value:
+      raise HTTPException(status_code=500, detail=f"Analysis failed after {job['attempts']} attempt(s): {job.get('error')}")
+    return JSONResponse(status_code=202, content=_job_response(job).model_dump(mode="json"))
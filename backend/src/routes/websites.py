@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, Query, status
-from typing import List, Optional
+from typing import List, Literal, Optional
 from src.schemas.website import WebsiteResponseSchema, WebsiteListResponseSchema, WebsiteCreateSchema, WebsiteUpdateSchema, PaginatedWebsiteResponseSchema
 from src.schemas.user import User
 from src.schemas.violation import ComplianceAnalysisResponse
+from src.schemas.policy import PolicyTranslationResponse
 from src.services.website_management_service.website_management_service import WebsiteManagementService
-from src.dependencies.dependencies import get_website_management_service, get_current_user, get_current_admin_or_manager
+from src.services.policy_translation_service.policy_translation_service import PolicyTranslationService
+from src.dependencies.dependencies import get_website_management_service, get_current_user, get_current_admin_or_manager, get_policy_translation_service
 from src.models.user import UserRole
+from src.utils.url_utils import get_base_url
 from src.exceptions.custom_exceptions import NotFoundException, BadRequestException, UnauthorizedError, InternalServerError
 
 router = APIRouter(prefix="/api", tags=["Websites"])
@@ -15,8 +18,11 @@ async def get_all_websites(
     current_user: User = Depends(get_current_user),
     search: Optional[str] = Query(None, description="Search keyword for domain name"),
     is_approved: Optional[bool] = Query(None, description="Filter by approval status (for admins/managers)"),
-    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    skip: int = Query(0, ge=0, description="Number of items to skip (ignored when a cursor is given)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    sort_by: Literal["_id", "last_checked_at"] = Query("_id", description="Newest first by creation or by last policy check"),
+    total: Literal["exact", "estimated", "cached"] = Query("exact", description="Total count mode; estimated/cached only apply to unfiltered listings"),
     website_management_service: WebsiteManagementService = Depends(get_website_management_service)
 ):
     return await website_management_service.get_all_websites(
@@ -25,7 +31,10 @@ async def get_all_websites(
         is_approved=is_approved,
         search_query=search,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        sort_by=sort_by,
+        total_mode=total
     )
 
 @router.get("/websites/{website_id}", response_model=WebsiteResponseSchema)
@@ -55,3 +64,25 @@ async def get_website_analytics(
         raise NotFoundException(str(e))
     except Exception as e:
         raise InternalServerError(f"An error occurred: {str(e)}")
+
+@router.get("/websites/{website_id}/translation", response_model=PolicyTranslationResponse)
+async def get_website_translation(
+    website_id: str,
+    current_user: User = Depends(get_current_user),
+    website_management_service: WebsiteManagementService = Depends(get_website_management_service),
+    translation_service: PolicyTranslationService = Depends(get_policy_translation_service)
+):
+    """
+    Lấy bản dịch tiếng Anh của chính sách; dịch ngay nếu bản dịch chưa được tạo.
+    """
+    website = await website_management_service.get_website_by_id(website_id)
+    translation = await translation_service.materialize(get_base_url(str(website.domain)))
+    if translation is None:
+        # Website tạo tay (không có policy content đã crawl): trả về những gì đã lưu
+        return PolicyTranslationResponse(
+            website_url=str(website.domain),
+            detected_language=website.detected_language,
+            translated_content=website.translated_content,
+            translated_table_content=website.translated_table_content
+        )
+    return PolicyTranslationResponse(**translation)
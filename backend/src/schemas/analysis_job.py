@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+from src.models.analysis_job import AnalysisJobStatus
+
+class AnalysisJobResponse(BaseModel):
+    job_id: str
+    website_url: str
+    root_url: str
+    status: AnalysisJobStatus
+    attempts: int
+    max_attempts: int
+    coalesced: bool = Field(default=False, description="True when this submission joined an identical in-flight job")
+    coalesced_count: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    status_url: str
+    result_url: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from enum import Enum
 from datetime import datetime
@@ -32,3 +32,6 @@ class ActualCookie(BaseModel):
 class CookieSubmissionRequest(BaseModel):
     website_url: str
     cookies: List[ActualCookie]
+
+class BatchCookieSubmissionRequest(BaseModel):
+    submissions: List[CookieSubmissionRequest] = Field(..., min_length=1)
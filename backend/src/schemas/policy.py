@@ -11,6 +11,7 @@ class DiscoveryMethod(str, Enum):
     NAVIGATION_LINK = "navigation_link"
     BING_SEARCH = "bing_search"
     SITEMAP = "sitemap"
+    WELL_KNOWN_PATH = "well_known_path"
 
 class PolicyContent(BaseModel):
     website_url: str
@@ -33,6 +34,13 @@ class PolicyExtractResponse(BaseModel):
     translated_table_content: Optional[str]
     error: Optional[str] = None
 
+class PolicyTranslationResponse(BaseModel):
+    """Deferred translation of a stored policy, materialised on request"""
+    website_url: str
+    detected_language: Optional[str]
+    translated_content: Optional[str]
+    translated_table_content: Optional[str]
+
 class PolicyExtractRequest(BaseModel):
     """Request schema for policy extraction"""
     website_url: str
@@ -71,5 +71,7 @@ class WebsiteListResponseSchema(BaseModel):
 class PaginatedWebsiteResponseSchema(BaseModel):
     websites: List[WebsiteListResponseSchema]
     total_count: int
-    page: int
+    page: Optional[int] = None # offset paging only; None when paging with a cursor
     page_size: int
+    next_cursor: Optional[str] = None # pass back as `cursor` for the next page, None on the last page
+    total_is_estimate: bool = False
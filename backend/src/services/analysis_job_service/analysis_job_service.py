@@ -0,0 +1,210 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from loguru import logger
+
+from src.configs.settings import settings
+from src.exceptions.custom_exceptions import PolicyAnalysisError
+from src.models.analysis_job import AnalysisJobStatus
+from src.schemas.cookie import CookieSubmissionRequest
+from src.services.analysis_job_service.interfaces.job_queue import IJobQueue
+from src.services.violation_analyzer_service.violation_analyzer_service import ViolationAnalyzerService
+from src.utils.cache_utils import stable_digest
+from src.utils.url_utils import get_base_url
+
+
+class AnalysisJobService:
+    """
+    Runs ViolationAnalyzerService.orchestrate_analysis outside the HTTP request.
+
+    Submissions are stored as jobs in an IJobQueue and consumed by a small pool
+    of in-process workers. Failed jobs are retried with exponential backoff and
+    dead-lettered once they run out of attempts; an identical submission for a
+    job that is still queued or running joins that job instead of creating one.
+    A worker renews its lease while the analysis runs, and its final write is
+    dropped if the lease was lost and the job reclaimed by another worker.
+    """
+
+    def __init__(
+        self,
+        queue: IJobQueue,
+        analyzer_factory: Callable[[], ViolationAnalyzerService],
+        workers: int = settings.internal_api.JOB_WORKERS,
+        max_attempts: int = settings.internal_api.JOB_MAX_ATTEMPTS,
+        retry_base_delay: float = settings.internal_api.JOB_RETRY_BASE_DELAY,
+        lease_seconds: int = settings.internal_api.JOB_LEASE_SECONDS,
+        heartbeat_interval: float = settings.internal_api.JOB_HEARTBEAT_INTERVAL,
+        poll_interval: float = settings.internal_api.JOB_POLL_INTERVAL,
+    ):
+        self.queue = queue
+        self.analyzer_factory = analyzer_factory
+        self.workers = workers
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = min(heartbeat_interval, lease_seconds / 3)
+        self.poll_interval = poll_interval
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._started = False
+        self._metrics = {
+            "submitted": 0,
+            "coalesced": 0,
+            "succeeded": 0,
+            "retried": 0,
+            "dead_lettered": 0,
+            "lease_lost": 0,
+        }
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        await self.queue.start()
+        self._started = True
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(f"{uuid.uuid4().hex[:8]}-{i}"))
+            for i in range(self.workers)
+        ]
+        logger.info(f"Analysis job service started with {self.workers} worker(s)")
+
+    async def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Analysis job service stopped")
+
+    async def submit(self, payload: CookieSubmissionRequest, request_id: str) -> Tuple[Dict[str, Any], bool]:
+        """Enqueue an analysis; returns (job, coalesced)"""
+        root_url = get_base_url(payload.website_url)
+        payload_data = payload.model_dump(mode="json")
+        now = datetime.utcnow()
+        job = {
+            "_id": ObjectId(),
+            "root_url": root_url,
+            "dedupe_key": stable_digest(root_url, payload_data["cookies"]),
+            "payload": payload_data,
+            "request_id": request_id,
+            "status": AnalysisJobStatus.QUEUED.value,
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "available_at": now,
+            "lease_expires_at": None,
+            "worker_id": None,
+            "coalesced_count": 0,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+        stored, coalesced = await self.queue.enqueue(job)
+        self._metrics["coalesced" if coalesced else "submitted"] += 1
+        if coalesced:
+            logger.info("analysis_job_coalesced", job_id=str(stored["_id"]), root_url=root_url, request_id=request_id)
+        else:
+            logger.info("analysis_job_enqueued", job_id=str(stored["_id"]), root_url=root_url, request_id=request_id)
+            self._wakeup.set()
+        return stored, coalesced
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.queue.get(job_id)
+
+    async def run_once(self, worker_id: str = "inline") -> bool:
+        """Claim and process a single job; returns False when the queue is empty"""
+        job = await self.queue.claim(worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        await self._process(job)
+        return True
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self._metrics,
+            "workers": len(self._tasks),
+            "jobs_by_status": await self.queue.count_by_status(),
+        }
+
+    async def _worker_loop(self, worker_id: str) -> None:
+        while True:
+            try:
+                if await self.run_once(worker_id):
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Analysis worker {worker_id} failed to process a job: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["_id"]
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        error: Optional[Exception] = None
+        try:
+            payload = CookieSubmissionRequest(**job["payload"])
+            result = await self.analyzer_factory().orchestrate_analysis(payload, job["request_id"])
+        except Exception as e:
+            error = e
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        if error is not None:
+            await self._handle_failure(job, error)
+            return
+        if not await self.queue.complete(job, result.model_dump(mode="json")):
+            self._lease_lost(job, "complete")
+            return
+        self._metrics["succeeded"] += 1
+        logger.info("analysis_job_succeeded", job_id=str(job_id), attempts=job["attempts"])
+
+    async def _heartbeat(self, job: Dict[str, Any]) -> None:
+        """Keep the lease alive while the analysis runs (LLM calls can outlast a single lease)"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                renewed = await self.queue.renew(job, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Failed to renew the lease of analysis job {job['_id']}: {e}")
+                continue
+            if not renewed:
+                self._lease_lost(job, "renew")
+                return
+
+    def _lease_lost(self, job: Dict[str, Any], operation: str) -> None:
+        self._metrics["lease_lost"] += 1
+        logger.warning("analysis_job_lease_lost", job_id=str(job["_id"]), attempts=job["attempts"], operation=operation)
+
+    async def _handle_failure(self, job: Dict[str, Any], error: Exception) -> None:
+        job_id = job["_id"]
+        message = error.message if isinstance(error, PolicyAnalysisError) else str(error)
+        # Client errors (e.g. no policy found) will not succeed on a retry
+        permanent = isinstance(error, PolicyAnalysisError) and error.status_code < 500
+
+        if permanent or job["attempts"] >= job.get("max_attempts", self.max_attempts):
+            if not await self.queue.dead_letter(job, message):
+                self._lease_lost(job, "dead_letter")
+                return
+            self._metrics["dead_lettered"] += 1
+            logger.error("analysis_job_dead_lettered", job_id=str(job_id), attempts=job["attempts"], error=message)
+            return
+
+        delay = self.retry_base_delay * (2 ** (job["attempts"] - 1))
+        if not await self.queue.retry(job, message, datetime.utcnow() + timedelta(seconds=delay)):
+            self._lease_lost(job, "retry")
+            return
+        self._metrics["retried"] += 1
+        logger.warning("analysis_job_retry_scheduled", job_id=str(job_id), attempts=job["attempts"], delay=delay, error=message)
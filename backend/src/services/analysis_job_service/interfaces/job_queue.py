@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+class IJobQueue(ABC):
+    """Storage backend for background analysis jobs"""
+
+    async def start(self) -> None:
+        """Prepare the backend (indexes, connections)"""
+        pass
+
+    @abstractmethod
+    async def enqueue(self, job: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Add a job, or return the active job with the same dedupe key. Returns (job, coalesced)"""
+        pass
+
+    @abstractmethod
+    async def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next available job for a worker. A running job whose lease expired is
+        reclaimed while it has attempts left and dead-lettered once it has none.
+        """
+        pass
+
+    # `job` là bản ghi trả về từ claim: các thao tác dưới đây chỉ có hiệu lực khi lượt nhận đó
+    # vẫn còn giữ job (đang chạy, cùng worker_id và attempts), và trả về False nếu lease đã mất
+
+    @abstractmethod
+    async def renew(self, job: Dict[str, Any], lease_seconds: int) -> bool:
+        """Extend the lease of a running job (heartbeat)"""
+        pass
+
+    @abstractmethod
+    async def complete(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    async def retry(self, job: Dict[str, Any], error: str, available_at: datetime) -> bool:
+        """Put a failed job back on the queue, to be claimed again after available_at"""
+        pass
+
+    @abstractmethod
+    async def dead_letter(self, job: Dict[str, Any], error: str) -> bool:
+        """Park a job that exhausted its attempts"""
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def count_by_status(self) -> Dict[str, int]:
+        pass
@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+
+from src.models.analysis_job import AnalysisJobStatus
+from src.services.analysis_job_service.interfaces.job_queue import IJobQueue
+
+
+class InMemoryJobQueue(IJobQueue):
+    """Process-local stand-in for MongoJobQueue, used in tests and single-process setups"""
+
+    def __init__(self):
+        self.jobs: Dict[ObjectId, Dict[str, Any]] = {}
+        self._active: Dict[str, ObjectId] = {}
+        self._lock = asyncio.Lock()
+
+    async def enqueue(self, job: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        async with self._lock:
+            active_id = self._active.get(job["dedupe_key"])
+            if active_id is not None:
+                existing = self.jobs[active_id]
+                existing["coalesced_count"] += 1
+                return dict(existing), True
+            stored = {**job, "active_key": job["dedupe_key"]}
+            self.jobs[stored["_id"]] = stored
+            self._active[job["dedupe_key"]] = stored["_id"]
+            return dict(stored), False
+
+    async def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        async with self._lock:
+            now = datetime.utcnow()
+            candidates = []
+            for job in list(self.jobs.values()):
+                if job["status"] == AnalysisJobStatus.QUEUED.value and job["available_at"] <= now:
+                    candidates.append(job)
+                elif job["status"] == AnalysisJobStatus.RUNNING.value and job["lease_expires_at"] <= now:
+                    if job["attempts"] < job["max_attempts"]:
+                        candidates.append(job)
+                    else:
+                        self._close(job, status=AnalysisJobStatus.DEAD_LETTERED.value, error="Lease expired on the last attempt")
+            if not candidates:
+                return None
+            job = min(candidates, key=lambda j: j["available_at"])
+            job.update(
+                status=AnalysisJobStatus.RUNNING.value,
+                worker_id=worker_id,
+                started_at=now,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=job["attempts"] + 1,
+            )
+            return dict(job)
+
+    async def renew(self, job: Dict[str, Any], lease_seconds: int) -> bool:
+        async with self._lock:
+            stored = self._held(job)
+            if stored is None:
+                return False
+            stored["lease_expires_at"] = datetime.utcnow() + timedelta(seconds=lease_seconds)
+            return True
+
+    async def complete(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        return await self._finish(job, status=AnalysisJobStatus.SUCCEEDED.value, result=result, error=None)
+
+    async def retry(self, job: Dict[str, Any], error: str, available_at: datetime) -> bool:
+        async with self._lock:
+            stored = self._held(job)
+            if stored is None:
+                return False
+            stored.update(
+                status=AnalysisJobStatus.QUEUED.value, error=error, available_at=available_at,
+                lease_expires_at=None, worker_id=None,
+            )
+            return True
+
+    async def dead_letter(self, job: Dict[str, Any], error: str) -> bool:
+        return await self._finish(job, status=AnalysisJobStatus.DEAD_LETTERED.value, error=error)
+
+    async def _finish(self, job: Dict[str, Any], **fields) -> bool:
+        async with self._lock:
+            stored = self._held(job)
+            if stored is None:
+                return False
+            self._close(stored, **fields)
+            return True
+
+    def _held(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The stored job, if it is still running under the claim in `job`"""
+        stored = self.jobs.get(job["_id"])
+        if (stored is None or stored["status"] != AnalysisJobStatus.RUNNING.value
+                or stored["worker_id"] != job["worker_id"] or stored["attempts"] != job["attempts"]):
+            return None
+        return stored
+
+    def _close(self, job: Dict[str, Any], **fields) -> None:
+        job.update(fields, finished_at=datetime.utcnow(), lease_expires_at=None)
+        self._active.pop(job.pop("active_key", None), None)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        job = self.jobs.get(ObjectId(job_id))
+        return dict(job) if job else None
+
+    async def count_by_status(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from loguru import logger
+
+from src.repositories.analysis_job_repository import AnalysisJobRepository
+from src.services.analysis_job_service.interfaces.job_queue import IJobQueue
+
+
+class MongoJobQueue(IJobQueue):
+    """Job queue shared by every API process through the analysis_jobs collection"""
+
+    def __init__(self, repository: AnalysisJobRepository):
+        self.repository = repository
+
+    async def start(self) -> None:
+        await self.repository.ensure_indexes()
+
+    async def enqueue(self, job: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        return await self.repository.insert_or_get_active(job)
+
+    async def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        expired = await self.repository.dead_letter_expired()
+        if expired:
+            logger.error("analysis_jobs_dead_lettered_on_lease_expiry", count=expired)
+        return await self.repository.claim_next(worker_id, lease_seconds)
+
+    async def renew(self, job: Dict[str, Any], lease_seconds: int) -> bool:
+        return await self.repository.renew_lease(job, lease_seconds)
+
+    async def complete(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        return await self.repository.mark_succeeded(job, result)
+
+    async def retry(self, job: Dict[str, Any], error: str, available_at: datetime) -> bool:
+        return await self.repository.mark_retry(job, error, available_at)
+
+    async def dead_letter(self, job: Dict[str, Any], error: str) -> bool:
+        return await self.repository.mark_dead_lettered(job, error)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        return await self.repository.find_by_id(job_id)
+
+    async def count_by_status(self) -> Dict[str, int]:
+        return await self.repository.count_by_status()
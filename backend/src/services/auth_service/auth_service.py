@@ -1,7 +1,10 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from typing import Any, Dict, Optional, List
 from pydantic import EmailStr
 import secrets
+import time
 from datetime import datetime, timedelta
 
 from src.schemas.auth import (
@@ -29,21 +32,32 @@ from src.exceptions.custom_exceptions import (
 )
 from src.repositories.user_repository import UserRepository
 from src.repositories.domain_request_repository import DomainRequestRepository
+from src.services.auth_service.principal_cache import PrincipalCache
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt tốn ~100ms CPU mỗi lần: chạy trên pool riêng, giới hạn số luồng, để không chặn event loop
+_password_executor = ThreadPoolExecutor(max_workers=max(1, settings.app.PASSWORD_HASH_WORKERS), thread_name_prefix="bcrypt")
+
+async def hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_password_executor, pwd_context.hash, password)
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_password_executor, pwd_context.verify, password, hashed_password)
 
 class AuthService:
-    def __init__(self, user_repo: UserRepository, role_change_request_repo: DomainRequestRepository):
+    def __init__(self, user_repo: UserRepository, role_change_request_repo: DomainRequestRepository,
+                 principal_cache: Optional[PrincipalCache] = None):
         self.user_repo = user_repo
         self.role_change_request_repo = role_change_request_repo
+        self.principal_cache = principal_cache
 
     async def register_user(self, data: RegisterSchema) -> RegisterResponseSchema:
         existing = await self.user_repo.get_user_by_email(data.email)
         if existing:
             raise EmailAlreadyExistsError()
 
-        hashed = pwd_context.hash(data.password)
+        hashed = await hash_password(data.password)
         new_user = User(
             name=data.name,
             email=data.email,
@@ -58,7 +72,7 @@ class AuthService:
 
     async def login_user(self, data: LoginSchema) -> LoginResponseSchema:
         user_data = await self.user_repo.get_user_by_email(data.email)
-        if not user_data or not pwd_context.verify(data.password, user_data["password"]):
+        if not user_data or not await verify_password(data.password, user_data["password"]):
             raise InvalidCredentialsError()
 
         user = UserModel.parse_obj(user_data)
@@ -81,6 +95,25 @@ class AuthService:
         user = User(**user_data) # Directly create User from user_data
         return user
 
+    async def authenticate(self, payload: Dict[str, Any], token: str) -> User:
+        """User of a decoded access token, from the principal cache when the token was seen recently"""
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise UnauthorizedError("Invalid token payload")
+        if self.principal_cache is None:
+            return await self.get_current_user(user_id)
+
+        token_id = self.principal_cache.token_id(payload, token)
+        user = self.principal_cache.get(token_id)
+        if user is not None and str(user.id) == str(user_id):
+            return user
+
+        version = self.principal_cache.version(user_id)
+        user = await self.get_current_user(user_id)
+        expires_in = payload["exp"] - time.time() if "exp" in payload else None
+        self.principal_cache.set(token_id, user, version, expires_in)
+        return user
+
     async def request_password_reset(self, email: EmailStr) -> MessageResponseSchema:
         user_data = await self.user_repo.get_user_by_email(email)
         if not user_data:
@@ -115,9 +148,11 @@ class AuthService:
             )
             raise TokenExpiredError()
 
-        hashed_password = pwd_context.hash(new_password)
+        hashed_password = await hash_password(new_password)
         await self.user_repo.update_user(
             user.id,
             {"password": hashed_password, "reset_token": None, "reset_token_expires": None}
         )
+        if self.principal_cache is not None:
+            self.principal_cache.invalidate_user(user.id)
         return MessageResponseSchema(message="Mật khẩu của bạn đã được đặt lại thành công.")
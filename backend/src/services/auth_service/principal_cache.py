@@ -0,0 +1,62 @@
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.configs.settings import settings
+from src.schemas.user import User
+from src.utils.cache_utils import TTLCache, stable_digest
+
+
+class PrincipalCache:
+    """
+    Users already authenticated by a recent access token, keyed by the token id (jti).
+
+    Saves the users lookup of every authenticated request. Updating a user bumps its
+    version, which invalidates all of its cached tokens at once; a lookup that started
+    before the update is not cached. The cache is per process, so other workers see an
+    update after at most `ttl_seconds`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.app.PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.app.PRINCIPAL_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._principals = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock)
+        self._versions: Dict[str, int] = {}
+        self.invalidations = 0
+
+    @staticmethod
+    def token_id(payload: Dict[str, Any], token: str) -> str:
+        # Token cũ không có jti: dùng digest của chính token
+        return payload.get("jti") or stable_digest(token)
+
+    def version(self, user_id: Any) -> int:
+        return self._versions.get(str(user_id), 0)
+
+    def get(self, token_id: str) -> Optional[User]:
+        entry = self._principals.get(token_id)
+        if entry is None:
+            return None
+        user, version = entry
+        if version != self.version(user.id):
+            self._principals.invalidate(token_id)
+            return None
+        return user.model_copy()
+
+    def set(self, token_id: str, user: User, version: int, expires_in: Optional[float] = None) -> None:
+        """Cache the principal loaded while the user was at `version`, never past the token expiry"""
+        if version != self.version(user.id) or not self.ttl_seconds:
+            return
+        ttl = self.ttl_seconds if expires_in is None else min(self.ttl_seconds, expires_in)
+        if ttl > 0:
+            self._principals.set(token_id, (user.model_copy(), version), ttl_seconds=ttl)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """Forget every cached token of the user (profile update, approval, password reset)"""
+        self._versions[str(user_id)] = self.version(user_id) + 1
+        self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._principals.get_stats(), "invalidations": self.invalidations}
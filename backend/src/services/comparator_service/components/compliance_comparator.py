@@ -1,25 +1,31 @@
 from typing import Dict, List, Any, Callable
 from collections import Counter
+from datetime import datetime
 from loguru import logger
 
-from src.utils.cookie_utils import calculate_actual_retention_days, is_third_party_domain, parse_retention_to_days
 from src.schemas.violation import ComplianceIssue
 from src.schemas.cookie import PolicyCookie, ActualCookie
 from src.utils.violation_rules import cookie_rules
+from src.utils.rule_engine import CompiledRuleSet, PolicyFacts, RuleContext
 
 class ComplianceComparator:
     """
     Một "Rule Engine" để phân tích sự tuân thủ cookie bằng cách áp dụng
     một tập hợp các quy tắc có thể mở rộng.
     """
-    def __init__(self, rules: List[Callable] = cookie_rules):
+    def __init__(self, rules: List[Callable] = cookie_rules, precompiled: bool = True):
         """
         Khởi tạo analyzer với một danh sách các quy tắc.
 
         Args:
             rules: Danh sách các hàm quy tắc sẽ được áp dụng. Mặc định là cookie_rules.
+            precompiled: True để tính policy fact một lần cho mỗi lần phân tích và chỉ chạy
+                các quy tắc áp dụng cho cookie (đã khai báo / chưa khai báo). False để chạy mọi
+                quy tắc với fact tính lại cho từng cookie (chế độ tham chiếu, dùng cho kiểm thử).
         """
         self.rules = rules
+        self.precompiled = precompiled
+        self.compiled_rules = CompiledRuleSet(rules)
 
     def analyze_compliance(
         self,
@@ -28,48 +34,48 @@ class ComplianceComparator:
         main_domain: str
     ) -> Dict[str, Any]:
         all_issues = []
-        policy_map = {cookie.cookie_name: cookie for cookie in policy_cookies}
-        declared_names = set(policy_map.keys())
-
-        for actual_cookie in actual_cookies:
-            context = {
-                "actual_cookie": actual_cookie,
-                "policy_cookie": policy_map.get(actual_cookie.name),
-                "policy_cookies": policy_cookies,
-                "main_domain": main_domain,
-                "is_declared": actual_cookie.name in declared_names,
-            }
-
-            for rule_func in self.rules:
-                issue = rule_func(context)
-                if issue:
-                    all_issues.append(issue)
-
-        return self._generate_compliance_report(all_issues, policy_cookies, actual_cookies, main_domain)
+        # Mỗi cookie có đúng một RuleContext cho cả quy tắc lẫn báo cáo, nên ngày hết hạn
+        # và retention khai báo chỉ được parse một lần cho mỗi lần phân tích
+        now = datetime.now()
+
+        if self.precompiled:
+            policy_facts = self.compiled_rules.build_policy_facts(policy_cookies, main_domain, now, actual_cookies)
+            contexts = [RuleContext(actual_cookie, policy_facts) for actual_cookie in actual_cookies]
+            for context in contexts:
+                for rule_func in self.compiled_rules.rules_for(context):
+                    issue = rule_func(context)
+                    if issue:
+                        all_issues.append(issue)
+        else:
+            contexts = [RuleContext(actual_cookie, PolicyFacts(policy_cookies, main_domain, now, [actual_cookie])) for actual_cookie in actual_cookies]
+            for context in contexts:
+                for rule_func in self.rules:
+                    issue = rule_func(context)
+                    if issue:
+                        all_issues.append(issue)
+
+        return self._generate_compliance_report(all_issues, policy_cookies, actual_cookies, contexts)
 
     def _generate_compliance_report(
         self,
         all_issues: List[ComplianceIssue],
         policy_cookies: List[PolicyCookie],
         actual_cookies: List[ActualCookie],
-        main_domain: str
+        contexts: List[RuleContext]
     ) -> Dict[str, Any]:
         severity_counts = _count_by_severity(all_issues)
         category_counts = _count_by_category(all_issues)
         compliance_score = _calculate_compliance_score(all_issues)
 
-        policy_map = {cookie.cookie_name: cookie for cookie in policy_cookies}
-        declared_names = set(policy_map.keys())
-
-        undeclared_actual_cookies = [c for c in actual_cookies if c.name not in declared_names]
+        undeclared_actual_cookies = [ctx["actual_cookie"] for ctx in contexts if not ctx["is_declared"]]
         declared_policy_cookies = [pc for pc in policy_cookies]
-        third_party_actual_cookies = [c for c in actual_cookies if is_third_party_domain(c.domain, main_domain)]
-        long_term_actual_cookies = [c for c in actual_cookies if calculate_actual_retention_days(c.expirationDate) and calculate_actual_retention_days(c.expirationDate) > 365]
+        third_party_actual_cookies = [ctx["actual_cookie"] for ctx in contexts if ctx["is_third_party"]]
+        long_term_actual_cookies = [ctx["actual_cookie"] for ctx in contexts if (ctx["actual_days"] or 0) > 365]
 
         declared_violating_cookies = _detect_declared_violations(policy_cookies, actual_cookies, all_issues)
         declared_compliant_cookies = _detect_compliant_cookies(policy_cookies, actual_cookies, all_issues)
         declared_by_third_party_stats = _group_declared_by_third_party(declared_policy_cookies)
-        retention_violations = _detect_retention_violations(policy_cookies, actual_cookies)
+        retention_violations = _detect_retention_violations(contexts)
 
         # Loại bỏ các cookie có name trùng nhau
         unique_actual_cookies = {c.name: c for c in actual_cookies}.values()
@@ -125,7 +131,8 @@ def _calculate_compliance_score(all_issues: List[ComplianceIssue]) -> int:
     return max(0, 100 - penalty)
 
 def _detect_declared_violations(policy_cookies: List[PolicyCookie], actual_cookies: List[ActualCookie], all_issues: List[ComplianceIssue]) -> List[ActualCookie]:
-    violating_cookie_names = {issue.cookie_name for issue in all_issues if issue.cookie_name in {pc.cookie_name for pc in policy_cookies}}
+    declared_cookie_names = {pc.cookie_name for pc in policy_cookies}
+    violating_cookie_names = {issue.cookie_name for issue in all_issues if issue.cookie_name in declared_cookie_names}
     return [c for c in actual_cookies if c.name in violating_cookie_names]
 
 def _detect_compliant_cookies(policy_cookies: List[PolicyCookie], actual_cookies: List[ActualCookie], all_issues: List[ComplianceIssue]) -> List[PolicyCookie]:
@@ -143,14 +150,14 @@ def _group_declared_by_third_party(declared_policy_cookies: List[PolicyCookie])
             grouped[tp].append(pc.dict())
     return grouped
 
-def _detect_retention_violations(policy_cookies: List[PolicyCookie], actual_cookies: List[ActualCookie]) -> List[Dict[str, Any]]:
+def _detect_retention_violations(contexts: List[RuleContext]) -> List[Dict[str, Any]]:
     violations = []
-    policy_map = {pc.cookie_name: pc for pc in policy_cookies}
-    for actual_cookie in actual_cookies:
-        if actual_cookie.name in policy_map:
-            policy_cookie = policy_map[actual_cookie.name]
-            actual_retention_days = calculate_actual_retention_days(actual_cookie.expirationDate)
-            declared_retention_days = parse_retention_to_days(policy_cookie.declared_retention)
+    for ctx in contexts:
+        policy_cookie = ctx["policy_cookie"]
+        if policy_cookie is not None:
+            actual_cookie = ctx["actual_cookie"]
+            actual_retention_days = ctx["actual_days"]
+            declared_retention_days = ctx["declared_days"]
 
             # Only compare if both are numerical and declared retention is not 'session'/'persistent' etc.
             if declared_retention_days is not None and actual_retention_days is not None and actual_retention_days > declared_retention_days:
@@ -67,6 +67,7 @@ class CookieExtractorFactory:
             api_endpoint=config.get("api_endpoint"),
             # model=config["model"],
             api_key=config.get("api_key"),
+            **{k: v for k, v in config.items() if k not in ["api_endpoint", "api_key", "model", "temperature", "max_tokens"]}
         )
 
     @staticmethod
@@ -14,3 +14,15 @@ class ILLMProvider(ABC):
     def get_provider_name(self) -> str:
         """Get the name of the LLM provider"""
         pass
+
+    async def start(self) -> None:
+        """Open long-lived clients/connection pools (called once at startup)"""
+        pass
+
+    async def close(self) -> None:
+        """Release clients opened by `start`"""
+        pass
+
+    def get_model_name(self) -> str:
+        """Get the model identifier, used to key cached extraction results"""
+        return getattr(self, "model", None) or "default"
@@ -1,10 +1,16 @@
-from typing import Optional
+import asyncio
+from typing import List, Optional, Tuple
 from loguru import logger
 
+from src.configs.settings import settings
+from src.exceptions.custom_exceptions import LLMResponseError
+
 from src.schemas.cookie import PolicyCookieList
 from src.repositories.cookie_feature_repository import CookieFeatureRepository
 from src.services.cookie_extractor_service.interfaces.llm_provider import ILLMProvider
 from src.services.cookie_extractor_service.processors.content_analyzer import ContentAnalyzer
+from src.services.cookie_extractor_service.processors.content_chunker import ContentChunker, merge_policy_cookie_lists
+from src.services.cookie_extractor_service.processors.extraction_cache import ExtractionCache
 from src.services.cookie_extractor_service.processors.prompt_builder import PromptBuilder
 from src.services.cookie_extractor_service.processors.response_processor import LLMResponseProcessor
 
@@ -15,22 +21,37 @@ class CookieExtractorService:
         content_analyzer: ContentAnalyzer,
         prompt_builder: PromptBuilder,
         response_processor: LLMResponseProcessor,
-        cookie_feature_repository: CookieFeatureRepository
+        cookie_feature_repository: CookieFeatureRepository,
+        extraction_cache: Optional[ExtractionCache] = None,
+        content_chunker: Optional[ContentChunker] = None,
+        max_concurrent_chunks: int = settings.llm.EXTRACTION_CHUNK_CONCURRENCY
     ):
+        """
+        content_chunker: enables map-reduce extraction of long content (None = one prompt per document)
+        max_concurrent_chunks: chunks of one document sent to the provider at once
+        """
         self.llm_provider = llm_provider
         self.content_analyzer = content_analyzer
         self.prompt_builder = prompt_builder
         self.response_processor = response_processor
         self.cookie_feature_repository = cookie_feature_repository
+        self.extraction_cache = extraction_cache
+        self.content_chunker = content_chunker
+        self.max_concurrent_chunks = max(1, max_concurrent_chunks)
 
     async def extract_cookie_features(
         self,
         original_content: Optional[str] = None,
         table_content: Optional[str] = None,
+        strict: bool = False,
     ) -> PolicyCookieList:
         """
         Extract cookie features from policy content
         Single responsibility: orchestrate the cookie extraction workflow
+
+        A failed or partial extraction (some chunks failed) is never cached or saved. It is
+        returned as is (an empty list when nothing could be extracted), or raises
+        LLMResponseError when `strict` is set so callers can tell it from a complete result.
         """
         # Step 1: Prepare content
         content_to_analyze, content_type = self.content_analyzer.prepare_content_for_analysis(
@@ -41,29 +62,101 @@ class CookieExtractorService:
             return PolicyCookieList(is_specific=0, cookies=[])
 
         try:
-            # Step 2: Build prompt
-            prompt = self.prompt_builder.build_cookie_extraction_prompt(content_to_analyze)
-
-            # Step 3: Get LLM response
-            raw_response = await self.llm_provider.generate_content(prompt)
-            logger.debug(f"LLM Raw Response from {self.llm_provider.get_provider_name()}: {raw_response}")
+            # Step 2: Look up a previous extraction of the same content
+            cache_key = None
+            policy_cookie_list = None
+            if self.extraction_cache is not None:
+                cache_key = self.extraction_cache.build_key(
+                    content_to_analyze,
+                    provider=self.llm_provider.get_provider_name(),
+                    model=self.llm_provider.get_model_name(),
+                    prompt_version=self.prompt_builder.get_prompt_version()
+                )
+                cached = await self.extraction_cache.get(cache_key)
+                if cached is not None:
+                    policy_cookie_list = PolicyCookieList(**cached)
+                    logger.info(f"Extraction cache hit for {content_type} content ({len(policy_cookie_list.cookies)} cookies)")
 
-            # Step 4: Process response
-            clean_response = self.response_processor.clean_json_response(raw_response)
-            response_dict = self.response_processor.parse_json_response(clean_response)
+            if policy_cookie_list is None:
+                policy_cookie_list, complete = await self._extract_in_chunks(content_to_analyze, content_type)
+                if not complete:
+                    if strict:
+                        raise LLMResponseError(f"Partial extraction of {content_type} content: some chunks failed")
+                    logger.warning(f"Partial extraction of {content_type} content is neither cached nor saved")
+                    return policy_cookie_list
 
-            # Step 5: Convert to model
-            policy_cookie_list = PolicyCookieList(**response_dict)
-            logger.info(f"Successfully extracted cookie features using {self.llm_provider.get_provider_name()}")
+                # Empty results are not cached: a later attempt may find the cookies the model missed
+                if cache_key is not None and policy_cookie_list.cookies:
+                    await self.extraction_cache.set(cache_key, policy_cookie_list.model_dump(), {
+                        "provider": self.llm_provider.get_provider_name(),
+                        "model": self.llm_provider.get_model_name(),
+                        "prompt_version": self.prompt_builder.get_prompt_version(),
+                        "content_type": content_type,
+                    })
 
-            # Step 6: Save extracted cookies to the database
-            if policy_cookie_list.cookies:
-                cookies_to_save = [cookie.model_dump() for cookie in policy_cookie_list.cookies]
-                await self.cookie_feature_repository.insert_many(cookies_to_save)
-                logger.info(f"Saved {len(cookies_to_save)} cookies to the database.")
+                # Step 3: Save freshly extracted cookies to the database (a cache hit was saved when first extracted)
+                if policy_cookie_list.cookies:
+                    cookies_to_save = [cookie.model_dump() for cookie in policy_cookie_list.cookies]
+                    await self.cookie_feature_repository.insert_many(cookies_to_save)
+                    logger.info(f"Saved {len(cookies_to_save)} cookies to the database.")
 
             return policy_cookie_list
 
+        except LLMResponseError as e:
+            logger.error(f"Error during cookie feature extraction: {e}")
+            if strict:
+                raise
+            return PolicyCookieList(is_specific=0, cookies=[])
         except Exception as e:
             logger.error(f"Error during cookie feature extraction: {e}")
+            if strict:
+                raise LLMResponseError(f"Cookie feature extraction failed: {e}") from e
             return PolicyCookieList(is_specific=0, cookies=[])
+
+    async def _extract_in_chunks(self, content_to_analyze: str, content_type: str) -> Tuple[PolicyCookieList, bool]:
+        """
+        Map-reduce extraction: split the content within the token budget, extract every
+        chunk concurrently and merge the cookie lists. Returns (result, complete) where
+        complete is False when some chunk failed.
+        """
+        chunks = self.content_chunker.split(content_to_analyze, content_type) if self.content_chunker else [content_to_analyze]
+        if len(chunks) == 1:
+            return await self._extract_with_llm(chunks[0]), True
+
+        logger.info(f"Extracting {content_type} content in {len(chunks)} chunks (max {self.max_concurrent_chunks} concurrent)")
+        semaphore = asyncio.Semaphore(self.max_concurrent_chunks)
+
+        async def extract_chunk(chunk: str) -> PolicyCookieList:
+            async with semaphore:
+                return await self._extract_with_llm(chunk)
+
+        results = await asyncio.gather(*[extract_chunk(chunk) for chunk in chunks], return_exceptions=True)
+        succeeded: List[PolicyCookieList] = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.error(f"Chunk {index + 1}/{len(chunks)} extraction failed: {result}")
+            else:
+                succeeded.append(result)
+        if not succeeded:
+            raise results[0]
+
+        merged = merge_policy_cookie_lists(succeeded)
+        logger.info(f"Merged {sum(len(r.cookies) for r in succeeded)} chunk cookies into {len(merged.cookies)} unique cookies")
+        return merged, len(succeeded) == len(chunks)
+
+    async def _extract_with_llm(self, content_to_analyze: str) -> PolicyCookieList:
+        # Build prompt
+        prompt = self.prompt_builder.build_cookie_extraction_prompt(content_to_analyze)
+
+        # Get LLM response
+        raw_response = await self.llm_provider.generate_content(prompt)
+        logger.debug(f"LLM Raw Response from {self.llm_provider.get_provider_name()}: {raw_response}")
+
+        # Process response: provider and parse failures raise, so a failed chunk is never taken for "no cookies"
+        clean_response = self.response_processor.clean_json_response(raw_response)
+        response_dict = self.response_processor.parse_json_response(clean_response, strict=True)
+
+        # Convert to model
+        policy_cookie_list = PolicyCookieList(**response_dict)
+        logger.info(f"Successfully extracted cookie features using {self.llm_provider.get_provider_name()}")
+        return policy_cookie_list
@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.configs.settings import settings
+from src.schemas.cookie import PolicyCookie, PolicyCookieList
+
+# Ranh giới ưu tiên giảm dần: mục (dòng trống) > dòng > câu
+_SECTION_BREAK = re.compile(r"\n\s*\n")
+_LINE_BREAK = re.compile(r"\n+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class ContentChunker:
+    """
+    Functional Cohesion - Chỉ làm một việc: chia nội dung chính sách thành các phần
+    vừa ngân sách token, cắt theo ranh giới mục/đoạn (văn bản) hoặc bảng/hàng (bảng JSON).
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = settings.llm.EXTRACTION_CHUNK_MAX_TOKENS,
+        chars_per_token: float = settings.llm.EXTRACTION_CHARS_PER_TOKEN
+    ):
+        self.max_tokens = max(1, max_tokens)
+        self.chars_per_token = chars_per_token
+        self.max_chars = max(1, int(self.max_tokens * chars_per_token))
+
+    def estimate_tokens(self, content: str) -> int:
+        return int(len(content) / self.chars_per_token) + 1
+
+    def split(self, content: str, content_type: str) -> List[str]:
+        """Return the content unchanged as a single chunk when it already fits the budget"""
+        if len(content) <= self.max_chars:
+            return [content]
+        if content_type == "table":
+            tables = self._load_tables(content)
+            if tables is not None:
+                return self._split_tables(tables)
+        return self._split_text(content)
+
+    # ---------- text ----------
+
+    def _split_text(self, content: str) -> List[str]:
+        sections = [s.strip() for s in _SECTION_BREAK.split(content) if s.strip()]
+        return self._pack(self._fit(sections, self._split_section), "\n\n")
+
+    def _split_section(self, section: str) -> List[str]:
+        lines = [line.strip() for line in _LINE_BREAK.split(section) if line.strip()]
+        return self._pack(self._fit(lines, self._split_line), "\n")
+
+    def _split_line(self, line: str) -> List[str]:
+        # Một dòng quá dài: cắt theo câu, rồi cắt cứng nếu một câu vẫn vượt ngân sách
+        pieces = []
+        for sentence in _SENTENCE_END.split(line):
+            if len(sentence) <= self.max_chars:
+                pieces.append(sentence)
+            else:
+                pieces.extend(sentence[i:i + self.max_chars] for i in range(0, len(sentence), self.max_chars))
+        return self._pack(pieces, " ")
+
+    # ---------- tables ----------
+
+    @staticmethod
+    def _load_tables(content: str) -> Optional[List[Any]]:
+        try:
+            tables = json.loads(content)
+        except (TypeError, ValueError):
+            return None
+        return tables if isinstance(tables, list) else None
+
+    def _split_tables(self, tables: List[Any]) -> List[str]:
+        serialized = [json.dumps(table, ensure_ascii=False) for table in tables]
+        pieces = self._fit(serialized, lambda s: self._split_table_rows(json.loads(s)))
+        # Mỗi phần vẫn là một mảng JSON các bảng, giống định dạng gốc
+        return ["[" + chunk + "]" for chunk in self._pack(pieces, ", ")]
+
+    def _split_table_rows(self, table: Any) -> List[str]:
+        # Bảng quá lớn: chia theo hàng, lặp lại headers trong mỗi phần để LLM hiểu các cột
+        if not isinstance(table, dict) or not isinstance(table.get("rows"), list) or len(table["rows"]) < 2:
+            return [json.dumps(table, ensure_ascii=False)]
+        middle = len(table["rows"]) // 2
+        halves = [{**table, "rows": table["rows"][:middle]}, {**table, "rows": table["rows"][middle:]}]
+        return self._fit([json.dumps(half, ensure_ascii=False) for half in halves], lambda s: self._split_table_rows(json.loads(s)))
+
+    # ---------- packing ----------
+
+    def _fit(self, pieces: Iterable[str], splitter) -> List[str]:
+        fitted = []
+        for piece in pieces:
+            fitted.extend([piece] if len(piece) <= self.max_chars else splitter(piece))
+        return fitted
+
+    def _pack(self, pieces: List[str], separator: str) -> List[str]:
+        """Greedily group consecutive pieces into chunks of at most max_chars"""
+        chunks, current, size = [], [], 0
+        for piece in pieces:
+            added = len(piece) + (len(separator) if current else 0)
+            if current and size + added > self.max_chars:
+                chunks.append(separator.join(current))
+                current, size = [], 0
+                added = len(piece)
+            current.append(piece)
+            size += added
+        if current:
+            chunks.append(separator.join(current))
+        return chunks
+
+
+def merge_policy_cookie_lists(results: Iterable[PolicyCookieList]) -> PolicyCookieList:
+    """
+    Reduce step: merge the per-chunk extractions, de-duplicating cookies by name.
+    The first non-empty value of each attribute wins and third parties are unioned.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    is_specific = 0
+    for result in results:
+        is_specific = max(is_specific, result.is_specific)
+        for cookie in result.cookies:
+            name = cookie.cookie_name.strip()
+            # Các mục chung không có tên chỉ trùng nhau khi mô tả trùng nhau
+            key = name.lower() if name else f"\0{(cookie.declared_description or '').strip().lower()}"
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = {**cookie.model_dump(), "declared_third_parties": list(cookie.declared_third_parties)}
+                continue
+            for field in ("declared_purpose", "declared_retention", "declared_description"):
+                if not existing[field] and getattr(cookie, field):
+                    existing[field] = getattr(cookie, field)
+            for party in cookie.declared_third_parties:
+                if party not in existing["declared_third_parties"]:
+                    existing["declared_third_parties"].append(party)
+    return PolicyCookieList(is_specific=is_specific, cookies=[PolicyCookie(**data) for data in merged.values()])
@@ -0,0 +1,90 @@
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from src.configs.settings import settings
+from src.repositories.llm_extraction_cache_repository import LLMExtractionCacheRepository
+from src.utils.cache_utils import TTLCache, stable_digest
+
+
+class ExtractionCache:
+    """
+    Content-addressed cache of LLM cookie extraction results.
+
+    Keys are a digest of the normalised content plus provider, model and prompt
+    version, so byte-identical (or whitespace-only different) policies such as
+    shared CMP boilerplate are only sent to the LLM once. Lookups go to the
+    in-process LRU tier first, then to the Mongo tier, which is shared between
+    workers and survives restarts.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[LLMExtractionCacheRepository] = None,
+        max_entries: int = settings.llm.EXTRACTION_CACHE_MAX_ENTRIES,
+        memory_ttl_seconds: int = settings.llm.EXTRACTION_CACHE_MEMORY_TTL_SECONDS,
+        persistent_ttl_seconds: int = settings.llm.EXTRACTION_CACHE_PERSISTENT_TTL_SECONDS,
+    ):
+        self.repository = repository
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=memory_ttl_seconds)
+        self.persistent_ttl_seconds = persistent_ttl_seconds
+        self._metrics = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "persistent_errors": 0,
+        }
+
+    @staticmethod
+    def normalize_content(content: str) -> str:
+        """Unicode- and whitespace-normalise content; case is kept since cookie names are case-sensitive"""
+        content = unicodedata.normalize("NFKC", content or "")
+        return re.sub(r"\s+", " ", content).strip()
+
+    def build_key(self, content: str, provider: str, model: str, prompt_version: str) -> str:
+        return stable_digest(provider, model, prompt_version, self.normalize_content(content))
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached extraction result (a PolicyCookieList dict) or None"""
+        result = self.memory.get(key)
+        if result is not None:
+            self._metrics["memory_hits"] += 1
+            return result
+
+        if self.repository is not None:
+            try:
+                entry = await self.repository.get_entry(key)
+                if entry:
+                    self._metrics["persistent_hits"] += 1
+                    self.memory.set(key, entry["result"])
+                    await self.repository.record_hit(key)
+                    return entry["result"]
+            except Exception as e:
+                self._metrics["persistent_errors"] += 1
+                logger.warning(f"Extraction cache lookup failed, falling back to LLM: {e}")
+
+        self._metrics["misses"] += 1
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+        self.memory.set(key, result)
+        self._metrics["stores"] += 1
+        if self.repository is not None:
+            try:
+                await self.repository.save_entry(key, result, metadata or {}, self.persistent_ttl_seconds)
+            except Exception as e:
+                self._metrics["persistent_errors"] += 1
+                logger.warning(f"Could not persist extraction cache entry: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        hits = self._metrics["memory_hits"] + self._metrics["persistent_hits"]
+        lookups = hits + self._metrics["misses"]
+        return {
+            **self._metrics,
+            "hits": hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory": self.memory.get_stats(),
+        }
@@ -1,4 +1,5 @@
 from src.configs.settings import settings
+from src.utils.cache_utils import stable_digest
 
 class PromptBuilder:
     def __init__(self, system_prompt: str = None):
@@ -9,3 +10,10 @@ class PromptBuilder:
         Builds the prompt for extracting cookie features.
         """
         return f"{self.system_prompt}\n\nContent to analyze:\n{content_to_analyze}"
+
+    def get_prompt_version(self) -> str:
+        """
+        Identifies the prompt used for extraction; changes whenever the
+        configured PROMPT_VERSION or the system prompt text changes.
+        """
+        return f"{settings.llm.PROMPT_VERSION}:{stable_digest(self.system_prompt)[:12]}"
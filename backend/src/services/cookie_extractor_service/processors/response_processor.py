@@ -3,6 +3,8 @@ import logging
 import re
 from typing import Dict, Any, Optional
 
+from src.exceptions.custom_exceptions import LLMResponseError
+
 logger = logging.getLogger(__name__)
 
 class LLMResponseProcessor:
@@ -49,18 +51,21 @@ class LLMResponseProcessor:
         return response
 
     @staticmethod
-    def parse_json_response(json_str: str) -> Dict[str, Any]:
+    def parse_json_response(json_str: str, strict: bool = False) -> Dict[str, Any]:
         """
         Parse JSON string to dictionary with error handling
 
         Args:
             json_str: JSON string to parse
+            strict: raise LLMResponseError instead of returning the default structure
 
         Returns:
             Parsed dictionary or default structure on error
         """
         if not json_str or not isinstance(json_str, str):
             logger.warning("Empty or invalid JSON string provided")
+            if strict:
+                raise LLMResponseError("Empty or invalid JSON string")
             return {"is_specific": 0, "cookies": []}
 
         try:
@@ -70,9 +75,13 @@ class LLMResponseProcessor:
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to decode JSON: {e}. Response: {json_str[:200]}...")
+            if strict:
+                raise LLMResponseError(f"Failed to decode JSON: {e}") from e
             return {"is_specific": 0, "cookies": []}
         except Exception as e:
             logger.error(f"Unexpected error parsing JSON: {e}")
+            if strict:
+                raise LLMResponseError(f"Unexpected error parsing JSON: {e}") from e
             return {"is_specific": 0, "cookies": []}
 
     @staticmethod
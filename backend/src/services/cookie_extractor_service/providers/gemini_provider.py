@@ -1,6 +1,9 @@
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 
+from src.configs.settings import settings
+from src.exceptions.custom_exceptions import LLMResponseError
 from src.services.cookie_extractor_service.interfaces.llm_provider import ILLMProvider
 
 logger = logging.getLogger(__name__)
@@ -18,6 +21,10 @@ class GeminiLLMProvider(ILLMProvider):
         model: str,
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        max_concurrency: int = settings.external.GEMINI_MAX_CONCURRENCY,
+        timeout: int = settings.external.LLM_REQUEST_TIMEOUT_SECONDS,
+        max_connections: int = settings.external.LLM_MAX_CONNECTIONS,
+        keepalive_seconds: int = settings.external.LLM_KEEPALIVE_SECONDS,
         **kwargs
     ):
         """
@@ -28,16 +35,29 @@ class GeminiLLMProvider(ILLMProvider):
             model: Model name (e.g., 'gemini-pro')
             temperature: Generation temperature (0.0 to 1.0)
             max_tokens: Maximum output tokens
+            max_concurrency: Maximum in-flight requests through this provider
+            timeout: Request timeout in seconds
+            max_connections: Size of the shared HTTP connection pool
+            keepalive_seconds: How long idle connections are kept open
             **kwargs: Additional configuration parameters
         """
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keepalive_seconds = keepalive_seconds
         self.config = kwargs
 
         self._validate_configuration()
 
+        # Client dùng chung cho mọi request, tạo một lần (start hoặc lần gọi đầu tiên)
+        self._client = None
+        self._http_client = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
     def _validate_configuration(self) -> None:
         """Validate the provider configuration"""
         if not self.api_key:
@@ -52,6 +72,38 @@ class GeminiLLMProvider(ILLMProvider):
         if self.max_tokens <= 0:
             raise ValueError("Max tokens must be greater than 0")
 
+    async def start(self) -> None:
+        self._get_client()
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        http_client, self._http_client = self._http_client, None
+        if client is not None:
+            await client.aio.aclose()
+        if http_client is not None:
+            await http_client.aclose()
+
+    def _get_client(self):
+        """Create the long-lived genai client with a keep-alive connection pool"""
+        if self._client is None:
+            from google import genai
+            from google.genai import types
+
+            http_options = {"timeout": self.timeout * 1000}
+            if "httpx_async_client" in types.HttpOptions.model_fields:
+                import httpx
+                self._http_client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=self.keepalive_seconds
+                    )
+                )
+                http_options["httpx_async_client"] = self._http_client
+            self._client = genai.Client(api_key=self.api_key, http_options=types.HttpOptions(**http_options))
+        return self._client
+
     async def generate_content(self, prompt: str, **kwargs) -> str:
         """
         Generate content using Gemini API
@@ -62,36 +114,34 @@ class GeminiLLMProvider(ILLMProvider):
 
         Returns:
             Generated content as string
+
+        Raises:
+            LLMResponseError: the API call failed or returned no text
         """
         try:
-            from google import genai
             from google.genai import types
 
-            # Create client
-            client = genai.Client(api_key=self.api_key)
+            client = self._get_client()
 
             # Use provided parameters or fall back to instance defaults
             temperature = kwargs.get('temperature', self.temperature)
             max_tokens = kwargs.get('max_tokens', self.max_tokens)
 
-            # Generate content
-            response = client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(
-                        role="user",
-                        parts=[types.Part.from_text(text=prompt)]
+            # Generate content (async SDK surface, never blocks the event loop)
+            async with self._semaphore:
+                response = await client.aio.models.generate_content(
+                    model=self.model,
+                    contents=[
+                        types.Content(
+                            role="user",
+                            parts=[types.Part.from_text(text=prompt)]
+                        )
+                    ],
+                    config=types.GenerateContentConfig(
+                        temperature=temperature,
+                        max_output_tokens=max_tokens,
                     )
-                ],
-                config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
                 )
-            )
-
-            result = response.text if response.text else '{"is_specific": 0, "cookies": []}'
-            logger.debug(f"Gemini API response received: {len(result)} characters")
-            return result
 
         except ImportError as e:
             logger.error(f"Google Generative AI library not found: {e}")
@@ -99,8 +149,13 @@ class GeminiLLMProvider(ILLMProvider):
 
         except Exception as e:
             logger.error(f"Gemini API error: {str(e)}")
-            # Return default JSON response on error
-            return '{"is_specific": 0, "cookies": []}'
+            raise LLMResponseError(f"Gemini API error: {e}") from e
+
+        # Phản hồi rỗng (bị chặn, hết max_tokens) không phải là "không có cookie"
+        if not response.text:
+            raise LLMResponseError("Gemini API returned an empty response")
+        logger.debug(f"Gemini API response received: {len(response.text)} characters")
+        return response.text
 
     def get_provider_name(self) -> str:
         """Get provider name"""
@@ -113,6 +168,8 @@ class GeminiLLMProvider(ILLMProvider):
             "model": self.model,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
             "api_key_set": bool(self.api_key),
             "additional_config": self.config
         }
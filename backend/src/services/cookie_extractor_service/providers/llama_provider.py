@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import aiohttp
 from typing import Dict, Any, Optional
 
+from src.configs.settings import settings
+from src.exceptions.custom_exceptions import LLMResponseError
 from src.services.cookie_extractor_service.interfaces.llm_provider import ILLMProvider
 
 logger = logging.getLogger(__name__)
@@ -13,15 +16,27 @@ class LlamaLLMProvider(ILLMProvider):
         api_endpoint: str,
         # model: str,
         api_key: Optional[str] = None,
+        max_concurrency: int = settings.external.LLAMA_MAX_CONCURRENCY,
+        timeout: int = settings.external.LLM_REQUEST_TIMEOUT_SECONDS,
+        max_connections: int = settings.external.LLM_MAX_CONNECTIONS,
+        keepalive_seconds: int = settings.external.LLM_KEEPALIVE_SECONDS,
         **kwargs
     ):
         self.api_endpoint = api_endpoint
         # self.model = model
         self.api_key = api_key
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keepalive_seconds = keepalive_seconds
         self.config = kwargs
 
         self._validate_configuration()
 
+        # Session dùng chung (keep-alive) thay vì mở một ClientSession cho mỗi request
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
     def _validate_configuration(self) -> None:
         """Validate the provider configuration"""
         if not self.api_endpoint:
@@ -31,6 +46,22 @@ class LlamaLLMProvider(ILLMProvider):
         #     raise ValueError("Model name is required for Llama provider")
 
 
+    async def start(self) -> None:
+        self._get_session()
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_seconds),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
     async def generate_content(self, content: str, **kwargs) -> str:
         """
         Generate content using Llama API
@@ -41,6 +72,9 @@ class LlamaLLMProvider(ILLMProvider):
 
         Returns:
             Generated content as string
+
+        Raises:
+            LLMResponseError: the API call failed or returned no text
         """
         try:
             headers = {"Content-Type": "application/json"}
@@ -55,45 +89,54 @@ class LlamaLLMProvider(ILLMProvider):
             }
 
             # Make API request
-            timeout = kwargs.get('timeout', 300)  # Default timeout set to 30 seconds
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-                async with session.post(
+            timeout = kwargs.get('timeout', self.timeout)
+            async with self._semaphore:
+                async with self._get_session().post(
                     f"{self.api_endpoint}?key={self.api_key}",
                     json=payload,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
                     # headers=headers
                 ) as response:
 
                     if response.status != 200:
                         logger.error(f"Llama API returned status {response.status}: {await response.text()}")
-                        return '{"is_specific": 0, "cookies": []}'
+                        raise LLMResponseError(f"Llama API returned status {response.status}")
 
                     result = await response.json()
 
                     logger.debug(f"Llama API response received: {result}")
 
-                    final_result = result.get('generated_text', '{"is_specific": 0, "cookies": []}')
+                    final_result = result.get('generated_text')
+                    if not final_result:
+                        raise LLMResponseError("Llama API returned no generated_text")
                     logger.debug(f"Llama API response received: {final_result} characters")
                     return final_result
 
+        except LLMResponseError:
+            raise
+
         except aiohttp.ClientError as e:
             logger.error(f"Llama API client error: {str(e)}")
-            return '{"is_specific": 0, "cookies": []}'
+            raise LLMResponseError(f"Llama API client error: {e}") from e
 
         except Exception as e:
             logger.error(f"Llama API error: {str(e)}")
-            return '{"is_specific": 0, "cookies": []}'
+            raise LLMResponseError(f"Llama API error: {e}") from e
 
     def get_provider_name(self) -> str:
         """Get provider name"""
         return "Llama"
 
+    def get_model_name(self) -> str:
+        """The served model is fixed per endpoint"""
+        return self.api_endpoint
+
     def get_model_info(self) -> Dict[str, Any]:
         """Get current model configuration"""
         return {
             "provider": self.get_provider_name(),
             "api_endpoint": self.api_endpoint,
-            "temperature": self.temperature,
-            "max_tokens": self.max_tokens,
+            "max_concurrency": self.max_concurrency,
             "timeout": self.timeout,
             "api_key_set": bool(self.api_key),
             "additional_config": self.config
@@ -8,15 +8,21 @@ from src.repositories.domain_request_repository import DomainRequestRepository
 from src.services.website_management_service.website_management_service import WebsiteManagementService
 from src.repositories.website_repository import WebsiteRepository
 from src.repositories.user_repository import UserRepository
+from src.services.user_identity_map import UserIdentityMap
+from src.services.auth_service.principal_cache import PrincipalCache
 from src.exceptions.custom_exceptions import DomainRequestNotFoundError, UnauthorizedError, DomainAlreadyExistsError, BadRequestException, InternalServerError
 from src.schemas.user import UserPublicSchema, UserRole
 from src.utils.validation_utils import DOMAIN_REGEX
+from src.utils.pagination_utils import EXACT, KeysetPage
 
 class DomainRequestService:
-    def __init__(self, domain_request_repo: DomainRequestRepository, website_repo: WebsiteRepository, user_repo: UserRepository):
+    def __init__(self, domain_request_repo: DomainRequestRepository, website_repo: WebsiteRepository, user_repo: UserRepository,
+                 user_identity_map: Optional[UserIdentityMap] = None, principal_cache: Optional[PrincipalCache] = None):
         self.domain_request_repo = domain_request_repo
         self.website_repo = website_repo
         self.user_repo = user_repo
+        self.user_identity_map = user_identity_map or UserIdentityMap(user_repo)
+        self.principal_cache = principal_cache
 
     async def _validate_domains(self, domains: List[str], exclude_request_id: Optional[str] = None) -> List[str]:
         invalid_domains = []
@@ -104,32 +110,43 @@ class DomainRequestService:
         return None
 
     async def _populate_user_info(self, request_data: dict) -> DomainRequestResponseSchema:
-        domain_request_response = DomainRequestResponseSchema.model_validate(request_data)
+        return (await self._populate_users_info([request_data]))[0]
 
-        if domain_request_response.requester_id:
-            requester = await self.user_repo.get_user_by_id(str(domain_request_response.requester_id))
+    async def _populate_users_info(self, requests_data: List[dict]) -> List[DomainRequestResponseSchema]:
+        # Gom mọi requester/processor của cả trang để nạp bằng một truy vấn $in
+        responses = [DomainRequestResponseSchema.model_validate(data) for data in requests_data]
+        users = await self.user_identity_map.get_many(
+            user_id for response in responses for user_id in (response.requester_id, response.processed_by)
+        )
+
+        for response in responses:
+            requester = users.get(str(response.requester_id)) if response.requester_id else None
             if requester:
-                domain_request_response.requester_info = UserPublicSchema.model_validate(requester)
+                response.requester_info = UserPublicSchema.model_validate(requester)
 
-        if domain_request_response.processed_by:
-            processed_by_user = await self.user_repo.get_user_by_id(str(domain_request_response.processed_by))
+            processed_by_user = users.get(str(response.processed_by)) if response.processed_by else None
             if processed_by_user:
-                domain_request_response.processed_by_info = UserPublicSchema.model_validate(processed_by_user)
+                response.processed_by_info = UserPublicSchema.model_validate(processed_by_user)
 
-        return domain_request_response
+        return responses
 
-    async def get_all_domain_requests(self, status: Optional[DomainRequestStatus] = None, requester_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[DomainRequestResponseSchema]:
+    async def get_all_domain_requests(self, status: Optional[DomainRequestStatus] = None, requester_id: Optional[str] = None,
+                                      cursor: Optional[str] = None, skip: int = 0, limit: int = 100,
+                                      total_mode: str = EXACT) -> KeysetPage:
         filters = {}
         if status:
             filters["status"] = status.value
         if requester_id:
             filters["requester_id"] = ObjectId(requester_id)
-        requests_data = await self.domain_request_repo.get_all_domain_requests(filters, skip=skip, limit=limit)
+        try:
+            page = await self.domain_request_repo.get_all_domain_requests(
+                filters, cursor=cursor, skip=skip, limit=limit, total_mode=total_mode
+            )
+        except ValueError as e:
+            raise BadRequestException(str(e))
 
-        populated_requests = []
-        for req_data in requests_data:
-            populated_requests.append(await self._populate_user_info(req_data.model_dump(by_alias=True)))
-        return populated_requests
+        populated_requests = await self._populate_users_info([req_data.model_dump(by_alias=True) for req_data in page.rows])
+        return page._replace(rows=populated_requests)
 
     async def approve_domain_request(self, request_id: str, approver_id: str, website_management_service: WebsiteManagementService) -> DomainRequestResponseSchema:
         request_data = await self.domain_request_repo.get_domain_request_by_id(request_id)
@@ -159,6 +176,9 @@ class DomainRequestService:
 
         # Update provider's approved_by_admin status
         await self.user_repo.update_user(str(domain_request.requester_id), {"approved_by_admin": True})
+        self.user_identity_map.forget(domain_request.requester_id)
+        if self.principal_cache is not None:
+            self.principal_cache.invalidate_user(domain_request.requester_id)
 
         updated_data = await self.domain_request_repo.get_domain_request_by_id(request_id)
         if not updated_data:
@@ -0,0 +1,271 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+from src.configs.settings import settings
+
+
+class _BrowserSlot:
+    """One warm Chromium instance plus the contexts created on it"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.generation = 0
+        self.browser: Optional[Browser] = None
+        self.contexts: List[BrowserContext] = []
+        self.pages_served = 0
+        self.active_leases = 0
+        self.crashed = False
+        self.recycling = False
+
+    @property
+    def healthy(self) -> bool:
+        return bool(self.browser) and not self.crashed and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Process-wide pool of long-lived Playwright browsers.
+
+    Browsers are launched once (normally from the FastAPI lifespan) and their
+    contexts are leased to callers such as PlaywrightContentExtractor and
+    SearchService. A browser is recycled after it has served
+    `max_pages_per_browser` pages or when it crashes / disconnects.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.crawler.BROWSER_POOL_SIZE,
+        contexts_per_browser: int = settings.crawler.BROWSER_POOL_CONTEXTS_PER_BROWSER,
+        max_pages_per_browser: int = settings.crawler.BROWSER_POOL_MAX_PAGES_PER_BROWSER,
+        lease_timeout: float = settings.crawler.BROWSER_POOL_LEASE_TIMEOUT,
+        health_check_interval: float = settings.crawler.BROWSER_POOL_HEALTH_CHECK_INTERVAL,
+    ):
+        self.size = max(1, size)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_pages_per_browser = max_pages_per_browser
+        self.lease_timeout = lease_timeout
+        self.health_check_interval = health_check_interval
+
+        self._playwright: Optional[Playwright] = None
+        self._slots: List[_BrowserSlot] = []
+        self._available: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        self._health_task: Optional[asyncio.Task] = None
+        self._started = False
+
+        self._metrics = {
+            "leases_total": 0,
+            "lease_wait_seconds_total": 0.0,
+            "lease_timeouts": 0,
+            "saturated_leases": 0,
+            "waiting": 0,
+            "pages_served": 0,
+            "recycles": 0,
+            "crashes": 0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def start(self) -> None:
+        """Launch the playwright driver, all browsers and their warm contexts"""
+        async with self._start_lock:
+            if self._started:
+                return
+            self._playwright = await async_playwright().start()
+            self._available = asyncio.Queue()
+            self._slots = [_BrowserSlot(i) for i in range(self.size)]
+            for slot in self._slots:
+                await self._launch_slot(slot)
+            if self.health_check_interval > 0:
+                self._health_task = asyncio.create_task(self._health_loop())
+            self._started = True
+            logger.info(f"Browser pool started with {self.size} browser(s) x {self.contexts_per_browser} context(s)")
+
+    async def stop(self) -> None:
+        """Close every browser and stop the playwright driver"""
+        async with self._start_lock:
+            if not self._started:
+                return
+            self._started = False
+            if self._health_task:
+                self._health_task.cancel()
+                try:
+                    await self._health_task
+                except asyncio.CancelledError:
+                    pass
+                self._health_task = None
+            for slot in self._slots:
+                await self._close_slot(slot)
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+            logger.info("Browser pool stopped")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserContext]:
+        """Borrow a warm browser context for the duration of the `async with` block"""
+        # Pool được mở trong lifespan; không tự khởi động lại một pool đã dừng (đang shutdown)
+        if not self._started:
+            raise RuntimeError("Browser pool is not started")
+
+        slot, context = await self._acquire()
+        try:
+            yield context
+        finally:
+            await self._release(slot, context)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool saturation and lifecycle counters"""
+        capacity = self.size * self.contexts_per_browser
+        in_use = sum(slot.active_leases for slot in self._slots)
+        leases_total = self._metrics["leases_total"]
+        return {
+            **self._metrics,
+            "started": self._started,
+            "browsers": self.size,
+            "healthy_browsers": sum(1 for slot in self._slots if slot.healthy),
+            "capacity": capacity,
+            "in_use": in_use,
+            "available": self._available.qsize() if self._available else 0,
+            "utilization": round(in_use / capacity, 3) if capacity else 0.0,
+            "avg_lease_wait_seconds": round(self._metrics["lease_wait_seconds_total"] / leases_total, 4) if leases_total else 0.0,
+            "browser_pages": {slot.index: slot.pages_served for slot in self._slots},
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Recycle crashed or disconnected browsers and report their state"""
+        for slot in self._slots:
+            if not slot.healthy and not slot.recycling and slot.active_leases == 0:
+                logger.warning(f"Browser #{slot.index} is unhealthy, recycling it")
+                await self._recycle_slot(slot)
+        return {slot.index: slot.healthy for slot in self._slots}
+
+    async def _acquire(self) -> Tuple[_BrowserSlot, BrowserContext]:
+        if self._available.empty():
+            self._metrics["saturated_leases"] += 1
+
+        started_at = time.monotonic()
+        self._metrics["waiting"] += 1
+        try:
+            while True:
+                remaining = self.lease_timeout - (time.monotonic() - started_at)
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                slot, generation, context = await asyncio.wait_for(self._available.get(), timeout=remaining)
+                # Contexts left in the queue from a browser that has since been (or is being) recycled are stale
+                if generation == slot.generation and slot.healthy and not slot.recycling:
+                    break
+        except asyncio.TimeoutError:
+            self._metrics["lease_timeouts"] += 1
+            raise RuntimeError(f"Timed out after {self.lease_timeout}s waiting for a browser context")
+        finally:
+            self._metrics["waiting"] -= 1
+
+        slot.active_leases += 1
+        self._metrics["leases_total"] += 1
+        self._metrics["lease_wait_seconds_total"] += time.monotonic() - started_at
+        return slot, context
+
+    async def _release(self, slot: _BrowserSlot, context: BrowserContext) -> None:
+        slot.active_leases -= 1
+        generation = slot.generation
+
+        needs_recycle = not slot.healthy or (
+            self.max_pages_per_browser > 0 and slot.pages_served >= self.max_pages_per_browser
+        )
+        if needs_recycle:
+            # Stop handing out this browser and rebuild it once the last lease is returned
+            slot.recycling = True
+            if slot.active_leases == 0 and self._started:
+                await self._recycle_slot(slot)
+            return
+
+        try:
+            await context.clear_cookies()
+        except Exception as e:
+            logger.warning(f"Could not reset context of browser #{slot.index}: {e}")
+            slot.crashed = True
+            if slot.active_leases == 0 and self._started:
+                await self._recycle_slot(slot)
+            return
+
+        if self._started and not slot.recycling:
+            self._available.put_nowait((slot, generation, context))
+
+    async def _launch_slot(self, slot: _BrowserSlot) -> None:
+        crawler = settings.crawler
+        slot.browser = await self._playwright.chromium.launch(
+            headless=crawler.BROWSER_HEADLESS,
+            args=crawler.BROWSER_ARGS,
+        )
+        slot.browser.on("disconnected", lambda _: self._on_disconnected(slot))
+        slot.generation += 1
+        slot.pages_served = 0
+        slot.crashed = False
+        slot.contexts = []
+        for _ in range(self.contexts_per_browser):
+            context = await slot.browser.new_context(
+                user_agent=crawler.USER_AGENT,
+                viewport={"width": crawler.BROWSER_VIEWPORT_WIDTH, "height": crawler.BROWSER_VIEWPORT_HEIGHT},
+                device_scale_factor=crawler.BROWSER_DEVICE_SCALE_FACTOR,
+                extra_http_headers=crawler.BROWSER_EXTRA_HTTP_HEADERS,
+            )
+            context.on("page", lambda _: self._on_page_opened(slot))
+            slot.contexts.append(context)
+        # Chỉ đưa context vào hàng đợi khi slot đã sẵn sàng, nếu không _acquire sẽ bỏ chúng
+        slot.recycling = False
+        for context in slot.contexts:
+            self._available.put_nowait((slot, slot.generation, context))
+
+    async def _close_slot(self, slot: _BrowserSlot) -> None:
+        for context in slot.contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        slot.contexts = []
+        if slot.browser:
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
+            slot.browser = None
+
+    async def _recycle_slot(self, slot: _BrowserSlot) -> None:
+        slot.recycling = True
+        logger.info(f"Recycling browser #{slot.index} after {slot.pages_served} page(s)")
+        await self._close_slot(slot)
+        try:
+            await self._launch_slot(slot)
+            self._metrics["recycles"] += 1
+        except Exception as e:
+            # Leave the slot marked as crashed; the health loop will retry later
+            logger.error(f"Failed to relaunch browser #{slot.index}: {e}")
+            slot.crashed = True
+            slot.recycling = False
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.health_check()
+            except Exception as e:
+                logger.error(f"Browser pool health check failed: {e}")
+
+    def _on_page_opened(self, slot: _BrowserSlot) -> None:
+        slot.pages_served += 1
+        self._metrics["pages_served"] += 1
+
+    def _on_disconnected(self, slot: _BrowserSlot) -> None:
+        if slot.recycling or not self._started:
+            return
+        logger.warning(f"Browser #{slot.index} disconnected unexpectedly")
+        slot.crashed = True
+        self._metrics["crashes"] += 1
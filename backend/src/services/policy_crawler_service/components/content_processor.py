@@ -1,4 +1,5 @@
 from src.schemas.policy import PolicyContent
+from src.utils.html_document import parse_html
 from src.utils.table_extractor import TableExtractor
 from src.utils.text_processing import TextProcessor
 from src.utils.translation_utils import TranslationManager
@@ -16,14 +17,17 @@ class ContentProcessor:
     async def process_content(self, website_url: str, policy_url: str,
                             html_content: str, translate_to_english: bool = True) -> PolicyContent:
 
+        # Parse the page once and share the tree between text and table extraction
+        document = parse_html(html_content)
+
         # Extract text content
-        policy_text = await self.text_processor.extract_clean_text(html_content)
+        policy_text = await self.text_processor.extract_clean_text(document)
 
         # Detect language
         detected_language = await self.text_processor.detect_language_async(policy_text)
 
         # Extract tables
-        table_data = self.table_extractor.extract_tables_from_html(html_content)
+        table_data = self.table_extractor.extract_tables_from_html(document)
 
         # Handle translation
         translated_text = None
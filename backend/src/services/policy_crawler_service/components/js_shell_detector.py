@@ -0,0 +1,50 @@
+import re
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from src.configs.settings import settings
+from src.utils.html_document import parse_html
+
+_HIDDEN_TAGS = ("script", "style", "noscript", "template")
+_POLICY_PATH = re.compile(r"cookie|privacy|datenschutz|privacidad|confidentialit", re.IGNORECASE)
+
+
+class JsShellDetector:
+    """
+    Decides whether a page fetched over plain HTTP is usable or is a
+    JavaScript shell that only a browser can render.
+    """
+
+    def __init__(
+        self,
+        min_text_chars: int = settings.crawler.JS_SHELL_MIN_TEXT_CHARS,
+        markers: List[str] = settings.crawler.JS_SHELL_MARKERS,
+        policy_patterns: List[str] = settings.policy_discovery.COOKIE_POLICY_PATTERNS,
+        policy_url_patterns: List[str] = settings.policy_discovery.URL_PATTERNS,
+    ):
+        self.min_text_chars = min_text_chars
+        self._markers = [re.compile(marker, re.IGNORECASE) for marker in markers]
+        self._policy_text = re.compile("|".join([r"\bcookies?\b", *policy_patterns]), re.IGNORECASE)
+        self._policy_urls = [re.compile(pattern, re.IGNORECASE) for pattern in policy_url_patterns]
+
+    def detect(self, url: str, html: str) -> Optional[str]:
+        """Return why the page needs the browser, or None when the HTTP response is good enough"""
+        if not html or not html.strip():
+            return "empty"
+
+        document = parse_html(html)
+        text = document.text(exclude_tags=_HIDDEN_TAGS)
+        if len(text) < self.min_text_chars:
+            if any(marker.search(html) for marker in self._markers):
+                return "framework_shell"
+            # Trang ngắn vẫn dùng được nếu có liên kết để tìm chính sách
+            if not document.anchors():
+                return "no_content"
+
+        if self.is_policy_url(url) and not self._policy_text.search(text):
+            return "missing_policy_keywords"
+        return None
+
+    def is_policy_url(self, url: str) -> bool:
+        path = urlparse(url).path
+        return bool(_POLICY_PATH.search(path)) or any(pattern.search(path) for pattern in self._policy_urls)
@@ -12,11 +12,11 @@ class LinkDiscovery:
         self.content_extractor = content_extractor
 
     async def discover_policy_link(self, root_url: str) -> Optional[str]:
-        """Discover policy link from main page DOM"""
+        """Discover policy link from main page DOM; raises when the main page cannot be loaded"""
         try:
             html_content = await self.content_extractor.extract_content(root_url)
             if not html_content:
-                return None
+                raise ValueError(f"No content extracted from {root_url}")
 
             policy_links = self.dom_parser.parse_policy_links_from_dom(html_content)
             if policy_links:
@@ -26,4 +26,4 @@ class LinkDiscovery:
             return None
         except Exception as e:
             logger.error(f"Error discovering policy link: {e}")
-            return None
+            raise
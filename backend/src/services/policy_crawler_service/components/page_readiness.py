@@ -0,0 +1,78 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+from playwright.async_api import Page
+
+from src.configs.settings import settings
+
+# Độ dài văn bản hiển thị và việc có chứa từ khoá chính sách hay không, trong một lần evaluate
+_TEXT_PROBE = """(source) => {
+    const text = document.body ? document.body.innerText || "" : "";
+    return [text.length, new RegExp(source, "i").test(text)];
+}"""
+
+
+class PageReadiness:
+    """
+    Decides when a policy page is ready to be read: as soon as the visible text
+    has stopped changing for a few polls and contains policy-like text (or is
+    long enough), bounded by `max_wait` seconds. Replaces networkidle + a fixed sleep.
+    """
+
+    def __init__(
+        self,
+        max_wait: float = settings.crawler.BROWSER_READINESS_MAX_WAIT_SECONDS,
+        poll_interval: float = settings.crawler.BROWSER_READINESS_POLL_SECONDS,
+        stable_polls: int = settings.crawler.BROWSER_READINESS_STABLE_POLLS,
+        min_text_chars: int = settings.crawler.BROWSER_READINESS_MIN_TEXT_CHARS,
+        policy_patterns: List[str] = settings.policy_discovery.COOKIE_POLICY_PATTERNS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.stable_polls = max(1, stable_polls)
+        self.min_text_chars = min_text_chars
+        self.policy_source = "|".join([r"\bcookies?\b", *policy_patterns])
+        self._clock = clock
+        self._outcomes = Counter()
+        self._waited_total = 0.0
+
+    async def wait(self, page: Page) -> str:
+        """Returns "policy_text", "stable" or "timeout" """
+        started = self._clock()
+        deadline = started + self.max_wait
+        last_length, unchanged = -1, 0
+        outcome = "timeout"
+        while True:
+            try:
+                length, has_policy_text = await page.evaluate(_TEXT_PROBE, self.policy_source)
+            except Exception:
+                # Trang đang điều hướng lại (redirect phía client): thử lại ở lần sau
+                length, has_policy_text = -1, False
+
+            unchanged = unchanged + 1 if length == last_length and length > 0 else 0
+            last_length = length
+            if unchanged >= self.stable_polls:
+                if has_policy_text:
+                    outcome = "policy_text"
+                    break
+                if length >= self.min_text_chars:
+                    outcome = "stable"
+                    break
+
+            if self._clock() + self.poll_interval > deadline:
+                break
+            await asyncio.sleep(self.poll_interval)
+
+        self._outcomes[outcome] += 1
+        self._waited_total += self._clock() - started
+        return outcome
+
+    def get_metrics(self) -> Dict[str, Any]:
+        pages = sum(self._outcomes.values())
+        return {
+            "outcomes": dict(self._outcomes),
+            "avg_wait_seconds": round(self._waited_total / pages, 3) if pages else 0.0,
+        }
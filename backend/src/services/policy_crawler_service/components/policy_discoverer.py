@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.configs.settings import settings
+from src.schemas.policy import DiscoveryMethod
+from src.services.policy_crawler_service.components.link_discovery import LinkDiscovery
+from src.services.policy_crawler_service.components.sitemap_discovery import SitemapDiscovery
+from src.services.policy_crawler_service.components.well_known_path_prober import WellKnownPathProber
+from src.services.policy_crawler_service.interfaces.search_provider_interface import ISearchProvider
+
+Strategy = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+
+
+class PolicyDiscoverer:
+    """
+    Runs the discovery strategies concurrently and scores candidates as they arrive:
+    landing-page DOM, well-known paths and sitemaps start immediately; search starts
+    after `search_delay` seconds or as soon as the cheap strategies have all finished
+    without a confident answer. The first candidate scoring at least
+    `confidence_threshold` wins and the remaining strategies are cancelled;
+    otherwise the best candidate seen is returned, along with whether any
+    strategy failed (so a miss caused by an outage is not taken as "no policy").
+    """
+
+    def __init__(
+        self,
+        link_discovery: LinkDiscovery,
+        search_provider: Optional[ISearchProvider] = None,
+        path_prober: Optional[WellKnownPathProber] = None,
+        sitemap_discovery: Optional[SitemapDiscovery] = None,
+        confidence_threshold: float = settings.policy_discovery.CONFIDENCE_THRESHOLD,
+        search_delay: float = settings.policy_discovery.SEARCH_DELAY_SECONDS,
+    ):
+        self.link_discovery = link_discovery
+        self.search_provider = search_provider
+        self.path_prober = path_prober
+        self.sitemap_discovery = sitemap_discovery
+        self.confidence_threshold = confidence_threshold
+        self.search_delay = search_delay
+
+    async def discover(self, root_url: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Best candidate as {'url', 'method', 'score'} (or None), and whether any strategy failed"""
+        started = time.monotonic()
+        cheap: Dict[str, Strategy] = {"dom": self._from_landing_page}
+        if self.path_prober is not None:
+            cheap["well_known_paths"] = self.path_prober.probe
+        if self.sitemap_discovery is not None:
+            cheap["sitemap"] = self.sitemap_discovery.discover
+
+        cheap_done = asyncio.Event()
+        tasks = {asyncio.create_task(strategy(root_url)): name for name, strategy in cheap.items()}
+        if self.search_provider is not None:
+            tasks[asyncio.create_task(self._from_search(root_url, cheap_done))] = "search"
+
+        best: Optional[Dict[str, Any]] = None
+        errored = False
+        try:
+            for finished in asyncio.as_completed(list(tasks)):
+                try:
+                    candidates = await finished
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Discovery strategy failed for {root_url}: {e}")
+                    errored = True
+                    candidates = []
+
+                for candidate in candidates:
+                    if best is None or candidate["score"] > best["score"]:
+                        best = candidate
+
+                if best is not None and best["score"] >= self.confidence_threshold:
+                    break
+                if all(task.done() for task, name in tasks.items() if name != "search"):
+                    cheap_done.set()
+        finally:
+            # Huỷ các chiến lược còn chạy khi đã có kết quả đủ tin cậy (hoặc khi bị huỷ từ bên ngoài)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if best is not None:
+            logger.info(
+                "policy_discovered", root_url=root_url, policy_url=best["url"], method=str(best["method"]),
+                score=round(best["score"], 2), elapsed=round(time.monotonic() - started, 3)
+            )
+        return best, errored
+
+    async def _from_landing_page(self, root_url: str) -> List[Dict[str, Any]]:
+        policy_url = await self.link_discovery.discover_policy_link(root_url)
+        if not policy_url:
+            return []
+        return [{"url": policy_url, "method": DiscoveryMethod.FOOTER_LINK, "score": settings.policy_discovery.DOM_LINK_SCORE}]
+
+    async def _from_search(self, root_url: str, cheap_done: asyncio.Event) -> List[Dict[str, Any]]:
+        try:
+            await asyncio.wait_for(cheap_done.wait(), timeout=self.search_delay)
+        except asyncio.TimeoutError:
+            pass
+        policy_url = await self.search_provider.search_policy(root_url)
+        if not policy_url:
+            return []
+        return [{"url": policy_url, "method": DiscoveryMethod.BING_SEARCH, "score": settings.policy_discovery.SEARCH_RESULT_SCORE}]
@@ -0,0 +1,66 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Page, Route
+
+from src.configs.settings import settings
+from src.utils.rule_engine import TrackerDomainIndex
+
+
+class ResourceBlocker:
+    """
+    Route interception for policy fetches: aborts sub-resources that never
+    contribute policy text (images, media, fonts, stylesheets) and requests to
+    known ad/analytics hosts, unless those hosts belong to the page's own site.
+    """
+
+    def __init__(
+        self,
+        resource_types: Iterable[str] = settings.crawler.BROWSER_BLOCK_RESOURCE_TYPES,
+        blocked_hosts: Iterable[str] = settings.crawler.BROWSER_BLOCKED_HOSTS,
+    ):
+        self.resource_types = frozenset(resource_types)
+        self.blocked_hosts = TrackerDomainIndex(blocked_hosts)
+        self._blocked = Counter()
+        self._allowed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.resource_types or self.blocked_hosts.trackers)
+
+    async def install(self, page: Page, page_url: str) -> None:
+        if not self.enabled:
+            return
+        site = _site_of(urlparse(page_url).hostname)
+
+        async def handle(route: Route) -> None:
+            reason = self.block_reason(route.request.resource_type, route.request.url, site)
+            if reason is None:
+                self._allowed += 1
+                await route.continue_()
+            else:
+                self._blocked[reason] += 1
+                await route.abort()
+
+        await page.route("**/*", handle)
+
+    def block_reason(self, resource_type: str, url: str, site: Optional[str] = None) -> Optional[str]:
+        # Không bao giờ chặn tài liệu chính (document) của trang
+        if resource_type == "document":
+            return None
+        if resource_type in self.resource_types:
+            return resource_type
+        host = urlparse(url).hostname or ""
+        if self.blocked_hosts.matches(host) and _site_of(host) != site:
+            return "tracker"
+        return None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"allowed": self._allowed, "blocked": dict(self._blocked), "blocked_total": sum(self._blocked.values())}
+
+
+def _site_of(host: Optional[str]) -> str:
+    # Xấp xỉ tên miền đăng ký bằng hai nhãn cuối (đủ để không chặn tracker "của chính site")
+    labels = (host or "").lower().strip(".").split(".")
+    return ".".join(labels[-2:])
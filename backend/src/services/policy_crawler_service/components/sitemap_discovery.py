@@ -0,0 +1,59 @@
+import re
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from src.configs.settings import settings
+from src.schemas.policy import DiscoveryMethod
+from src.services.policy_crawler_service.content_extractors.http_content_extractor import HttpContentExtractor
+from src.utils.dom_parser_utils import DOMParserService
+
+_ROBOTS_SITEMAP = re.compile(r"^\s*sitemap:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_LOC = re.compile(r"<loc>\s*(.*?)\s*</loc>", re.IGNORECASE | re.DOTALL)
+_SITEMAP_TYPES = ("xml", "text/plain")
+
+
+class SitemapDiscovery:
+    """Responsible only for finding policy URLs listed in robots.txt-referenced sitemaps and /sitemap.xml"""
+
+    def __init__(
+        self,
+        http_extractor: HttpContentExtractor,
+        dom_parser: DOMParserService,
+        max_fetches: int = settings.policy_discovery.SITEMAP_MAX_FETCHES,
+        url_patterns: List[str] = settings.policy_discovery.URL_PATTERNS,
+    ):
+        self.http_extractor = http_extractor
+        self.dom_parser = dom_parser
+        self.max_fetches = max(1, max_fetches)
+        self._policy_url = re.compile("|".join(url_patterns), re.IGNORECASE)
+
+    async def discover(self, root_url: str) -> List[Dict]:
+        """Policy-like URLs of the site found in its sitemaps, scored with the DOM link ranking"""
+        root_url = root_url.rstrip("/")
+        host = urlparse(root_url).netloc
+        _, robots = await self.http_extractor.fetch(f"{root_url}/robots.txt", ("text/plain",))
+        pending = _ROBOTS_SITEMAP.findall(robots) or [f"{root_url}/sitemap.xml"]
+        seen, candidates, fetches = set(), {}, 0
+
+        while pending and fetches < self.max_fetches:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen or sitemap_url.endswith(".gz"):
+                continue
+            seen.add(sitemap_url)
+            fetches += 1
+            _, xml = await self.http_extractor.fetch(sitemap_url, _SITEMAP_TYPES)
+            locations = _LOC.findall(xml)
+            if "<sitemapindex" in xml.lower():
+                # Ưu tiên sitemap con có tên gợi ý trang pháp lý/tĩnh
+                pending.extend(sorted(locations, key=lambda loc: not re.search(r"page|legal|static|misc", loc, re.IGNORECASE)))
+                continue
+            for location in locations:
+                if urlparse(location).netloc == host and self._policy_url.search(urlparse(location).path):
+                    candidates.setdefault(location, {"url": location, "method": DiscoveryMethod.SITEMAP, "score": 0.6})
+
+        if candidates:
+            logger.info(f"Sitemap lists {len(candidates)} policy-like URL(s) for {root_url}")
+        ranked = [self.dom_parser.rank_policy_links([link], root_url) for link in candidates.values()]
+        return sorted(ranked, key=lambda link: link["score"], reverse=True)
@@ -0,0 +1,60 @@
+import asyncio
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from src.configs.settings import settings
+from src.schemas.policy import DiscoveryMethod
+from src.services.policy_crawler_service.content_extractors.http_content_extractor import HttpContentExtractor
+from src.utils.html_document import parse_html
+
+_COOKIE_WORD = re.compile(r"\bcookies?\b", re.IGNORECASE)
+
+
+class WellKnownPathProber:
+    """Responsible only for probing common policy paths (/cookie-policy, /cookies, ...) over plain HTTP"""
+
+    def __init__(
+        self,
+        http_extractor: HttpContentExtractor,
+        paths: List[str] = settings.policy_discovery.WELL_KNOWN_PATHS,
+        min_keyword_hits: int = settings.policy_discovery.PROBE_MIN_KEYWORD_HITS,
+        policy_patterns: List[str] = settings.policy_discovery.COOKIE_POLICY_PATTERNS,
+    ):
+        self.http_extractor = http_extractor
+        self.paths = paths
+        self.min_keyword_hits = min_keyword_hits
+        self._policy_text = re.compile("|".join(policy_patterns), re.IGNORECASE)
+
+    async def probe(self, root_url: str) -> List[Dict]:
+        """All probed paths that serve a policy page, in the configured order"""
+        results = await asyncio.gather(*[self._probe_path(root_url, path) for path in self.paths])
+        return [result for result in results if result]
+
+    async def _probe_path(self, root_url: str, path: str) -> Optional[Dict]:
+        final_url, html = await self.http_extractor.fetch(root_url.rstrip("/") + path)
+        if not html:
+            return None
+        # Chuyển hướng về trang chủ (soft 404) hoặc sang site khác thì bỏ qua; example.com -> www.example.com vẫn là cùng site
+        final = urlparse(final_url)
+        if final.path in ("", "/") or _bare_host(final.hostname) != _bare_host(urlparse(root_url).hostname):
+            return None
+        if not self.looks_like_policy(html):
+            return None
+        logger.info(f"Well-known path {final_url} serves a cookie policy")
+        return {
+            "url": final_url,
+            "method": DiscoveryMethod.WELL_KNOWN_PATH,
+            "score": settings.policy_discovery.WELL_KNOWN_PATH_SCORE,
+        }
+
+    def looks_like_policy(self, html: str) -> bool:
+        text = parse_html(html).text(exclude_tags=("script", "style", "noscript"))
+        return bool(self._policy_text.search(text)) and len(_COOKIE_WORD.findall(text)) >= self.min_keyword_hits
+
+
+def _bare_host(host: Optional[str]) -> str:
+    host = (host or "").lower()
+    return host[4:] if host.startswith("www.") else host
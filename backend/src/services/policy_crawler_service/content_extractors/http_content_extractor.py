@@ -0,0 +1,100 @@
+import asyncio
+from typing import Optional, Tuple
+
+import aiohttp
+from loguru import logger
+
+from src.configs.settings import settings
+from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
+
+try:
+    import brotli  # noqa: F401 - aiohttp giải nén "br" khi có brotli
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+
+class HttpContentExtractor(IContentExtractor):
+    """
+    Plain async HTTP fetcher sharing one keep-alive aiohttp session
+    (DNS cache, per-host connection limit, compressed responses).
+    Returns "" for errors, non-2xx statuses and non-HTML responses.
+    """
+
+    def __init__(
+        self,
+        timeout: int = settings.crawler.HTTP_FETCH_TIMEOUT_SECONDS,
+        max_connections: int = settings.crawler.HTTP_FETCH_MAX_CONNECTIONS,
+        max_connections_per_host: int = settings.crawler.HTTP_FETCH_MAX_CONNECTIONS_PER_HOST,
+        dns_cache_seconds: int = settings.crawler.HTTP_FETCH_DNS_CACHE_SECONDS,
+        keepalive_seconds: int = settings.crawler.HTTP_FETCH_KEEPALIVE_SECONDS,
+        max_bytes: int = settings.crawler.HTTP_FETCH_MAX_BYTES,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.dns_cache_seconds = dns_cache_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.max_bytes = max_bytes
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self) -> None:
+        self._get_session()
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host,
+                    ttl_dns_cache=self.dns_cache_seconds,
+                    keepalive_timeout=self.keepalive_seconds,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "User-Agent": settings.crawler.USER_AGENT,
+                    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": settings.crawler.BROWSER_EXTRA_HTTP_HEADERS.get("Accept-Language", "en-US,en;q=0.9"),
+                    "Accept-Encoding": _ACCEPT_ENCODING,
+                },
+            )
+        return self._session
+
+    async def _read_limited(self, response: aiohttp.ClientResponse) -> bytes:
+        # Trang quá lớn bị cắt ở max_bytes thay vì đọc hết vào bộ nhớ
+        chunks, size = [], 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                break
+        return b"".join(chunks)[:self.max_bytes]
+
+    async def extract_content(self, url: str) -> str:
+        _, text = await self.fetch(url)
+        return text
+
+    async def fetch(self, url: str, content_types: Tuple[str, ...] = ("html",)) -> Tuple[str, str]:
+        """
+        GET `url` and return (final URL after redirects, decoded body).
+        The body is "" on errors, non-2xx statuses and content types not containing one of `content_types`.
+        """
+        try:
+            async with self._get_session().get(url, allow_redirects=True) as response:
+                final_url = str(response.url)
+                if response.status >= 400:
+                    logger.info(f"HTTP fetch of {url} returned {response.status}")
+                    return final_url, ""
+                content_type = response.headers.get("Content-Type", "").lower()
+                if content_type and not any(kind in content_type for kind in content_types):
+                    return final_url, ""
+                body = await self._read_limited(response)
+                return final_url, body.decode(response.charset or "utf-8", errors="replace")
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeError, LookupError) as e:
+            logger.info(f"HTTP fetch of {url} failed: {e}")
+            return url, ""
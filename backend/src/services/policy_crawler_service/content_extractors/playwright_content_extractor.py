@@ -1,35 +1,53 @@
-import asyncio
+from typing import Any, Dict, Optional
+
 from loguru import logger
 from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
+from src.services.policy_crawler_service.components.browser_pool import BrowserPool
+from src.services.policy_crawler_service.components.page_readiness import PageReadiness
+from src.services.policy_crawler_service.components.resource_blocker import ResourceBlocker
 
 class PlaywrightContentExtractor(IContentExtractor):
-    """Playwright-based content extraction"""
+    """
+    Playwright-based content extraction using contexts leased from the shared browser pool.
+    Non-document resources and tracker hosts are aborted, and the page is read as soon as it is ready.
+    """
 
-    def __init__(self, browser_context, timeout: int):
-        self.context = browser_context
+    def __init__(self, browser_pool: BrowserPool, timeout: int,
+                 resource_blocker: Optional[ResourceBlocker] = None,
+                 readiness: Optional[PageReadiness] = None):
+        self.browser_pool = browser_pool
         self.timeout = timeout
+        self.resource_blocker = resource_blocker or ResourceBlocker()
+        self.readiness = readiness or PageReadiness()
 
     async def extract_content(self, url: str) -> str:
-        page = await self.context.new_page()
-        try:
+        async with self.browser_pool.lease() as context:
+            page = await context.new_page()
             try:
-                await page.goto(url, wait_until="networkidle", timeout=self.timeout * 1000)
-                await asyncio.sleep(2)
-            except Exception as timeout_error:
-                logger.warning(f"Timeout hoặc lỗi khi load trang {url}: {timeout_error}")
+                try:
+                    await self.resource_blocker.install(page, url)
+                    await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout * 1000)
+                    outcome = await self.readiness.wait(page)
+                    if outcome == "timeout":
+                        logger.info(f"Trang {url} chưa ổn định sau {self.readiness.max_wait}s, đọc nội dung hiện có")
+                except Exception as timeout_error:
+                    logger.warning(f"Timeout hoặc lỗi khi load trang {url}: {timeout_error}")
 
-            content = await page.content()
+                content = await page.content()
 
-            if not content or len(content.strip()) < 100:
-                logger.warning(f"Nội dung trang {url} không đầy đủ (độ dài: {len(content)})")
+                if not content or len(content.strip()) < 100:
+                    logger.warning(f"Nội dung trang {url} không đầy đủ (độ dài: {len(content)})")
 
-            return content
+                return content
 
-        except Exception as e:
-            logger.error(f"Error extracting content with Playwright {url}: {e}")
-            try:
-                return await page.content()
-            except:
-                return ""
-        finally:
-            await page.close()
+            except Exception as e:
+                logger.error(f"Error extracting content with Playwright {url}: {e}")
+                try:
+                    return await page.content()
+                except:
+                    return ""
+            finally:
+                await page.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"requests": self.resource_blocker.get_metrics(), "readiness": self.readiness.get_metrics()}
@@ -1,3 +1,4 @@
+import asyncio
 import requests
 from loguru import logger
 from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
@@ -7,7 +8,8 @@ class RequestsContentExtractor(IContentExtractor):
 
     async def extract_content(self, url: str) -> str:
         try:
-            response = requests.get(url, timeout=10)
+            # requests là blocking: chạy trong thread để không chặn event loop
+            response = await asyncio.to_thread(requests.get, url, timeout=10)
             response.raise_for_status()  # Raise an exception for HTTP errors
             return response.text
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,53 @@
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from src.services.policy_crawler_service.components.js_shell_detector import JsShellDetector
+from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
+
+
+class TieredContentExtractor(IContentExtractor):
+    """
+    Fetches a page over plain HTTP first and escalates to the browser only when
+    the response is missing or looks like a JavaScript shell.
+    Records how many pages each tier served and why pages were escalated.
+    """
+
+    HTTP_TIER = "http"
+    BROWSER_TIER = "browser"
+
+    def __init__(
+        self,
+        http_extractor: IContentExtractor,
+        browser_extractor: IContentExtractor,
+        detector: Optional[JsShellDetector] = None,
+    ):
+        self.http_extractor = http_extractor
+        self.browser_extractor = browser_extractor
+        self.detector = detector or JsShellDetector()
+        self._hits = Counter({self.HTTP_TIER: 0, self.BROWSER_TIER: 0})
+        self._escalations = Counter()
+
+    async def extract_content(self, url: str) -> str:
+        html = await self.http_extractor.extract_content(url)
+        reason = self.detector.detect(url, html) if html else "http_failed"
+        if reason is None:
+            self._hits[self.HTTP_TIER] += 1
+            return html
+
+        self._escalations[reason] += 1
+        logger.info("fetch_escalated_to_browser", url=url, reason=reason)
+        browser_html = await self.browser_extractor.extract_content(url)
+        self._hits[self.BROWSER_TIER] += 1
+        # Trình duyệt thất bại: vẫn dùng bản HTTP nếu có
+        return browser_html or html
+
+    def get_metrics(self) -> Dict[str, Any]:
+        total = sum(self._hits.values())
+        return {
+            "requests": total,
+            "hits": dict(self._hits),
+            "hit_rates": {tier: round(count / total, 4) if total else 0.0 for tier, count in self._hits.items()},
+            "escalations": dict(self._escalations),
+        }
@@ -1,19 +1,29 @@
 from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 from src.repositories.policy_content_repository import PolicyContentRepository
 # from src.services.policy_crawler_service.content_extractors import scrapy_content_extractor # Updated path
 from src.services.policy_crawler_service.content_extractors.playwright_content_extractor import PlaywrightContentExtractor
+from src.services.policy_crawler_service.components.browser_pool import BrowserPool
 from src.services.policy_crawler_service.components.content_processor import ContentProcessor
 from src.services.policy_crawler_service.components.link_discovery import LinkDiscovery
+from src.services.policy_crawler_service.components.policy_discoverer import PolicyDiscoverer
+from src.services.policy_crawler_service.components.sitemap_discovery import SitemapDiscovery
+from src.services.policy_crawler_service.components.well_known_path_prober import WellKnownPathProber
+from src.services.policy_crawler_service.content_extractors.http_content_extractor import HttpContentExtractor
 from src.repositories.policy_storage_repository import PolicyStorageService
+from src.repositories.policy_miss_repository import PolicyMissRepository
+from src.configs.settings import settings
 from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
 from src.services.policy_crawler_service.interfaces.search_provider_interface import ISearchProvider
 from src.services.policy_crawler_service.policy_crawler_service import PolicyCrawlerService
+from src.services.policy_translation_service.policy_translation_service import PolicyTranslationService
 from src.services.policy_crawler_service.search_providers.bing_search import BingSearch
 from src.utils.dom_parser_utils import DOMParserService
 from src.utils.table_extractor import TableExtractor
 from src.utils.text_processing import TextProcessor
 from src.utils.translation_utils import TranslationManager
+from src.utils.concurrency_utils import StageLimiter
 
 
 class CrawlerFactory:
@@ -22,23 +32,37 @@ class CrawlerFactory:
     @staticmethod
     def create_playwright_bing_extractor(
         policy_content_repo: PolicyContentRepository,
-        browser_context,
-        timeout: int = 30
+        browser_pool: BrowserPool,
+        timeout: int = 30,
+        stage_limiter: Optional[StageLimiter] = None,
+        translation_manager: Optional[TranslationManager] = None,
+        translation_service: Optional[PolicyTranslationService] = None,
+        content_extractor: Optional[IContentExtractor] = None,
+        http_extractor: Optional[HttpContentExtractor] = None
     ) -> PolicyCrawlerService:
-        """Create extractor using Playwright + Bing"""
+        """
+        Create extractor using Playwright + Bing, leasing browser contexts from the shared pool.
+        A shared content_extractor (e.g. the tiered HTTP -> browser fetcher) replaces the plain Playwright one;
+        with an http_extractor, discovery also probes well-known paths and sitemaps.
+        """
 
-        content_extractor = PlaywrightContentExtractor(browser_context, timeout)
-        search_provider = BingSearch(browser_context)
+        content_extractor = content_extractor or PlaywrightContentExtractor(browser_pool, timeout)
+        search_provider = BingSearch(browser_pool)
 
         return CrawlerFactory._create_extractor(
-            policy_content_repo, content_extractor, search_provider
+            policy_content_repo, content_extractor, search_provider, stage_limiter,
+            translation_manager, translation_service, http_extractor
         )
 
     @staticmethod
     def _create_extractor(
         policy_content_repo: PolicyContentRepository,
         content_extractor: IContentExtractor,
-        search_provider: ISearchProvider
+        search_provider: ISearchProvider,
+        stage_limiter: Optional[StageLimiter] = None,
+        translation_manager: Optional[TranslationManager] = None,
+        translation_service: Optional[PolicyTranslationService] = None,
+        http_extractor: Optional[HttpContentExtractor] = None
     ) -> PolicyCrawlerService:
         """Internal method to create extractor with given components"""
 
@@ -46,11 +70,18 @@ class CrawlerFactory:
 
         dom_parser = DOMParserService()
         text_processor = TextProcessor(executor)
-        translation_manager = TranslationManager(executor)
+        # Dùng TranslationManager dùng chung của tiến trình nếu có (cache và giới hạn tốc độ chung)
+        translation_manager = translation_manager or TranslationManager()
         table_extractor = TableExtractor()
 
         # Create specialized components
         discovery_service = LinkDiscovery(dom_parser, content_extractor)
+        policy_discoverer = PolicyDiscoverer(
+            discovery_service,
+            search_provider,
+            path_prober=WellKnownPathProber(http_extractor) if http_extractor else None,
+            sitemap_discovery=SitemapDiscovery(http_extractor, dom_parser) if http_extractor else None,
+        )
         content_processor = ContentProcessor(text_processor, translation_manager, table_extractor)
         storage_repository = PolicyStorageService(policy_content_repo)
 
@@ -59,5 +90,9 @@ class CrawlerFactory:
             content_extractor=content_extractor,
             search_provider=search_provider,
             content_processor=content_processor,
-            storage_repository=storage_repository
+            storage_repository=storage_repository,
+            stage_limiter=stage_limiter,
+            translation_service=translation_service,
+            policy_discoverer=policy_discoverer,
+            miss_repository=PolicyMissRepository() if settings.policy_discovery.NEGATIVE_CACHE_ENABLED else None
         )
@@ -7,10 +7,15 @@ from src.schemas.policy import PolicyContent
 from src.utils.url_utils import normalize_url, get_base_url
 from src.repositories.policy_content_repository import PolicyContentRepository
 from src.repositories.policy_storage_repository import PolicyStorageService
+from src.repositories.policy_miss_repository import PolicyMissRepository
 from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
 from src.services.policy_crawler_service.interfaces.search_provider_interface import ISearchProvider
 from src.services.policy_crawler_service.components.link_discovery import LinkDiscovery
+from src.services.policy_crawler_service.components.policy_discoverer import PolicyDiscoverer
 from src.services.policy_crawler_service.components.content_processor import ContentProcessor
+from src.services.policy_translation_service.policy_translation_service import PolicyTranslationService
+from src.configs.settings import settings
+from src.utils.concurrency_utils import StageLimiter, limit_stage
 
 
 class PolicyCrawlerService:
@@ -24,17 +29,30 @@ class PolicyCrawlerService:
                  content_extractor: IContentExtractor,
                  search_provider: ISearchProvider,
                  content_processor: ContentProcessor,
-                 storage_repository: PolicyStorageService):
+                 storage_repository: PolicyStorageService,
+                 stage_limiter: Optional[StageLimiter] = None,
+                 translation_service: Optional[PolicyTranslationService] = None,
+                 policy_discoverer: Optional[PolicyDiscoverer] = None,
+                 miss_repository: Optional[PolicyMissRepository] = None):
         self.discovery_service = discovery_service
         self.content_extractor = content_extractor
         self.search_provider = search_provider
         self.content_processor = content_processor
         self.storage_repository = storage_repository
+        self.stage_limiter = stage_limiter
+        self.translation_service = translation_service
+        self.policy_discoverer = policy_discoverer or PolicyDiscoverer(discovery_service, search_provider)
+        self.miss_repository = miss_repository
+
+    @property
+    def _defer_translation(self) -> bool:
+        return settings.crawler.TRANSLATION_DEFERRED and self.translation_service is not None
 
     async def extract_policy(self, web_url: str, force_refresh: bool = False) -> Optional[PolicyContent]:
         """
         Finds and extracts cookie policy content for a given URL.
-        Follows the sequence diagram: DB check -> DOM parsing -> Search.
+        Follows the sequence diagram: DB check -> discovery (DOM, well-known paths, sitemap, search) -> extraction.
+        Sites recently found to have no policy are answered from the negative cache until their backoff expires.
         """
         web_url = normalize_url(web_url)
         root_url = get_base_url(web_url)
@@ -46,22 +64,29 @@ class PolicyCrawlerService:
                 logger.info(f"Policy for {web_url} found in DB. Returning existing policy object.")
                 return existing_policy
 
+            if self.miss_repository is not None:
+                miss = await self.miss_repository.get_active_miss(root_url)
+                if miss:
+                    logger.info(f"No policy for {root_url} ({miss['reason']}, {miss['miss_count']} miss(es)); retry after {miss['retry_at']}.")
+                    return None
+
         logger.info(f"Policy for {web_url} not found in DB or force refresh. Starting extraction process.")
 
         policy_url = None
 
-        # 2. Find policy link on main page
-        policy_url = await self.discovery_service.discover_policy_link(root_url)
-        if policy_url:
-            logger.info(f"Found policy link on main page: {policy_url}")
-        else:
-            # 3. Fallback to search if no link found on main page
-            logger.info(f"No policy link found on main page. Falling back to search for {root_url}.")
-            policy_url = await self.search_provider.search_policy(root_url)
-            if policy_url:
-                logger.info(f"Found policy via search: {policy_url}")
+        async with limit_stage(self.stage_limiter, "discovery"):
+            # 2-3. Landing-page DOM, well-known paths, sitemaps and search run concurrently
+            candidate, errored = await self.policy_discoverer.discover(root_url)
+            if candidate:
+                policy_url = candidate["url"]
+                logger.info(f"Found policy link via {candidate['method']}: {policy_url}")
+            elif errored:
+                # Chiến lược lỗi (site hoặc công cụ tìm kiếm không truy cập được): không coi là "không có chính sách"
+                logger.warning(f"No policy found for {root_url} and some discovery strategies failed; not caching the miss.")
+                return None
             else:
-                logger.warning(f"No policy found via search for {root_url}.")
+                logger.warning(f"No policy found for {root_url}.")
+                await self._record_miss(root_url, "no_policy_found")
                 return None
 
         if not policy_url:
@@ -70,23 +95,30 @@ class PolicyCrawlerService:
 
         # 4. Extract and process content from the discovered policy URL
         try:
-            html_content = await self.content_extractor.extract_content(policy_url)
-            if not html_content:
-                raise ValueError(f"No content extracted from {policy_url}")
+            async with limit_stage(self.stage_limiter, "extraction"):
+                html_content = await self.content_extractor.extract_content(policy_url)
+                if not html_content:
+                    raise ValueError(f"No content extracted from {policy_url}")
 
-            policy_content_obj = await self.content_processor.process_content(
-                website_url=root_url,
-                policy_url=policy_url,
-                html_content=html_content,
-                translate_to_english=True,
-            )
+                policy_content_obj = await self.content_processor.process_content(
+                    website_url=root_url,
+                    policy_url=policy_url,
+                    html_content=html_content,
+                    # Bản dịch không nằm trên đường phân tích: để PolicyTranslationService tạo sau
+                    translate_to_english=not self._defer_translation,
+                )
 
             if policy_content_obj and policy_content_obj.original_content:
                 await self.storage_repository.save_policy(root_url, policy_content_obj)
                 logger.info(f"Policy content for {web_url} saved to database.")
+                if self.miss_repository is not None:
+                    await self.miss_repository.clear_miss(root_url)
+                if self._defer_translation and PolicyTranslationService.needs_translation(policy_content_obj.detected_language):
+                    self.translation_service.schedule(root_url)
                 return policy_content_obj
             else:
                 logger.error(f"Failed to extract or process content from policy URL: {policy_url}")
+                await self._record_miss(root_url, "empty_policy_content")
                 return None
         except Exception as e:
             logger.error(f"Error during content extraction for {policy_url}: {e}")
@@ -100,3 +132,16 @@ class PolicyCrawlerService:
                 translated_table_content=None,
                 error=str(e)
             )
+
+    async def _record_miss(self, root_url: str, reason: str) -> None:
+        if self.miss_repository is None:
+            return
+        try:
+            miss = await self.miss_repository.record_miss(
+                root_url, reason,
+                settings.policy_discovery.NEGATIVE_CACHE_BASE_TTL_SECONDS,
+                settings.policy_discovery.NEGATIVE_CACHE_MAX_TTL_SECONDS
+            )
+            logger.info(f"Negative-cached {root_url} ({reason}) for {miss['ttl_seconds']} s after {miss['miss_count']} miss(es).")
+        except Exception as e:
+            logger.error(f"Could not record policy miss for {root_url}: {e}")
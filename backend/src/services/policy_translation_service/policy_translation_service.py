@@ -0,0 +1,165 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from loguru import logger
+
+from src.configs.settings import settings
+from src.repositories.policy_content_repository import PolicyContentRepository
+from src.repositories.website_repository import WebsiteRepository
+from src.utils.concurrency_utils import SingleFlight
+from src.utils.translation_utils import TranslationManager
+
+
+class PolicyTranslationService:
+    """
+    Materialises `translated_content` / `translated_table_content` of a policy
+    off the analysis path.
+
+    Nothing in the analysis reads the translation, so the crawler stores the
+    original content only and schedules the website here. A low-priority
+    background worker translates scheduled websites one at a time, and
+    `materialize` translates immediately when the dashboard or an API consumer
+    asks for the translation. Both paths are coalesced per website and write
+    the result to the translated policy content record and every website
+    document of the domain that still holds that policy.
+    """
+
+    def __init__(
+        self,
+        translation_manager: TranslationManager,
+        policy_content_repository: PolicyContentRepository,
+        website_repository: WebsiteRepository,
+        workers: int = settings.crawler.TRANSLATION_BACKGROUND_WORKERS,
+        max_queue_size: int = settings.crawler.TRANSLATION_QUEUE_MAX_SIZE,
+    ):
+        self.translation_manager = translation_manager
+        self.policy_content_repository = policy_content_repository
+        self.website_repository = website_repository
+        self.workers = max(0, workers)
+        self.max_queue_size = max(1, max_queue_size)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._single_flight = SingleFlight()
+        self._metrics = {
+            "scheduled": 0,
+            "dropped": 0,
+            "on_demand": 0,
+            "background": 0,
+            "translated": 0,
+            "already_translated": 0,
+            "not_needed": 0,
+            "failed": 0,
+        }
+
+    @staticmethod
+    def needs_translation(detected_language: Optional[str]) -> bool:
+        return bool(detected_language) and detected_language != "en"
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [asyncio.create_task(self._worker_loop()) for _ in range(self.workers)]
+        logger.info(f"Policy translation service started with {self.workers} background worker(s)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+
+    def schedule(self, website_url: str) -> bool:
+        """Queue a website for background translation; returns False when it was not queued"""
+        if self._queue is None or website_url in self._pending:
+            return False
+        try:
+            self._queue.put_nowait(website_url)
+        except asyncio.QueueFull:
+            # Bản dịch vẫn được tạo khi có người yêu cầu (materialize)
+            self._metrics["dropped"] += 1
+            return False
+        self._pending.add(website_url)
+        self._metrics["scheduled"] += 1
+        return True
+
+    async def materialize(self, website_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the translation of the latest policy of `website_url`, translating it now if needed.
+        Returns None when no policy content is stored for the website.
+        """
+        self._metrics["on_demand"] += 1
+        return await self._single_flight.do(website_url, lambda: self._materialize(website_url))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self._metrics,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._tasks),
+            "coalesced": self._single_flight.coalesced,
+        }
+
+    async def _worker_loop(self) -> None:
+        while True:
+            website_url = await self._queue.get()
+            try:
+                self._metrics["background"] += 1
+                await self._single_flight.do(website_url, lambda: self._materialize(website_url))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background translation failed for {website_url}: {e}")
+            finally:
+                self._pending.discard(website_url)
+                self._queue.task_done()
+
+    async def _materialize(self, website_url: str) -> Optional[Dict[str, Any]]:
+        policy = await self.policy_content_repository.get_latest_by_website_url(website_url)
+        if policy is None:
+            return None
+
+        result = {
+            "website_url": website_url,
+            "detected_language": policy.detected_language,
+            "translated_content": policy.translated_content,
+            "translated_table_content": policy.translated_table_content,
+        }
+        if not self.needs_translation(policy.detected_language):
+            self._metrics["not_needed"] += 1
+            return result
+
+        if policy.translated_content is not None:
+            self._metrics["already_translated"] += 1
+        else:
+            try:
+                result["translated_content"], result["translated_table_content"] = await self._translate(policy)
+            except Exception as e:
+                self._metrics["failed"] += 1
+                logger.warning("policy_translation_failed", website_url=website_url, error=str(e))
+                return result
+            # Ghi theo _id: policy mới được lưu trong lúc dịch không nhận bản dịch của policy cũ
+            await self.policy_content_repository.set_translation(
+                policy.id, result["translated_content"], result["translated_table_content"]
+            )
+            self._metrics["translated"] += 1
+            logger.info("policy_translation_materialized", website_url=website_url)
+
+        # Website có thể được tạo sau khi policy đã được dịch: luôn đồng bộ các bản còn thiếu,
+        # trừ website đã được làm mới sang nội dung khác trong lúc dịch
+        await self.website_repository.set_translation_by_domain(
+            website_url, policy.original_content, result["translated_content"], result["translated_table_content"]
+        )
+        return result
+
+    async def _translate(self, policy) -> tuple:
+        # strict: a failed translation raises instead of returning the original text, so it is never stored
+        translate = self.translation_manager.translate_content_to_english
+        tasks = [translate(policy.original_content, strict=True)]
+        if policy.table_content:
+            tasks.append(translate(json.dumps(policy.table_content, ensure_ascii=False, indent=2), strict=True))
+        translated = await asyncio.gather(*tasks)
+        return translated[0], translated[1] if len(translated) > 1 else None
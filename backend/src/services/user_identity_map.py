@@ -0,0 +1,36 @@
+from typing import Any, Dict, Iterable, Optional
+
+from src.repositories.user_repository import UserRepository
+
+
+class UserIdentityMap:
+    """
+    Request-scoped cache of user documents by ID.
+
+    Users asked for together are loaded with a single $in query, and a user already
+    loaded (or known not to exist) is never read twice within the request. Share one
+    instance per request through `get_user_identity_map`.
+    """
+
+    def __init__(self, user_repo: UserRepository):
+        self.user_repo = user_repo
+        self._users: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.queries = 0
+
+    async def get_many(self, user_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+        """Users found among `user_ids` (falsy IDs are ignored), keyed by string ID"""
+        wanted = {str(user_id) for user_id in user_ids if user_id}
+        missing = [user_id for user_id in wanted if user_id not in self._users]
+        if missing:
+            self.queries += 1
+            found = await self.user_repo.get_users_by_ids(missing)
+            for user_id in missing:
+                self._users[user_id] = found.get(user_id)
+        return {user_id: self._users[user_id] for user_id in wanted if self._users[user_id] is not None}
+
+    async def get(self, user_id: Any) -> Optional[Dict[str, Any]]:
+        return (await self.get_many([user_id])).get(str(user_id))
+
+    def forget(self, user_id: Any) -> None:
+        """Drop a user updated during the request so the next read sees the change"""
+        self._users.pop(str(user_id), None)
@@ -0,0 +1,125 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from loguru import logger
+
+from src.configs.settings import settings
+from src.models.website import WebsiteAnalysisView
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+BACKOFF = "backoff"
+
+# Nhãn nhóm tuổi dữ liệu được phục vụ, theo giây
+_AGE_BUCKETS = ((3600, "<1h"), (24 * 3600, "<1d"), (7 * 24 * 3600, "<7d"), (30 * 24 * 3600, "<30d"))
+
+
+class PolicyCacheFreshness:
+    """
+    Stale-while-revalidate policy for stored website analyses.
+
+    A website younger than the soft TTL (by `last_checked_at`) is fresh. Between
+    the soft and hard TTL it is served as is while a background refresh runs.
+    Past the hard TTL it is refreshed before answering. A TTL of 0 never expires,
+    and the website document may override both TTLs. After a failed refresh the
+    stored data is served without refreshing until `refresh_retry_at` (backoff),
+    then the site is revalidated whatever its age.
+    """
+
+    def __init__(
+        self,
+        soft_ttl_seconds: int = settings.internal_api.POLICY_CACHE_SOFT_TTL_SECONDS,
+        hard_ttl_seconds: int = settings.internal_api.POLICY_CACHE_HARD_TTL_SECONDS,
+        retry_base_seconds: int = settings.internal_api.POLICY_REFRESH_RETRY_BASE_SECONDS,
+        retry_max_seconds: int = settings.internal_api.POLICY_REFRESH_RETRY_MAX_SECONDS,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.soft_ttl_seconds = soft_ttl_seconds
+        self.hard_ttl_seconds = hard_ttl_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._clock = clock
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.served = {FRESH: 0, STALE: 0, EXPIRED: 0, BACKOFF: 0}
+        self.served_age_buckets = {label: 0 for _, label in _AGE_BUCKETS}
+        self.served_age_buckets[">=30d"] = 0
+        self.max_age_served = 0.0
+        self.refreshes = {"started": 0, "succeeded": 0, "failed": 0, "skipped_in_flight": 0}
+
+    def age_seconds(self, website: WebsiteAnalysisView) -> float:
+        return max(0.0, (self._clock() - _naive_utc(website.last_checked_at)).total_seconds())
+
+    def classify(self, website: WebsiteAnalysisView) -> Tuple[str, float]:
+        """(fresh | stale | expired | backoff, age in seconds) of a stored website, recorded in the metrics"""
+        age = self.age_seconds(website)
+        soft = website.cache_soft_ttl_seconds if website.cache_soft_ttl_seconds is not None else self.soft_ttl_seconds
+        hard = website.cache_hard_ttl_seconds if website.cache_hard_ttl_seconds is not None else self.hard_ttl_seconds
+
+        if hard and age >= hard:
+            state = EXPIRED
+        elif soft and age >= soft:
+            state = STALE
+        else:
+            state = FRESH
+        if state == FRESH and website.refresh_failures:
+            # Lần kiểm tra gần nhất thất bại (vd. chưa trích xuất được cookie): làm lại khi hết thời gian chờ
+            state = STALE
+        if state != FRESH and website.refresh_retry_at is not None and self._clock() < _naive_utc(website.refresh_retry_at):
+            state = BACKOFF
+
+        self.served[state] += 1
+        self.served_age_buckets[next((label for limit, label in _AGE_BUCKETS if age < limit), ">=30d")] += 1
+        self.max_age_served = max(self.max_age_served, age)
+        return state, age
+
+    def refresh_retry_at(self, failures: int) -> datetime:
+        """When to revalidate again after `failures` consecutive failed refreshes (exponential backoff)"""
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (max(1, failures) - 1))
+        return self._clock() + timedelta(seconds=delay)
+
+    def schedule_refresh(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """Start a background refresh unless one is already running for the key"""
+        if key in self._refreshing:
+            self.refreshes["skipped_in_flight"] += 1
+            return False
+        self.refreshes["started"] += 1
+        self._refreshing[key] = asyncio.create_task(self._run_refresh(key, refresh))
+        return True
+
+    async def _run_refresh(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await refresh()
+            self.refreshes["succeeded"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.refreshes["failed"] += 1
+            logger.error("website_background_refresh_failed", root_url=key, error=str(e))
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def stop(self) -> None:
+        """Cancel the background refreshes still running (FastAPI shutdown)"""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "soft_ttl_seconds": self.soft_ttl_seconds,
+            "hard_ttl_seconds": self.hard_ttl_seconds,
+            "served": dict(self.served),
+            "served_age": dict(self.served_age_buckets),
+            "max_age_served_seconds": round(self.max_age_served, 1),
+            "refreshes": dict(self.refreshes),
+            "refreshes_in_flight": len(self._refreshing),
+        }
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.replace(tzinfo=None) - value.utcoffset()
+    return value
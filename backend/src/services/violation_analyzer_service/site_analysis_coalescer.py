@@ -0,0 +1,115 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from loguru import logger
+
+from src.configs.settings import settings
+from src.repositories.site_lease_repository import SiteLeaseRepository
+from src.utils.concurrency_utils import SingleFlight
+
+T = TypeVar("T")
+
+
+class SiteAnalysisCoalescer:
+    """
+    Single-flight for cache-miss analyses, keyed on the canonical root URL.
+
+    Concurrent callers in the process await one in-flight build. Across workers a
+    Mongo lease lets one worker discover and extract the site while the others
+    poll `lookup` until its website record appears (or the wait times out and
+    they build it themselves). The lease is renewed while the build runs, so a
+    slow LLM extraction does not let a second worker start the same build.
+    """
+
+    def __init__(
+        self,
+        lease_repository: Optional[SiteLeaseRepository] = None,
+        lease_seconds: int = settings.internal_api.SITE_LEASE_SECONDS,
+        wait_seconds: float = settings.internal_api.SITE_LEASE_WAIT_SECONDS,
+        poll_interval: float = settings.internal_api.SITE_LEASE_POLL_INTERVAL,
+        renew_interval: Optional[float] = None,
+    ):
+        self.lease_repository = lease_repository
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.renew_interval = renew_interval if renew_interval is not None else lease_seconds / 3
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._single_flight = SingleFlight()
+        self.builds = 0
+        self.remote_coalesced = 0
+        self.lease_wait_timeouts = 0
+        self.leases_lost = 0
+
+    async def run(self, key: str, lookup: Callable[[], Awaitable[Optional[T]]], build: Callable[[], Awaitable[T]]) -> T:
+        """Result of `build` for the key, shared with every concurrent caller in the process and across workers"""
+        return await self._single_flight.do(key, lambda: self._run_leased(key, lookup, build))
+
+    async def _run_leased(self, key: str, lookup: Callable[[], Awaitable[Optional[T]]], build: Callable[[], Awaitable[T]]) -> T:
+        if self.lease_repository is None:
+            return await self._build(build)
+
+        deadline = time.monotonic() + self.wait_seconds
+        waited = False
+        while True:
+            if await self.lease_repository.try_acquire(key, self.owner, self.lease_seconds):
+                try:
+                    # Worker khác có thể vừa lưu xong giữa lần tra cứu đầu và lúc lấy lease
+                    existing = await lookup()
+                    if existing is not None:
+                        self.remote_coalesced += 1
+                        return existing
+                    heartbeat = asyncio.create_task(self._renew_lease(key))
+                    try:
+                        return await self._build(build)
+                    finally:
+                        heartbeat.cancel()
+                        await asyncio.gather(heartbeat, return_exceptions=True)
+                finally:
+                    await self.lease_repository.release(key, self.owner)
+
+            if not waited:
+                waited = True
+                logger.info("site_analysis_waiting_on_lease", root_url=key)
+            await asyncio.sleep(self.poll_interval)
+            existing = await lookup()
+            if existing is not None:
+                self.remote_coalesced += 1
+                logger.info("site_analysis_coalesced_across_workers", root_url=key)
+                return existing
+            if time.monotonic() >= deadline:
+                self.lease_wait_timeouts += 1
+                logger.warning("site_analysis_lease_wait_timeout", root_url=key)
+                return await self._build(build)
+
+    async def _renew_lease(self, key: str) -> None:
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            try:
+                renewed = await self.lease_repository.renew(key, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.warning("site_analysis_lease_renew_failed", root_url=key, error=str(e))
+                continue
+            if not renewed:
+                self.leases_lost += 1
+                logger.warning("site_analysis_lease_lost", root_url=key)
+                return
+
+    async def _build(self, build: Callable[[], Awaitable[T]]) -> T:
+        self.builds += 1
+        return await build()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "builds": self.builds,
+            "coalesced_in_process": self._single_flight.coalesced,
+            "coalesced_across_workers": self.remote_coalesced,
+            "coalesced_total": self._single_flight.coalesced + self.remote_coalesced,
+            "lease_wait_timeouts": self.lease_wait_timeouts,
+            "leases_lost": self.leases_lost,
+            "distributed": self.lease_repository is not None,
+        }
@@ -1,20 +1,29 @@
+import asyncio
 from datetime import datetime
 import json
 import time
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any
 from loguru import logger
+from pymongo.errors import DuplicateKeyError
 
+from src.configs.settings import settings
 from src.utils.url_utils import get_base_url
+from src.utils.cache_utils import stable_digest
+from src.utils.concurrency_utils import StageLimiter, limit_stage
 from src.schemas.policy import PolicyContent
 from src.schemas.cookie import CookieSubmissionRequest, PolicyCookieList
 from src.schemas.violation import ComplianceAnalysisResponse
-from src.models.website import Website # Giả sử model Website của bạn ở đây
+from src.models.website import WebsiteAnalysisView
 
 from src.services.policy_crawler_service.policy_crawler_service import PolicyCrawlerService
 from src.services.cookie_extractor_service.policy_cookie_extractor_service import CookieExtractorService
 from src.services.comparator_service.comparator_service import ComparatorService
+from src.services.policy_translation_service.policy_translation_service import PolicyTranslationService
+from src.services.violation_analyzer_service.site_analysis_coalescer import SiteAnalysisCoalescer
+from src.services.violation_analyzer_service.policy_cache_freshness import PolicyCacheFreshness, FRESH, STALE, EXPIRED
 from src.repositories.violation_repository import ViolationRepository
 from src.repositories.website_repository import WebsiteRepository # Bổ sung repository
+from src.exceptions.custom_exceptions import LLMResponseError, PolicyAnalysisError
 
 class ViolationAnalyzerService:
     def __init__(
@@ -23,13 +32,21 @@ class ViolationAnalyzerService:
         policy_cookie_extractor_service: CookieExtractorService,
         comparator_service: ComparatorService,
         violation_repository: ViolationRepository,
-        website_repository: WebsiteRepository # Inject WebsiteRepository
+        website_repository: WebsiteRepository, # Inject WebsiteRepository
+        stage_limiter: Optional[StageLimiter] = None,
+        translation_service: Optional[PolicyTranslationService] = None,
+        coalescer: Optional[SiteAnalysisCoalescer] = None,
+        freshness: Optional[PolicyCacheFreshness] = None
     ):
         self.policy_crawler = policy_crawler
         self.policy_cookie_extractor_service = policy_cookie_extractor_service
         self.comparator_service = comparator_service
         self.violation_repository = violation_repository
         self.website_repository = website_repository # Gán vào service
+        self.stage_limiter = stage_limiter
+        self.translation_service = translation_service
+        self.coalescer = coalescer
+        self.freshness = freshness
 
     async def orchestrate_analysis(self, payload: CookieSubmissionRequest, request_id: str) -> ComplianceAnalysisResponse:
         """
@@ -48,77 +65,53 @@ class ViolationAnalyzerService:
 
         try:
             # === BƯỚC KIỂM TRA DATABASE ĐẦU TIÊN ===
-            found_website: Optional[Website] = await self.website_repository.get_website_by_root_url(root_url)
+            found_website: Optional[WebsiteAnalysisView] = await self.website_repository.get_view_by_root_url(
+                root_url, WebsiteAnalysisView
+            )
 
             if found_website:
                 # CACHE HIT: Website đã có trong DB
-                logger.info("website_found_in_db", website_url=root_url, request_id=request_id)
+                state, age = self.freshness.classify(found_website) if self.freshness else (FRESH, 0.0)
+                logger.info("website_found_in_db", website_url=root_url, request_id=request_id,
+                            freshness=state, age_seconds=round(age))
 
                 # Lấy thông tin đã lưu, bỏ qua crawling và feature extraction
-                policy_url = found_website.policy_url
-                policy_features = {
-                    "is_specific": found_website.is_specific,
-                    "cookies": [cookie.dict() for cookie in found_website.policy_cookies]
-                }
+                site = self._site_result(found_website)
+                lookup = lambda: self._lookup_site(root_url, checked_after=found_website.last_checked_at)
+                refresh = lambda: self._refresh_site(payload, found_website, root_url, request_id)
+
+                if state == EXPIRED:
+                    # Quá hard TTL: làm mới trước khi trả lời
+                    site = await self._analyse_site_once(root_url, refresh, lookup)
+                else:
+                    if state == STALE:
+                        # Giữa soft và hard TTL: trả dữ liệu cũ ngay, làm mới ở nền
+                        self.freshness.schedule_refresh(root_url, lambda: self._analyse_site_once(root_url, refresh, lookup))
+                    logger.info("phase_skipped", phases=["policy_extraction", "feature_extraction"], request_id=request_id)
 
-                # Cập nhật thời gian quét
-                await self.website_repository.update_website(found_website.id, {"last_checked_at": datetime.utcnow()})
-                logger.info("phase_skipped", phases=["policy_extraction", "feature_extraction"], request_id=request_id)
+                policy_url = site["policy_url"]
+                policy_features = site["policy_features"]
 
             else:
                 # CACHE MISS: Website mới, thực hiện quy trình đầy đủ
                 logger.info("website_not_found_in_db", website_url=root_url, request_id=request_id)
 
-                # Phase 1: Policy Discovery and Content Extraction
-                logger.info("phase_started", phase="policy_extraction", request_id=request_id)
-                policy_content: Optional[PolicyContent] = await self.policy_crawler.extract_policy(payload.website_url)
-                if policy_content:
-                    policy_url = policy_content.policy_url
-
-                # Phase 2: Feature Extraction
-                policy_features_obj = None
-                if policy_content and policy_content.original_content:
-                    logger.info("phase_started", phase="feature_extraction", request_id=request_id)
-                    # (logic trích xuất feature của bạn ở đây)
-                    policy_features_obj = await self.policy_cookie_extractor_service.extract_cookie_features(
-                        policy_content.original_content,
-                        json.dumps(policy_content.table_content, ensure_ascii=False) if policy_content.table_content else None,
-                    )
-                    policy_features = {
-                        "is_specific": policy_features_obj.is_specific,
-                        "cookies": [cookie.dict() for cookie in policy_features_obj.cookies]
-                    }
-
-                # === FIX: Chuyển đổi list object thành list dictionary ===
-                policy_cookies_for_db = []
-                if policy_features_obj and policy_features_obj.cookies:
-                    policy_cookies_for_db = [cookie.model_dump() for cookie in policy_features_obj.cookies]
-                # =======================================================
-
-                # Lưu website mới vào DB để tái sử dụng lần sau
-                new_website_data = {
-                    "domain": root_url,
-                    "provider_id": None, # Hoặc provider_id nếu có
-                    "last_checked_at": datetime.utcnow(),
-                    "policy_url": policy_url,
-                    "detected_language": policy_content.detected_language if policy_content else None,
-                    "original_content": policy_content.original_content if policy_content else "",
-                    "translated_content": policy_content.translated_content if policy_content else None,
-                    "table_content": policy_content.table_content if policy_content else [],
-                    "translated_table_content": policy_content.translated_table_content if policy_content else None,
-                    "is_specific": policy_features_obj.is_specific if policy_features_obj else 0,
-                    "policy_cookies": policy_cookies_for_db # <-- SỬ DỤNG LIST DICTIONARY Ở ĐÂY
-                }
-                await self.website_repository.create_website(new_website_data)
-                logger.info("new_website_saved_to_db", website_url=root_url, request_id=request_id)
+                # Các yêu cầu đồng thời cho cùng site dùng chung một lần crawl + trích xuất
+                site = await self._analyse_site_once(
+                    root_url, lambda: self._analyse_new_site(payload, root_url, request_id),
+                    lambda: self._lookup_site(root_url)
+                )
+                policy_url = site["policy_url"]
+                policy_features = site["policy_features"]
 
             # === BƯỚC PHÂN TÍCH VÀ LƯU TRỮ (DÙNG CHUNG CHO CẢ 2 LUỒNG) ===
             logger.info("phase_started", phase="compliance_check", request_id=request_id)
-            result = await self.comparator_service.compare_compliance(
-                payload.website_url,
-                payload.cookies,
-                policy_features,
-            )
+            async with limit_stage(self.stage_limiter, "comparison"):
+                result = await self.comparator_service.compare_compliance(
+                    payload.website_url,
+                    payload.cookies,
+                    policy_features,
+                )
 
             # (Phần còn lại của hàm giữ nguyên)
             # ...
@@ -138,3 +131,239 @@ class ViolationAnalyzerService:
                 execution_time=time.time() - start_time
             )
             raise e
+
+    async def _analyse_site_once(
+        self,
+        root_url: str,
+        build: Callable[[], Awaitable[Dict[str, Any]]],
+        lookup: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Dict[str, Any]:
+        if self.coalescer is None:
+            return await build()
+        return await self.coalescer.run(root_url, lookup, build)
+
+    @staticmethod
+    def _site_result(website: WebsiteAnalysisView) -> Dict[str, Any]:
+        return {
+            "policy_url": website.policy_url,
+            "policy_features": {
+                "is_specific": website.is_specific,
+                "cookies": [cookie.dict() for cookie in website.policy_cookies]
+            }
+        }
+
+    @staticmethod
+    def _content_hash(policy_content: PolicyContent) -> str:
+        return stable_digest(policy_content.original_content, policy_content.table_content)
+
+    async def _lookup_site(self, root_url: str, checked_after: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Site result from a website record saved (or re-checked after `checked_after`) by another worker"""
+        website = await self.website_repository.get_view_by_root_url(root_url, WebsiteAnalysisView)
+        if website is None or (checked_after is not None and website.last_checked_at <= checked_after):
+            return None
+        return self._site_result(website)
+
+    async def _extract_features(self, policy_content: Optional[PolicyContent], request_id: str):
+        """Cookies of the policy; raises LLMResponseError when the extraction failed or is partial"""
+        if not (policy_content and policy_content.original_content):
+            return None
+        logger.info("phase_started", phase="feature_extraction", request_id=request_id)
+        async with limit_stage(self.stage_limiter, "llm"):
+            return await self.policy_cookie_extractor_service.extract_cookie_features(
+                policy_content.original_content,
+                json.dumps(policy_content.table_content, ensure_ascii=False) if policy_content.table_content else None,
+                strict=True,
+            )
+
+    def _policy_fields(self, policy_content: Optional[PolicyContent], policy_features_obj) -> Dict[str, Any]:
+        """Website fields derived from a crawled policy and its extracted cookies"""
+        # === FIX: Chuyển đổi list object thành list dictionary ===
+        policy_cookies_for_db = []
+        if policy_features_obj and policy_features_obj.cookies:
+            policy_cookies_for_db = [cookie.model_dump() for cookie in policy_features_obj.cookies]
+        # =======================================================
+        return {
+            "last_checked_at": datetime.utcnow(),
+            "policy_url": policy_content.policy_url if policy_content else None,
+            "detected_language": policy_content.detected_language if policy_content else None,
+            "original_content": policy_content.original_content if policy_content else "",
+            "translated_content": policy_content.translated_content if policy_content else None,
+            "table_content": policy_content.table_content if policy_content else [],
+            "translated_table_content": policy_content.translated_table_content if policy_content else None,
+            "is_specific": policy_features_obj.is_specific if policy_features_obj else 0,
+            "policy_cookies": policy_cookies_for_db, # <-- SỬ DỤNG LIST DICTIONARY Ở ĐÂY
+            "policy_content_hash": self._content_hash(policy_content) if policy_content and policy_content.original_content else None,
+            "refresh_failures": 0,
+            "refresh_retry_at": None,
+        }
+
+    def _features_result(self, policy_url: Optional[str], policy_features_obj) -> Dict[str, Any]:
+        policy_features: Dict[str, Any] = {"is_specific": 0, "cookies": []}
+        if policy_features_obj:
+            policy_features = {
+                "is_specific": policy_features_obj.is_specific,
+                "cookies": [cookie.dict() for cookie in policy_features_obj.cookies]
+            }
+        return {"policy_url": policy_url, "policy_features": policy_features}
+
+    def _schedule_translation(self, root_url: str, policy_content: Optional[PolicyContent]) -> None:
+        # Bản dịch được tạo nền sau khi website đã lưu (không chặn phân tích)
+        if (self.translation_service and policy_content and policy_content.translated_content is None
+                and self.translation_service.needs_translation(policy_content.detected_language)):
+            self.translation_service.schedule(root_url)
+
+    async def _analyse_new_site(self, payload: CookieSubmissionRequest, root_url: str, request_id: str) -> Dict[str, Any]:
+        """Discover and extract the policy of an uncached site, then save its website record"""
+        # Phase 1: Policy Discovery and Content Extraction
+        logger.info("phase_started", phase="policy_extraction", request_id=request_id)
+        policy_content: Optional[PolicyContent] = await self.policy_crawler.extract_policy(payload.website_url)
+
+        # Phase 2: Feature Extraction
+        extracted = True
+        try:
+            policy_features_obj = await self._extract_features(policy_content, request_id)
+        except LLMResponseError as e:
+            logger.warning("feature_extraction_failed", website_url=root_url, request_id=request_id, error=str(e))
+            policy_features_obj, extracted = None, False
+
+        # Lưu website mới vào DB để tái sử dụng lần sau
+        new_website_data = {
+            "domain": root_url,
+            "provider_id": None, # Hoặc provider_id nếu có
+            **self._policy_fields(policy_content, policy_features_obj)
+        }
+        if not extracted:
+            # Không lưu hash khi chưa có cookie: lần làm mới sau thời gian chờ sẽ trích xuất lại
+            new_website_data.update(policy_content_hash=None, **self._refresh_failure_fields(1))
+        try:
+            await self.website_repository.create_website(new_website_data)
+        except DuplicateKeyError:
+            # Worker khác đã lưu site trước (hết thời gian chờ lease hoặc không có lease): dùng bản đã lưu
+            existing = await self._lookup_site(root_url)
+            if existing is None:
+                raise
+            logger.info("new_website_already_saved", website_url=root_url, request_id=request_id)
+            return existing
+        logger.info("new_website_saved_to_db", website_url=root_url, request_id=request_id)
+
+        self._schedule_translation(root_url, policy_content)
+        return self._features_result(new_website_data["policy_url"], policy_features_obj)
+
+    async def _refresh_site(self, payload: CookieSubmissionRequest, website: WebsiteAnalysisView, root_url: str, request_id: str) -> Dict[str, Any]:
+        """
+        Re-crawl the policy of a stored website. Cookies are only re-extracted when the
+        policy content hash changed; a failed crawl or extraction keeps serving the stored
+        data and backs off further revalidation of the site.
+        """
+        logger.info("phase_started", phase="policy_revalidation", request_id=request_id)
+        policy_content = await self.policy_crawler.extract_policy(payload.website_url, force_refresh=True)
+        if not (policy_content and policy_content.original_content):
+            await self._record_refresh_failure(website)
+            logger.warning("website_refresh_failed", website_url=root_url, request_id=request_id,
+                           failures=website.refresh_failures + 1)
+            return self._site_result(website)
+
+        if self._content_hash(policy_content) == website.policy_content_hash:
+            await self.website_repository.update_website(
+                website.id, {"last_checked_at": datetime.utcnow(), "policy_url": policy_content.policy_url,
+                             "refresh_failures": 0, "refresh_retry_at": None}
+            )
+            logger.info("website_policy_unchanged", website_url=root_url, request_id=request_id)
+            return {**self._site_result(website), "policy_url": policy_content.policy_url}
+
+        try:
+            policy_features_obj = await self._extract_features(policy_content, request_id)
+        except LLMResponseError as e:
+            # Giữ cookie và hash đã lưu: ghi đè bằng kết quả lỗi sẽ khiến site trống đến khi chính sách đổi
+            await self._record_refresh_failure(website)
+            logger.warning("website_refresh_extraction_failed", website_url=root_url, request_id=request_id,
+                           failures=website.refresh_failures + 1, error=str(e))
+            return self._site_result(website)
+        await self.website_repository.update_website(website.id, self._policy_fields(policy_content, policy_features_obj))
+        logger.info("website_policy_refreshed", website_url=root_url, request_id=request_id)
+
+        self._schedule_translation(root_url, policy_content)
+        return self._features_result(policy_content.policy_url, policy_features_obj)
+
+    def _refresh_failure_fields(self, failures: int) -> Dict[str, Any]:
+        retry_at = self.freshness.refresh_retry_at(failures) if self.freshness else None
+        return {"refresh_failures": failures, "refresh_retry_at": retry_at}
+
+    async def _record_refresh_failure(self, website: WebsiteAnalysisView) -> None:
+        if self.freshness is None:
+            return
+        await self.website_repository.update_one(
+            {"_id": website.id}, {"$set": self._refresh_failure_fields(website.refresh_failures + 1)}
+        )
+
+    async def orchestrate_batch_analysis(
+        self,
+        submissions: List[CookieSubmissionRequest],
+        request_id: str,
+        max_concurrent_sites: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyses many submissions concurrently and yields one result line per
+        submission as soon as it finishes, followed by a summary line.
+
+        Submissions are grouped by root URL: a group runs sequentially so the
+        policy of a site is discovered and extracted once and later members hit
+        the website record; identical submissions are analysed only once.
+        Stage-level limits come from the shared StageLimiter.
+        """
+        start_time = time.time()
+        groups: Dict[str, List[int]] = {}
+        for index, submission in enumerate(submissions):
+            groups.setdefault(get_base_url(submission.website_url), []).append(index)
+
+        logger.info(
+            "batch_analysis_started",
+            request_id=request_id,
+            submissions=len(submissions),
+            unique_sites=len(groups),
+        )
+
+        site_slots = asyncio.Semaphore(max_concurrent_sites or settings.internal_api.MAX_CONCURRENT_REQUESTS)
+        lines: asyncio.Queue = asyncio.Queue()
+        counts = {"succeeded": 0, "failed": 0, "deduplicated": 0}
+
+        async def run_site(root_url: str, indexes: List[int]) -> None:
+            async with site_slots:
+                analysed: Dict[str, tuple] = {}
+                for index in indexes:
+                    submission = submissions[index]
+                    line: Dict[str, Any] = {"type": "result", "index": index, "website_url": submission.website_url, "root_url": root_url}
+                    try:
+                        digest = stable_digest(submission.model_dump(mode="json"))
+                        if digest in analysed:
+                            counts["deduplicated"] += 1
+                            first_index, first_outcome = analysed[digest]
+                            line.update(first_outcome, duplicate_of=first_index)
+                        else:
+                            result = await self.orchestrate_analysis(submission, f"{request_id}:{index}")
+                            line.update(status="ok", result=result.model_dump(mode="json"))
+                            analysed[digest] = (index, {"status": "ok", "result": line["result"]})
+                    except PolicyAnalysisError as e:
+                        line.update(status="error", error=e.message, phase=e.phase.value, status_code=e.status_code)
+                    except Exception as e:
+                        line.update(status="error", error=str(e), status_code=500)
+                    counts["succeeded" if line["status"] == "ok" else "failed"] += 1
+                    await lines.put(line)
+
+        tasks = [asyncio.create_task(run_site(root_url, indexes)) for root_url, indexes in groups.items()]
+        try:
+            for _ in range(len(submissions)):
+                yield await lines.get()
+        finally:
+            # The client may disconnect mid-stream; do not leave orphaned analyses running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        yield {
+            "type": "summary",
+            "submissions": len(submissions),
+            "unique_sites": len(groups),
+            **counts,
+            "execution_time": round(time.time() - start_time, 3),
+        }
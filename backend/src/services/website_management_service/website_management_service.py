@@ -9,11 +9,12 @@ from src.repositories.violation_repository import ViolationRepository
 from src.repositories.domain_request_repository import DomainRequestRepository
 from src.schemas.website import WebsiteListResponseSchema, WebsiteCreateSchema, WebsiteUpdateSchema, WebsiteResponseSchema, PaginatedWebsiteResponseSchema
 from src.schemas.violation import ComplianceAnalysisResponse
-from src.models.website import Website
+from src.models.website import Website, WebsiteAnalysisView, WebsiteDetailView
 from src.models.user import UserRole
 from src.schemas.domain_request import DomainRequestStatus # Import DomainRequestStatus
 from src.exceptions.custom_exceptions import NotFoundException, BadRequestException
 from src.repositories.user_repository import UserRepository # Import UserRepository
+from src.utils.pagination_utils import EXACT
 
 class WebsiteManagementService:
     def __init__(self, website_repo: WebsiteRepository, violation_repo: ViolationRepository, user_repo: UserRepository):
@@ -21,7 +22,8 @@ class WebsiteManagementService:
         self.violation_repo = violation_repo
         self.user_repo = user_repo
 
-    async def get_all_websites(self, user_id: str, user_role: UserRole, is_approved: Optional[bool] = None, search_query: Optional[str] = None, skip: int = 0, limit: int = 100) -> PaginatedWebsiteResponseSchema:
+    async def get_all_websites(self, user_id: str, user_role: UserRole, is_approved: Optional[bool] = None, search_query: Optional[str] = None, skip: int = 0, limit: int = 100,
+                               cursor: Optional[str] = None, sort_by: str = "_id", total_mode: str = EXACT) -> PaginatedWebsiteResponseSchema:
         filters = {}
         if search_query:
             filters["domain"] = {"$regex": search_query, "$options": "i"}
@@ -33,41 +35,44 @@ class WebsiteManagementService:
         elif is_approved is not None:
             filters["is_approved"] = is_approved
 
-        total_count = await self.website_repo.count_websites(filters)
-        websites_data = await self.website_repo.get_all_websites(filters, skip=skip, limit=limit)
+        # Chỉ đọc các trường của dòng danh sách; số cookie và tổng số được tính phía Mongo trong một truy vấn
+        try:
+            page = await self.website_repo.list_rows(
+                filters, sort_field=sort_by, cursor=cursor, skip=skip, limit=limit, total_mode=total_mode
+            )
+        except ValueError as e:
+            raise BadRequestException(str(e))
 
         response_list = []
-        for website_data in websites_data:
-            website = Website.model_validate(website_data)
-
+        for row in page.rows:
             policy_status = "unknown"
-            if website.is_specific is not None:
-                policy_status = "specific" if website.is_specific == 1 else "general"
-
-            num_specified_cookies = len(website.policy_cookies)
+            if row.is_specific is not None:
+                policy_status = "specific" if row.is_specific == 1 else "general"
 
             response_list.append(
                 WebsiteListResponseSchema(
-                    id=website.id,
-                    domain=str(website.domain),
+                    id=row.id,
+                    domain=row.domain,
                     policy_status=policy_status,
-                    policy_url=website.policy_url,
-                    num_specified_cookies=num_specified_cookies,
-                    last_checked_at=website.last_checked_at
+                    policy_url=row.policy_url,
+                    num_specified_cookies=row.num_specified_cookies,
+                    last_checked_at=row.last_checked_at
                 )
             )
         return PaginatedWebsiteResponseSchema(
             websites=response_list,
-            total_count=total_count,
-            page=int(skip / limit) + 1,
-            page_size=limit
+            total_count=page.total,
+            page=None if cursor else skip // limit + 1,
+            page_size=limit,
+            next_cursor=page.next_cursor,
+            total_is_estimate=page.total_is_estimate
         )
 
     async def get_website_by_id(self, website_id: str) -> WebsiteResponseSchema:
-        website_data = await self.website_repo.get_website_by_id(website_id)
+        website_data = await self.website_repo.get_view_by_id(website_id, WebsiteDetailView)
         if not website_data:
             raise NotFoundException(f"Website with ID {website_id} not found")
-        return WebsiteResponseSchema.model_validate(website_data.model_dump())
+        return WebsiteResponseSchema.model_validate(website_data.model_dump(by_alias=True))
 
     async def create_website(self, website_data: WebsiteCreateSchema, user_id: str) -> WebsiteResponseSchema:
         # Check if a website with the same domain already exists for this user
@@ -115,8 +120,8 @@ class WebsiteManagementService:
         """
         Retrieves the latest compliance analysis data for a specific website.
         """
-        # Get website info
-        website = await self.website_repo.get_website_by_id(website_id)
+        # Get website info (domain and policy URL only)
+        website = await self.website_repo.get_view_by_id(website_id, WebsiteAnalysisView)
         if not website:
             raise NotFoundException(f"Website with ID {website_id} not found")
 
@@ -0,0 +1,155 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.cache_utils import stable_digest
+
+# Định dạng lưu trữ gọn của kết quả phân tích (tài liệu cũ không có trường "format")
+COMPACT_FORMAT = 2
+
+# Các mục của details/summary chứa cookie thực tế (đối tượng hoặc tên)
+_ACTUAL_COOKIE_DETAILS = ("realtime_cookie_details", "undeclared_cookie_details", "declared_violating_cookies")
+_ACTUAL_COOKIE_NAMES = ("undeclared_cookies", "third_party_cookies", "long_term_cookies")
+_POLICY_COOKIE_DETAILS = ("declared_compliant_cookies",)
+
+
+class _Table:
+    """Rows stored once, referenced by position; rows are matched by their full content"""
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None):
+        self.rows: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}
+        for row in rows or []:
+            self.ref(row)
+
+    def ref(self, row: Dict[str, Any]) -> int:
+        key = json.dumps(row, sort_keys=True, default=str)
+        if key not in self._positions:
+            self._positions[key] = len(self.rows)
+            self.rows.append(row)
+            self._by_name.setdefault(row.get("name", row.get("cookie_name")), self._positions[key])
+        return self._positions[key]
+
+    def find(self, row: Dict[str, Any]) -> Optional[int]:
+        return self._positions.get(json.dumps(row, sort_keys=True, default=str))
+
+    def find_name(self, name: str) -> Optional[int]:
+        return self._by_name.get(name)
+
+
+def policy_version_hash(policy_cookies: List[Dict[str, Any]]) -> str:
+    """Content hash of a policy's cookie declarations, shared by every analysis against that policy version"""
+    return stable_digest(policy_cookies)
+
+
+def compact_analysis(document: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Compact storage form of a ComplianceAnalysisResult dump and the policy version it references.
+
+    Each collected cookie is stored once in `cookies`; issues, summary lists and details
+    refer to it by position. The policy's cookie declarations move to a policy version
+    keyed by their hash, referred to by position within it. An entry with no match in a
+    table stays inline, so `rehydrate_analysis` always restores the original document.
+    Error results (no cookie details) are returned unchanged.
+    """
+    details = document.get("details") or {}
+    if "realtime_cookie_details" not in details or "declared_cookie_details" not in details:
+        return document, None
+
+    policy_cookies = details["declared_cookie_details"]
+    policy = _Table(policy_cookies)
+    cookies = _Table()
+
+    compact_details = {key: value for key, value in details.items() if key != "declared_cookie_details"}
+    for key in _ACTUAL_COOKIE_DETAILS:
+        if key in details:
+            compact_details[key] = [cookies.ref(row) for row in details[key]]
+    for key in _POLICY_COOKIE_DETAILS:
+        if key in details:
+            compact_details[key] = [_ref_or_inline(policy.find(row), row) for row in details[key]]
+    if "declared_by_third_party" in details:
+        compact_details["declared_by_third_party"] = {
+            party: [_ref_or_inline(policy.find(row), row) for row in rows]
+            for party, rows in details["declared_by_third_party"].items()
+        }
+
+    summary = dict(document.get("summary") or {})
+    for key in _ACTUAL_COOKIE_NAMES:
+        if key in summary:
+            summary[key] = [_ref_or_inline(cookies.find_name(name), name) for name in summary[key]]
+    if "declared_cookies" in summary:
+        summary["declared_cookies"] = [_ref_or_inline(policy.find_name(name), name) for name in summary["declared_cookies"]]
+
+    issues = []
+    for issue in document.get("issues") or []:
+        issue = dict(issue)
+        position = cookies.find_name(issue.get("cookie_name"))
+        if position is not None:
+            del issue["cookie_name"]
+            issue["cookie"] = position
+        issues.append(issue)
+
+    version = policy_version_hash(policy_cookies)
+    compact = {key: value for key, value in document.items() if key not in ("issues", "summary", "details")}
+    compact.update({
+        "format": COMPACT_FORMAT,
+        "policy_version": version,
+        "cookies": cookies.rows,
+        "issues": issues,
+        "summary": summary,
+        "details": compact_details,
+    })
+    return compact, {"_id": version, "cookies": policy_cookies}
+
+
+def rehydrate_analysis(document: Dict[str, Any], policy_cookies: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Full response shape of a stored analysis; documents not in the compact format are returned as is.
+    Raises ValueError when a compact document is rehydrated without its policy version.
+    """
+    if document.get("format") != COMPACT_FORMAT:
+        return document
+    if policy_cookies is None:
+        raise ValueError(f"Policy version {document.get('policy_version')} is required to rehydrate the analysis")
+
+    cookies = document["cookies"]
+    policy = policy_cookies
+    cookie = lambda ref: cookies[ref] if isinstance(ref, int) else ref
+    cookie_name = lambda ref: cookies[ref]["name"] if isinstance(ref, int) else ref
+    declared = lambda ref: policy[ref] if isinstance(ref, int) else ref
+    declared_name = lambda ref: policy[ref]["cookie_name"] if isinstance(ref, int) else ref
+
+    details = dict(document["details"])
+    details["declared_cookie_details"] = list(policy)
+    for key in _ACTUAL_COOKIE_DETAILS:
+        if key in details:
+            details[key] = [cookie(ref) for ref in details[key]]
+    for key in _POLICY_COOKIE_DETAILS:
+        if key in details:
+            details[key] = [declared(ref) for ref in details[key]]
+    if "declared_by_third_party" in details:
+        details["declared_by_third_party"] = {
+            party: [declared(ref) for ref in refs] for party, refs in details["declared_by_third_party"].items()
+        }
+
+    summary = dict(document["summary"])
+    for key in _ACTUAL_COOKIE_NAMES:
+        if key in summary:
+            summary[key] = [cookie_name(ref) for ref in summary[key]]
+    if "declared_cookies" in summary:
+        summary["declared_cookies"] = [declared_name(ref) for ref in summary["declared_cookies"]]
+
+    issues = []
+    for issue in document["issues"]:
+        issue = dict(issue)
+        if "cookie" in issue:
+            issue["cookie_name"] = cookie_name(issue.pop("cookie"))
+        issues.append(issue)
+
+    full = {key: value for key, value in document.items() if key not in ("format", "policy_version", "cookies")}
+    full.update({"issues": issues, "summary": summary, "details": details})
+    return full
+
+
+def _ref_or_inline(position: Optional[int], value: Any) -> Any:
+    return value if position is None else position
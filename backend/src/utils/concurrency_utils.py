@@ -0,0 +1,138 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from src.configs.settings import settings
+
+T = TypeVar("T")
+
+
+class StageLimiter:
+    """
+    Independent concurrency limits for the stages of an analysis.
+
+    Each stage (discovery, extraction, llm, comparison) has its own semaphore so
+    a slow stage - typically the browser or the LLM - cannot starve the others.
+    One instance is shared by every analysis running in the process.
+    """
+
+    STAGES = ("discovery", "extraction", "llm", "comparison")
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default_limit: Optional[int] = None):
+        default_limit = default_limit or settings.internal_api.MAX_CONCURRENT_REQUESTS
+        limits = limits or {}
+        self.limits = {stage: max(1, limits.get(stage) or default_limit) for stage in self.STAGES}
+        self._semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in self.limits.items()}
+        self._metrics = {
+            stage: {"in_flight": 0, "waiting": 0, "completed": 0, "wait_seconds_total": 0.0}
+            for stage in self.STAGES
+        }
+
+    @classmethod
+    def from_settings(cls) -> "StageLimiter":
+        api = settings.internal_api
+        return cls({
+            "discovery": api.DISCOVERY_CONCURRENCY,
+            "extraction": api.EXTRACTION_CONCURRENCY,
+            "llm": api.LLM_CONCURRENCY,
+            "comparison": api.COMPARISON_CONCURRENCY,
+        })
+
+    @asynccontextmanager
+    async def stage(self, name: str) -> AsyncIterator[None]:
+        """Hold a slot of the given stage for the duration of the `async with` block"""
+        metrics = self._metrics[name]
+        started_at = time.monotonic()
+        metrics["waiting"] += 1
+        try:
+            await self._semaphores[name].acquire()
+        finally:
+            metrics["waiting"] -= 1
+        metrics["wait_seconds_total"] += time.monotonic() - started_at
+        metrics["in_flight"] += 1
+        try:
+            yield
+        finally:
+            metrics["in_flight"] -= 1
+            metrics["completed"] += 1
+            self._semaphores[name].release()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            stage: {**metrics, "limit": self.limits[stage]}
+            for stage, metrics in self._metrics.items()
+        }
+
+
+@asynccontextmanager
+async def limit_stage(limiter: Optional[StageLimiter], name: str) -> AsyncIterator[None]:
+    """`limiter.stage(name)`, or a no-op when no limiter is configured"""
+    if limiter is None:
+        yield
+        return
+    async with limiter.stage(name):
+        yield
+
+
+class RateLimiter:
+    """
+    Async token bucket shared by concurrent callers: `acquire` returns at most
+    `rate_per_second` times per second on average, after an initial `burst`.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+        self.waited_seconds_total = 0.0
+
+    async def acquire(self) -> None:
+        if self.rate_per_second <= 0:
+            return
+        # Waiters queue on the lock, so slots are handed out in arrival order
+        async with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate_per_second
+                self.waited_seconds_total += wait
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated_at = self._clock()
+            self._tokens -= 1
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    coroutine, later callers await the same in-flight task. Waiters are shielded,
+    so a cancelled caller does not cancel the shared work.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception() # mark as retrieved when every waiter went away
@@ -2,9 +2,11 @@ import re
 import base64
 import email.utils
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
+from src.configs.settings import settings
 from src.schemas.cookie import ActualCookie
 
 def parse_cookie(raw: dict) -> Optional[ActualCookie]:
@@ -41,29 +43,35 @@ def parse_cookie(raw: dict) -> Optional[ActualCookie]:
         return None
 
 
+# Compiled once; ordered from the longest unit to the shortest
+_RETENTION_PATTERNS = [
+    (re.compile(r'(\d+(?:\.\d+)?)\s*year[s]?'), 365.25), # Use average days in a year
+    (re.compile(r'(\d+(?:\.\d+)?)\s*month[s]?'), 30.44), # Use average days in a month
+    (re.compile(r'(\d+(?:\.\d+)?)\s*week[s]?'), 7.0),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*day[s]?'), 1.0),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*hour[s]?'), 1.0/24.0),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*minute[s]?'), 1.0/(24.0*60.0))
+]
+
+
 def parse_retention_to_days(retention_str: str) -> Optional[float]: # Changed return type to float
     """Chuyển đổi retention string thành số ngày với nhiều format hơn"""
-    if not retention_str:
+    if not retention_str or not isinstance(retention_str, str):
         return None
 
-    retention_lower = retention_str.lower().strip()
+    # Chính sách thường lặp lại vài chuỗi ("2 years", "session", "13 months") nên kết quả được cache theo chuỗi đã chuẩn hoá
+    return _parse_normalized_retention(retention_str.lower().strip())
+
 
+@lru_cache(maxsize=settings.violation.RETENTION_PARSE_CACHE_SIZE)
+def _parse_normalized_retention(retention_lower: str) -> Optional[float]:
     # Handle non-fixed retention periods by returning None
     if 'session' in retention_lower or 'browser' in retention_lower or 'local storage' in retention_lower or 'persistent' in retention_lower:
         return None
 
     # Parse các format phổ biến với regex tốt hơn
-    patterns = [
-        (r'(\d+(?:\.\d+)?)\s*year[s]?', 365.25), # Use average days in a year
-        (r'(\d+(?:\.\d+)?)\s*month[s]?', 30.44), # Use average days in a month
-        (r'(\d+(?:\.\d+)?)\s*week[s]?', 7.0),
-        (r'(\d+(?:\.\d+)?)\s*day[s]?', 1.0),
-        (r'(\d+(?:\.\d+)?)\s*hour[s]?', 1.0/24.0),
-        (r'(\d+(?:\.\d+)?)\s*minute[s]?', 1.0/(24.0*60.0))
-    ]
-
-    for pattern, multiplier in patterns:
-        match = re.search(pattern, retention_lower)
+    for pattern, multiplier in _RETENTION_PATTERNS:
+        match = pattern.search(retention_lower)
         if match:
             return float(match.group(1)) * multiplier # Return float
 
@@ -80,27 +88,29 @@ def parse_retention_to_days(retention_str: str) -> Optional[float]: # Changed re
     return None
 
 
-def calculate_actual_retention_days(expirationDate_str: Optional[str]) -> Optional[int]:
-    """Tính số ngày retention thực tế với timezone handling, chấp nhận string hoặc None."""
+def parse_expiration_date(expirationDate_str: Optional[str]) -> Optional[datetime]:
+    """Parse ngày hết hạn của cookie (ISO hoặc RFC 2822); None cho session cookie hoặc chuỗi không hợp lệ."""
     if not expirationDate_str or expirationDate_str.lower() == 'session':
-        return 0  # Session cookie or no expiration date
+        return None
 
-    parsed_expiration_date = None
     try:
         # Try parsing as ISO format (e.g., "2026-06-16T07:09:10.000Z")
-        parsed_expiration_date = datetime.fromisoformat(expirationDate_str.replace('Z', '+00:00'))
+        return datetime.fromisoformat(expirationDate_str.replace('Z', '+00:00'))
     except ValueError:
         try:
             # Try parsing other common date formats if ISO fails
-            parsed_expiration_date = email.utils.parsedate_to_datetime(expirationDate_str)
+            return email.utils.parsedate_to_datetime(expirationDate_str)
         except Exception:
             # If all parsing fails, treat as session or unknown
-            return 0
+            return None
+
 
+def retention_days_until(parsed_expiration_date: Optional[datetime], now: Optional[datetime] = None) -> int:
+    """Số ngày còn lại đến thời điểm hết hạn đã parse (0 nếu đã hết hạn hoặc là session cookie)."""
     if not parsed_expiration_date:
         return 0
 
-    now = datetime.now()
+    now = now or datetime.now()
     # Handle timezone-aware datetime
     if parsed_expiration_date.tzinfo and not now.tzinfo:
         now = now.replace(tzinfo=parsed_expiration_date.tzinfo)
@@ -114,6 +124,11 @@ def calculate_actual_retention_days(expirationDate_str: Optional[str]) -> Option
     return max(0, delta.days)
 
 
+def calculate_actual_retention_days(expirationDate_str: Optional[str], now: Optional[datetime] = None) -> Optional[int]:
+    """Tính số ngày retention thực tế với timezone handling, chấp nhận string hoặc None."""
+    return retention_days_until(parse_expiration_date(expirationDate_str), now)
+
+
 def is_third_party_domain(cookie_domain: str, main_domain: str) -> bool:
     """Kiểm tra domain có phải third-party không với logic cải thiện"""
     if not cookie_domain or not main_domain:
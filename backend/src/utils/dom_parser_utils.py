@@ -1,11 +1,11 @@
 import re
 from loguru import logger
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, Union
 from urllib.parse import urljoin
 
 from src.schemas.policy import DiscoveryMethod
 from src.configs.settings import settings
+from src.utils.html_document import IHTMLDocument, parse_html
 
 class DOMParserService:
     def __init__(self):
@@ -14,40 +14,38 @@ class DOMParserService:
         self.FOOTER_SELECTORS = settings.policy_discovery.FOOTER_SELECTORS
         self.NAV_SELECTORS = settings.policy_discovery.NAV_SELECTORS
 
-    def parse_policy_links_from_dom(self, html_content: str) -> List[Dict[str, Any]]:
+    def parse_policy_links_from_dom(self, html_content: Union[str, IHTMLDocument]) -> List[Dict[str, Any]]:
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
+            document = parse_html(html_content)
             found_links = []
 
             # Method 1: Check for link tags
-            link_tags = soup.find_all('link', href=True)
-            for link in link_tags:
-                href = link.get('href', '')
-                rel = link.get('rel', [])
+            for link in document.link_tags():
+                href = link['href']
+                rel = link['rel']
 
-                if self._is_cookie_policy_link(href) or 'cookie' in str(rel).lower():
+                if self._is_cookie_policy_link(href) or 'cookie' in rel.lower():
                     found_links.append({
                         'url': href,
                         'method': DiscoveryMethod.LINK_TAG,
-                        'text': link.get('title', ''),
+                        'text': link['title'],
                         'score': 0.9
                     })
 
             # Method 2: Check footer links
-            footer_links = self._find_links_in_section(soup, self.FOOTER_SELECTORS)
+            footer_links = self._find_links_in_section(document, self.FOOTER_SELECTORS)
             found_links.extend([{**link, 'method': DiscoveryMethod.FOOTER_LINK, 'score': 0.8}
                                for link in footer_links])
 
             # Method 3: Check navigation links
-            nav_links = self._find_links_in_section(soup, self.NAV_SELECTORS)
+            nav_links = self._find_links_in_section(document, self.NAV_SELECTORS)
             found_links.extend([{**link, 'method': DiscoveryMethod.NAVIGATION_LINK, 'score': 0.7}
                                for link in nav_links])
 
             # Method 4: Check all links with policy patterns
-            all_links = soup.find_all('a', href=True)
-            for link in all_links:
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
+            for link in document.anchors():
+                href = link['href']
+                text = link['text']
 
                 if self._is_cookie_policy_link(href) or self._is_policy_text(text):
                     # Avoid duplicates
@@ -66,23 +64,19 @@ class DOMParserService:
             logger.error(f"Error parsing DOM: {str(e)}")
             return []
 
-    def _find_links_in_section(self, soup: BeautifulSoup, selectors: List[str]) -> List[Dict[str, Any]]:
+    def _find_links_in_section(self, document: IHTMLDocument, selectors: List[str]) -> List[Dict[str, Any]]:
         """Find policy links in specific page sections"""
         links = []
 
-        for selector in selectors:
-            sections = soup.select(selector)
-            for section in sections:
-                section_links = section.find_all('a', href=True)
-                for link in section_links:
-                    href = link.get('href', '')
-                    text = link.get_text(strip=True)
+        for link in document.anchors(selectors):
+            href = link['href']
+            text = link['text']
 
-                    if self._is_cookie_policy_link(href) or self._is_policy_text(text):
-                        links.append({
-                            'url': href,
-                            'text': text
-                        })
+            if self._is_cookie_policy_link(href) or self._is_policy_text(text):
+                links.append({
+                    'url': href,
+                    'text': text
+                })
 
         return links
 
@@ -0,0 +1,215 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import lxml.html
+from bs4 import BeautifulSoup, Tag
+
+from src.configs.settings import settings
+
+# A table cell is represented as (tag_name, stripped_text)
+TableCell = Tuple[str, str]
+
+
+class HTMLTable:
+    """Backend-neutral view of a <table> element"""
+
+    def __init__(self, thead_row: Optional[List[TableCell]], rows: List[List[TableCell]]):
+        self.thead_row = thead_row  # first <tr> inside <thead>, if any
+        self.rows = rows            # every <tr> in the table, in document order
+
+
+class IHTMLDocument(ABC):
+    """
+    An HTML payload parsed exactly once.
+
+    The same instance is shared by link discovery, text cleaning and table
+    extraction so that a page is never re-parsed by each consumer. Queries
+    must not mutate the underlying tree.
+    """
+
+    @abstractmethod
+    def link_tags(self) -> List[Dict[str, str]]:
+        """All <link href> elements as {'href', 'rel', 'title'}"""
+        pass
+
+    @abstractmethod
+    def anchors(self, selectors: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """<a href> elements as {'href', 'text'}, optionally only inside sections matching the CSS selectors"""
+        pass
+
+    @abstractmethod
+    def text(self, exclude_tags: Iterable[str] = ()) -> str:
+        """Visible text joined by single spaces, skipping the given element types"""
+        pass
+
+    @abstractmethod
+    def tables(self) -> List[HTMLTable]:
+        """All <table> elements"""
+        pass
+
+
+class LxmlHTMLDocument(IHTMLDocument):
+    """lxml-native backend (default); avoids building a BeautifulSoup tree"""
+
+    def __init__(self, html_content: str):
+        self.root = self._parse(html_content)
+
+    @staticmethod
+    def _parse(html_content: str):
+        if not html_content or not html_content.strip():
+            return None
+        try:
+            return lxml.html.fromstring(html_content)
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration
+            return lxml.html.fromstring(html_content.encode("utf-8"))
+        except Exception:
+            return None
+
+    def link_tags(self) -> List[Dict[str, str]]:
+        if self.root is None:
+            return []
+        return [
+            {"href": el.get("href", ""), "rel": el.get("rel", ""), "title": el.get("title", "")}
+            for el in self.root.iter("link") if el.get("href") is not None
+        ]
+
+    def anchors(self, selectors: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        if self.root is None:
+            return []
+        sections = [self.root] if selectors is None else [
+            section for selector in selectors for section in self.root.xpath(_css_to_xpath(selector))
+        ]
+        return [
+            {"href": el.get("href", ""), "text": _joined_text(el)}
+            for section in sections
+            for el in section.iter("a") if el.get("href") is not None
+        ]
+
+    def text(self, exclude_tags: Iterable[str] = ()) -> str:
+        if self.root is None:
+            return ""
+        excluded = set(exclude_tags)
+        parts: List[str] = []
+        self._collect_text(self.root, excluded, parts)
+        return " ".join(parts)
+
+    def _collect_text(self, element, excluded: set, parts: List[str]) -> None:
+        # Comments and processing instructions have a non-string tag; their text is not page content
+        is_element = isinstance(element.tag, str)
+        if is_element and element.tag not in excluded:
+            if element.text and element.text.strip():
+                parts.append(element.text.strip())
+            for child in element:
+                self._collect_text(child, excluded, parts)
+                if child.tail and child.tail.strip():
+                    parts.append(child.tail.strip())
+
+    def tables(self) -> List[HTMLTable]:
+        if self.root is None:
+            return []
+        tables = []
+        for table in self.root.iter("table"):
+            thead_row = None
+            thead = next(table.iter("thead"), None)
+            if thead is not None:
+                first_row = next(thead.iter("tr"), None)
+                if first_row is not None:
+                    thead_row = _lxml_row(first_row)
+            tables.append(HTMLTable(thead_row, [_lxml_row(row) for row in table.iter("tr")]))
+        return tables
+
+
+class SoupHTMLDocument(IHTMLDocument):
+    """BeautifulSoup backend, kept as the reference implementation"""
+
+    def __init__(self, html_content: str):
+        self.soup = BeautifulSoup(html_content or "", "lxml")
+
+    def link_tags(self) -> List[Dict[str, str]]:
+        return [
+            {"href": link.get("href", ""), "rel": " ".join(link.get("rel", [])), "title": link.get("title", "")}
+            for link in self.soup.find_all("link", href=True)
+        ]
+
+    def anchors(self, selectors: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        sections = [self.soup] if selectors is None else [
+            section for selector in selectors for section in self.soup.select(selector)
+        ]
+        return [
+            {"href": link.get("href", ""), "text": link.get_text(strip=True)}
+            for section in sections
+            for link in section.find_all("a", href=True)
+        ]
+
+    def text(self, exclude_tags: Iterable[str] = ()) -> str:
+        excluded = set(exclude_tags)
+        parts = []
+        for string in self.soup.find_all(string=True):
+            if string.__class__.__name__ not in ("NavigableString", "CData"):
+                continue
+            if any(parent.name in excluded for parent in string.parents):
+                continue
+            if string.strip():
+                parts.append(string.strip())
+        return " ".join(parts)
+
+    def tables(self) -> List[HTMLTable]:
+        tables = []
+        for table in self.soup.find_all("table"):
+            thead_row = None
+            thead = table.find("thead")
+            if thead:
+                first_row = thead.find("tr")
+                if first_row:
+                    thead_row = _soup_row(first_row)
+            tables.append(HTMLTable(thead_row, [_soup_row(row) for row in table.find_all("tr")]))
+        return tables
+
+
+HTML_DOCUMENT_BACKENDS = {
+    "lxml": LxmlHTMLDocument,
+    "bs4": SoupHTMLDocument,
+}
+
+
+def parse_html(html_content: Union[str, IHTMLDocument], backend: Optional[str] = None) -> IHTMLDocument:
+    """Parse an HTML payload once; already-parsed documents are returned unchanged"""
+    if isinstance(html_content, IHTMLDocument):
+        return html_content
+    backend_cls = HTML_DOCUMENT_BACKENDS.get(backend or settings.crawler.HTML_PARSER_BACKEND, LxmlHTMLDocument)
+    return backend_cls(html_content)
+
+
+def _joined_text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)"""
+    return "".join(s.strip() for s in element.itertext() if s.strip())
+
+
+def _lxml_row(row) -> List[TableCell]:
+    return [(cell.tag, _joined_text(cell)) for cell in row.iter("td", "th")]
+
+
+def _soup_row(row: Tag) -> List[TableCell]:
+    return [(cell.name, cell.get_text(strip=True)) for cell in row.find_all(["td", "th"])]
+
+
+_SIMPLE_SELECTOR = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:[.#][\w-]+)*)$")
+
+
+def _css_to_xpath(selector: str) -> str:
+    """Translate simple `tag`, `.class`, `#id` and `tag.class` selectors to XPath"""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match:
+        raise ValueError(f"Unsupported CSS selector for lxml backend: {selector}")
+    conditions = []
+    for kind, name in re.findall(r"([.#])([\w-]+)", match.group("rest")):
+        if kind == ".":
+            conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')")
+        else:
+            conditions.append(f"@id='{name}'")
+    xpath = f"//{match.group('tag') or '*'}"
+    if conditions:
+        xpath += "[" + " and ".join(conditions) + "]"
+    return xpath
@@ -1,6 +1,7 @@
 import jwt
 from datetime import datetime, timedelta
 import os
+import uuid
 from dotenv import load_dotenv, find_dotenv
 
 load_dotenv(find_dotenv())
@@ -12,7 +13,7 @@ JWT_EXP_DELTA_MINUTES = int(os.environ.get("JWT_EXP_DELTA_MINUTES", "60"))
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=JWT_EXP_DELTA_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 def decode_access_token(token: str):
@@ -0,0 +1,66 @@
+import base64
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from bson import ObjectId, json_util
+
+from src.configs.settings import settings
+from src.utils.cache_utils import TTLCache
+
+EXACT = "exact"
+ESTIMATED = "estimated"
+CACHED = "cached"
+TOTAL_MODES = (EXACT, ESTIMATED, CACHED)
+
+# Tổng số bản ghi của các danh sách không lọc, theo tên collection
+_total_cache = TTLCache(max_entries=64, ttl_seconds=settings.internal_api.LISTING_TOTAL_CACHE_TTL_SECONDS)
+
+
+class KeysetPage(NamedTuple):
+    rows: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+    total: int
+    total_is_estimate: bool = False
+
+
+def encode_cursor(sort_value: Any, last_id: ObjectId) -> str:
+    """Opaque cursor pointing just after the row (sort_value, last_id)"""
+    return base64.urlsafe_b64encode(json_util.dumps([sort_value, last_id]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    try:
+        sort_value, last_id = json_util.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError(f"Invalid pagination cursor: {cursor}")
+    if not isinstance(last_id, ObjectId):
+        raise ValueError(f"Invalid pagination cursor: {cursor}")
+    return sort_value, last_id
+
+
+def keyset_filter(sort_field: str, cursor: str) -> Dict[str, Any]:
+    """
+    Rows strictly after the cursor in (sort_field desc, _id desc) order.
+    Missing/null sort values come last in that order, so they stay reachable.
+    """
+    sort_value, last_id = decode_cursor(cursor)
+    if sort_field == "_id":
+        return {"_id": {"$lt": last_id}}
+    if sort_value is None:
+        return {sort_field: None, "_id": {"$lt": last_id}}
+    return {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "_id": {"$lt": last_id}},
+        {sort_field: None},
+    ]}
+
+
+def get_cached_total(collection_name: str) -> Optional[int]:
+    return _total_cache.get(collection_name)
+
+
+def set_cached_total(collection_name: str, total: int) -> None:
+    _total_cache.set(collection_name, total)
+
+
+def get_total_cache_stats() -> Dict[str, Any]:
+    return _total_cache.get_stats()
@@ -0,0 +1,258 @@
+"""
+Hạ tầng cho rule engine của ComplianceComparator.
+
+Các quy tắc trong `violation_rules` khai báo (qua decorator `rule`) loại cookie mà
+chúng áp dụng và các "fact" chúng cần. Fact cấp chính sách (policy-level) được tính
+một lần cho mỗi lần phân tích trong `PolicyFacts`; fact cấp cookie được tính lười
+và cache trong `RuleContext`, nên không quy tắc nào phải quét lại `policy_cookies`.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.configs.settings import settings
+from src.schemas.cookie import PolicyCookie, ActualCookie
+from src.utils.similarity import PurposeSimilarityIndex, get_purpose_index
+from src.utils.cookie_utils import (
+    parse_expiration_date,
+    parse_retention_to_days,
+    retention_days_until,
+    is_third_party_domain,
+)
+
+APPLIES_TO_ALL = "all"
+APPLIES_TO_DECLARED = "declared"
+APPLIES_TO_UNDECLARED = "undeclared"
+
+# ================= TRACKER DOMAIN INDEX =================
+
+class TrackerDomainIndex:
+    """Suffix index of known tracker domains: a cookie domain matches when it is a tracker domain or one of its subdomains"""
+
+    def __init__(self, trackers: Iterable[str]):
+        self.trackers = frozenset(t.lower().strip().lstrip(".") for t in trackers if t)
+        self._lookup = lru_cache(maxsize=4096)(self._matches)
+
+    def _matches(self, domain: str) -> bool:
+        labels = domain.lower().strip().lstrip(".").split(".")
+        return any(".".join(labels[i:]) in self.trackers for i in range(len(labels)))
+
+    def matches(self, domain: Optional[str]) -> bool:
+        return bool(domain) and self._lookup(domain)
+
+
+_tracker_index: Optional[TrackerDomainIndex] = None
+
+def get_tracker_index() -> TrackerDomainIndex:
+    """Index over settings.violation.KNOWN_AD_TRACKERS, built on first use"""
+    global _tracker_index
+    if _tracker_index is None:
+        _tracker_index = TrackerDomainIndex(settings.violation.KNOWN_AD_TRACKERS)
+    return _tracker_index
+
+# ================= FACT REGISTRIES =================
+
+POLICY_FACTS: Dict[str, Callable[["PolicyFacts"], Any]] = {}
+COOKIE_FACTS: Dict[str, Callable[["RuleContext"], Any]] = {}
+
+def policy_fact(name: str):
+    def decorator(func):
+        POLICY_FACTS[name] = func
+        return func
+    return decorator
+
+def cookie_fact(name: str):
+    def decorator(func):
+        COOKIE_FACTS[name] = func
+        return func
+    return decorator
+
+
+class PolicyFacts(dict):
+    """
+    Fact cấp chính sách, mỗi fact chỉ được tính một lần (khi được dùng lần đầu hoặc qua `precompute`).
+    `now` là mốc thời gian chung để mọi cookie trong cùng một lần phân tích tính retention như nhau;
+    `actual_cookies` cho phép các fact xử lý theo lô (vd. chấm điểm tương đồng cho mọi cookie một lần).
+    """
+
+    def __init__(
+        self,
+        policy_cookies: List[PolicyCookie],
+        main_domain: str,
+        now: Optional[datetime] = None,
+        actual_cookies: Iterable[ActualCookie] = ()
+    ):
+        super().__init__()
+        self.policy_cookies = policy_cookies
+        self.main_domain = main_domain
+        self.now = now or datetime.now()
+        self.actual_cookies = list(actual_cookies)
+
+    def __missing__(self, key: str) -> Any:
+        if key not in POLICY_FACTS:
+            raise KeyError(key)
+        value = self[key] = POLICY_FACTS[key](self)
+        return value
+
+    def precompute(self, names: Iterable[str]) -> "PolicyFacts":
+        for name in names:
+            self[name]
+        return self
+
+
+class RuleContext(dict):
+    """
+    Context truyền vào mỗi quy tắc cho một cookie thực tế.
+    Các khoá gốc (actual_cookie, policy_cookie, policy_cookies, main_domain, is_declared)
+    được đặt sẵn; fact cấp cookie được tính lười, còn lại tra trong PolicyFacts.
+    """
+
+    def __init__(self, actual_cookie: ActualCookie, policy_facts: PolicyFacts):
+        policy_cookie = policy_facts["policy_map"].get(actual_cookie.name)
+        super().__init__(
+            actual_cookie=actual_cookie,
+            policy_cookie=policy_cookie,
+            policy_cookies=policy_facts.policy_cookies,
+            main_domain=policy_facts.main_domain,
+            is_declared=actual_cookie.name in policy_facts["declared_names"],
+        )
+        self.policy_facts = policy_facts
+
+    def __missing__(self, key: str) -> Any:
+        if key in COOKIE_FACTS:
+            value = self[key] = COOKIE_FACTS[key](self)
+            return value
+        return self.policy_facts[key]
+
+# ================= POLICY-LEVEL FACTS =================
+
+@policy_fact("policy_map")
+def _policy_map(facts: PolicyFacts) -> Dict[str, PolicyCookie]:
+    return {cookie.cookie_name: cookie for cookie in facts.policy_cookies}
+
+@policy_fact("declared_names")
+def _declared_names(facts: PolicyFacts) -> set:
+    return set(facts["policy_map"].keys())
+
+@policy_fact("declared_purposes")
+def _declared_purposes(facts: PolicyFacts) -> List[str]:
+    return list(set([p.declared_purpose for p in facts.policy_cookies if p.declared_purpose] + settings.violation.STANDARD_PURPOSE_LABELS))
+
+@policy_fact("general_descriptions")
+def _general_descriptions(facts: PolicyFacts) -> List[str]:
+    # Mô tả của các mục chung (không có tên cookie cụ thể)
+    return [p.declared_description.lower() if p.declared_description else "" for p in facts.policy_cookies if not p.cookie_name]
+
+@policy_fact("has_vague_third_party_sharing")
+def _has_vague_third_party_sharing(facts: PolicyFacts) -> bool:
+    return any("third-part" in description for description in facts["general_descriptions"])
+
+@policy_fact("has_vague_retention")
+def _has_vague_retention(facts: PolicyFacts) -> bool:
+    return any(
+        any(term in description for term in ["reasonable", "necessary period"])
+        for description in facts["general_descriptions"]
+    )
+
+@policy_fact("mentions_third_party")
+def _mentions_third_party(facts: PolicyFacts) -> bool:
+    return any(p.declared_third_parties for p in facts.policy_cookies)
+
+@policy_fact("mentions_retention")
+def _mentions_retention(facts: PolicyFacts) -> bool:
+    return any(p.declared_retention for p in facts.policy_cookies)
+
+@policy_fact("declared_retention_days")
+def _declared_retention_days(facts: PolicyFacts) -> Dict[str, Optional[float]]:
+    return {name: parse_retention_to_days(p.declared_retention) for name, p in facts["policy_map"].items()}
+
+@policy_fact("declared_parties_lower")
+def _declared_parties_lower(facts: PolicyFacts) -> Dict[str, List[str]]:
+    return {name: [party.lower() for party in p.declared_third_parties] for name, p in facts["policy_map"].items()}
+
+@policy_fact("purpose_similarity")
+def _purpose_similarity(facts: PolicyFacts) -> PurposeSimilarityIndex:
+    index = get_purpose_index(facts["declared_purposes"])
+    # Chấm điểm mọi cookie đã khai báo trong một lần gọi backend
+    declared_names = facts["declared_names"]
+    index.score_many(c.name for c in facts.actual_cookies if c.name in declared_names)
+    return index
+
+@policy_fact("tracker_index")
+def _tracker_index_fact(facts: PolicyFacts) -> TrackerDomainIndex:
+    return get_tracker_index()
+
+# ================= COOKIE-LEVEL FACTS =================
+
+@cookie_fact("expiration_date")
+def _expiration_date(context: RuleContext) -> Optional[datetime]:
+    return parse_expiration_date(context["actual_cookie"].expirationDate)
+
+@cookie_fact("actual_days")
+def _actual_days(context: RuleContext) -> Optional[int]:
+    return retention_days_until(context["expiration_date"], context.policy_facts.now)
+
+@cookie_fact("declared_days")
+def _declared_days(context: RuleContext) -> Optional[float]:
+    return context["declared_retention_days"].get(context["actual_cookie"].name)
+
+@cookie_fact("declared_parties")
+def _declared_parties(context: RuleContext) -> List[str]:
+    return context["declared_parties_lower"].get(context["actual_cookie"].name, [])
+
+@cookie_fact("is_third_party")
+def _is_third_party(context: RuleContext) -> bool:
+    return is_third_party_domain(context["actual_cookie"].domain, context["main_domain"])
+
+@cookie_fact("purpose_similarity_score")
+def _purpose_similarity_score(context: RuleContext) -> float:
+    return context["purpose_similarity"].score(context["actual_cookie"].name)
+
+@cookie_fact("is_known_tracker")
+def _is_known_tracker(context: RuleContext) -> bool:
+    return context["tracker_index"].matches(context["actual_cookie"].domain)
+
+# ================= RULE DECLARATION & COMPILATION =================
+
+def rule(applies_to: str = APPLIES_TO_ALL, requires: Tuple[str, ...] = ()):
+    """Khai báo loại cookie mà quy tắc áp dụng và các fact nó phụ thuộc"""
+    def decorator(func):
+        unknown = [name for name in requires if name not in POLICY_FACTS and name not in COOKIE_FACTS]
+        if unknown:
+            raise ValueError(f"Rule {func.__name__} requires unknown facts: {unknown}")
+        func.applies_to = applies_to
+        func.requires = tuple(requires)
+        return func
+    return decorator
+
+
+class CompiledRuleSet:
+    """
+    Danh sách quy tắc đã được "biên dịch": chia sẵn theo cookie được khai báo / không
+    được khai báo (giữ nguyên thứ tự gốc) và gom các policy fact cần tính trước.
+    Quy tắc không có khai báo được coi là áp dụng cho mọi cookie.
+    """
+
+    def __init__(self, rules: List[Callable]):
+        self.rules = list(rules)
+        self.declared_rules = [r for r in self.rules if getattr(r, "applies_to", APPLIES_TO_ALL) != APPLIES_TO_UNDECLARED]
+        self.undeclared_rules = [r for r in self.rules if getattr(r, "applies_to", APPLIES_TO_ALL) != APPLIES_TO_DECLARED]
+
+        required = {"policy_map", "declared_names"}
+        for r in self.rules:
+            for name in getattr(r, "requires", ()):
+                if name in POLICY_FACTS:
+                    required.add(name)
+        self.policy_fact_names = sorted(required)
+
+    def build_policy_facts(
+        self,
+        policy_cookies: List[PolicyCookie],
+        main_domain: str,
+        now: Optional[datetime] = None,
+        actual_cookies: Iterable[ActualCookie] = ()
+    ) -> PolicyFacts:
+        return PolicyFacts(policy_cookies, main_domain, now, actual_cookies).precompute(self.policy_fact_names)
+
+    def rules_for(self, context: RuleContext) -> List[Callable]:
+        return self.declared_rules if context["is_declared"] else self.undeclared_rules
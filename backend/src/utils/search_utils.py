@@ -1,15 +1,56 @@
 import re
 from loguru import logger
 import asyncio
-from typing import List, Dict, Optional
+from typing import Any, Awaitable, Callable, List, Dict, Optional
 from urllib.parse import urlparse, quote_plus, urljoin
-from playwright.async_api import Browser, Page
+from playwright.async_api import Page
+
+from src.configs.settings import settings
+from src.exceptions.custom_exceptions import SearchError
+from src.services.policy_crawler_service.components.browser_pool import BrowserPool
+from src.utils.cache_utils import TTLCache
+from src.utils.concurrency_utils import RateLimiter
+
+# Kết quả "đã tìm nhưng không có URL chính sách" (cache âm), khác với None = lỗi khi tìm
+_NO_RESULT = ""
+
+# Dùng chung cho mọi SearchService của tiến trình
+_result_cache = TTLCache(
+    max_entries=settings.policy_discovery.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.policy_discovery.SEARCH_CACHE_TTL_SECONDS
+)
+_rate_limiters = {
+    engine: RateLimiter(settings.policy_discovery.SEARCH_RATE_PER_SECOND, burst=settings.policy_discovery.SEARCH_RATE_BURST)
+    for engine in ("bing", "google")
+}
+
+SearchRunner = Callable[[Any, str, str, str], Awaitable[Optional[str]]]
+
+
+def get_search_metrics() -> Dict[str, Any]:
+    """Search result cache counters and time spent waiting on the per-engine rate limiters"""
+    return {
+        "cache": _result_cache.get_stats(),
+        "rate_limit_waited_seconds": {
+            engine: round(limiter.waited_seconds_total, 3) for engine, limiter in _rate_limiters.items()
+        },
+    }
+
 
 class SearchService:
     """Service for finding cookie policies through search engines"""
 
-    def __init__(self, browser: Browser):
-        self.browser = browser
+    def __init__(
+        self,
+        browser_pool: BrowserPool,
+        result_cache: Optional[TTLCache] = None,
+        rate_limiters: Optional[Dict[str, RateLimiter]] = None,
+        negative_ttl_seconds: float = settings.policy_discovery.SEARCH_NEGATIVE_CACHE_TTL_SECONDS
+    ):
+        self.browser_pool = browser_pool
+        self.result_cache = result_cache if result_cache is not None else _result_cache
+        self.rate_limiters = rate_limiters if rate_limiters is not None else _rate_limiters
+        self.negative_ttl_seconds = negative_ttl_seconds
 
         # Enhanced cookie policy patterns for scoring search results
         self.cookie_policy_patterns = [
@@ -87,62 +128,108 @@ class SearchService:
 
     async def search_policy_with_bing(self, website_url: str) -> Optional[str]:
         """Search for cookie policy using Bing search"""
-        if not self.browser:
-            logger.warning("Browser not available, skipping Bing search")
+        if not self.browser_pool:
+            logger.warning("Browser pool not available, skipping Bing search")
             return None
 
+        domain = urlparse(website_url).netloc
+        # Enhanced search queries with better targeting
+        search_queries = [
+            f'site:{domain} "cookie policy"',
+            f'site:{domain} cookies',
+            f'site:{domain} "use of cookies"',
+            f'site:{domain} "manage cookies"',
+        ]
+        return await self._search("bing", website_url, search_queries, self._run_bing_search)
+
+    async def _search(self, engine: str, website_url: str, queries: List[str], run_search: SearchRunner) -> Optional[str]:
+        """
+        Answer from the result cache where possible, otherwise run the uncached queries
+        concurrently in one leased browser context. The first query returning a valid
+        policy URL wins and the others are cancelled. Raises SearchError when no policy
+        was found and some query failed, so callers can tell an outage from a clean miss.
+        """
         try:
-            logger.info(f"Searching policy with Bing for: {website_url}")
+            logger.info(f"Searching policy with {engine} for: {website_url}")
 
             # Extract domain and URL root
-            parsed_url = urlparse(website_url)
-            domain = parsed_url.netloc
+            domain = urlparse(website_url).netloc
             url_root = self._extract_url_root(website_url)
 
             # Skip localhost and local development URLs
             if 'localhost' in domain or '127.0.0.1' in domain or domain.startswith('192.168.'):
-                logger.info(f"Skipping Bing search for local domain: {domain}")
+                logger.info(f"Skipping {engine} search for local domain: {domain}")
                 return None
 
-            # Enhanced search queries with better targeting
-            search_queries = [
-                f'site:{domain} "cookie policy"',
-                f'site:{domain} cookies',
-                f'site:{domain} "use of cookies"',
-                f'site:{domain} "manage cookies"',
-            ]
-
-            # Try each search query
-            for query in search_queries:
-                logger.info(f"Trying Bing search query: {query}")
-
-                policy_url = await self._perform_bing_search(query, domain, url_root)
-                if policy_url and self._is_valid_policy_url(policy_url, url_root):
-                    logger.info(f"Found valid policy URL via Bing: {policy_url}")
-                    return policy_url
-
-                # Small delay between searches to avoid rate limiting
-                await asyncio.sleep(1)
+            pending = []
+            for query in queries:
+                cached = self.result_cache.get((engine, domain, query))
+                if cached:
+                    logger.info(f"Search cache hit for {query!r}: {cached}")
+                    return cached
+                if cached is None:
+                    pending.append(query)
+
+            if not pending:
+                logger.info(f"All {engine} queries for {domain} are cached without a policy URL")
+                return None
 
-            logger.info("Bing search completed - no valid results found")
+            failed = 0
+            async with self.browser_pool.lease() as context:
+                tasks = [
+                    asyncio.create_task(self._run_query(engine, run_search, context, query, domain, url_root))
+                    for query in pending
+                ]
+                try:
+                    for finished in asyncio.as_completed(tasks):
+                        policy_url = await finished
+                        if policy_url:
+                            logger.info(f"Found valid policy URL via {engine}: {policy_url}")
+                            return policy_url
+                        if policy_url is None:
+                            failed += 1
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+            if failed:
+                # Truy vấn lỗi không chứng minh được site không có chính sách
+                raise SearchError(f"{failed} of {len(pending)} {engine} queries failed for {domain}")
+            logger.info(f"{engine} search completed - no valid results found")
             return None
 
+        except SearchError:
+            raise
         except Exception as e:
-            logger.error(f"Bing search error: {str(e)}")
+            logger.error(f"{engine} search error: {str(e)}")
+            raise SearchError(f"{engine} search error: {e}") from e
+
+    async def _run_query(
+        self, engine: str, run_search: SearchRunner, context, query: str, domain: str, url_root: str
+    ) -> Optional[str]:
+        """Run one rate-limited query and cache its outcome: the policy URL, "" when none, None on failure (not cached)"""
+        rate_limiter = self.rate_limiters.get(engine)
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        logger.info(f"Trying {engine} search query: {query}")
+
+        policy_url = await run_search(context, query, domain, url_root)
+        if policy_url is None:
             return None
-
-    async def _perform_bing_search(self, query: str, domain: str, url_root: str) -> Optional[str]:
-        """Perform a single Bing search query"""
+        if policy_url and self._is_valid_policy_url(policy_url, url_root):
+            self.result_cache.set((engine, domain, query), policy_url)
+            return policy_url
+        self.result_cache.set((engine, domain, query), _NO_RESULT, ttl_seconds=self.negative_ttl_seconds)
+        return _NO_RESULT
+
+    async def _run_bing_search(self, context, query: str, domain: str, url_root: str) -> Optional[str]:
+        """Perform a single Bing search query: the policy URL, "" when the results hold none, None on failure"""
         page = None
         try:
-            # Check if browser is still available
-            if not self.browser:
-                logger.error("Browser is not available, cannot perform search")
-                return None
-
             # Create new page with proper error handling
             try:
-                page = await self.browser.new_page()
+                page = await context.new_page()
             except Exception as page_error:
                 logger.error(f"Failed to create new page: {str(page_error)}")
                 return None
@@ -230,10 +317,10 @@ class SearchService:
             if results:
                 logger.info(f"Found {len(results)} search results")
                 policy_url = self._extract_policy_from_search_results(results, domain, url_root)
-                return policy_url
+                return policy_url or _NO_RESULT
             else:
                 logger.info("No search results found")
-                return None
+                return _NO_RESULT
 
         except Exception as e:
             logger.error(f"Error performing Bing search: {str(e)}")
@@ -331,53 +418,23 @@ class SearchService:
 
     async def search_policy_with_google(self, website_url: str) -> Optional[str]:
         """Search for cookie policy using Google search (alternative method)"""
-        if not self.browser:
-            logger.warning("Browser not available, skipping Google search")
-            return None
-
-        try:
-            logger.info(f"Searching policy with Google for: {website_url}")
-
-            # Extract domain and URL root
-            parsed_url = urlparse(website_url)
-            domain = parsed_url.netloc
-            url_root = self._extract_url_root(website_url)
-
-            # Skip localhost and local development URLs
-            if 'localhost' in domain or '127.0.0.1' in domain or domain.startswith('192.168.'):
-                logger.info(f"Skipping Google search for local domain: {domain}")
-                return None
-
-            # Google search queries
-            search_queries = [
-                f'site:{domain} "cookie policy"',
-                f'{domain} cookie policy',
-            ]
-
-            # Try each search query
-            for query in search_queries:
-                logger.info(f"Trying Google search query: {query}")
-
-                policy_url = await self._perform_google_search(query, domain, url_root)
-                if policy_url and self._is_valid_policy_url(policy_url, url_root):
-                    logger.info(f"Found valid policy URL via Google: {policy_url}")
-                    return policy_url
-
-                # Small delay between searches
-                await asyncio.sleep(1)
-
-            logger.info("Google search completed - no valid results found")
+        if not self.browser_pool:
+            logger.warning("Browser pool not available, skipping Google search")
             return None
 
-        except Exception as e:
-            logger.error(f"Google search error: {str(e)}")
-            return None
+        domain = urlparse(website_url).netloc
+        # Google search queries
+        search_queries = [
+            f'site:{domain} "cookie policy"',
+            f'{domain} cookie policy',
+        ]
+        return await self._search("google", website_url, search_queries, self._run_google_search)
 
-    async def _perform_google_search(self, query: str, domain: str, url_root: str) -> Optional[str]:
-        """Perform a single Google search query"""
+    async def _run_google_search(self, context, query: str, domain: str, url_root: str) -> Optional[str]:
+        """Perform a single Google search query: the policy URL, "" when the results hold none, None on failure"""
         page = None
         try:
-            page = await self.browser.new_page()
+            page = await context.new_page()
             page.set_default_timeout(15000)
 
             await page.set_extra_http_headers({
@@ -424,9 +481,9 @@ class SearchService:
 
             if results:
                 logger.info(f"Found {len(results)} Google search results")
-                return self._extract_policy_from_search_results(results, domain, url_root)
+                return self._extract_policy_from_search_results(results, domain, url_root) or _NO_RESULT
 
-            return None
+            return _NO_RESULT
 
         except Exception as e:
             logger.error(f"Error performing Google search: {str(e)}")
@@ -0,0 +1,160 @@
+"""
+Backend tính độ tương đồng giữa tên cookie và nhãn mục đích (quy tắc 8).
+
+`DifflibSimilarityBackend` giữ nguyên hành vi gốc (SequenceMatcher cho từng cặp) và
+là bản tham chiếu cho kiểm thử parity. `NgramSimilarityBackend` vector hoá nhãn một
+lần thành ma trận n-gram ký tự nhị phân và chấm điểm mọi tên cookie với mọi nhãn
+bằng một phép nhân ma trận NumPy (hệ số Dice trên tập n-gram).
+"""
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from src.configs.settings import settings
+from src.utils.cache_utils import TTLCache
+from src.utils.cookie_utils import calculate_semantic_similarity
+
+
+class ISimilarityBackend(ABC):
+    """Chấm điểm tương đồng lớn nhất của mỗi tên với một tập nhãn cố định"""
+
+    name: str = ""
+
+    @abstractmethod
+    def prepare(self, labels: Sequence[str]) -> object:
+        """Tiền xử lý tập nhãn (một lần cho mỗi tập nhãn)"""
+        pass
+
+    @abstractmethod
+    def max_scores(self, prepared: object, names: Sequence[str]) -> List[float]:
+        """Điểm tương đồng lớn nhất của từng tên với các nhãn đã chuẩn bị"""
+        pass
+
+
+class DifflibSimilarityBackend(ISimilarityBackend):
+    name = "difflib"
+
+    def prepare(self, labels: Sequence[str]) -> object:
+        return list(labels)
+
+    def max_scores(self, prepared: object, names: Sequence[str]) -> List[float]:
+        return [max((calculate_semantic_similarity(name, label) for label in prepared), default=0.0) for name in names]
+
+
+class NgramSimilarityBackend(ISimilarityBackend):
+    name = "ngram"
+
+    def __init__(self, n: int = 2):
+        self.n = max(1, n)
+
+    def ngrams(self, text: str) -> set:
+        text = (text or "").lower().strip()
+        if len(text) < self.n:
+            return {text} if text else set()
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def prepare(self, labels: Sequence[str]) -> object:
+        import numpy as np
+
+        vocabulary: Dict[str, int] = {}
+        label_grams = [self.ngrams(label) for label in labels]
+        for grams in label_grams:
+            for gram in grams:
+                vocabulary.setdefault(gram, len(vocabulary))
+
+        matrix = np.zeros((len(labels), max(1, len(vocabulary))), dtype=np.float32)
+        for row, grams in enumerate(label_grams):
+            matrix[row, [vocabulary[g] for g in grams]] = 1.0
+        return vocabulary, matrix, matrix.sum(axis=1)
+
+    def max_scores(self, prepared: object, names: Sequence[str]) -> List[float]:
+        import numpy as np
+
+        vocabulary, label_matrix, label_sizes = prepared
+        if not names or not len(label_sizes):
+            return [0.0] * len(names)
+
+        name_matrix = np.zeros((len(names), label_matrix.shape[1]), dtype=np.float32)
+        name_sizes = np.zeros(len(names), dtype=np.float32)
+        for row, name in enumerate(names):
+            grams = self.ngrams(name)
+            name_sizes[row] = len(grams)
+            # n-gram không có trong nhãn nào chỉ làm tăng mẫu số
+            columns = [vocabulary[g] for g in grams if g in vocabulary]
+            if columns:
+                name_matrix[row, columns] = 1.0
+
+        # Dice = 2|A ∩ B| / (|A| + |B|) cho mọi cặp (tên, nhãn) trong một phép nhân ma trận
+        overlap = name_matrix @ label_matrix.T
+        totals = name_sizes[:, None] + label_sizes[None, :]
+        scores = np.divide(2.0 * overlap, totals, out=np.zeros_like(overlap), where=totals > 0)
+        return [float(score) for score in scores.max(axis=1)]
+
+
+SIMILARITY_BACKENDS = {
+    DifflibSimilarityBackend.name: DifflibSimilarityBackend,
+    NgramSimilarityBackend.name: NgramSimilarityBackend,
+}
+
+
+def create_similarity_backend(name: str = None) -> ISimilarityBackend:
+    name = (name or settings.violation.SEMANTIC_SIMILARITY_BACKEND).lower()
+    if name not in SIMILARITY_BACKENDS:
+        raise ValueError(f"Unsupported similarity backend: {name}. Available: {list(SIMILARITY_BACKENDS)}")
+    if name == NgramSimilarityBackend.name:
+        return NgramSimilarityBackend(settings.violation.SEMANTIC_SIMILARITY_NGRAM_SIZE)
+    return SIMILARITY_BACKENDS[name]()
+
+
+class PurposeSimilarityIndex:
+    """
+    Nhãn mục đích đã được vector hoá cùng cache tên cookie -> điểm lớn nhất.
+    `score_many` chấm điểm mọi tên chưa có trong cache trong một lần gọi backend.
+    """
+
+    def __init__(self, backend: ISimilarityBackend, labels: Sequence[str], max_cached_names: int = 4096):
+        self.backend = backend
+        self.labels = tuple(labels)
+        self._prepared = backend.prepare(self.labels)
+        self._scores = TTLCache(max_entries=max_cached_names)
+        self._lock = Lock()
+
+    def score_many(self, names: Iterable[str]) -> Dict[str, float]:
+        names = list(dict.fromkeys(names))
+        with self._lock:
+            missing = [name for name in names if name not in self._scores]
+            if missing:
+                for name, score in zip(missing, self.backend.max_scores(self._prepared, missing)):
+                    self._scores.set(name, score)
+            return {name: self._cached(name) for name in names}
+
+    def score(self, name: str) -> float:
+        return self.score_many([name])[name]
+
+    def _cached(self, name: str) -> float:
+        score = self._scores.get(name)
+        if score is None:
+            # Bị loại khỏi LRU ngay trong lần gọi này (lô lớn hơn max_cached_names)
+            score = self.backend.max_scores(self._prepared, [name])[0]
+        return score
+
+    def get_stats(self) -> Dict[str, object]:
+        return {"backend": self.backend.name, "labels": len(self.labels), **self._scores.get_stats()}
+
+
+_indexes = TTLCache(max_entries=settings.violation.SEMANTIC_SIMILARITY_INDEX_CACHE_SIZE)
+_indexes_lock = Lock()
+
+def get_purpose_index(labels: Sequence[str], backend_name: str = None) -> PurposeSimilarityIndex:
+    """Index dùng chung theo (backend, tập nhãn), để các lần phân tích có cùng nhãn tái sử dụng vector và điểm"""
+    backend_name = (backend_name or settings.violation.SEMANTIC_SIMILARITY_BACKEND).lower()
+    key: Tuple[str, Tuple[str, ...]] = (backend_name, tuple(sorted(labels)))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = PurposeSimilarityIndex(
+                create_similarity_backend(backend_name), key[1],
+                settings.violation.SEMANTIC_SIMILARITY_NAME_CACHE_SIZE
+            )
+            _indexes.set(key, index)
+        return index
@@ -1,14 +1,14 @@
-from typing import List, Dict
-from bs4 import BeautifulSoup, Tag
+from typing import List, Dict, Union
+
+from src.utils.html_document import HTMLTable, IHTMLDocument, parse_html
 
 class TableExtractor:
     """Utility class for extracting table data from HTML"""
 
-    def extract_tables_from_html(self, html_content: str) -> List[dict]:
-        """Extract and structure table data from HTML content"""
+    def extract_tables_from_html(self, html_content: Union[str, IHTMLDocument]) -> List[dict]:
+        """Extract and structure table data from HTML content (raw string or an already parsed document)"""
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
-            tables = soup.find_all('table')
+            tables = parse_html(html_content).tables()
             extracted_tables = []
 
             for i, table in enumerate(tables):
@@ -44,46 +44,41 @@ class TableExtractor:
         except Exception:
             return []
 
-    def _extract_table_headers(self, table: Tag) -> List[str]:
+    def _extract_table_headers(self, table: HTMLTable) -> List[str]:
         """Extract headers from table with improved logic"""
         headers = []
 
         # Try thead first
-        thead = table.find('thead')
-        if thead:
-            header_row = thead.find('tr')
-            if header_row:
-                headers = [th.get_text(strip=True) for th in header_row.find_all(['th', 'td'])]
+        if table.thead_row:
+            headers = [text for _, text in table.thead_row]
 
         # If no thead, try first row with th elements
+        first_row = table.rows[0] if table.rows else None
         if not headers:
-            first_row = table.find('tr')
-            if first_row and first_row.find_all('th'):
-                headers = [th.get_text(strip=True) for th in first_row.find_all('th')]
+            if first_row and any(tag == 'th' for tag, _ in first_row):
+                headers = [text for tag, text in first_row if tag == 'th']
 
         # If still no headers, use first row as headers if it looks like headers
         if not headers:
-            first_row = table.find('tr')
             if first_row:
-                potential_headers = [td.get_text(strip=True) for td in first_row.find_all('td')]
+                potential_headers = [text for tag, text in first_row if tag == 'td']
                 if self._looks_like_headers(potential_headers):
                     headers = potential_headers
 
         return [h for h in headers if h]
 
-    def _extract_table_rows(self, table: Tag, headers: List[str]) -> List[Dict[str, str]]:
+    def _extract_table_rows(self, table: HTMLTable, headers: List[str]) -> List[Dict[str, str]]:
         """Extract data rows from table"""
         rows = []
-        all_rows = table.find_all('tr')
+        all_rows = table.rows
         data_rows = all_rows[1:] if len(all_rows) > 1 else all_rows
 
-        for row in data_rows:
-            cells = row.find_all(['td', 'th'])
+        for cells in data_rows:
             if len(cells) == len(headers):
                 row_data = {}
-                for i, cell in enumerate(cells):
+                for i, (_, text) in enumerate(cells):
                     if i < len(headers):
-                        row_data[headers[i]] = cell.get_text(strip=True)
+                        row_data[headers[i]] = text
                 rows.append(row_data)
 
         return rows
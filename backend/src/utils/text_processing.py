@@ -1,28 +1,27 @@
 import re
 import json
 from urllib.parse import urlparse
-from typing import Optional
+from typing import Optional, Union
 import asyncio
 import langdetect
 from concurrent.futures import ThreadPoolExecutor
 
+from src.utils.html_document import IHTMLDocument, parse_html
+
 class TextProcessor:
+    EXCLUDED_TAGS = ('script', 'style', 'footer', 'header', 'nav',
+                     'form', 'iframe', 'aside', 'meta', 'link', 'noscript')
+
     def __init__(self, executor: ThreadPoolExecutor):
         self._executor = executor
 
-    async def extract_clean_text(self, html_content: str) -> str:
-        """Extract and clean text content from HTML"""
+    async def extract_clean_text(self, html_content: Union[str, IHTMLDocument]) -> str:
+        """Extract and clean text content from HTML (raw string or an already parsed document)"""
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'lxml')
-
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'footer', 'header', 'nav',
-                               'form', 'iframe', 'aside', 'meta', 'link', 'noscript']):
-                element.decompose()
+            document = parse_html(html_content)
 
-            # Get text content
-            text = soup.get_text(separator=' ', strip=True)
+            # Get text content, skipping unwanted elements
+            text = document.text(exclude_tags=self.EXCLUDED_TAGS)
 
             # Clean up the text
             text = re.sub(r'\s+', ' ', text)
@@ -1,56 +1,218 @@
-import time
 import asyncio
-from typing import Dict
+import re
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
 from deep_translator import GoogleTranslator
 from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+
+from src.configs.settings import settings
+from src.exceptions.custom_exceptions import TranslationError
+from src.repositories.translation_cache_repository import TranslationCacheRepository
+from src.utils.cache_utils import TTLCache, stable_digest
+from src.utils.concurrency_utils import RateLimiter, SingleFlight
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+")
+# Đoạn không cần dịch: chỉ gồm số, dấu câu, khoảng trắng
+_UNTRANSLATABLE = re.compile(r"^[\W\d_]*$")
+
 
 class TranslationManager:
-    def __init__(self, executor: ThreadPoolExecutor):
-        self._executor = executor
-        self._translation_cache: Dict[str, str] = {}
+    """
+    Translates policy content with:
+    - sentence-aware chunking: long paragraphs are split on sentences, and paragraphs
+      are batched into translator requests of at most `chunk_size` characters
+    - paragraph de-duplication: repeated paragraphs are translated once
+    - concurrent chunk requests bounded by `max_concurrency` and a shared rate limiter
+    - an in-process LRU (documents and chunks) plus a Mongo tier, keyed by a stable
+      digest of the normalised content and the language pair
+    - coalescing of concurrent requests for the same document
+    """
 
-    async def translate_content_to_english(self, content: str) -> str:
+    def __init__(
+        self,
+        executor: Optional[ThreadPoolExecutor] = None,
+        repository: Optional[TranslationCacheRepository] = None,
+        chunk_size: int = settings.crawler.TRANSLATION_CHUNK_SIZE,
+        max_concurrency: int = settings.crawler.TRANSLATION_MAX_CONCURRENCY,
+        rate_per_second: float = settings.crawler.TRANSLATION_RATE_PER_SECOND,
+        max_entries: int = settings.crawler.TRANSLATION_CACHE_MAX_ENTRIES,
+        persistent_ttl_seconds: int = settings.crawler.TRANSLATION_CACHE_TTL_SECONDS,
+        translate_func: Optional[Callable[[str, str, str], str]] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = executor or ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="translation")
+        self.repository = repository
+        self.chunk_size = max(1, chunk_size)
+        self.persistent_ttl_seconds = persistent_ttl_seconds
+        self._translate_func = translate_func or self._google_translate
+        self._memory = TTLCache(max_entries=max_entries)
+        self._rate_limiter = RateLimiter(rate_per_second, burst=self.max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._single_flight = SingleFlight()
+        self._metrics = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "chunk_requests": 0,
+            "chunk_cache_hits": 0,
+            "deduplicated_paragraphs": 0,
+            "errors": 0,
+        }
+
+    async def translate_content_to_english(self, content: str, strict: bool = False) -> str:
         """Translate content to English with caching and error handling"""
+        return await self.translate(content, source_lang="auto", target_lang="en", strict=strict)
+
+    async def translate(self, content: str, source_lang: str = "auto", target_lang: str = "en", strict: bool = False) -> str:
+        """
+        Translate content; on failure the original content is returned (and not cached),
+        or TranslationError is raised when `strict` is set
+        """
         if not content or not content.strip():
             return content
 
-        # Check cache first
-        content_hash = str(hash(content))
-        if content_hash in self._translation_cache:
-            return self._translation_cache[content_hash]
+        key = self.build_key(content, source_lang, target_lang)
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._metrics["memory_hits"] += 1
+            return cached
 
         try:
-            loop = asyncio.get_event_loop()
-            translated = await loop.run_in_executor(
-                self._executor,
-                self._translate_text,
-                content
-            )
+            return await self._single_flight.do(key, lambda: self._translate_document(key, content, source_lang, target_lang))
+        except TranslationError:
+            if strict:
+                raise
+            return content
 
-            self._translation_cache[content_hash] = translated
-            return translated
+    @staticmethod
+    def build_key(content: str, source_lang: str, target_lang: str) -> str:
+        normalized = unicodedata.normalize("NFKC", content).strip()
+        return stable_digest("translation", source_lang, target_lang, normalized)
 
-        except Exception:
-            return content
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self._metrics,
+            "coalesced": self._single_flight.coalesced,
+            "rate_limit_wait_seconds": round(self._rate_limiter.waited_seconds_total, 3),
+            "memory": self._memory.get_stats(),
+        }
 
-    def _translate_text(self, text: str) -> str:
-        """Synchronous translation method for thread pool"""
+    async def _translate_document(self, key: str, content: str, source_lang: str, target_lang: str) -> str:
+        if self.repository is not None:
+            try:
+                entry = await self.repository.get_translation(key)
+                if entry:
+                    self._metrics["persistent_hits"] += 1
+                    self._memory.set(key, entry["translated"])
+                    return entry["translated"]
+            except Exception as e:
+                logger.warning(f"Translation cache lookup failed: {e}")
+
+        self._metrics["misses"] += 1
         try:
-            max_chunk_size = 4000
-            if len(text) <= max_chunk_size:
-                return GoogleTranslator(source='auto', target='en').translate(text)
+            translated = await self._translate_text(content, source_lang, target_lang)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Translation failed: {e}")
+            raise TranslationError(str(e)) from e
+
+        self._memory.set(key, translated)
+        if self.repository is not None:
+            try:
+                await self.repository.save_translation(key, translated, source_lang, target_lang, self.persistent_ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Could not persist translation: {e}")
+        return translated
+
+    async def _translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
+        # Mỗi đoạn (dòng) thành một hoặc nhiều phần theo câu; dòng trống và đoạn không chữ giữ nguyên
+        paragraphs = text.split("\n")
+        layout: List[List[str]] = [self._split_paragraph(p) if self._needs_translation(p) else [] for p in paragraphs]
+
+        units = list(dict.fromkeys(unit for chunks in layout for unit in chunks))
+        self._metrics["deduplicated_paragraphs"] += sum(len(chunks) for chunks in layout) - len(units)
+
+        translated: Dict[str, str] = {}
+        missing = []
+        for unit in units:
+            cached = self._memory.get(self.build_key(unit, source_lang, target_lang))
+            if cached is not None:
+                self._metrics["chunk_cache_hits"] += 1
+                translated[unit] = cached
+            else:
+                missing.append(unit)
+
+        batches = self._pack_batches(missing)
+        for batch_result in await asyncio.gather(*[self._translate_batch(batch, source_lang, target_lang) for batch in batches]):
+            translated.update(batch_result)
+
+        return "\n".join(
+            " ".join(translated[unit] for unit in chunks) if chunks else paragraph
+            for paragraph, chunks in zip(paragraphs, layout)
+        )
+
+    def _pack_batches(self, units: List[str]) -> List[List[str]]:
+        """Group consecutive units into translator requests of at most chunk_size characters"""
+        batches, current, size = [], [], 0
+        for unit in units:
+            if current and size + 1 + len(unit) > self.chunk_size:
+                batches.append(current)
+                current, size = [], 0
+            size += len(unit) + (1 if current else 0)
+            current.append(unit)
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _translate_batch(self, batch: List[str], source_lang: str, target_lang: str) -> Dict[str, str]:
+        """One request per batch (units joined by newlines); falls back to per-unit requests if the line structure is lost"""
+        lines = (await self._request("\n".join(batch), source_lang, target_lang)).split("\n")
+        if len(batch) > 1 and len(lines) != len(batch):
+            lines = await asyncio.gather(*[self._request(unit, source_lang, target_lang) for unit in batch])
+        elif len(batch) == 1:
+            lines = ["\n".join(lines)]
+
+        result = {}
+        for unit, line in zip(batch, lines):
+            result[unit] = line.strip() or unit
+            self._memory.set(self.build_key(unit, source_lang, target_lang), result[unit])
+        return result
+
+    async def _request(self, text: str, source_lang: str, target_lang: str) -> str:
+        async with self._semaphore:
+            await self._rate_limiter.acquire()
+            self._metrics["chunk_requests"] += 1
+            loop = asyncio.get_running_loop()
+            translated = await loop.run_in_executor(self._executor, self._translate_func, text, source_lang, target_lang)
+        if translated is None:
+            raise TranslationError("Translator returned no text")
+        return translated
 
-            # Handle long text by splitting into chunks
-            chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-            translated_chunks = []
+    def _split_paragraph(self, paragraph: str) -> List[str]:
+        paragraph = paragraph.strip()
+        if len(paragraph) <= self.chunk_size:
+            return [paragraph]
 
-            for chunk in chunks:
-                if chunk.strip():
-                    translated = GoogleTranslator(source='auto', target='en').translate(chunk)
-                    translated_chunks.append(translated)
-                    time.sleep(0.1)
+        chunks, current = [], ""
+        for sentence in _SENTENCE_END.split(paragraph):
+            # Câu dài hơn cả chunk_size thì mới phải cắt cứng
+            pieces = [sentence[i:i + self.chunk_size] for i in range(0, len(sentence), self.chunk_size)] or [""]
+            for piece in pieces:
+                if current and len(current) + 1 + len(piece) > self.chunk_size:
+                    chunks.append(current)
+                    current = piece
+                else:
+                    current = f"{current} {piece}" if current else piece
+        if current:
+            chunks.append(current)
+        return chunks
 
-            return ' '.join(translated_chunks)
+    @staticmethod
+    def _needs_translation(paragraph: str) -> bool:
+        return bool(paragraph.strip()) and not _UNTRANSLATABLE.match(paragraph.strip())
 
-        except Exception:
-            return text
+    @staticmethod
+    def _google_translate(text: str, source_lang: str, target_lang: str) -> str:
+        """Synchronous translation call, run in the manager's thread pool"""
+        return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
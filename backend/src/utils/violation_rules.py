@@ -2,18 +2,16 @@
 Module này chứa tất cả các quy tắc kiểm tra vi phạm cookie.
 Mỗi quy tắc là một hàm độc lập, nhận một `context` và trả về một `ComplianceIssue` nếu có vi phạm,
 hoặc `None` nếu không.
+
+`context` là một `RuleContext` (xem `rule_engine`): ngoài các khoá gốc, quy tắc đọc các fact
+đã khai báo trong `@rule(requires=...)` thay vì tự quét lại `policy_cookies`.
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
 
 from src.schemas.cookie import PolicyCookie, ActualCookie
 from src.schemas.violation import ComplianceIssue
-from src.utils.cookie_utils import (
-    calculate_actual_retention_days,
-    parse_retention_to_days,
-    is_third_party_domain,
-    calculate_semantic_similarity,
-    analyze_cookie_data_collection
-)
+from src.utils.cookie_utils import analyze_cookie_data_collection
+from src.utils.rule_engine import rule, APPLIES_TO_DECLARED, APPLIES_TO_UNDECLARED
 from src.configs.settings import settings
 
 # ================= HELPER FUNCTION =================
@@ -40,6 +38,7 @@ def create_issue(
 
 # ================= SPECIFIC VIOLATION RULES =================
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("actual_days",))
 def check_rule_1_session_retention(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 1: Cookie khai báo là 'session' nhưng tồn tại lâu hơn 24 giờ."""
     if not context["is_declared"]: return None
@@ -47,7 +46,7 @@ def check_rule_1_session_retention(context: Dict[str, Any]) -> Optional[Complian
     actual: ActualCookie = context["actual_cookie"]
 
     if policy.declared_retention and policy.declared_retention.lower() == 'session':
-        actual_hours = calculate_actual_retention_days(actual.expirationDate) * 24
+        actual_hours = context["actual_days"] * 24
         if actual_hours > settings.violation.SESSION_THRESHOLD_HOURS:
             return create_issue(
                 issue_id=1, category="Specific", violation_type="Retention",
@@ -57,14 +56,14 @@ def check_rule_1_session_retention(context: Dict[str, Any]) -> Optional[Complian
             )
     return None
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("declared_days", "actual_days"))
 def check_rule_2_retention_mismatch(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 2: Thời gian sống thực tế vượt quá khai báo > 30%."""
     if not context["is_declared"]: return None
-    policy: PolicyCookie = context["policy_cookie"]
     actual: ActualCookie = context["actual_cookie"]
 
-    declared_days = parse_retention_to_days(policy.declared_retention)
-    actual_days = calculate_actual_retention_days(actual.expirationDate)
+    declared_days = context["declared_days"]
+    actual_days = context["actual_days"]
 
     if declared_days and actual_days and declared_days > 0:
         diff = actual_days - declared_days
@@ -82,14 +81,14 @@ def check_rule_2_retention_mismatch(context: Dict[str, Any]) -> Optional[Complia
                 )
     return None
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("declared_days", "actual_days"))
 def check_rule_3_short_term_vs_long_term(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 3: Chính sách ghi ngắn hạn (<1 năm) nhưng cookie tồn tại > 1 năm."""
     if not context["is_declared"]: return None
-    policy: PolicyCookie = context["policy_cookie"]
     actual: ActualCookie = context["actual_cookie"]
 
-    declared_days = parse_retention_to_days(policy.declared_retention)
-    actual_days = calculate_actual_retention_days(actual.expirationDate)
+    declared_days = context["declared_days"]
+    actual_days = context["actual_days"]
 
     if declared_days and actual_days and declared_days < settings.violation.LONG_TERM_RETENTION_DAYS:
         if actual_days > settings.violation.LONG_TERM_RETENTION_DAYS:
@@ -101,15 +100,15 @@ def check_rule_3_short_term_vs_long_term(context: Dict[str, Any]) -> Optional[Co
             )
     return None
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("is_third_party", "declared_parties"))
 def check_rule_4_undeclared_third_party(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 4: Cookie gửi đến bên thứ ba không được liệt kê trong chính sách."""
     if not context["is_declared"]: return None
     policy: PolicyCookie = context["policy_cookie"]
     actual: ActualCookie = context["actual_cookie"]
-    main_domain: str = context["main_domain"]
 
-    if is_third_party_domain(actual.domain, main_domain):
-        declared_parties = [party.lower() for party in policy.declared_third_parties]
+    if context["is_third_party"]:
+        declared_parties = context["declared_parties"]
         actual_domain_lower = actual.domain.lower()
 
         # Check if actual domain is a subdomain of any declared party
@@ -124,18 +123,17 @@ def check_rule_4_undeclared_third_party(context: Dict[str, Any]) -> Optional[Com
             )
     return None
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("declared_parties", "is_known_tracker"))
 def check_rule_5_claimed_first_party_is_third_party(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 5: Chính sách ghi là first-party nhưng cookie gửi đến tracker bên ngoài."""
     if not context["is_declared"]: return None
     policy: PolicyCookie = context["policy_cookie"]
     actual: ActualCookie = context["actual_cookie"]
 
-    declared_parties = [p.lower() for p in policy.declared_third_parties]
+    declared_parties = context["declared_parties"]
     is_claimed_first_party = any(p in ["first party", "no", "none"] for p in declared_parties)
 
-    is_known_tracker = any(tracker in actual.domain.lower() for tracker in settings.violation.KNOWN_AD_TRACKERS)
-
-    if is_claimed_first_party and is_known_tracker:
+    if is_claimed_first_party and context["is_known_tracker"]:
         return create_issue(
             issue_id=5, category="Specific", violation_type="Third-party",
             description="Policy claims first-party only, but cookie is sent to a known external tracker.",
@@ -144,6 +142,7 @@ def check_rule_5_claimed_first_party_is_third_party(context: Dict[str, Any]) ->
         )
     return None
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("is_known_tracker",))
 def check_rule_6_necessary_cookie_is_tracking(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 6: Khai báo là 'strictly necessary' nhưng lại dùng để quảng cáo/theo dõi."""
     if not context["is_declared"]: return None
@@ -152,7 +151,7 @@ def check_rule_6_necessary_cookie_is_tracking(context: Dict[str, Any]) -> Option
 
     if policy.declared_purpose and policy.declared_purpose.lower() == 'strictly necessary':
         is_tracking_cookie = any(tracker in actual.name.lower() for tracker in ['track', 'ad', 'analytics', '_ga']) or \
-                               any(tracker in actual.domain.lower() for tracker in settings.violation.KNOWN_AD_TRACKERS)
+                               context["is_known_tracker"]
 
         if is_tracking_cookie:
             return create_issue(
@@ -163,6 +162,7 @@ def check_rule_6_necessary_cookie_is_tracking(context: Dict[str, Any]) -> Option
             )
     return None
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("is_third_party", "is_known_tracker"))
 def check_rule_7_unreported_behavior(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 7: Cookie có hành vi theo dõi chéo trang không được mô tả."""
     # Logic này chỉ có thể suy luận. Phân tích traffic thực tế sẽ chính xác hơn.
@@ -170,8 +170,7 @@ def check_rule_7_unreported_behavior(context: Dict[str, Any]) -> Optional[Compli
     policy: PolicyCookie = context["policy_cookie"]
     actual: ActualCookie = context["actual_cookie"]
 
-    is_cross_site_tracker = is_third_party_domain(actual.domain, context["main_domain"]) and \
-                           any(tracker in actual.domain.lower() for tracker in settings.violation.KNOWN_AD_TRACKERS)
+    is_cross_site_tracker = context["is_third_party"] and context["is_known_tracker"]
 
     description = policy.declared_description.lower() if policy.declared_description else ""
     behavior_is_described = any(term in description for term in ["track", "ad", "target", "profile"])
@@ -187,17 +186,17 @@ def check_rule_7_unreported_behavior(context: Dict[str, Any]) -> Optional[Compli
 
 # ================= GENERAL VIOLATION RULES =================
 
+@rule(applies_to=APPLIES_TO_DECLARED, requires=("declared_purposes", "purpose_similarity_score"))
 def check_rule_8_low_semantic_similarity(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 8: Tên cookie không tương đồng ngữ nghĩa với bất kỳ mục đích nào được khai báo."""
     if not context["is_declared"]: return None # Chỉ áp dụng cho cookie được khai báo chung
-    policy_cookies: List[PolicyCookie] = context["policy_cookies"]
     actual: ActualCookie = context["actual_cookie"]
 
-    declared_purposes = list(set([p.declared_purpose for p in policy_cookies if p.declared_purpose] + settings.violation.STANDARD_PURPOSE_LABELS))
+    declared_purposes = context["declared_purposes"]
     if not declared_purposes: return None
 
-    similarities = [calculate_semantic_similarity(actual.name, purpose) for purpose in declared_purposes]
-    max_similarity = max(similarities) if similarities else 0
+    # Điểm lớn nhất với mọi nhãn, đã được backend tương đồng chấm theo lô cho cả lần phân tích
+    max_similarity = context["purpose_similarity_score"]
 
     if max_similarity < settings.violation.SEMANTIC_SIMILARITY_THRESHOLD:
         return create_issue(
@@ -208,19 +207,14 @@ def check_rule_8_low_semantic_similarity(context: Dict[str, Any]) -> Optional[Co
         )
     return None
 
+@rule(requires=("is_known_tracker", "has_vague_third_party_sharing"))
 def check_rule_9_vague_third_party_sharing(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 9: Chính sách mơ hồ về 'chia sẻ' nhưng cookie gửi đến tracker quảng cáo."""
     actual: ActualCookie = context["actual_cookie"]
-    is_known_tracker = any(tracker in actual.domain.lower() for tracker in settings.violation.KNOWN_AD_TRACKERS)
-
-    if is_known_tracker:
-        policy_cookies: List[PolicyCookie] = context["policy_cookies"]
-        # Tìm xem có chính sách nào nói chung chung về "third-party" không
-        has_vague_policy = any(
-            "third-part" in (p.declared_description.lower() if p.declared_description else "")
-            for p in policy_cookies if not p.cookie_name # Áp dụng cho mục đích chung
-        )
-        if has_vague_policy:
+
+    if context["is_known_tracker"]:
+        # Có chính sách nào nói chung chung về "third-party" không (tính một lần cho cả chính sách)
+        if context["has_vague_third_party_sharing"]:
             return create_issue(
                 issue_id=9, category="General", violation_type="Third-party",
                 description="Policy vaguely mentions third-party sharing, but cookie is sent to a known advertising tracker without specific disclosure.",
@@ -229,19 +223,15 @@ def check_rule_9_vague_third_party_sharing(context: Dict[str, Any]) -> Optional[
             )
     return None
 
+@rule(requires=("actual_days", "has_vague_retention"))
 def check_rule_10_vague_retention(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 10: Chính sách nói 'thời gian hợp lý' nhưng cookie tồn tại > 1 năm."""
     actual: ActualCookie = context["actual_cookie"]
-    actual_days = calculate_actual_retention_days(actual.expirationDate)
+    actual_days = context["actual_days"]
 
     if actual_days > settings.violation.LONG_TERM_RETENTION_DAYS:
-        policy_cookies: List[PolicyCookie] = context["policy_cookies"]
-        # Tìm xem có chính sách nào nói chung chung về retention không
-        has_vague_retention = any(
-            any(term in (p.declared_description.lower() if p.declared_description else "") for term in ["reasonable", "necessary period"])
-            for p in policy_cookies if not p.cookie_name
-        )
-        if has_vague_retention:
+        # Có chính sách nào nói chung chung về retention không (tính một lần cho cả chính sách)
+        if context["has_vague_retention"]:
              return create_issue(
                 issue_id=10, category="General", violation_type="Retention",
                 description="Policy states a vague retention period (e.g., 'reasonable time'), but cookie persists for over a year.",
@@ -252,6 +242,7 @@ def check_rule_10_vague_retention(context: Dict[str, Any]) -> Optional[Complianc
 
 # ================= UNDEFINED VIOLATION RULES =================
 
+@rule(applies_to=APPLIES_TO_UNDECLARED)
 def check_rule_11_undeclared_purpose(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 11: Cookie không được khai báo nhưng thu thập dữ liệu người dùng."""
     if context["is_declared"]: return None
@@ -268,6 +259,7 @@ def check_rule_11_undeclared_purpose(context: Dict[str, Any]) -> Optional[Compli
         )
     return None
 
+@rule(applies_to=APPLIES_TO_UNDECLARED)
 def check_rule_12_silent_deployment(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 12: Cookie được triển khai âm thầm (Không thể kiểm tra hoàn toàn ở backend)."""
     # Ghi chú: Quy tắc này liên quan đến sự đồng ý (consent), khó xác định ở
@@ -281,19 +273,15 @@ def check_rule_12_silent_deployment(context: Dict[str, Any]) -> Optional[Complia
         details={"note": "This check is based on the absence of the cookie in the policy. Verifying user consent requires client-side analysis."}
     )
 
+@rule(applies_to=APPLIES_TO_UNDECLARED, requires=("is_third_party", "mentions_third_party"))
 def check_rule_13_undeclared_third_party_involvement(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 13: Cookie thuộc bên thứ ba nhưng chính sách không đề cập đến bên thứ ba."""
     if context["is_declared"]: return None
     actual: ActualCookie = context["actual_cookie"]
-    main_domain: str = context["main_domain"]
 
-    if is_third_party_domain(actual.domain, main_domain):
-        policy_cookies: List[PolicyCookie] = context["policy_cookies"]
-        # Kiểm tra toàn bộ chính sách xem có đề cập đến bên thứ 3 không
-        mentions_third_party = any(
-            p.declared_third_parties for p in policy_cookies
-        )
-        if not mentions_third_party:
+    if context["is_third_party"]:
+        # Toàn bộ chính sách có đề cập đến bên thứ 3 không (tính một lần cho cả chính sách)
+        if not context["mentions_third_party"]:
             return create_issue(
                 issue_id=13, category="Undefined", violation_type="Third-party",
                 description="An undeclared cookie belongs to an external domain, but the policy contains no information about third-party involvement.",
@@ -302,17 +290,16 @@ def check_rule_13_undeclared_third_party_involvement(context: Dict[str, Any]) ->
             )
     return None
 
+@rule(applies_to=APPLIES_TO_UNDECLARED, requires=("actual_days", "mentions_retention"))
 def check_rule_14_undeclared_long_term_retention(context: Dict[str, Any]) -> Optional[ComplianceIssue]:
     """Quy tắc 14: Chính sách không nói về thời gian lưu trữ nhưng cookie tồn tại rất lâu."""
     if context["is_declared"]: return None
     actual: ActualCookie = context["actual_cookie"]
-    actual_days = calculate_actual_retention_days(actual.expirationDate)
+    actual_days = context["actual_days"]
 
     if actual_days > settings.violation.LONG_TERM_RETENTION_DAYS:
-        policy_cookies: List[PolicyCookie] = context["policy_cookies"]
-        # Kiểm tra toàn bộ chính sách xem có nói về retention không
-        mentions_retention = any(p.declared_retention for p in policy_cookies)
-        if not mentions_retention:
+        # Toàn bộ chính sách có nói về retention không (tính một lần cho cả chính sách)
+        if not context["mentions_retention"]:
             return create_issue(
                 issue_id=14, category="Undefined", violation_type="Retention",
                 description="Policy omits any reference to retention, but this undeclared cookie persists for over a year.",
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.repositories.indexes import INDEXED_REPOSITORIES, audit_query_shapes
+
+# Chạy với một MongoDB thật, vd. MONGODB_TEST_URI=mongodb://localhost:27017
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI")
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not MONGODB_TEST_URI, reason="MONGODB_TEST_URI is not set")
+async def test_no_repository_query_falls_back_to_collscan():
+    client = AsyncIOMotorClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=2000)
+    database = client["query_plan_audit"]
+    repositories = []
+    for cls in INDEXED_REPOSITORIES:
+        repository = cls()
+        repository.collection = database[repository.collection.name]
+        await repository.ensure_indexes()
+        repositories.append(repository)
+    try:
+        assert await audit_query_shapes(repositories) == []
+    finally:
+        await client.drop_database("query_plan_audit")
+        client.close()
@@ -13,7 +13,7 @@ from src.repositories.website_repository import WebsiteRepository
 from src.schemas.cookie import CookieSubmissionRequest, PolicyCookieList, PolicyCookie
 from src.schemas.policy import PolicyContent
 from src.schemas.violation import ComplianceAnalysisResult, ComplianceAnalysisResponse, ComplianceIssue
-from src.models.website import Website
+from src.models.website import Website, WebsiteAnalysisView
 from src.utils.url_utils import get_base_url
 
 # Mock data
@@ -115,7 +115,7 @@ async def test_orchestrate_analysis_new_website_success(
     Test the full analysis flow for a new website (cache miss).
     """
     # Mock repository responses
-    mock_website_repository.get_website_by_root_url.return_value = None
+    mock_website_repository.get_view_by_root_url.return_value = None
     mock_policy_crawler.extract_policy.return_value = PolicyContent(
         website_url=MOCK_ROOT_URL,
         policy_url=MOCK_POLICY_URL,
@@ -151,7 +151,7 @@ async def test_orchestrate_analysis_new_website_success(
     response = await violation_analyzer_service.orchestrate_analysis(payload, MOCK_REQUEST_ID)
 
     # Assertions
-    mock_website_repository.get_website_by_root_url.assert_called_once_with(MOCK_ROOT_URL)
+    mock_website_repository.get_view_by_root_url.assert_called_once_with(MOCK_ROOT_URL, WebsiteAnalysisView)
     mock_policy_crawler.extract_policy.assert_called_once_with(MOCK_WEBSITE_URL)
     mock_cookie_extractor_service.extract_cookie_features.assert_called_once()
     mock_website_repository.create_website.assert_called_once()
@@ -190,7 +190,7 @@ async def test_orchestrate_analysis_existing_website_cache_hit(
         table_content=[],
         translated_table_content=None
     )
-    mock_website_repository.get_website_by_root_url.return_value = existing_website
+    mock_website_repository.get_view_by_root_url.return_value = existing_website
     mock_website_repository.update_website.return_value = None
     mock_violation_repository.create_violation.return_value = None
 
@@ -202,7 +202,7 @@ async def test_orchestrate_analysis_existing_website_cache_hit(
     response = await violation_analyzer_service.orchestrate_analysis(payload, MOCK_REQUEST_ID)
 
     # Assertions
-    mock_website_repository.get_website_by_root_url.assert_called_once_with(MOCK_ROOT_URL)
+    mock_website_repository.get_view_by_root_url.assert_called_once_with(MOCK_ROOT_URL, WebsiteAnalysisView)
     mock_website_repository.update_website.assert_called_once()
     mock_policy_crawler.extract_policy.assert_not_called() # Should be skipped
     mock_cookie_extractor_service.extract_cookie_features.assert_not_called() # Should be skipped
@@ -225,7 +225,7 @@ async def test_orchestrate_analysis_policy_not_found(
     """
     Test the analysis flow when policy cannot be found.
     """
-    mock_website_repository.get_website_by_root_url.return_value = None
+    mock_website_repository.get_view_by_root_url.return_value = None
     mock_policy_crawler.extract_policy.return_value = None # Policy not found
     mock_comparator_service.compare_compliance.return_value = MOCK_COMPLIANCE_RESULT # Still call comparator with empty policy
     mock_violation_repository.create_violation.return_value = None
@@ -238,7 +238,7 @@ async def test_orchestrate_analysis_policy_not_found(
     response = await violation_analyzer_service.orchestrate_analysis(payload, MOCK_REQUEST_ID)
 
     # Assertions
-    mock_website_repository.get_website_by_root_url.assert_called_once_with(MOCK_ROOT_URL)
+    mock_website_repository.get_view_by_root_url.assert_called_once_with(MOCK_ROOT_URL, WebsiteAnalysisView)
     mock_policy_crawler.extract_policy.assert_called_once_with(MOCK_WEBSITE_URL)
     mock_cookie_extractor_service.extract_cookie_features.assert_not_called() # Should be skipped
     mock_website_repository.create_website.assert_not_called() # Should be skipped
@@ -261,7 +261,7 @@ async def test_orchestrate_analysis_extraction_failure(
     """
     Test the analysis flow when cookie extraction fails.
     """
-    mock_website_repository.get_website_by_root_url.return_value = None
+    mock_website_repository.get_view_by_root_url.return_value = None
     mock_policy_crawler.extract_policy.return_value = PolicyContent(
         website_url=MOCK_ROOT_URL,
         policy_url=MOCK_POLICY_URL,
@@ -283,7 +283,7 @@ async def test_orchestrate_analysis_extraction_failure(
     response = await violation_analyzer_service.orchestrate_analysis(payload, MOCK_REQUEST_ID)
 
     # Assertions
-    mock_website_repository.get_website_by_root_url.assert_called_once_with(MOCK_ROOT_URL)
+    mock_website_repository.get_view_by_root_url.assert_called_once_with(MOCK_ROOT_URL, WebsiteAnalysisView)
     mock_policy_crawler.extract_policy.assert_called_once_with(MOCK_WEBSITE_URL)
     mock_cookie_extractor_service.extract_cookie_features.assert_called_once()
     mock_website_repository.create_website.assert_called_once() # Website still saved, but with empty policy_cookies
@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from src.repositories import indexes
+from src.repositories.indexes import (
+    INDEXED_REPOSITORIES,
+    audit_query_shapes,
+    ensure_all_indexes,
+    find_unindexed_query_shapes,
+    query_shape_uses_index,
+    winning_plan_stages,
+)
+from src.repositories.website_repository import WebsiteRepository
+
+COLLSCAN_EXPLAIN = {"queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}}
+IXSCAN_EXPLAIN = {"queryPlanner": {"winningPlan": {"queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}}
+
+
+def test_every_repository_query_shape_is_served_by_an_index():
+    assert find_unindexed_query_shapes() == []
+    assert all(cls.query_shapes for cls in INDEXED_REPOSITORIES if not cls.__name__.endswith("CacheRepository"))
+
+
+def test_static_check_rejects_shapes_without_a_leading_index_key():
+    by_domain = [IndexModel([("domain", ASCENDING), ("user_id", ASCENDING)])]
+
+    assert query_shape_uses_index({"filter": {"domain": "a", "user_id": 1}}, by_domain)
+    assert not query_shape_uses_index({"filter": {"user_id": 1}}, by_domain)
+    assert not query_shape_uses_index({"filter": {"domain": {"$ne": "a"}}}, by_domain)
+    assert not query_shape_uses_index({"filter": {"$or": [{"domain": "a"}, {"user_id": 1}]}}, by_domain)
+    assert query_shape_uses_index({"filter": {}, "sort": [("domain", 1)]}, by_domain)
+
+
+def test_winning_plan_stages_handles_both_explain_layouts():
+    assert winning_plan_stages(COLLSCAN_EXPLAIN) == ["SORT", "COLLSCAN"]
+    assert winning_plan_stages(IXSCAN_EXPLAIN) == ["FETCH", "IXSCAN"]
+
+
+def make_repository(name, explain, query_shapes=None):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.explain = AsyncMock(return_value=explain)
+    repository = MagicMock()
+    repository.collection.name = name
+    repository.collection.find.return_value = cursor
+    repository.query_shapes = query_shapes or {"by_key": {"filter": {"key": 1}, "sort": [("key", 1)]}}
+    repository.ensure_indexes = AsyncMock(return_value=[f"{name}_key_1"])
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_audit_reports_collection_scans():
+    offenders = await audit_query_shapes([make_repository("ok", IXSCAN_EXPLAIN), make_repository("slow", COLLSCAN_EXPLAIN)])
+
+    assert len(offenders) == 1
+    assert offenders[0]["query"] == "by_key" and "COLLSCAN" in offenders[0]["stages"]
+
+
+@pytest.mark.asyncio
+async def test_index_bootstrap_continues_after_a_failing_collection():
+    broken = make_repository("broken", IXSCAN_EXPLAIN)
+    broken.ensure_indexes.side_effect = RuntimeError("E11000 duplicate key")
+    healthy = make_repository("healthy", IXSCAN_EXPLAIN)
+
+    created = await ensure_all_indexes([broken, healthy])
+
+    assert created == {"healthy": ["healthy_key_1"]}
+
+
+@pytest.mark.asyncio
+async def test_a_unique_index_blocked_by_duplicates_does_not_block_the_others():
+    def create_indexes(models):
+        if models[0].document.get("unique"):
+            raise OperationFailure("E11000 duplicate key")
+        return [models[0].document["name"]]
+
+    repository = WebsiteRepository.__new__(WebsiteRepository)
+    repository.collection = MagicMock()
+    repository.collection.create_indexes = AsyncMock(side_effect=create_indexes)
+
+    created = await repository.ensure_indexes()
+
+    assert "domain_1" in created and "domain_1_user_id_1" not in created
+    assert len(created) == len(WebsiteRepository.indexes) - 1
@@ -0,0 +1,62 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from src.repositories.violation_repository import ViolationRepository
+
+POLICY_COOKIE = {"cookie_name": "_ga", "declared_purpose": "Analytical", "declared_retention": "2 years",
+                 "declared_third_parties": ["Google"], "declared_description": None}
+ACTUAL_COOKIE = {"name": "_ga", "value": "GA1.2.1", "domain": ".shop.example.com", "expirationDate": None,
+                 "secure": True, "httpOnly": False, "sameSite": None, "path": "/"}
+
+
+def build_analysis():
+    return {
+        "website_url": "https://shop.example.com/", "analysis_date": datetime(2025, 1, 1), "total_issues": 1,
+        "compliance_score": 90.0,
+        "issues": [{"issue_id": 2, "category": "Specific", "type": "Retention", "description": "Lives too long",
+                    "severity": "High", "cookie_name": "_ga", "details": {"declared_days": 730, "actual_days": 1000}}],
+        "statistics": {"by_severity": {"High": 1}},
+        "summary": {"critical_issues": 0, "high_issues": 1, "undeclared_cookies": [], "declared_cookies": ["_ga"],
+                    "third_party_cookies": [], "long_term_cookies": ["_ga"]},
+        "policy_cookies_count": 1, "actual_cookies_count": 1,
+        "details": {"declared_cookie_details": [POLICY_COOKIE], "realtime_cookie_details": [ACTUAL_COOKIE],
+                    "undeclared_cookie_details": [], "declared_violating_cookies": [ACTUAL_COOKIE],
+                    "declared_compliant_cookies": [], "declared_by_third_party": {"Google": [POLICY_COOKIE]}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_violations_are_stored_compact_and_read_back_in_full():
+    document = build_analysis()
+    policy_versions = AsyncMock()
+    repository = ViolationRepository(policy_versions)
+    repository.insert_one = AsyncMock(return_value="id")
+
+    await repository.create_violation(document)
+
+    stored = repository.insert_one.call_args.args[0]
+    version = policy_versions.save_version.call_args.args[0]
+    assert stored["policy_version"] == version["_id"] and "declared_cookie_details" not in stored["details"]
+
+    repository.find_many = AsyncMock(return_value=[stored, stored])
+    policy_versions.get_versions.return_value = {version["_id"]: version["cookies"]}
+
+    assert await repository.get_violations_by_website("https://shop.example.com/") == [document, document]
+    policy_versions.get_versions.assert_awaited_once_with({version["_id"]})
+
+
+@pytest.mark.asyncio
+async def test_analyses_whose_policy_version_is_missing_are_skipped():
+    document = build_analysis()
+    policy_versions = AsyncMock()
+    repository = ViolationRepository(policy_versions)
+    repository.insert_one = AsyncMock(return_value="id")
+    await repository.create_violation(document)
+    stored = repository.insert_one.call_args.args[0]
+    legacy = {**build_analysis(), "website_url": "https://shop.example.com/legacy"}
+
+    repository.find_many = AsyncMock(return_value=[stored, legacy])
+    policy_versions.get_versions.return_value = {}
+
+    assert await repository.get_violations_by_website("https://shop.example.com/") == [legacy]
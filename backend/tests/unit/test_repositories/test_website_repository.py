@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from bson import ObjectId
+
+from src.models.website import WebsiteAnalysisView, WebsiteDetailView, WebsiteListRow
+from src.repositories.website_repository import WebsiteRepository
+from src.utils.pagination_utils import ESTIMATED, decode_cursor
+
+HEAVY_FIELDS = {"original_content", "translated_content", "table_content", "translated_table_content"}
+
+
+def test_views_never_project_the_policy_text_or_cookie_list_they_do_not_need():
+    assert not HEAVY_FIELDS & set(WebsiteAnalysisView.projection())
+    assert not (HEAVY_FIELDS | {"policy_cookies"}) & set(WebsiteListRow.projection())
+    assert "policy_cookies" not in WebsiteDetailView.projection()
+    assert WebsiteAnalysisView.projection()["_id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_view_by_root_url_reads_with_the_view_projection():
+    repository = WebsiteRepository()
+    repository.collection = MagicMock()
+    repository.collection.find_one = AsyncMock(return_value={
+        "_id": ObjectId(), "domain": "https://shop.example.com/", "last_checked_at": datetime(2024, 1, 1),
+        "is_specific": 1, "policy_cookies": [{"cookie_name": "_ga", "declared_purpose": "Analytical",
+                                              "declared_retention": "2 years", "declared_third_parties": ["Google"],
+                                              "declared_description": None}],
+    })
+
+    view = await repository.get_view_by_root_url("https://shop.example.com/", WebsiteAnalysisView)
+
+    assert repository.collection.find_one.call_args.args == ({"domain": "https://shop.example.com/"}, WebsiteAnalysisView.projection())
+    assert view.policy_cookies[0].cookie_name == "_ga"
+
+
+def make_aggregating_repository(rows, total=0):
+    repository = WebsiteRepository()
+    repository.collection = MagicMock()
+    repository.collection.name = "websites"
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=rows)
+    repository.collection.aggregate.return_value = cursor
+    repository.collection.count_documents = AsyncMock(return_value=total)
+    repository.collection.estimated_document_count = AsyncMock(return_value=12345)
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_list_rows_seeks_from_the_cursor_and_counts_separately():
+    rows = [{"_id": ObjectId(), "domain": f"https://site-{i}.example.com/", "num_specified_cookies": 3} for i in range(11)]
+    repository = make_aggregating_repository(rows, total=42)
+
+    page = await repository.list_rows({"is_approved": True}, limit=10)
+
+    pipeline = repository.collection.aggregate.call_args.args[0]
+    assert [list(stage)[0] for stage in pipeline] == ["$match", "$sort", "$limit", "$project"]
+    assert pipeline[-1]["$project"]["num_specified_cookies"] == {"$size": {"$ifNull": ["$policy_cookies", []]}}
+    repository.collection.count_documents.assert_awaited_once_with({"is_approved": True})
+    assert len(page.rows) == 10 and page.total == 42 and not page.total_is_estimate
+    assert decode_cursor(page.next_cursor)[1] == rows[9]["_id"]
+
+    # Trang kế tiếp: điều kiện con trỏ nằm trong $match đầu tiên (quét index), không $skip
+    await repository.list_rows({"is_approved": True}, cursor=page.next_cursor, skip=500, limit=10)
+    pipeline = repository.collection.aggregate.call_args.args[0]
+    assert pipeline[0] == {"$match": {"$and": [{"is_approved": True}, {"_id": {"$lt": rows[9]["_id"]}}]}}
+    assert pipeline[2] == {"$limit": 11}
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_listing_skips_the_count_with_an_estimated_total():
+    repository = make_aggregating_repository([{"_id": ObjectId(), "domain": "https://shop.example.com/"}])
+
+    page = await repository.list_rows({}, limit=10, total_mode=ESTIMATED)
+
+    repository.collection.count_documents.assert_not_called()
+    assert page.total == 12345 and page.total_is_estimate and page.next_cursor is None
+
+    # Danh sách có lọc luôn đếm chính xác
+    repository = make_aggregating_repository([], total=0)
+    page = await repository.list_rows({"is_approved": False}, limit=10, total_mode=ESTIMATED)
+    assert page.total == 0 and not page.total_is_estimate
+    repository.collection.estimated_document_count.assert_not_called()
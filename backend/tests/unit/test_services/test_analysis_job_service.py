@@ -0,0 +1,181 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from src.exceptions.custom_exceptions import PolicyAnalysisError
+from src.models.analysis_job import AnalysisJobStatus
+from src.schemas.cookie import CookieSubmissionRequest
+from src.schemas.violation import AnalysisPhase, ComplianceAnalysisResponse
+from src.services.analysis_job_service.analysis_job_service import AnalysisJobService
+from src.services.analysis_job_service.queues.in_memory_job_queue import InMemoryJobQueue
+from src.services.violation_analyzer_service.violation_analyzer_service import ViolationAnalyzerService
+
+RESPONSE = ComplianceAnalysisResponse(
+    website_url="https://example.com/",
+    analysis_date=datetime(2024, 1, 1),
+    total_issues=0,
+    compliance_score=100.0,
+    issues=[],
+    statistics={},
+    summary={},
+    policy_cookies_count=0,
+    actual_cookies_count=0,
+    details={},
+    policy_url="https://example.com/cookies"
+)
+
+
+@pytest.fixture
+def mock_analyzer():
+    analyzer = AsyncMock(spec=ViolationAnalyzerService)
+    analyzer.orchestrate_analysis.return_value = RESPONSE
+    return analyzer
+
+
+@pytest.fixture
+def job_service(mock_analyzer):
+    return AnalysisJobService(
+        queue=InMemoryJobQueue(),
+        analyzer_factory=MagicMock(return_value=mock_analyzer),
+        workers=0,
+        max_attempts=2,
+        retry_base_delay=0,
+        lease_seconds=60,
+        poll_interval=0.01
+    )
+
+
+def make_payload(url="https://example.com/page"):
+    return CookieSubmissionRequest(website_url=url, cookies=[])
+
+
+@pytest.mark.asyncio
+async def test_job_runs_and_stores_result(job_service, mock_analyzer):
+    job, coalesced = await job_service.submit(make_payload(), "req-1")
+
+    assert not coalesced
+    assert await job_service.run_once() is True
+    stored = await job_service.get_job(str(job["_id"]))
+    assert stored["status"] == AnalysisJobStatus.SUCCEEDED.value
+    assert stored["result"]["policy_url"] == "https://example.com/cookies"
+    assert await job_service.run_once() is False
+
+
+@pytest.mark.asyncio
+async def test_duplicate_in_flight_jobs_are_coalesced(job_service, mock_analyzer):
+    first, _ = await job_service.submit(make_payload("https://example.com/a"), "req-1")
+    second, coalesced = await job_service.submit(make_payload("https://example.com/b"), "req-2")
+    other_site, other_coalesced = await job_service.submit(make_payload("https://other.com/"), "req-3")
+
+    assert coalesced and second["_id"] == first["_id"]
+    assert not other_coalesced and other_site["_id"] != first["_id"]
+
+    while await job_service.run_once():
+        pass
+    assert mock_analyzer.orchestrate_analysis.await_count == 2
+
+    # Once finished, a new submission starts a fresh job
+    third, coalesced = await job_service.submit(make_payload("https://example.com/a"), "req-4")
+    assert not coalesced and third["_id"] != first["_id"]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_dead_lettered(job_service, mock_analyzer):
+    mock_analyzer.orchestrate_analysis.side_effect = [RuntimeError("timeout"), RuntimeError("timeout again")]
+    job, _ = await job_service.submit(make_payload(), "req-1")
+
+    await job_service.run_once()
+    retried = await job_service.get_job(str(job["_id"]))
+    assert retried["status"] == AnalysisJobStatus.QUEUED.value and retried["attempts"] == 1
+
+    await job_service.run_once()
+    dead = await job_service.get_job(str(job["_id"]))
+    assert dead["status"] == AnalysisJobStatus.DEAD_LETTERED.value
+    assert dead["error"] == "timeout again"
+    metrics = await job_service.get_metrics()
+    assert metrics["retried"] == 1 and metrics["dead_lettered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(job_service, mock_analyzer):
+    mock_analyzer.orchestrate_analysis.side_effect = PolicyAnalysisError(AnalysisPhase.DISCOVERY, "no policy", 404)
+    job, _ = await job_service.submit(make_payload(), "req-1")
+
+    await job_service.run_once()
+
+    stored = await job_service.get_job(str(job["_id"]))
+    assert stored["status"] == AnalysisJobStatus.DEAD_LETTERED.value and stored["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_workers_consume_jobs_in_background(job_service, mock_analyzer):
+    job_service.workers = 2
+    await job_service.start()
+    try:
+        job, _ = await job_service.submit(make_payload(), "req-1")
+        for _ in range(100):
+            stored = await job_service.get_job(str(job["_id"]))
+            if stored["status"] == AnalysisJobStatus.SUCCEEDED.value:
+                break
+            await asyncio.sleep(0.01)
+        assert stored["status"] == AnalysisJobStatus.SUCCEEDED.value
+    finally:
+        await job_service.stop()
+
+
+def expire_lease(queue, job_id):
+    queue.jobs[job_id]["lease_expires_at"] = datetime(2000, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed_until_attempts_run_out():
+    queue = InMemoryJobQueue()
+    service = AnalysisJobService(queue=queue, analyzer_factory=MagicMock(), workers=0, max_attempts=2, lease_seconds=60)
+    job, _ = await service.submit(make_payload(), "req-1")
+
+    first = await queue.claim("worker-a", 60)
+    expire_lease(queue, job["_id"])
+    second = await queue.claim("worker-b", 60)
+    assert second["_id"] == job["_id"] and second["attempts"] == 2
+
+    # Worker cũ mất lease: lần ghi kết quả của nó bị bỏ qua
+    assert await queue.complete(first, {"stale": True}) is False
+    assert await queue.renew(first, 60) is False
+    assert await queue.renew(second, 60) is True
+
+    # Lần thử cuối cũng hết lease: job bị dead-letter thay vì nhận lại mãi
+    expire_lease(queue, job["_id"])
+    assert await queue.claim("worker-c", 60) is None
+    stored = await service.get_job(str(job["_id"]))
+    assert stored["status"] == AnalysisJobStatus.DEAD_LETTERED.value and stored["attempts"] == 2
+    assert await queue.complete(second, {"late": True}) is False
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_the_analysis_runs(mock_analyzer):
+    queue = InMemoryJobQueue()
+    service = AnalysisJobService(
+        queue=queue, analyzer_factory=MagicMock(return_value=mock_analyzer), workers=0,
+        lease_seconds=60, heartbeat_interval=0.01
+    )
+    renewals = []
+    renew = queue.renew
+
+    async def counting_renew(job, lease_seconds):
+        renewals.append(job["_id"])
+        return await renew(job, lease_seconds)
+
+    async def slow_analysis(*args):
+        await asyncio.sleep(0.05)
+        return RESPONSE
+
+    queue.renew = counting_renew
+    mock_analyzer.orchestrate_analysis.side_effect = slow_analysis
+    job, _ = await service.submit(make_payload(), "req-1")
+
+    await service.run_once()
+
+    assert len(renewals) >= 2
+    stored = await service.get_job(str(job["_id"]))
+    assert stored["status"] == AnalysisJobStatus.SUCCEEDED.value
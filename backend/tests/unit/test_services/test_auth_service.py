@@ -1,8 +1,12 @@
+import threading
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from passlib.context import CryptContext
 
-from src.services.auth_service.auth_service import AuthService
+from src.services.auth_service.auth_service import AuthService, hash_password
+from src.services.auth_service.principal_cache import PrincipalCache
 from src.schemas.auth import RegisterSchema, LoginSchema, RegisterResponseSchema, LoginResponseSchema
 from src.schemas.user import User as UserSchema
 from src.models.user import User as UserModel, UserRole
@@ -150,3 +154,44 @@ async def test_get_current_user_not_found(auth_service, mock_user_repository):
         await auth_service.get_current_user(user_id)
 
     mock_user_repository.get_user_by_id.assert_called_once_with(user_id)
+
+# --- Test authenticate / principal cache ---
+@pytest.mark.asyncio
+async def test_authenticate_serves_repeat_tokens_from_the_principal_cache(mock_user_repository, mock_domain_request_repository, mock_user_model_data):
+    cache = PrincipalCache(ttl_seconds=60)
+    service = AuthService(mock_user_repository, mock_domain_request_repository, cache)
+    mock_user_repository.get_user_by_id.return_value = mock_user_model_data
+    payload = {"sub": mock_user_model_data["id"], "jti": "token-1", "exp": time.time() + 600}
+
+    first = await service.authenticate(payload, "raw-token")
+    second = await service.authenticate(payload, "raw-token")
+
+    assert first.email == second.email == mock_user_model_data["email"]
+    mock_user_repository.get_user_by_id.assert_called_once_with(mock_user_model_data["id"])
+
+    # Cập nhật người dùng làm mất hiệu lực mọi token đã cache của họ
+    cache.invalidate_user(mock_user_model_data["id"])
+    await service.authenticate(payload, "raw-token")
+    assert mock_user_repository.get_user_by_id.call_count == 2
+
+def test_principal_cache_drops_lookups_that_raced_an_invalidation(mock_user_model_data):
+    cache = PrincipalCache(ttl_seconds=60)
+    user = UserSchema(**mock_user_model_data)
+    version = cache.version(user.id)
+
+    cache.invalidate_user(user.id) # e.g. password reset while the users lookup was in flight
+    cache.set("token-1", user, version)
+    assert cache.get("token-1") is None
+
+    cache.set("token-1", user, cache.version(user.id), expires_in=0)
+    assert cache.get("token-1") is None
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_off_the_event_loop_thread(mocker):
+    threads = []
+    context = MagicMock(spec=CryptContext)
+    context.hash.side_effect = lambda password: threads.append(threading.current_thread().name) or "hashed"
+    mocker.patch('src.services.auth_service.auth_service.pwd_context', context)
+
+    assert await hash_password("password123") == "hashed"
+    assert threads and threads[0] != threading.current_thread().name
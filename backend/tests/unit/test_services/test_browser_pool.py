@@ -0,0 +1,158 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.policy_crawler_service.components import browser_pool as browser_pool_module
+from src.services.policy_crawler_service.components.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = {}
+        self.clear_cookies = AsyncMock()
+        self.close = AsyncMock()
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def new_page(self):
+        self.handlers["page"](MagicMock())
+        return AsyncMock()
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.handlers = {}
+        self.connected = True
+        self.contexts = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+@pytest.fixture
+def launched_browsers(monkeypatch):
+    browsers = []
+
+    async def launch(**kwargs):
+        browser = FakeBrowser()
+        browsers.append(browser)
+        return browser
+
+    playwright = MagicMock()
+    playwright.chromium.launch = launch
+    playwright.stop = AsyncMock()
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+    monkeypatch.setattr(browser_pool_module, "async_playwright", lambda: starter)
+    return browsers
+
+
+def make_pool(**overrides):
+    config = dict(size=1, contexts_per_browser=2, max_pages_per_browser=0, lease_timeout=0.2, health_check_interval=0)
+    config.update(overrides)
+    return BrowserPool(**config)
+
+
+@pytest.mark.asyncio
+async def test_lease_reuses_warm_contexts(launched_browsers):
+    pool = make_pool()
+    await pool.start()
+
+    async with pool.lease() as first:
+        await first.new_page()
+    async with pool.lease() as second:
+        await second.new_page()
+
+    assert len(launched_browsers) == 1
+    assert len(launched_browsers[0].contexts) == 2
+    metrics = pool.get_metrics()
+    assert metrics["leases_total"] == 2
+    assert metrics["pages_served"] == 2
+    assert metrics["in_use"] == 0
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_lease_times_out_when_saturated(launched_browsers):
+    pool = make_pool(contexts_per_browser=1)
+    await pool.start()
+
+    async with pool.lease():
+        with pytest.raises(RuntimeError):
+            async with pool.lease():
+                pass
+
+    metrics = pool.get_metrics()
+    assert metrics["lease_timeouts"] == 1
+    assert metrics["saturated_leases"] == 1
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_browser_recycled_after_page_limit(launched_browsers):
+    pool = make_pool(max_pages_per_browser=2)
+    await pool.start()
+
+    for _ in range(2):
+        async with pool.lease() as context:
+            await context.new_page()
+
+    assert len(launched_browsers) == 2
+    assert pool.get_metrics()["recycles"] == 1
+    async with pool.lease() as context:
+        assert context in launched_browsers[1].contexts
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_crashed_browser_recycled_by_health_check(launched_browsers):
+    pool = make_pool()
+    await pool.start()
+
+    launched_browsers[0].connected = False
+    launched_browsers[0].handlers["disconnected"](launched_browsers[0])
+    status = await pool.health_check()
+
+    assert status == {0: True}
+    assert len(launched_browsers) == 2
+    assert pool.get_metrics()["crashes"] == 1
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_contexts_of_a_browser_awaiting_recycle_are_not_leased(launched_browsers):
+    pool = make_pool(contexts_per_browser=3, max_pages_per_browser=1)
+    await pool.start()
+
+    async with pool.lease():
+        async with pool.lease() as second:
+            await second.new_page()
+        # second đã trả về, browser chờ lease ngoài cùng để được tạo lại: context còn lại không được cho mượn
+        with pytest.raises(RuntimeError):
+            async with pool.lease():
+                pass
+
+    async with pool.lease() as context:
+        assert context in launched_browsers[1].contexts
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_lease_on_a_stopped_pool_raises(launched_browsers):
+    pool = make_pool()
+
+    with pytest.raises(RuntimeError):
+        async with pool.lease():
+            pass
+    assert launched_browsers == []
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import re
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.exceptions.custom_exceptions import LLMResponseError
+from src.repositories.cookie_feature_repository import CookieFeatureRepository
+from src.schemas.cookie import PolicyCookie, PolicyCookieList
+from src.services.cookie_extractor_service.interfaces.llm_provider import ILLMProvider
+from src.services.cookie_extractor_service.policy_cookie_extractor_service import CookieExtractorService
+from src.services.cookie_extractor_service.processors.content_analyzer import ContentAnalyzer
+from src.services.cookie_extractor_service.processors.content_chunker import ContentChunker, merge_policy_cookie_lists
+from src.services.cookie_extractor_service.processors.extraction_cache import ExtractionCache
+from src.services.cookie_extractor_service.processors.prompt_builder import PromptBuilder
+from src.services.cookie_extractor_service.processors.response_processor import LLMResponseProcessor
+
+
+def cookie(name, purpose=None, retention=None, parties=(), description=None):
+    return PolicyCookie(cookie_name=name, declared_purpose=purpose, declared_retention=retention,
+                        declared_third_parties=list(parties), declared_description=description)
+
+
+def build_policy(sections: int) -> str:
+    return "\n\n".join(
+        f"Section {i}\nThe cookie_{i} cookie is used for analytics. It is kept for {i} days." for i in range(sections)
+    )
+
+
+class ChunkEchoProvider:
+    """Returns one cookie per 'cookie_N' mention in the prompt, and tracks concurrency"""
+
+    def __init__(self, delay=0.02, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self.prompts = []
+
+    async def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        names = sorted(set(re.findall(r"cookie_\d+", prompt.split("Content to analyze:")[-1])))
+        if self.fail_on in names:
+            return "Sorry, I cannot help with that."
+        return json.dumps({"is_specific": 1, "cookies": [
+            {"cookie_name": n, "declared_purpose": "Analytical", "declared_retention": None,
+             "declared_third_parties": [], "declared_description": None} for n in names
+        ]})
+
+
+def make_service(provider, chunker, max_concurrent_chunks=2, extraction_cache=None):
+    llm = MagicMock(spec=ILLMProvider)
+    llm.generate_content = provider.generate_content
+    llm.get_provider_name = MagicMock(return_value="Fake")
+    return CookieExtractorService(
+        llm_provider=llm,
+        content_analyzer=ContentAnalyzer(),
+        prompt_builder=PromptBuilder(system_prompt="Extract cookies."),
+        response_processor=LLMResponseProcessor(),
+        cookie_feature_repository=AsyncMock(spec=CookieFeatureRepository),
+        extraction_cache=extraction_cache,
+        content_chunker=chunker,
+        max_concurrent_chunks=max_concurrent_chunks
+    )
+
+
+def test_text_chunks_respect_budget_and_section_boundaries():
+    chunker = ContentChunker(max_tokens=50, chars_per_token=4)
+    content = build_policy(20)
+
+    chunks = chunker.split(content, "original")
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= chunker.max_chars for chunk in chunks)
+    assert all(chunk.startswith("Section") for chunk in chunks)
+    assert "\n\n".join(chunks) == content
+
+
+def test_oversized_table_is_split_by_rows_with_headers_repeated():
+    chunker = ContentChunker(max_tokens=100, chars_per_token=4)
+    table = {"headers": ["Name", "Purpose"], "rows": [{"Name": f"cookie_{i}", "Purpose": "Analytics"} for i in range(40)]}
+
+    chunks = chunker.split(json.dumps([table, {"headers": ["Name"], "rows": [{"Name": "small"}]}]), "table")
+
+    parsed = [json.loads(chunk) for chunk in chunks]
+    assert len(chunks) > 1 and all(len(chunk) <= chunker.max_chars for chunk in chunks)
+    assert all(t["headers"] for tables in parsed for t in tables)
+    rows = [row["Name"] for tables in parsed for t in tables for row in t["rows"]]
+    assert rows == [f"cookie_{i}" for i in range(40)] + ["small"]
+
+
+def test_merge_dedupes_cookies_by_name_and_fills_missing_attributes():
+    merged = merge_policy_cookie_lists([
+        PolicyCookieList(is_specific=0, cookies=[cookie("_ga", purpose="Analytical", parties=["Google"]), cookie("", description="Marketing")]),
+        PolicyCookieList(is_specific=1, cookies=[cookie("_GA ", retention="2 years", parties=["Google", "DoubleClick"]),
+                                                 cookie("", description="Marketing"), cookie("", description="Necessary")]),
+    ])
+
+    assert merged.is_specific == 1
+    assert [c.cookie_name for c in merged.cookies] == ["_ga", "", ""]
+    ga = merged.cookies[0]
+    assert (ga.declared_purpose, ga.declared_retention, ga.declared_third_parties) == ("Analytical", "2 years", ["Google", "DoubleClick"])
+
+
+@pytest.mark.asyncio
+async def test_long_policy_is_extracted_concurrently_and_merged():
+    provider = ChunkEchoProvider()
+    service = make_service(provider, ContentChunker(max_tokens=60, chars_per_token=4), max_concurrent_chunks=3)
+    content = build_policy(30) + "\n\nSummary\nWe use cookie_0 and cookie_1."
+
+    started = time.perf_counter()
+    result = await service.extract_cookie_features(original_content=content)
+    elapsed = time.perf_counter() - started
+
+    assert len(provider.prompts) > 3
+    assert provider.peak == 3
+    assert sorted(c.cookie_name for c in result.cookies) == sorted(f"cookie_{i}" for i in range(30))
+    # Roughly ceil(chunks / concurrency) round trips instead of one per chunk
+    assert elapsed < provider.delay * len(provider.prompts)
+
+
+@pytest.mark.asyncio
+async def test_short_policy_uses_a_single_prompt():
+    provider = ChunkEchoProvider(delay=0)
+    service = make_service(provider, ContentChunker(max_tokens=6000))
+
+    result = await service.extract_cookie_features(original_content=build_policy(3))
+
+    assert len(provider.prompts) == 1
+    assert len(result.cookies) == 3
+
+
+@pytest.mark.asyncio
+async def test_unparseable_chunk_keeps_the_partial_result_out_of_the_cache():
+    provider = ChunkEchoProvider(delay=0, fail_on="cookie_7")
+    cache = AsyncMock(spec=ExtractionCache)
+    cache.build_key = MagicMock(return_value="key")
+    cache.get.return_value = None
+    service = make_service(provider, ContentChunker(max_tokens=60, chars_per_token=4), extraction_cache=cache)
+
+    result = await service.extract_cookie_features(original_content=build_policy(30))
+
+    names = {c.cookie_name for c in result.cookies}
+    assert "cookie_7" not in names and "cookie_0" in names
+    cache.set.assert_not_awaited()
+    service.cookie_feature_repository.insert_many.assert_not_awaited()
+
+    with pytest.raises(LLMResponseError):
+        await service.extract_cookie_features(original_content=build_policy(30), strict=True)
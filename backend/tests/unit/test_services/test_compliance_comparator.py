@@ -0,0 +1,152 @@
+import random
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.schemas.cookie import PolicyCookie, ActualCookie
+from src.services.comparator_service.components.compliance_comparator import ComplianceComparator
+from src.utils import rule_engine
+from src.utils.rule_engine import TrackerDomainIndex, rule
+
+MAIN_DOMAIN = "shop.example.com"
+DOMAINS = [".example.com", "shop.example.com", ".doubleclick.net", "stats.g.doubleclick.net",
+           ".facebook.com", "cdn.partner.io", ".hotjar.com"]
+RETENTIONS = ["session", "2 years", "30 days", "1 month", "persistent", None, "6 months"]
+PURPOSES = ["Strictly Necessary", "Analytical", "Targeting/Advertising/Marketing", None]
+
+
+def build_site(actual_count: int, policy_count: int, seed: int = 7):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    policy_cookies = [
+        PolicyCookie(
+            cookie_name=f"cookie_{i}",
+            declared_purpose=rng.choice(PURPOSES),
+            declared_retention=rng.choice(RETENTIONS),
+            declared_third_parties=rng.choice([[], ["First Party"], ["doubleclick.net"], ["Google", "Facebook"]]),
+            declared_description=rng.choice([None, "Used to track visits", "Stores preferences"])
+        )
+        for i in range(policy_count)
+    ]
+    # General (unnamed) entries drive the policy-level rules 9 and 10
+    policy_cookies.append(PolicyCookie(cookie_name="", declared_purpose="Marketing", declared_retention=None,
+                                       declared_third_parties=[], declared_description="Shared with third-parties for a reasonable time"))
+    actual_cookies = [
+        ActualCookie(
+            name=f"cookie_{rng.randrange(policy_count * 2)}",
+            value=rng.choice(["abc", "user_id=42", "1700000000000", ""]),
+            domain=rng.choice(DOMAINS),
+            expirationDate=rng.choice([None, (now + timedelta(days=rng.randrange(1, 1200))).isoformat()]),
+            secure=True,
+            httpOnly=False,
+            sameSite=None
+        )
+        for _ in range(actual_count)
+    ]
+    return policy_cookies, actual_cookies
+
+
+def test_precompiled_engine_matches_per_cookie_evaluation():
+    policy_cookies, actual_cookies = build_site(actual_count=3000, policy_count=400)
+
+    compiled = ComplianceComparator(precompiled=True).analyze_compliance(policy_cookies, actual_cookies, MAIN_DOMAIN)
+    reference = ComplianceComparator(precompiled=False).analyze_compliance(policy_cookies, actual_cookies, MAIN_DOMAIN)
+
+    assert compiled["total_issues"] > 0
+    assert compiled["issues"] == reference["issues"]
+    assert compiled["summary"] == reference["summary"]
+    assert {issue["issue_id"] for issue in compiled["issues"]} >= {1, 2, 9, 10, 12}
+
+
+@pytest.mark.parametrize("actual_count", [100, 5000])
+def test_policy_facts_are_computed_once_per_analysis(monkeypatch, actual_count):
+    calls = {"mentions_retention": 0, "has_vague_retention": 0}
+    for name in calls:
+        original = rule_engine.POLICY_FACTS[name]
+
+        def counting(facts, _name=name, _original=original):
+            calls[_name] += 1
+            return _original(facts)
+
+        monkeypatch.setitem(rule_engine.POLICY_FACTS, name, counting)
+
+    policy_cookies, actual_cookies = build_site(actual_count=actual_count, policy_count=300)
+    ComplianceComparator(precompiled=True).analyze_compliance(policy_cookies, actual_cookies, MAIN_DOMAIN)
+
+    assert calls == {"mentions_retention": 1, "has_vague_retention": 1}
+
+
+def test_undeclared_cookies_skip_declared_only_rules():
+    comparator = ComplianceComparator()
+
+    declared_ids = {r.__name__.split("_")[2] for r in comparator.compiled_rules.declared_rules}
+    undeclared_ids = {r.__name__.split("_")[2] for r in comparator.compiled_rules.undeclared_rules}
+
+    assert declared_ids == {str(i) for i in range(1, 11)}
+    assert undeclared_ids == {"9", "10", "11", "12", "13", "14"}
+
+
+def test_tracker_index_matches_domain_suffixes_only():
+    index = TrackerDomainIndex(["doubleclick.net", "facebook.com"])
+
+    assert index.matches(".doubleclick.net")
+    assert index.matches("stats.g.DoubleClick.net")
+    assert index.matches("facebook.com")
+    assert not index.matches("notfacebook.com")
+    assert not index.matches("example.com")
+    assert not index.matches("")
+
+
+def test_rule_with_unknown_fact_is_rejected():
+    with pytest.raises(ValueError):
+        @rule(requires=("no_such_fact",))
+        def check_custom(context):
+            return None
+
+
+def test_cookie_dates_and_retentions_are_parsed_once_per_analysis(monkeypatch):
+    calls = {"expiration": 0, "retention": 0}
+    original_expiration = rule_engine.parse_expiration_date
+    original_retention = rule_engine.parse_retention_to_days
+
+    def counting_expiration(value):
+        calls["expiration"] += 1
+        return original_expiration(value)
+
+    def counting_retention(value):
+        calls["retention"] += 1
+        return original_retention(value)
+
+    monkeypatch.setattr(rule_engine, "parse_expiration_date", counting_expiration)
+    monkeypatch.setattr(rule_engine, "parse_retention_to_days", counting_retention)
+
+    policy_cookies, actual_cookies = build_site(actual_count=2000, policy_count=200)
+    report = ComplianceComparator(precompiled=True).analyze_compliance(policy_cookies, actual_cookies, MAIN_DOMAIN)
+
+    assert calls["expiration"] == len(actual_cookies)
+    assert calls["retention"] == len({p.cookie_name for p in policy_cookies})
+    assert report["details"]["expired_cookies_vs_declared"]
+    assert report["summary"]["long_term_cookies"]
+
+
+@pytest.mark.parametrize("backend", ["difflib", "ngram"])
+def test_rule_8_flags_match_the_configured_similarity_backend(monkeypatch, backend):
+    from src.configs.settings import settings
+    from src.utils.similarity import create_similarity_backend
+
+    monkeypatch.setattr(settings.violation, "SEMANTIC_SIMILARITY_BACKEND", backend)
+    policy_cookies, actual_cookies = build_site(actual_count=500, policy_count=100)
+    policy_cookies.append(PolicyCookie(cookie_name="analytics_id", declared_purpose="Analytical", declared_retention=None,
+                                       declared_third_parties=[], declared_description=None))
+    actual_cookies[0] = actual_cookies[0].model_copy(update={"name": "analytics_id"})
+
+    report = ComplianceComparator().analyze_compliance(policy_cookies, actual_cookies, MAIN_DOMAIN)
+
+    flagged = {issue["cookie_name"] for issue in report["issues"] if issue["issue_id"] == 8}
+    declared = {p.cookie_name for p in policy_cookies}
+    reference = create_similarity_backend(backend)
+    prepared = reference.prepare(sorted({p.declared_purpose for p in policy_cookies if p.declared_purpose}
+                                        | set(settings.violation.STANDARD_PURPOSE_LABELS)))
+    expected = {c.name for c in actual_cookies if c.name in declared
+                and reference.max_scores(prepared, [c.name])[0] < settings.violation.SEMANTIC_SIMILARITY_THRESHOLD}
+    assert flagged == expected
+    assert "analytics_id" not in flagged
@@ -8,7 +8,8 @@ from unittest.mock import patch
 from src.services.domain_request_service import DomainRequestService
 from src.schemas.domain_request import DomainRequestCreateSchema, DomainRequestResponseSchema, DomainRequestStatus
 from src.models.domain_request import DomainRequest
-from src.exceptions.custom_exceptions import DomainRequestNotFoundError, DomainAlreadyExistsError
+from src.exceptions.custom_exceptions import BadRequestException, DomainRequestNotFoundError, DomainAlreadyExistsError
+from src.utils.pagination_utils import KeysetPage
 
 @pytest.fixture
 def mock_domain_request_repo():
@@ -19,8 +20,14 @@ def mock_website_repo():
     return AsyncMock()
 
 @pytest.fixture
-def domain_request_service(mock_domain_request_repo, mock_website_repo):
-    return DomainRequestService(mock_domain_request_repo, mock_website_repo)
+def mock_user_repo():
+    repo = AsyncMock()
+    repo.get_users_by_ids.return_value = {}
+    return repo
+
+@pytest.fixture
+def domain_request_service(mock_domain_request_repo, mock_website_repo, mock_user_repo):
+    return DomainRequestService(mock_domain_request_repo, mock_website_repo, mock_user_repo)
 
 @pytest.fixture
 def sample_requester_id():
@@ -40,6 +47,8 @@ def sample_domain_request_model(sample_requester_id):
     return DomainRequest(
         id=str(ObjectId()),
         requester_id=ObjectId(sample_requester_id),
+        requester_username="requester",
+        requester_email="requester@example.com",
         domains=["example.com", "test.org"],
         purpose="Testing service",
         status=DomainRequestStatus.PENDING,
@@ -96,23 +105,40 @@ class TestDomainRequestService:
 
     @pytest.mark.asyncio
     async def test_get_all_domain_requests_no_filter(self, domain_request_service, mock_domain_request_repo, sample_domain_request_model):
-        mock_domain_request_repo.get_all_domain_requests.return_value = [sample_domain_request_model.model_dump(by_alias=True)]
+        mock_domain_request_repo.get_all_domain_requests.return_value = KeysetPage(rows=[sample_domain_request_model], next_cursor=None, total=1)
 
         result = await domain_request_service.get_all_domain_requests()
 
-        assert len(result) == 1
-        assert result[0].id == sample_domain_request_model.id
-        mock_domain_request_repo.get_all_domain_requests.assert_called_once_with({}, skip=0, limit=100)
+        assert len(result.rows) == 1 and result.total == 1
+        assert result.rows[0].id == sample_domain_request_model.id
+        mock_domain_request_repo.get_all_domain_requests.assert_called_once_with({}, cursor=None, skip=0, limit=100, total_mode="exact")
 
     @pytest.mark.asyncio
     async def test_get_all_domain_requests_with_status_filter(self, domain_request_service, mock_domain_request_repo, sample_domain_request_model):
-        mock_domain_request_repo.get_all_domain_requests.return_value = [sample_domain_request_model.model_dump(by_alias=True)]
+        mock_domain_request_repo.get_all_domain_requests.return_value = KeysetPage(rows=[sample_domain_request_model], next_cursor=None, total=1)
 
         result = await domain_request_service.get_all_domain_requests(status=DomainRequestStatus.PENDING)
 
-        assert len(result) == 1
-        assert result[0].status == DomainRequestStatus.PENDING
-        mock_domain_request_repo.get_all_domain_requests.assert_called_once_with({"status": "pending"}, skip=0, limit=100)
+        assert len(result.rows) == 1
+        assert result.rows[0].status == DomainRequestStatus.PENDING
+        mock_domain_request_repo.get_all_domain_requests.assert_called_once_with({"status": "pending"}, cursor=None, skip=0, limit=100, total_mode="exact")
+
+    @pytest.mark.asyncio
+    async def test_get_all_domain_requests_follows_the_cursor(self, domain_request_service, mock_domain_request_repo, sample_domain_request_model):
+        mock_domain_request_repo.get_all_domain_requests.return_value = KeysetPage(rows=[sample_domain_request_model], next_cursor="next", total=3)
+
+        result = await domain_request_service.get_all_domain_requests(cursor="current", limit=1)
+
+        assert result.next_cursor == "next" and result.total == 3
+        assert result.rows[0].id == sample_domain_request_model.id
+        mock_domain_request_repo.get_all_domain_requests.assert_called_once_with({}, cursor="current", skip=0, limit=1, total_mode="exact")
+
+    @pytest.mark.asyncio
+    async def test_get_all_domain_requests_rejects_a_malformed_cursor(self, domain_request_service, mock_domain_request_repo):
+        mock_domain_request_repo.get_all_domain_requests.side_effect = ValueError("Invalid cursor")
+
+        with pytest.raises(BadRequestException):
+            await domain_request_service.get_all_domain_requests(cursor="garbage")
 
     @pytest.mark.asyncio
     async def test_approve_domain_request_success(self, domain_request_service, mock_domain_request_repo, mock_website_repo, sample_domain_request_model, sample_requester_id):
@@ -0,0 +1,148 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.repositories.cookie_feature_repository import CookieFeatureRepository
+from src.repositories.llm_extraction_cache_repository import LLMExtractionCacheRepository
+from src.services.cookie_extractor_service.interfaces.llm_provider import ILLMProvider
+from src.services.cookie_extractor_service.policy_cookie_extractor_service import CookieExtractorService
+from src.services.cookie_extractor_service.processors.content_analyzer import ContentAnalyzer
+from src.services.cookie_extractor_service.processors.extraction_cache import ExtractionCache
+from src.services.cookie_extractor_service.processors.prompt_builder import PromptBuilder
+from src.services.cookie_extractor_service.processors.response_processor import LLMResponseProcessor
+from src.utils.cache_utils import TTLCache
+
+LLM_RESPONSE = json.dumps({
+    "is_specific": 1,
+    "cookies": [{
+        "cookie_name": "_ga",
+        "declared_purpose": "Analytical",
+        "declared_retention": "2 years",
+        "declared_third_parties": ["Google"],
+        "declared_description": "Distinguishes users"
+    }]
+})
+
+
+@pytest.fixture
+def mock_llm_provider():
+    provider = AsyncMock(spec=ILLMProvider)
+    provider.generate_content.return_value = LLM_RESPONSE
+    provider.get_provider_name = MagicMock(return_value="Gemini")
+    provider.get_model_name = MagicMock(return_value="gemini-1.5-flash")
+    return provider
+
+
+@pytest.fixture
+def mock_cache_repository():
+    repository = AsyncMock(spec=LLMExtractionCacheRepository)
+    repository.get_entry.return_value = None
+    return repository
+
+
+def make_service(llm_provider, extraction_cache, system_prompt="Extract cookies"):
+    return CookieExtractorService(
+        llm_provider=llm_provider,
+        content_analyzer=ContentAnalyzer(),
+        prompt_builder=PromptBuilder(system_prompt=system_prompt),
+        response_processor=LLMResponseProcessor(),
+        cookie_feature_repository=AsyncMock(spec=CookieFeatureRepository),
+        extraction_cache=extraction_cache
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_content_calls_llm_once(mock_llm_provider, mock_cache_repository):
+    cache = ExtractionCache(repository=mock_cache_repository)
+    service = make_service(mock_llm_provider, cache)
+
+    first = await service.extract_cookie_features(original_content="We use  _ga\ncookies.")
+    second = await service.extract_cookie_features(original_content="We use _ga cookies.  ")
+
+    assert mock_llm_provider.generate_content.await_count == 1
+    assert first == second
+    assert second.cookies[0].cookie_name == "_ga"
+    mock_cache_repository.save_entry.assert_awaited_once()
+    # Cache hit: cookies were already saved by the first extraction
+    service.cookie_feature_repository.insert_many.assert_awaited_once()
+    metrics = cache.get_metrics()
+    assert metrics["misses"] == 1
+    assert metrics["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_serves_other_workers(mock_llm_provider, mock_cache_repository):
+    stored = {}
+
+    async def save_entry(key, result, metadata, ttl_seconds=0):
+        stored[key] = {"_id": key, "result": result, **metadata}
+
+    mock_cache_repository.save_entry.side_effect = save_entry
+    mock_cache_repository.get_entry.side_effect = lambda key: stored.get(key)
+
+    await make_service(mock_llm_provider, ExtractionCache(repository=mock_cache_repository)) \
+        .extract_cookie_features(table_content="_ga | Analytical | 2 years")
+
+    # A fresh process has an empty memory tier but shares the Mongo tier
+    other_cache = ExtractionCache(repository=mock_cache_repository)
+    result = await make_service(mock_llm_provider, other_cache) \
+        .extract_cookie_features(table_content="_ga | Analytical | 2 years")
+
+    assert mock_llm_provider.generate_content.await_count == 1
+    assert result.cookies[0].cookie_name == "_ga"
+    assert other_cache.get_metrics()["persistent_hits"] == 1
+    mock_cache_repository.record_hit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_key_includes_provider_model_and_prompt_version(mock_llm_provider, mock_cache_repository):
+    cache = ExtractionCache(repository=mock_cache_repository)
+
+    await make_service(mock_llm_provider, cache).extract_cookie_features(original_content="policy")
+    await make_service(mock_llm_provider, cache, system_prompt="Extract cookies v2").extract_cookie_features(original_content="policy")
+    mock_llm_provider.get_model_name.return_value = "gemini-2.0-flash"
+    await make_service(mock_llm_provider, cache).extract_cookie_features(original_content="policy")
+
+    assert mock_llm_provider.generate_content.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_empty_results_are_not_cached(mock_llm_provider, mock_cache_repository):
+    mock_llm_provider.generate_content.return_value = '{"is_specific": 0, "cookies": []}'
+    cache = ExtractionCache(repository=mock_cache_repository)
+    service = make_service(mock_llm_provider, cache)
+
+    await service.extract_cookie_features(original_content="policy")
+    await service.extract_cookie_features(original_content="policy")
+
+    assert mock_llm_provider.generate_content.await_count == 2
+    mock_cache_repository.save_entry.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_failure_falls_back_to_llm(mock_llm_provider, mock_cache_repository):
+    mock_cache_repository.get_entry.side_effect = RuntimeError("mongo down")
+    mock_cache_repository.save_entry.side_effect = RuntimeError("mongo down")
+    cache = ExtractionCache(repository=mock_cache_repository)
+
+    result = await make_service(mock_llm_provider, cache).extract_cookie_features(original_content="policy")
+
+    assert result.cookies[0].cookie_name == "_ga"
+    assert cache.get_metrics()["persistent_errors"] == 2
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+
+    assert "b" not in cache
+    now[0] = 11
+    assert cache.get("a") is None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from aiohttp import web
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from src.exceptions.custom_exceptions import LLMResponseError
+
+from src.services.cookie_extractor_service.providers.gemini_provider import GeminiLLMProvider
+from src.services.cookie_extractor_service.providers.llama_provider import LlamaLLMProvider
+
+
+class FakeAsyncModels:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def generate_content(self, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return SimpleNamespace(text='{"is_specific": 1, "cookies": []}')
+
+
+class FakeGenaiClient:
+    instances = []
+
+    def __init__(self, api_key, http_options=None):
+        self.http_options = http_options
+        self.closed = False
+        self.aio = SimpleNamespace(models=FakeAsyncModels(), aclose=self._aclose)
+        # The blocking surface must never be used from the event loop
+        self.models = None
+        FakeGenaiClient.instances.append(self)
+
+    async def _aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_gemini_provider_reuses_one_async_client_and_bounds_concurrency(monkeypatch):
+    from google import genai
+    FakeGenaiClient.instances = []
+    monkeypatch.setattr(genai, "Client", FakeGenaiClient)
+    provider = GeminiLLMProvider(api_key="key", model="gemini-test", max_concurrency=2)
+
+    await provider.start()
+    results = await asyncio.gather(*[provider.generate_content(f"prompt {i}") for i in range(6)])
+    await provider.close()
+
+    assert len(FakeGenaiClient.instances) == 1
+    client = FakeGenaiClient.instances[0]
+    assert all(result == '{"is_specific": 1, "cookies": []}' for result in results)
+    assert client.aio.models.peak == 2
+    assert client.closed
+
+
+@pytest.mark.asyncio
+async def test_gemini_provider_raises_instead_of_returning_an_empty_extraction(monkeypatch):
+    from google import genai
+    monkeypatch.setattr(genai, "Client", FakeGenaiClient)
+    provider = GeminiLLMProvider(api_key="key", model="gemini-test")
+    models = provider._get_client().aio.models
+
+    models.generate_content = AsyncMock(side_effect=RuntimeError("503 UNAVAILABLE"))
+    with pytest.raises(LLMResponseError):
+        await provider.generate_content("prompt")
+
+    models.generate_content = AsyncMock(return_value=SimpleNamespace(text=None))
+    with pytest.raises(LLMResponseError):
+        await provider.generate_content("prompt")
+
+
+@pytest.mark.asyncio
+async def test_llama_provider_keeps_connections_alive_across_requests():
+    peers = set()
+    active = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return web.json_response({"generated_text": "ok"})
+
+    app = web.Application()
+    app.router.add_post("/generate", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    provider = LlamaLLMProvider(api_endpoint=f"http://127.0.0.1:{port}/generate", api_key="key", max_concurrency=2)
+    try:
+        await provider.start()
+        session = provider._session
+        results = await asyncio.gather(*[provider.generate_content(f"chunk {i}") for i in range(8)])
+        assert provider._session is session
+    finally:
+        await provider.close()
+        await runner.cleanup()
+
+    assert results == ["ok"] * 8
+    assert active["peak"] == 2
+    assert len(peers) <= 2
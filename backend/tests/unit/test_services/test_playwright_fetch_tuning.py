@@ -0,0 +1,114 @@
+import pytest
+from types import SimpleNamespace
+
+from src.services.policy_crawler_service.components.page_readiness import PageReadiness
+from src.services.policy_crawler_service.components.resource_blocker import ResourceBlocker
+
+PAGE_URL = "https://shop.example.com/cookie-policy"
+
+
+@pytest.mark.parametrize("resource_type,url,reason", [
+    ("document", "https://shop.example.com/cookie-policy", None),
+    ("image", "https://shop.example.com/logo.png", "image"),
+    ("font", "https://fonts.example-cdn.com/a.woff2", "font"),
+    ("script", "https://shop.example.com/app.js", None),
+    ("script", "https://www.googletagmanager.com/gtm.js", "tracker"),
+    ("xhr", "https://stats.g.doubleclick.net/collect", "tracker"),
+    ("script", "https://cdn.cookielaw.org/otSDKStub.js", None),
+])
+def test_block_reason(resource_type, url, reason):
+    blocker = ResourceBlocker(resource_types=["image", "font"], blocked_hosts=["googletagmanager.com", "doubleclick.net"])
+
+    assert blocker.block_reason(resource_type, url, "example.com") == reason
+
+
+def test_tracker_hosts_of_the_page_own_site_are_not_blocked():
+    blocker = ResourceBlocker(resource_types=[], blocked_hosts=["hotjar.com"])
+
+    assert blocker.block_reason("script", "https://static.hotjar.com/c.js", "hotjar.com") is None
+    assert blocker.block_reason("script", "https://static.hotjar.com/c.js", "example.com") == "tracker"
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.action = None
+
+    async def continue_(self):
+        self.action = "continue"
+
+    async def abort(self):
+        self.action = "abort"
+
+
+class FakePage:
+    def __init__(self, probes=()):
+        self.handler = None
+        self.probes = list(probes)
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    async def evaluate(self, script, arg):
+        return self.probes.pop(0) if len(self.probes) > 1 else self.probes[0]
+
+
+@pytest.mark.asyncio
+async def test_installed_route_aborts_blocked_requests_and_counts_them():
+    blocker = ResourceBlocker(resource_types=["image"], blocked_hosts=["doubleclick.net"])
+    page = FakePage()
+    await blocker.install(page, PAGE_URL)
+
+    routes = [FakeRoute("document", PAGE_URL), FakeRoute("image", "https://shop.example.com/a.png"),
+              FakeRoute("script", "https://ad.doubleclick.net/x.js")]
+    for route in routes:
+        await page.handler(route)
+
+    assert [route.action for route in routes] == ["continue", "abort", "abort"]
+    assert blocker.get_metrics() == {"allowed": 1, "blocked": {"image": 1, "tracker": 1}, "blocked_total": 2}
+
+
+@pytest.mark.asyncio
+async def test_disabled_blocker_does_not_intercept():
+    page = FakePage()
+    await ResourceBlocker(resource_types=[], blocked_hosts=[]).install(page, PAGE_URL)
+
+    assert page.handler is None
+
+
+def make_readiness(**kwargs):
+    now = [0.0]
+
+    async def no_sleep(seconds):
+        now[0] += seconds
+
+    readiness = PageReadiness(clock=lambda: now[0], poll_interval=0.25, **kwargs)
+    return readiness, now, no_sleep
+
+
+@pytest.mark.asyncio
+async def test_ready_as_soon_as_policy_text_is_stable(monkeypatch):
+    readiness, now, no_sleep = make_readiness(max_wait=8, stable_polls=2)
+    monkeypatch.setattr("src.services.policy_crawler_service.components.page_readiness.asyncio.sleep", no_sleep)
+    page = FakePage([[0, False], [1200, True], [1500, True], [1500, True], [1500, True]])
+
+    assert await readiness.wait(page) == "policy_text"
+    assert now[0] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_long_stable_page_without_keywords_is_ready(monkeypatch):
+    readiness, _, no_sleep = make_readiness(max_wait=8, stable_polls=2, min_text_chars=300)
+    monkeypatch.setattr("src.services.policy_crawler_service.components.page_readiness.asyncio.sleep", no_sleep)
+
+    assert await readiness.wait(FakePage([[800, False]])) == "stable"
+
+
+@pytest.mark.asyncio
+async def test_changing_or_empty_page_times_out_at_max_wait(monkeypatch):
+    readiness, now, no_sleep = make_readiness(max_wait=2, stable_polls=2)
+    monkeypatch.setattr("src.services.policy_crawler_service.components.page_readiness.asyncio.sleep", no_sleep)
+
+    assert await readiness.wait(FakePage([[50, False]])) == "timeout"
+    assert now[0] <= 2
+    assert readiness.get_metrics()["outcomes"] == {"timeout": 1}
@@ -0,0 +1,196 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from bson import ObjectId
+
+from src.exceptions.custom_exceptions import LLMResponseError
+from src.models.website import Website
+from src.schemas.cookie import CookieSubmissionRequest, PolicyCookieList
+from src.schemas.policy import PolicyContent
+from src.services.violation_analyzer_service.policy_cache_freshness import PolicyCacheFreshness
+from src.services.violation_analyzer_service.violation_analyzer_service import ViolationAnalyzerService
+from src.utils.cache_utils import stable_digest
+
+ROOT = "https://shop.example.com/"
+NOW = datetime(2024, 6, 1)
+DAY = 24 * 3600
+
+
+def make_website(age_days: float, **overrides) -> Website:
+    return Website(**{
+        "_id": ObjectId(), "domain": ROOT, "user_id": ObjectId(), "original_content": "old policy", "is_specific": 1,
+        "policy_url": f"{ROOT}cookies", "last_checked_at": NOW - timedelta(days=age_days),
+        "policy_content_hash": stable_digest("old policy", []), **overrides
+    })
+
+
+def make_policy(text: str) -> PolicyContent:
+    return PolicyContent(website_url=ROOT, policy_url=f"{ROOT}cookie-policy", detected_language="en",
+                         original_content=text, translated_content=None, table_content=[], translated_table_content=None)
+
+
+@pytest.mark.parametrize("age_days,state", [(1, "fresh"), (10, "stale"), (40, "expired")])
+def test_classify_by_last_checked_at(age_days, state):
+    freshness = PolicyCacheFreshness(soft_ttl_seconds=7 * DAY, hard_ttl_seconds=30 * DAY, clock=lambda: NOW)
+
+    assert freshness.classify(make_website(age_days)) == (state, pytest.approx(age_days * DAY))
+    assert freshness.get_metrics()["served"][state] == 1
+
+
+def test_per_site_override_and_age_metrics():
+    freshness = PolicyCacheFreshness(soft_ttl_seconds=7 * DAY, hard_ttl_seconds=30 * DAY, clock=lambda: NOW)
+
+    assert freshness.classify(make_website(2, cache_soft_ttl_seconds=DAY))[0] == "stale"
+    assert freshness.classify(make_website(40, cache_hard_ttl_seconds=0))[0] == "stale"
+    metrics = freshness.get_metrics()
+    assert metrics["served_age"]["<7d"] == 1 and metrics["served_age"][">=30d"] == 1
+    assert metrics["max_age_served_seconds"] == 40 * DAY
+
+
+def test_failed_refresh_backs_off_revalidation():
+    freshness = PolicyCacheFreshness(soft_ttl_seconds=7 * DAY, hard_ttl_seconds=30 * DAY,
+                                     retry_base_seconds=3600, retry_max_seconds=4 * 3600, clock=lambda: NOW)
+
+    assert freshness.refresh_retry_at(1) == NOW + timedelta(hours=1)
+    assert freshness.refresh_retry_at(3) == NOW + timedelta(hours=4)
+    assert freshness.classify(make_website(40, refresh_retry_at=NOW + timedelta(hours=1)))[0] == "backoff"
+    assert freshness.classify(make_website(10, refresh_retry_at=NOW - timedelta(hours=1)))[0] == "stale"
+    # Còn mới thì vẫn là fresh, bất kể lịch thử lại
+    assert freshness.classify(make_website(1, refresh_retry_at=NOW + timedelta(hours=1)))[0] == "fresh"
+
+
+def make_service(mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+                 mock_violation_repository, mock_website_repository, website):
+    result = MagicMock()
+    result.model_dump.return_value = {
+        "website_url": ROOT, "analysis_date": NOW, "total_issues": 0, "compliance_score": 100.0, "issues": [],
+        "statistics": {}, "summary": {}, "policy_cookies_count": 0, "actual_cookies_count": 0, "details": {}
+    }
+    mock_comparator_service.compare_compliance.return_value = result
+    mock_website_repository.get_view_by_root_url.return_value = website
+    mock_cookie_extractor_service.extract_cookie_features.return_value = PolicyCookieList(is_specific=0, cookies=[])
+    freshness = PolicyCacheFreshness(soft_ttl_seconds=7 * DAY, hard_ttl_seconds=30 * DAY, clock=lambda: NOW)
+    service = ViolationAnalyzerService(
+        mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+        mock_violation_repository, mock_website_repository, freshness=freshness
+    )
+    return service, freshness
+
+
+@pytest.mark.asyncio
+async def test_stale_site_is_served_immediately_and_revalidated_in_background(
+    mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+    mock_violation_repository, mock_website_repository
+):
+    website = make_website(10)
+    service, freshness = make_service(mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+                                      mock_violation_repository, mock_website_repository, website)
+    crawled = asyncio.Event()
+
+    async def slow_crawl(url, force_refresh=False):
+        await crawled.wait()
+        return make_policy("old policy")
+
+    mock_policy_crawler.extract_policy.side_effect = slow_crawl
+
+    response = await service.orchestrate_analysis(CookieSubmissionRequest(website_url=ROOT, cookies=[]), "req")
+
+    assert response.policy_url == f"{ROOT}cookies"
+    assert freshness.get_metrics()["refreshes_in_flight"] == 1
+    crawled.set()
+    while freshness.get_metrics()["refreshes_in_flight"]:
+        await asyncio.sleep(0)
+    assert freshness.get_metrics()["refreshes"]["succeeded"] == 1
+    # Nội dung không đổi: chỉ cập nhật last_checked_at, không gọi lại LLM
+    mock_cookie_extractor_service.extract_cookie_features.assert_not_called()
+    update = mock_website_repository.update_website.await_args_list[-1].args[1]
+    assert set(update) == {"last_checked_at", "policy_url", "refresh_failures", "refresh_retry_at"}
+
+
+@pytest.mark.asyncio
+async def test_expired_site_with_changed_policy_is_re_extracted_inline(
+    mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+    mock_violation_repository, mock_website_repository
+):
+    website = make_website(40)
+    service, _ = make_service(mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+                              mock_violation_repository, mock_website_repository, website)
+    mock_policy_crawler.extract_policy.return_value = make_policy("new policy")
+
+    response = await service.orchestrate_analysis(CookieSubmissionRequest(website_url=ROOT, cookies=[]), "req")
+
+    assert response.policy_url == f"{ROOT}cookie-policy"
+    mock_policy_crawler.extract_policy.assert_awaited_once_with(ROOT, force_refresh=True)
+    mock_cookie_extractor_service.extract_cookie_features.assert_awaited_once()
+    refreshed = mock_website_repository.update_website.await_args_list[0].args[1]
+    assert refreshed["policy_content_hash"] == stable_digest("new policy", [])
+    assert refreshed["original_content"] == "new policy"
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_records_a_retry_time_and_serves_stored_data(
+    mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+    mock_violation_repository, mock_website_repository
+):
+    website = make_website(40, refresh_failures=1)
+    service, freshness = make_service(mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+                                      mock_violation_repository, mock_website_repository, website)
+    mock_policy_crawler.extract_policy.return_value = None
+
+    response = await service.orchestrate_analysis(CookieSubmissionRequest(website_url=ROOT, cookies=[]), "req")
+
+    assert response.policy_url == f"{ROOT}cookies"
+    mock_website_repository.update_one.assert_awaited_once_with(
+        {"_id": website.id}, {"$set": {"refresh_failures": 2, "refresh_retry_at": freshness.refresh_retry_at(2)}}
+    )
+    # Lượt phục vụ không ghi lại website
+    mock_website_repository.update_website.assert_not_called()
+
+    # Trong thời gian chờ, site được phục vụ ngay mà không crawl lại
+    mock_website_repository.get_view_by_root_url.return_value = make_website(40, refresh_retry_at=freshness.refresh_retry_at(2))
+    await service.orchestrate_analysis(CookieSubmissionRequest(website_url=ROOT, cookies=[]), "req")
+    mock_policy_crawler.extract_policy.assert_awaited_once()
+    assert freshness.get_metrics()["served"]["backoff"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_keeps_stored_cookies_and_hash(
+    mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+    mock_violation_repository, mock_website_repository
+):
+    website = make_website(40)
+    service, freshness = make_service(mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+                                      mock_violation_repository, mock_website_repository, website)
+    mock_policy_crawler.extract_policy.return_value = make_policy("new policy")
+    mock_cookie_extractor_service.extract_cookie_features.side_effect = LLMResponseError("partial extraction")
+
+    response = await service.orchestrate_analysis(CookieSubmissionRequest(website_url=ROOT, cookies=[]), "req")
+
+    assert response.policy_url == f"{ROOT}cookies"
+    mock_website_repository.update_website.assert_not_called()
+    mock_website_repository.update_one.assert_awaited_once_with(
+        {"_id": website.id}, {"$set": {"refresh_failures": 1, "refresh_retry_at": freshness.refresh_retry_at(1)}}
+    )
+
+
+@pytest.mark.asyncio
+async def test_new_site_with_failed_extraction_is_stored_without_hash(
+    mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+    mock_violation_repository, mock_website_repository
+):
+    service, freshness = make_service(mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+                                      mock_violation_repository, mock_website_repository, None)
+    mock_policy_crawler.extract_policy.return_value = make_policy("new policy")
+    mock_cookie_extractor_service.extract_cookie_features.side_effect = LLMResponseError("partial extraction")
+
+    await service.orchestrate_analysis(CookieSubmissionRequest(website_url=ROOT, cookies=[]), "req")
+
+    created = mock_website_repository.create_website.await_args.args[0]
+    assert created["policy_content_hash"] is None and created["policy_cookies"] == []
+    assert created["refresh_failures"] == 1 and created["refresh_retry_at"] == freshness.refresh_retry_at(1)
+    stored = Website(_id=ObjectId(), user_id=ObjectId(), **{**created, "last_checked_at": NOW})
+    assert freshness.classify(stored)[0] == "backoff"
+    # Hết thời gian chờ, site được kiểm tra lại dù còn mới
+    assert freshness.classify(stored.model_copy(update={"refresh_retry_at": NOW - timedelta(hours=1)}))[0] == "stale"
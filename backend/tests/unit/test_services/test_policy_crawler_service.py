@@ -4,12 +4,13 @@ from src.services.policy_crawler_service.policy_crawler_service import PolicyCra
 from src.services.policy_crawler_service.crawler_factory import CrawlerFactory
 from src.repositories.policy_content_repository import PolicyContentRepository
 from src.repositories.policy_storage_repository import PolicyStorageService
+from src.repositories.policy_miss_repository import PolicyMissRepository
 from src.services.policy_crawler_service.components.link_discovery import LinkDiscovery
 from src.services.policy_crawler_service.components.content_processor import ContentProcessor
 from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
 from src.services.policy_crawler_service.interfaces.search_provider_interface import ISearchProvider
 from src.models.policy import PolicyContent
-from src.exceptions.custom_exceptions import PolicyCrawlException
+from src.exceptions.custom_exceptions import PolicyCrawlException, SearchError
 
 @pytest.fixture
 def mock_link_discovery():
@@ -219,3 +220,86 @@ class TestPolicyCrawlerService:
         mock_content_extractor.extract_content.assert_called_once_with(policy_url)
         mock_content_processor.process_content.assert_called_once()
         mock_policy_storage_service.save_policy.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_extract_policy_recent_miss_short_circuits(self, policy_crawler_service, mock_link_discovery, mock_search_provider, mock_policy_storage_service):
+        # Arrange
+        url = "http://example.com"
+        miss_repository = AsyncMock(spec=PolicyMissRepository)
+        miss_repository.get_active_miss.return_value = {"reason": "no_policy_found", "miss_count": 2, "retry_at": "later"}
+        policy_crawler_service.miss_repository = miss_repository
+        mock_policy_storage_service.get_existing_policy.return_value = None
+
+        # Act
+        result = await policy_crawler_service.extract_policy(url)
+
+        # Assert
+        assert result is None
+        miss_repository.get_active_miss.assert_called_once_with(url)
+        mock_link_discovery.discover_policy_link.assert_not_called()
+        mock_search_provider.search_policy.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_policy_no_policy_found_is_negative_cached(self, policy_crawler_service, mock_link_discovery, mock_search_provider, mock_policy_storage_service):
+        # Arrange
+        url = "http://example.com"
+        miss_repository = AsyncMock(spec=PolicyMissRepository)
+        miss_repository.get_active_miss.return_value = None
+        miss_repository.record_miss.return_value = {"miss_count": 1, "ttl_seconds": 60}
+        policy_crawler_service.miss_repository = miss_repository
+        mock_link_discovery.discover_policy_link.return_value = None
+        mock_search_provider.search_policy.return_value = None
+        mock_policy_storage_service.get_existing_policy.return_value = None
+
+        # Act
+        result = await policy_crawler_service.extract_policy(url)
+
+        # Assert
+        assert result is None
+        assert miss_repository.record_miss.call_args.args[:2] == (url, "no_policy_found")
+
+    @pytest.mark.asyncio
+    async def test_extract_policy_failed_discovery_is_not_negative_cached(self, policy_crawler_service, mock_link_discovery, mock_search_provider, mock_policy_storage_service):
+        # Arrange
+        url = "http://example.com"
+        miss_repository = AsyncMock(spec=PolicyMissRepository)
+        miss_repository.get_active_miss.return_value = None
+        policy_crawler_service.miss_repository = miss_repository
+        mock_link_discovery.discover_policy_link.return_value = None
+        mock_search_provider.search_policy.side_effect = SearchError("bing search error: timeout")
+        mock_policy_storage_service.get_existing_policy.return_value = None
+
+        # Act
+        result = await policy_crawler_service.extract_policy(url)
+
+        # Assert
+        assert result is None
+        miss_repository.record_miss.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_policy_force_refresh_ignores_miss_and_clears_it_on_success(self, policy_crawler_service, mock_link_discovery, mock_content_extractor, mock_content_processor, mock_policy_storage_service):
+        # Arrange
+        url = "http://example.com"
+        policy_url = "http://example.com/cookies"
+        miss_repository = AsyncMock(spec=PolicyMissRepository)
+        policy_crawler_service.miss_repository = miss_repository
+        mock_link_discovery.discover_policy_link.return_value = policy_url
+        mock_content_extractor.extract_content.return_value = "<html>Policy</html>"
+        mock_content_processor.process_content.return_value = PolicyContent(
+            website_url=url,
+            policy_url=policy_url,
+            detected_language="en",
+            original_content="Policy content",
+            translated_content=None,
+            table_content=[],
+            translated_table_content=None,
+            error=None
+        )
+
+        # Act
+        result = await policy_crawler_service.extract_policy(url, force_refresh=True)
+
+        # Assert
+        assert result.policy_url == policy_url
+        miss_repository.get_active_miss.assert_not_called()
+        miss_repository.clear_miss.assert_called_once_with(url)
@@ -0,0 +1,139 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.schemas.policy import DiscoveryMethod
+from src.exceptions.custom_exceptions import SearchError
+from src.services.policy_crawler_service.components.policy_discoverer import PolicyDiscoverer
+from src.services.policy_crawler_service.components.sitemap_discovery import SitemapDiscovery
+from src.services.policy_crawler_service.components.well_known_path_prober import WellKnownPathProber
+from src.utils.dom_parser_utils import DOMParserService
+
+ROOT = "https://shop.example.com"
+POLICY_HTML = "<html><body><h1>Cookie Policy</h1>" + "<p>We use cookies to remember you.</p>" * 6 + "</body></html>"
+
+
+class FakeHttp:
+    """Serves canned (final_url, body) pairs by requested URL"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    async def fetch(self, url, content_types=("html",)):
+        self.requested.append(url)
+        return self.pages.get(url, (url, ""))
+
+
+@pytest.mark.asyncio
+async def test_prober_accepts_policy_page_and_rejects_soft_404_and_thin_pages():
+    http = FakeHttp({
+        f"{ROOT}/cookie-policy": (f"{ROOT}/cookie-policy", POLICY_HTML),
+        f"{ROOT}/cookies": (f"{ROOT}/", POLICY_HTML),
+        f"{ROOT}/privacy": (f"{ROOT}/privacy", "<p>Privacy policy. We use cookies.</p>"),
+    })
+    prober = WellKnownPathProber(http, paths=["/cookie-policy", "/cookies", "/privacy"])
+
+    assert await prober.probe(ROOT) == [
+        {"url": f"{ROOT}/cookie-policy", "method": DiscoveryMethod.WELL_KNOWN_PATH, "score": pytest.approx(0.9)}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prober_follows_redirects_to_the_www_host_but_not_to_other_sites():
+    http = FakeHttp({
+        "https://example.com/cookie-policy": ("https://www.example.com/cookie-policy", POLICY_HTML),
+        "https://example.com/cookies": ("https://cdn.other.net/cookies", POLICY_HTML),
+    })
+    prober = WellKnownPathProber(http, paths=["/cookie-policy", "/cookies"])
+
+    assert [found["url"] for found in await prober.probe("https://example.com")] == ["https://www.example.com/cookie-policy"]
+
+
+@pytest.mark.asyncio
+async def test_sitemap_follows_robots_and_index_keeping_same_host_policy_urls():
+    http = FakeHttp({
+        f"{ROOT}/robots.txt": (f"{ROOT}/robots.txt", f"User-agent: *\nSitemap: {ROOT}/sitemap_index.xml\n"),
+        f"{ROOT}/sitemap_index.xml": (f"{ROOT}/sitemap_index.xml", (
+            "<sitemapindex>"
+            f"<sitemap><loc>{ROOT}/sitemap-products.xml</loc></sitemap>"
+            f"<sitemap><loc>{ROOT}/sitemap-pages.xml</loc></sitemap>"
+            "</sitemapindex>"
+        )),
+        f"{ROOT}/sitemap-pages.xml": (f"{ROOT}/sitemap-pages.xml", (
+            "<urlset>"
+            f"<url><loc>{ROOT}/about</loc></url>"
+            f"<url><loc>{ROOT}/legal/cookie-notice</loc></url>"
+            f"<url><loc>{ROOT}/cookie-policy</loc></url>"
+            "<url><loc>https://other.example.org/cookie-policy</loc></url>"
+            "</urlset>"
+        )),
+    })
+    sitemap = SitemapDiscovery(http, DOMParserService(), max_fetches=2)
+
+    candidates = await sitemap.discover(ROOT)
+
+    assert [c["url"] for c in candidates] == [f"{ROOT}/cookie-policy", f"{ROOT}/legal/cookie-notice"]
+    assert all(c["method"] == DiscoveryMethod.SITEMAP for c in candidates)
+    # Sitemap "pages" được ưu tiên, sitemap sản phẩm không bị tải khi hết lượt
+    assert f"{ROOT}/sitemap-products.xml" not in http.requested
+
+
+def make_discoverer(dom_result=None, dom_delay=0.0, probe_result=(), search_result=None, search_delay=5.0):
+    async def slow_dom(root_url):
+        await asyncio.sleep(dom_delay)
+        return dom_result
+
+    link_discovery = MagicMock()
+    link_discovery.discover_policy_link = AsyncMock(side_effect=slow_dom)
+    prober = MagicMock()
+    prober.probe = AsyncMock(return_value=list(probe_result))
+    search = MagicMock()
+    search.search_policy = AsyncMock(return_value=search_result)
+    discoverer = PolicyDiscoverer(link_discovery, search, path_prober=prober, search_delay=search_delay)
+    return discoverer, link_discovery, search
+
+
+@pytest.mark.asyncio
+async def test_confident_probe_wins_and_cancels_slow_strategies():
+    probe = {"url": f"{ROOT}/cookie-policy", "method": DiscoveryMethod.WELL_KNOWN_PATH, "score": 0.9}
+    discoverer, _, search = make_discoverer(dom_result=f"{ROOT}/legal", dom_delay=10, probe_result=[probe])
+
+    result, errored = await asyncio.wait_for(discoverer.discover(ROOT), timeout=1)
+
+    assert result == probe and not errored
+    search.search_policy.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_starts_early_once_cheap_strategies_fail():
+    discoverer, _, search = make_discoverer(search_result=f"{ROOT}/cookies", search_delay=10)
+
+    result, errored = await asyncio.wait_for(discoverer.discover(ROOT), timeout=1)
+
+    assert result["url"] == f"{ROOT}/cookies"
+    assert result["method"] == DiscoveryMethod.BING_SEARCH
+    search.search_policy.assert_awaited_once_with(ROOT)
+
+
+@pytest.mark.asyncio
+async def test_best_candidate_below_threshold_is_returned():
+    weak = {"url": f"{ROOT}/legal", "method": DiscoveryMethod.SITEMAP, "score": 0.6}
+    discoverer, _, _ = make_discoverer(probe_result=[weak], search_delay=0)
+
+    assert await discoverer.discover(ROOT) == (weak, False)
+
+
+@pytest.mark.asyncio
+async def test_nothing_found_returns_none():
+    discoverer, _, _ = make_discoverer(search_delay=0)
+
+    assert await discoverer.discover(ROOT) == (None, False)
+
+
+@pytest.mark.asyncio
+async def test_failing_strategy_is_reported():
+    discoverer, _, search = make_discoverer(search_delay=0)
+    search.search_policy.side_effect = SearchError("bing blocked")
+
+    assert await discoverer.discover(ROOT) == (None, True)
@@ -0,0 +1,180 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from bson import ObjectId
+
+from src.exceptions.custom_exceptions import TranslationError
+from src.models.policy import PolicyContent
+from src.repositories.policy_content_repository import PolicyContentRepository
+from src.repositories.policy_storage_repository import PolicyStorageService
+from src.repositories.website_repository import WebsiteRepository
+from src.services.policy_crawler_service.components.content_processor import ContentProcessor
+from src.services.policy_crawler_service.components.link_discovery import LinkDiscovery
+from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
+from src.services.policy_crawler_service.interfaces.search_provider_interface import ISearchProvider
+from src.services.policy_crawler_service.policy_crawler_service import PolicyCrawlerService
+from src.services.policy_translation_service.policy_translation_service import PolicyTranslationService
+from src.utils.translation_utils import TranslationManager
+
+ROOT_URL = "https://example.fr"
+POLICY_ID = ObjectId()
+
+
+def make_policy(language="fr", translated=None, tables=None):
+    return PolicyContent(
+        _id=POLICY_ID,
+        website_url=ROOT_URL,
+        policy_url=f"{ROOT_URL}/cookies",
+        detected_language=language,
+        original_content="Nous utilisons des cookies.",
+        translated_content=translated,
+        table_content=tables or [],
+        translated_table_content=None,
+    )
+
+
+@pytest.fixture
+def translator():
+    manager = AsyncMock(spec=TranslationManager)
+    manager.translate_content_to_english.side_effect = lambda text, strict=False: f"EN:{text}"
+    return manager
+
+
+@pytest.fixture
+def policy_repository():
+    return AsyncMock(spec=PolicyContentRepository)
+
+
+@pytest.fixture
+def website_repository():
+    return AsyncMock(spec=WebsiteRepository)
+
+
+@pytest.fixture
+def service(translator, policy_repository, website_repository):
+    return PolicyTranslationService(translator, policy_repository, website_repository, workers=1)
+
+
+@pytest.mark.asyncio
+async def test_materialize_translates_text_and_tables_and_stores_them(service, policy_repository, website_repository):
+    policy_repository.get_latest_by_website_url.return_value = make_policy(tables=[{"headers": ["Nom"], "rows": [["_ga"]]}])
+
+    result = await service.materialize(ROOT_URL)
+
+    assert result["translated_content"] == "EN:Nous utilisons des cookies."
+    assert result["translated_table_content"].startswith("EN:[")
+    policy_repository.set_translation.assert_awaited_once_with(
+        POLICY_ID, result["translated_content"], result["translated_table_content"]
+    )
+    website_repository.set_translation_by_domain.assert_awaited_once_with(
+        ROOT_URL, "Nous utilisons des cookies.", result["translated_content"], result["translated_table_content"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_existing_translation_is_reused_and_copied_to_websites(service, translator, policy_repository, website_repository):
+    policy_repository.get_latest_by_website_url.return_value = make_policy(translated="We use cookies.")
+
+    result = await service.materialize(ROOT_URL)
+
+    assert result["translated_content"] == "We use cookies."
+    translator.translate_content_to_english.assert_not_awaited()
+    policy_repository.set_translation.assert_not_awaited()
+    website_repository.set_translation_by_domain.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_english_policies_are_not_translated(service, translator, policy_repository, website_repository):
+    policy_repository.get_latest_by_website_url.return_value = make_policy(language="en")
+
+    result = await service.materialize(ROOT_URL)
+
+    assert result["translated_content"] is None
+    translator.translate_content_to_english.assert_not_awaited()
+    website_repository.set_translation_by_domain.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_translation_is_not_stored(service, translator, policy_repository, website_repository):
+    translator.translate_content_to_english.side_effect = TranslationError("translator unavailable")
+    policy_repository.get_latest_by_website_url.return_value = make_policy()
+
+    result = await service.materialize(ROOT_URL)
+
+    assert result["translated_content"] is None
+    assert translator.translate_content_to_english.await_args.kwargs == {"strict": True}
+    policy_repository.set_translation.assert_not_awaited()
+    website_repository.set_translation_by_domain.assert_not_awaited()
+    assert service.get_metrics()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_policy_returns_none(service, policy_repository):
+    policy_repository.get_latest_by_website_url.return_value = None
+
+    assert await service.materialize(ROOT_URL) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_translate_once(service, translator, policy_repository):
+    async def slow_lookup(_):
+        await asyncio.sleep(0.01)
+        return make_policy()
+
+    policy_repository.get_latest_by_website_url.side_effect = slow_lookup
+
+    results = await asyncio.gather(*[service.materialize(ROOT_URL) for _ in range(3)])
+
+    assert len({r["translated_content"] for r in results}) == 1
+    assert translator.translate_content_to_english.await_count == 1
+    assert service.get_metrics()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_background_worker_materializes_scheduled_websites_once(service, translator, policy_repository):
+    policy_repository.get_latest_by_website_url.return_value = make_policy()
+    await service.start()
+    try:
+        assert service.schedule(ROOT_URL) is True
+        assert service.schedule(ROOT_URL) is False
+        await asyncio.wait_for(service._queue.join(), timeout=1)
+    finally:
+        await service.stop()
+
+    assert translator.translate_content_to_english.await_count == 1
+    assert service.get_metrics()["translated"] == 1
+
+
+def test_schedule_before_start_is_a_no_op(service):
+    assert service.schedule(ROOT_URL) is False
+
+
+@pytest.mark.asyncio
+async def test_crawler_stores_original_content_and_schedules_translation():
+    content_processor = AsyncMock(spec=ContentProcessor)
+    content_processor.process_content.return_value = make_policy()
+    storage = AsyncMock(spec=PolicyStorageService)
+    storage.get_existing_policy.return_value = None
+    discovery = AsyncMock(spec=LinkDiscovery)
+    discovery.discover_policy_link.return_value = f"{ROOT_URL}/cookies"
+    extractor = AsyncMock(spec=IContentExtractor)
+    extractor.extract_content.return_value = "<html><body>Nous utilisons des cookies.</body></html>"
+    translation_service = AsyncMock(spec=PolicyTranslationService)
+    translation_service.schedule = lambda url: scheduled.append(url)
+    scheduled = []
+
+    crawler = PolicyCrawlerService(
+        discovery_service=discovery,
+        content_extractor=extractor,
+        search_provider=AsyncMock(spec=ISearchProvider),
+        content_processor=content_processor,
+        storage_repository=storage,
+        translation_service=translation_service,
+    )
+
+    await crawler.extract_policy(ROOT_URL)
+
+    assert content_processor.process_content.await_args.kwargs["translate_to_english"] is False
+    storage.save_policy.assert_awaited_once()
+    assert scheduled == [ROOT_URL]
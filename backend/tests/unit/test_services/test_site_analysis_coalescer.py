@@ -0,0 +1,145 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from pymongo.errors import DuplicateKeyError
+
+from src.schemas.cookie import CookieSubmissionRequest
+from src.services.violation_analyzer_service.site_analysis_coalescer import SiteAnalysisCoalescer
+from src.services.violation_analyzer_service.violation_analyzer_service import ViolationAnalyzerService
+
+ROOT = "https://shop.example.com/"
+
+
+class FakeLeaseRepository:
+    """In-memory stand-in for the Mongo lease collection (no expiry)"""
+
+    def __init__(self, holders=None):
+        self.holders = dict(holders or {})
+        self.renewals = 0
+
+    async def try_acquire(self, key, owner, lease_seconds):
+        if self.holders.get(key, owner) != owner:
+            return False
+        self.holders[key] = owner
+        return True
+
+    async def renew(self, key, owner, lease_seconds):
+        self.renewals += 1
+        return self.holders.get(key) == owner
+
+    async def release(self, key, owner):
+        if self.holders.get(key) == owner:
+            del self.holders[key]
+
+
+def make_build(result, delay=0.01):
+    calls = []
+
+    async def build():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result
+
+    return build, calls
+
+
+async def nothing_saved():
+    return None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_build_and_lease():
+    leases = FakeLeaseRepository()
+    coalescer = SiteAnalysisCoalescer(leases, poll_interval=0)
+    build, calls = make_build({"policy_url": "p"})
+
+    results = await asyncio.gather(*[coalescer.run(ROOT, nothing_saved, build) for _ in range(5)])
+
+    assert results == [{"policy_url": "p"}] * 5
+    assert len(calls) == 1
+    assert leases.holders == {}
+    assert coalescer.get_metrics()["coalesced_in_process"] == 4
+
+
+@pytest.mark.asyncio
+async def test_waits_for_the_worker_holding_the_lease():
+    coalescer = SiteAnalysisCoalescer(FakeLeaseRepository({ROOT: "other-worker"}), poll_interval=0)
+    build, calls = make_build({"policy_url": "mine"})
+    lookup = AsyncMock(side_effect=[None, None, {"policy_url": "theirs"}])
+
+    assert await coalescer.run(ROOT, lookup, build) == {"policy_url": "theirs"}
+    assert calls == []
+    assert coalescer.get_metrics()["coalesced_across_workers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_builds_itself_when_the_other_worker_never_finishes():
+    coalescer = SiteAnalysisCoalescer(FakeLeaseRepository({ROOT: "other-worker"}), wait_seconds=0, poll_interval=0)
+    build, calls = make_build({"policy_url": "mine"})
+
+    assert await coalescer.run(ROOT, nothing_saved, build) == {"policy_url": "mine"}
+    assert len(calls) == 1
+    assert coalescer.get_metrics()["lease_wait_timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_a_slow_build_runs():
+    leases = FakeLeaseRepository()
+    coalescer = SiteAnalysisCoalescer(leases, poll_interval=0, renew_interval=0.001)
+    build, calls = make_build({"policy_url": "p"}, delay=0.02)
+
+    assert await coalescer.run(ROOT, nothing_saved, build) == {"policy_url": "p"}
+    assert leases.renewals > 0
+    assert leases.holders == {}
+    assert coalescer.get_metrics()["leases_lost"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cache_miss_analyses_crawl_and_save_once(
+    mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+    mock_violation_repository, mock_website_repository
+):
+    async def slow_crawl(url):
+        await asyncio.sleep(0.01)
+        return None
+
+    mock_website_repository.get_view_by_root_url.return_value = None
+    mock_policy_crawler.extract_policy.side_effect = slow_crawl
+    result = MagicMock()
+    result.model_dump.return_value = {
+        "website_url": ROOT, "analysis_date": datetime(2024, 1, 1), "total_issues": 0, "compliance_score": 100.0,
+        "issues": [], "statistics": {}, "summary": {}, "policy_cookies_count": 0, "actual_cookies_count": 0, "details": {}
+    }
+    mock_comparator_service.compare_compliance.return_value = result
+    service = ViolationAnalyzerService(
+        mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+        mock_violation_repository, mock_website_repository, coalescer=SiteAnalysisCoalescer(poll_interval=0)
+    )
+    payloads = [CookieSubmissionRequest(website_url=f"{ROOT}page-{i}", cookies=[]) for i in range(3)]
+
+    await asyncio.gather(*[service.orchestrate_analysis(payload, f"req-{i}") for i, payload in enumerate(payloads)])
+
+    mock_policy_crawler.extract_policy.assert_awaited_once()
+    mock_website_repository.create_website.assert_awaited_once()
+    assert mock_comparator_service.compare_compliance.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_site_saved_first_by_another_worker_is_reused(
+    mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+    mock_violation_repository, mock_website_repository
+):
+    service = ViolationAnalyzerService(
+        mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+        mock_violation_repository, mock_website_repository
+    )
+    mock_policy_crawler.extract_policy.return_value = None
+    mock_website_repository.create_website.side_effect = DuplicateKeyError("E11000 duplicate key")
+    theirs = MagicMock(policy_url=f"{ROOT}cookies", is_specific=1, policy_cookies=[])
+    mock_website_repository.get_view_by_root_url.return_value = theirs
+
+    site = await service._analyse_new_site(CookieSubmissionRequest(website_url=ROOT, cookies=[]), ROOT, "req")
+
+    assert site == {"policy_url": f"{ROOT}cookies", "policy_features": {"is_specific": 1, "cookies": []}}
@@ -0,0 +1,118 @@
+import gzip
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+from aiohttp import web
+
+from src.services.policy_crawler_service.components.js_shell_detector import JsShellDetector
+from src.services.policy_crawler_service.content_extractors.http_content_extractor import HttpContentExtractor
+from src.services.policy_crawler_service.content_extractors.tiered_content_extractor import TieredContentExtractor
+from src.services.policy_crawler_service.interfaces.content_extractor_interface import IContentExtractor
+
+POLICY_TEXT = "We use cookies to remember your preferences and to measure traffic. " * 10
+STATIC_POLICY = f"<html><body><h1>Cookie Policy</h1><p>{POLICY_TEXT}</p></body></html>"
+REACT_SHELL = '<html><body><div id="root"></div><script src="/static/js/main.js"></script></body></html>'
+NOSCRIPT_SHELL = "<html><body><noscript>You need to enable JavaScript to run this app.</noscript></body></html>"
+LANDING_PAGE = '<html><body><a href="/cookie-policy">Cookies</a><a href="/about">About</a></body></html>'
+PRIVACY_WITHOUT_COOKIES = f"<html><body><p>{'Our company sells shoes and ships worldwide. ' * 20}</p></body></html>"
+
+
+@pytest.mark.parametrize("url,html,reason", [
+    ("https://example.com/cookie-policy", STATIC_POLICY, None),
+    ("https://example.com/", LANDING_PAGE, None),
+    ("https://example.com/cookie-policy", REACT_SHELL, "framework_shell"),
+    ("https://example.com/", NOSCRIPT_SHELL, "framework_shell"),
+    ("https://example.com/cookie-policy", "<html><body></body></html>", "no_content"),
+    ("https://example.com/privacy", PRIVACY_WITHOUT_COOKIES, "missing_policy_keywords"),
+    ("https://example.com/about", PRIVACY_WITHOUT_COOKIES, None),
+    ("https://example.com/", "   ", "empty"),
+])
+def test_js_shell_detection(url, html, reason):
+    assert JsShellDetector().detect(url, html) == reason
+
+
+def make_tiered(http_html: str, browser_html: str = "<html>rendered</html>"):
+    http = AsyncMock(spec=IContentExtractor)
+    http.extract_content.return_value = http_html
+    browser = AsyncMock(spec=IContentExtractor)
+    browser.extract_content.return_value = browser_html
+    return TieredContentExtractor(http, browser), http, browser
+
+
+@pytest.mark.asyncio
+async def test_static_pages_are_served_by_http_without_the_browser():
+    extractor, _, browser = make_tiered(STATIC_POLICY)
+
+    assert await extractor.extract_content("https://example.com/cookie-policy") == STATIC_POLICY
+
+    browser.extract_content.assert_not_awaited()
+    assert extractor.get_metrics()["hit_rates"]["http"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_js_shells_and_http_failures_escalate_to_the_browser():
+    extractor, http, browser = make_tiered(REACT_SHELL)
+
+    assert await extractor.extract_content("https://example.com/cookie-policy") == "<html>rendered</html>"
+    http.extract_content.return_value = ""
+    await extractor.extract_content("https://example.com/")
+
+    metrics = extractor.get_metrics()
+    assert browser.extract_content.await_count == 2
+    assert metrics["hits"] == {"http": 0, "browser": 2}
+    assert metrics["escalations"] == {"framework_shell": 1, "http_failed": 1}
+
+
+@pytest.mark.asyncio
+async def test_http_response_is_kept_when_the_browser_fails():
+    extractor, _, _ = make_tiered(REACT_SHELL, browser_html="")
+
+    assert await extractor.extract_content("https://example.com/") == REACT_SHELL
+
+
+@asynccontextmanager
+async def fixture_site():
+    async def policy(request):
+        return web.Response(body=gzip.compress(STATIC_POLICY.encode()), content_type="text/html",
+                            headers={"Content-Encoding": "gzip"})
+
+    async def pdf(request):
+        return web.Response(body=b"%PDF-1.4", content_type="application/pdf")
+
+    app = web.Application()
+    app.router.add_get("/cookie-policy", policy)
+    app.router.add_get("/policy.pdf", pdf)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_http_extractor_reuses_one_session_and_skips_non_html():
+    extractor = HttpContentExtractor(timeout=5)
+    async with fixture_site() as base_url:
+        try:
+            assert await extractor.extract_content(f"{base_url}/cookie-policy") == STATIC_POLICY
+            session = extractor._session
+            assert await extractor.extract_content(f"{base_url}/policy.pdf") == ""
+            assert await extractor.extract_content(f"{base_url}/missing") == ""
+            assert extractor._session is session
+        finally:
+            await extractor.close()
+
+
+@pytest.mark.asyncio
+async def test_http_extractor_truncates_oversized_pages():
+    extractor = HttpContentExtractor(timeout=5, max_bytes=50)
+    async with fixture_site() as base_url:
+        try:
+            assert await extractor.extract_content(f"{base_url}/cookie-policy") == STATIC_POLICY[:50]
+        finally:
+            await extractor.close()
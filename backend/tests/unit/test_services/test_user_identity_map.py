@@ -0,0 +1,55 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from bson import ObjectId
+
+from src.schemas.domain_request import DomainRequestStatus
+from src.services.domain_request_service import DomainRequestService
+from src.services.user_identity_map import UserIdentityMap
+
+
+def make_user(user_id, role="provider"):
+    return {"_id": user_id, "name": f"user-{user_id}", "email": f"{user_id}@example.com", "role": role}
+
+
+def make_request(requester_id, processed_by=None):
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return {
+        "_id": ObjectId(), "requester_id": requester_id, "requester_username": "provider", "requester_email": "p@example.com",
+        "domains": ["example.com"], "purpose": "Register our shop domain", "status": DomainRequestStatus.PENDING.value,
+        "processed_by": processed_by, "created_at": now, "updated_at": now,
+    }
+
+
+@pytest.mark.asyncio
+async def test_identity_map_loads_each_user_once_per_request():
+    known, unknown = ObjectId(), ObjectId()
+    user_repo = AsyncMock()
+    user_repo.get_users_by_ids.return_value = {str(known): make_user(known)}
+    users = UserIdentityMap(user_repo)
+
+    assert set(await users.get_many([known, unknown, known, None])) == {str(known)}
+    assert await users.get(known) is not None
+    assert await users.get(unknown) is None
+    assert users.queries == 1
+    assert sorted(user_repo.get_users_by_ids.call_args.args[0]) == sorted([str(known), str(unknown)])
+
+
+@pytest.mark.asyncio
+async def test_listing_hydrates_requesters_and_processors_with_one_query():
+    admin = ObjectId()
+    providers = [ObjectId() for _ in range(3)]
+    page = [make_request(providers[i % 3], processed_by=admin if i % 2 else None) for i in range(50)]
+
+    domain_request_repo = AsyncMock()
+    user_repo = AsyncMock()
+    user_repo.get_users_by_ids.return_value = {str(u): make_user(u) for u in providers} | {str(admin): make_user(admin, "admin")}
+    service = DomainRequestService(domain_request_repo, AsyncMock(), user_repo)
+
+    responses = await service._populate_users_info(page)
+
+    user_repo.get_users_by_ids.assert_awaited_once()
+    user_repo.get_user_by_id.assert_not_called()
+    assert all(response.requester_info.id == response.requester_id for response in responses)
+    assert responses[1].processed_by_info.role == "admin" and responses[0].processed_by_info is None
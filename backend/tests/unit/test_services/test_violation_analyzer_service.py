@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from datetime import datetime
+
+from src.exceptions.custom_exceptions import PolicyAnalysisError
+from src.schemas.cookie import CookieSubmissionRequest
+from src.schemas.violation import AnalysisPhase, ComplianceAnalysisResponse
+from src.services.violation_analyzer_service.violation_analyzer_service import ViolationAnalyzerService
+from src.utils.concurrency_utils import StageLimiter
+
+
+@pytest.fixture
+def violation_analyzer_service(mock_policy_crawler, mock_cookie_extractor_service, mock_comparator_service,
+                               mock_violation_repository, mock_website_repository):
+    return ViolationAnalyzerService(
+        policy_crawler=mock_policy_crawler,
+        policy_cookie_extractor_service=mock_cookie_extractor_service,
+        comparator_service=mock_comparator_service,
+        violation_repository=mock_violation_repository,
+        website_repository=mock_website_repository,
+        stage_limiter=StageLimiter(default_limit=2)
+    )
+
+
+def make_response(website_url: str) -> ComplianceAnalysisResponse:
+    return ComplianceAnalysisResponse(
+        website_url=website_url,
+        analysis_date=datetime(2024, 1, 1),
+        total_issues=0,
+        compliance_score=100.0,
+        issues=[],
+        statistics={},
+        summary={},
+        policy_cookies_count=0,
+        actual_cookies_count=0,
+        details={},
+        policy_url=None
+    )
+
+
+async def collect(stream):
+    return [line async for line in stream]
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_one_line_per_submission_and_dedupes(violation_analyzer_service, monkeypatch):
+    calls = []
+    active_roots = set()
+
+    async def fake_orchestrate(payload, request_id):
+        root = payload.website_url.split("/")[2]
+        # Submissions for the same root URL must never be analysed concurrently
+        assert root not in active_roots
+        active_roots.add(root)
+        calls.append(payload.website_url)
+        await asyncio.sleep(0.01 if "slow" in root else 0)
+        active_roots.discard(root)
+        return make_response(payload.website_url)
+
+    monkeypatch.setattr(violation_analyzer_service, "orchestrate_analysis", fake_orchestrate)
+    submissions = [
+        CookieSubmissionRequest(website_url="https://slow.example.com/", cookies=[]),
+        CookieSubmissionRequest(website_url="https://fast.example.com/a", cookies=[]),
+        CookieSubmissionRequest(website_url="https://fast.example.com/a", cookies=[]),
+        CookieSubmissionRequest(website_url="https://fast.example.com/b", cookies=[]),
+    ]
+
+    lines = await collect(violation_analyzer_service.orchestrate_batch_analysis(submissions, "req"))
+
+    results, summary = lines[:-1], lines[-1]
+    assert sorted(line["index"] for line in results) == [0, 1, 2, 3]
+    assert results[-1]["index"] == 0  # the slow site finishes last
+    assert len(calls) == 3
+    duplicate = next(line for line in results if line["index"] == 2)
+    assert duplicate["duplicate_of"] == 1 and duplicate["status"] == "ok"
+    assert summary == {**summary, "type": "summary", "submissions": 4, "unique_sites": 2,
+                       "succeeded": 4, "failed": 0, "deduplicated": 1}
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_failures_without_aborting(violation_analyzer_service, monkeypatch):
+    async def fake_orchestrate(payload, request_id):
+        if "broken" in payload.website_url:
+            raise PolicyAnalysisError(AnalysisPhase.DISCOVERY, "no policy", 404)
+        return make_response(payload.website_url)
+
+    monkeypatch.setattr(violation_analyzer_service, "orchestrate_analysis", fake_orchestrate)
+    submissions = [
+        CookieSubmissionRequest(website_url="https://broken.example.com/", cookies=[]),
+        CookieSubmissionRequest(website_url="https://ok.example.com/", cookies=[]),
+    ]
+
+    lines = await collect(violation_analyzer_service.orchestrate_batch_analysis(submissions, "req"))
+
+    failed = next(line for line in lines if line.get("index") == 0)
+    assert failed["status"] == "error" and failed["status_code"] == 404
+    assert lines[-1]["failed"] == 1 and lines[-1]["succeeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stage_limiter_bounds_each_stage_independently():
+    limiter = StageLimiter({"llm": 1}, default_limit=3)
+    peak = {"llm": 0, "discovery": 0}
+    active = {"llm": 0, "discovery": 0}
+
+    async def work(stage):
+        async with limiter.stage(stage):
+            active[stage] += 1
+            peak[stage] = max(peak[stage], active[stage])
+            await asyncio.sleep(0.01)
+            active[stage] -= 1
+
+    await asyncio.gather(*[work("llm") for _ in range(4)], *[work("discovery") for _ in range(6)])
+
+    assert peak == {"llm": 1, "discovery": 3}
+    metrics = limiter.get_metrics()
+    assert metrics["llm"]["completed"] == 4 and metrics["llm"]["limit"] == 1
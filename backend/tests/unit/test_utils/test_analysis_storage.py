@@ -0,0 +1,59 @@
+import bson
+from datetime import datetime, timedelta, timezone
+
+from src.schemas.cookie import ActualCookie, PolicyCookie
+from src.services.comparator_service.components.compliance_comparator import ComplianceComparator
+from src.services.comparator_service.components.compliance_result import ComplianceResultBuilder
+from src.utils.analysis_storage import COMPACT_FORMAT, compact_analysis, policy_version_hash, rehydrate_analysis
+
+
+def build_analysis():
+    now = datetime.now(timezone.utc)
+    policy_cookies = [
+        PolicyCookie(cookie_name="_ga", declared_purpose="Analytical", declared_retention="2 years",
+                     declared_third_parties=["Google"], declared_description="Distinguishes users"),
+        PolicyCookie(cookie_name="session", declared_purpose="Strictly Necessary", declared_retention="session",
+                     declared_third_parties=[], declared_description=None),
+        PolicyCookie(cookie_name="_fbp", declared_purpose="Marketing", declared_retention="30 days",
+                     declared_third_parties=["Facebook"], declared_description=None),
+    ]
+    actual_cookies = [
+        ActualCookie(name="_ga", value="GA1.2.1", domain=".shop.example.com", secure=True, httpOnly=False, sameSite=None,
+                     expirationDate=(now + timedelta(days=1000)).isoformat()),
+        ActualCookie(name="session", value="s3cr3t", domain="shop.example.com", secure=True, httpOnly=True, sameSite="Lax",
+                     expirationDate=(now + timedelta(days=10)).isoformat()),
+        ActualCookie(name="IDE", value="x" * 200, domain=".doubleclick.net", secure=True, httpOnly=False, sameSite="None",
+                     expirationDate=(now + timedelta(days=400)).isoformat()),
+        ActualCookie(name="IDE", value="y" * 200, domain=".doubleclick.net", secure=True, httpOnly=False, sameSite="None",
+                     expirationDate=(now + timedelta(days=400)).isoformat()),
+    ]
+    report = ComplianceComparator().analyze_compliance(policy_cookies, actual_cookies, "shop.example.com")
+    return ComplianceResultBuilder().build_success_result("https://shop.example.com/", report).model_dump()
+
+
+def test_compact_form_rehydrates_to_the_original_document_and_is_smaller():
+    document = build_analysis()
+
+    compact, policy_version = compact_analysis(document)
+
+    assert compact["format"] == COMPACT_FORMAT
+    assert compact["policy_version"] == policy_version["_id"] == policy_version_hash(document["details"]["declared_cookie_details"])
+    assert "declared_cookie_details" not in compact["details"]
+    assert all(isinstance(ref, int) for ref in compact["details"]["realtime_cookie_details"])
+    assert len(compact["cookies"]) == 4 # one row per distinct collected cookie
+    assert rehydrate_analysis(compact, policy_version["cookies"]) == document
+    assert len(bson.encode(compact)) < len(bson.encode(document))
+
+
+def test_reanalyses_against_the_same_policy_share_one_policy_version():
+    first, second = build_analysis(), build_analysis()
+
+    assert compact_analysis(first)[1]["_id"] == compact_analysis(second)[1]["_id"]
+
+
+def test_error_results_and_legacy_documents_pass_through_unchanged():
+    error = ComplianceResultBuilder().build_error_result("https://shop.example.com/", "boom").model_dump()
+    legacy = build_analysis()
+
+    assert compact_analysis(error) == (error, None)
+    assert rehydrate_analysis(legacy, None) is legacy
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from src.utils import cookie_utils
+from src.utils.cookie_utils import calculate_actual_retention_days, parse_expiration_date, parse_retention_to_days
+
+
+def test_retention_strings_are_parsed_once_per_normalized_value():
+    cookie_utils._parse_normalized_retention.cache_clear()
+
+    assert parse_retention_to_days("2 Years") == 2 * 365.25
+    assert parse_retention_to_days("  2 years ") == 2 * 365.25
+    assert parse_retention_to_days("session") is None
+    assert parse_retention_to_days("Session") is None
+
+    info = cookie_utils._parse_normalized_retention.cache_info()
+    assert info.misses == 2 and info.hits == 2
+    assert info.maxsize == cookie_utils.settings.violation.RETENTION_PARSE_CACHE_SIZE
+
+
+def test_retention_parsing_matches_uncached_reference():
+    samples = ["13 months", "1.5 weeks", "30 minutes", "permanent", "short term", "until you log out", "", None]
+    for sample in samples:
+        expected = cookie_utils._parse_normalized_retention.__wrapped__(sample.lower().strip()) if sample else None
+        assert parse_retention_to_days(sample) == expected
+
+
+def test_expiration_days_are_computed_against_a_fixed_clock():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    assert parse_expiration_date("session") is None
+    assert parse_expiration_date("not a date") is None
+    assert calculate_actual_retention_days("2024-01-31T00:00:00.000Z", now) == 30
+    assert calculate_actual_retention_days("Wed, 31 Jan 2024 00:00:00 GMT", now) == 30
+    assert calculate_actual_retention_days("2023-12-01T00:00:00Z", now) == 0
@@ -0,0 +1,72 @@
+import pytest
+
+from src.utils.dom_parser_utils import DOMParserService
+from src.utils.html_document import LxmlHTMLDocument, SoupHTMLDocument, parse_html
+from src.utils.table_extractor import TableExtractor
+
+SAMPLE_HTML = """
+<html>
+<head>
+  <link rel="cookie-policy" href="/cookies" title="Cookies">
+  <style>body { color: red; }</style>
+</head>
+<body>
+  <nav><a href="/privacy">Privacy Policy</a></nav>
+  <main>
+    <h1>Cookie Policy</h1>
+    <p>We use <b>cookies</b> to improve your experience.<!-- hidden --></p>
+    <script>var tracking = true;</script>
+    <table>
+      <thead><tr><th>Name</th><th>Purpose</th><th>Duration</th></tr></thead>
+      <tr><th>Name</th><th>Purpose</th><th>Duration</th></tr>
+      <tr><td>_ga</td><td>Analytics</td><td>2 years</td></tr>
+      <tr><td>_gid</td><td>Analytics</td><td>24 hours</td></tr>
+    </table>
+  </main>
+  <footer class="site-footer"><a href="/cookie-policy">Cookie settings</a></footer>
+</body>
+</html>
+"""
+
+EXCLUDED = ("script", "style", "footer", "header", "nav")
+
+
+@pytest.mark.parametrize("method, args", [
+    ("link_tags", ()),
+    ("anchors", ()),
+    ("anchors", (["footer", ".site-footer", "nav"],)),
+    ("text", (EXCLUDED,)),
+])
+def test_lxml_backend_matches_bs4_reference(method, args):
+    lxml_doc = LxmlHTMLDocument(SAMPLE_HTML)
+    soup_doc = SoupHTMLDocument(SAMPLE_HTML)
+
+    assert getattr(lxml_doc, method)(*args) == getattr(soup_doc, method)(*args)
+
+
+def test_tables_match_between_backends():
+    lxml_tables = LxmlHTMLDocument(SAMPLE_HTML).tables()
+    soup_tables = SoupHTMLDocument(SAMPLE_HTML).tables()
+
+    assert [(t.thead_row, t.rows) for t in lxml_tables] == [(t.thead_row, t.rows) for t in soup_tables]
+
+
+def test_parsed_document_is_shared_by_consumers():
+    document = parse_html(SAMPLE_HTML)
+
+    assert parse_html(document) is document
+    tables = TableExtractor().extract_tables_from_html(document)
+    links = DOMParserService().parse_policy_links_from_dom(document)
+
+    assert tables[0]["headers"] == ["Name", "Purpose", "Duration"]
+    assert {row["Name"] for row in tables[0]["rows"]} == {"_ga", "_gid"}
+    assert any(link["url"] == "/cookie-policy" for link in links)
+
+
+def test_text_query_does_not_mutate_document():
+    document = parse_html(SAMPLE_HTML)
+
+    first = document.text(exclude_tags=EXCLUDED)
+    assert "tracking" not in first and "hidden" not in first
+    assert document.text() != first
+    assert document.text(exclude_tags=EXCLUDED) == first
@@ -0,0 +1,28 @@
+import pytest
+from datetime import datetime
+
+from bson import ObjectId
+
+from src.utils.pagination_utils import decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trips_datetimes_and_object_ids():
+    last_id = ObjectId()
+    checked_at = datetime(2024, 5, 1, 12, 30)
+
+    assert decode_cursor(encode_cursor(checked_at, last_id)) == (checked_at, last_id)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_filter_breaks_ties_on_id_and_keeps_unchecked_sites_reachable():
+    last_id = ObjectId()
+    checked_at = datetime(2024, 5, 1)
+
+    assert keyset_filter("_id", encode_cursor(last_id, last_id)) == {"_id": {"$lt": last_id}}
+    assert keyset_filter("last_checked_at", encode_cursor(checked_at, last_id)) == {"$or": [
+        {"last_checked_at": {"$lt": checked_at}},
+        {"last_checked_at": checked_at, "_id": {"$lt": last_id}},
+        {"last_checked_at": None},
+    ]}
+    assert keyset_filter("last_checked_at", encode_cursor(None, last_id)) == {"last_checked_at": None, "_id": {"$lt": last_id}}
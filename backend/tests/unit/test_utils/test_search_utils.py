@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+
+from src.exceptions.custom_exceptions import SearchError
+from src.utils.cache_utils import TTLCache
+from src.utils.search_utils import SearchService
+
+SITE = "https://shop.example.com"
+
+
+class FakePool:
+    def __init__(self):
+        self.leases = 0
+
+    @asynccontextmanager
+    async def lease(self):
+        self.leases += 1
+        yield object()
+
+
+class FakeEngine:
+    """Search runner answering per query, optionally after a delay"""
+
+    def __init__(self, answers, delays=None):
+        self.answers = answers
+        self.delays = delays or {}
+        self.queries = []
+        self.cancelled = []
+
+    async def __call__(self, context, query, domain, url_root):
+        self.queries.append(query)
+        try:
+            await asyncio.sleep(self.delays.get(query, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(query)
+            raise
+        return self.answers.get(query, "")
+
+
+def make_service(pool=None):
+    return SearchService(pool or FakePool(), result_cache=TTLCache(), rate_limiters={})
+
+
+@pytest.mark.asyncio
+async def test_first_valid_result_wins_and_cancels_slower_queries():
+    pool = FakePool()
+    service = make_service(pool)
+    engine = FakeEngine(
+        {"q1": f"{SITE}/cookie-policy", "q2": f"{SITE}/cookies", "q3": "https://other.example.org/cookies"},
+        delays={"q1": 5, "q2": 0.01, "q3": 0},
+    )
+
+    result = await asyncio.wait_for(service._search("bing", SITE, ["q1", "q2", "q3"], engine), timeout=1)
+
+    assert result == f"{SITE}/cookies"
+    assert engine.cancelled == ["q1"]
+    assert pool.leases == 1
+
+
+@pytest.mark.asyncio
+async def test_results_and_misses_are_cached_per_domain_and_query():
+    pool = FakePool()
+    service = make_service(pool)
+    engine = FakeEngine({"q2": f"{SITE}/cookies"})
+
+    assert await service._search("bing", SITE, ["q1", "q2"], engine) == f"{SITE}/cookies"
+    assert await service._search("bing", SITE, ["q1", "q2"], engine) == f"{SITE}/cookies"
+
+    assert engine.queries == ["q1", "q2"]
+    assert pool.leases == 1
+    assert service.result_cache.get(("bing", "shop.example.com", "q1")) == ""
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_skips_the_browser_until_it_expires():
+    now = [0.0]
+    pool = FakePool()
+    service = SearchService(pool, result_cache=TTLCache(clock=lambda: now[0]), rate_limiters={}, negative_ttl_seconds=60)
+    engine = FakeEngine({})
+
+    assert await service._search("bing", SITE, ["q1"], engine) is None
+    assert await service._search("bing", SITE, ["q1"], engine) is None
+    assert pool.leases == 1
+
+    now[0] = 61
+    assert await service._search("bing", SITE, ["q1"], engine) is None
+    assert pool.leases == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_searches_are_not_cached():
+    service = make_service()
+
+    async def failing(context, query, domain, url_root):
+        return None
+
+    with pytest.raises(SearchError):
+        await service._search("bing", SITE, ["q1"], failing)
+    assert ("bing", "shop.example.com", "q1") not in service.result_cache
@@ -0,0 +1,73 @@
+import pytest
+
+from src.configs.settings import settings
+from src.utils.cookie_utils import calculate_semantic_similarity
+from src.utils.similarity import (
+    DifflibSimilarityBackend,
+    NgramSimilarityBackend,
+    PurposeSimilarityIndex,
+    create_similarity_backend,
+)
+
+LABELS = settings.violation.STANDARD_PURPOSE_LABELS + ["Marketing", "Preferences"]
+NAMES = ["_ga", "_gid", "_fbp", "analytics_id", "marketing_pref", "performance_cookie", "necessary", "session_id",
+         "PHPSESSID", "functional", "_hjSessionUser", "social_share", "strictly_necessary", "cookie_consent",
+         "advertising_id", "__cf_bm", "preferences", "", "x"]
+
+
+def dice_reference(backend: NgramSimilarityBackend, name: str, label: str) -> float:
+    a, b = backend.ngrams(name), backend.ngrams(label)
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+def test_difflib_backend_reproduces_original_scores():
+    backend = DifflibSimilarityBackend()
+    scores = backend.max_scores(backend.prepare(LABELS), NAMES)
+
+    assert scores == [max(calculate_semantic_similarity(name, label) for label in LABELS) for name in NAMES]
+
+
+@pytest.mark.parametrize("n", [2, 3])
+def test_ngram_matrix_scores_match_pairwise_dice(n):
+    backend = NgramSimilarityBackend(n)
+    scores = backend.max_scores(backend.prepare(LABELS), NAMES)
+
+    for name, score in zip(NAMES, scores):
+        assert score == pytest.approx(max(dice_reference(backend, name, label) for label in LABELS), abs=1e-6)
+
+
+def test_ngram_backend_agrees_with_difflib_away_from_the_threshold():
+    threshold = settings.violation.SEMANTIC_SIMILARITY_THRESHOLD
+    reference = DifflibSimilarityBackend()
+    vectorised = NgramSimilarityBackend(2)
+    expected = reference.max_scores(reference.prepare(LABELS), NAMES)
+    actual = vectorised.max_scores(vectorised.prepare(LABELS), NAMES)
+
+    clear_cut = [(e, a) for e, a in zip(expected, actual) if abs(e - threshold) >= 0.15]
+    assert len(clear_cut) >= len(NAMES) - 3
+    assert all((e < threshold) == (a < threshold) for e, a in clear_cut)
+
+
+def test_index_scores_each_name_once():
+    backend = NgramSimilarityBackend(2)
+    calls = []
+    original = backend.max_scores
+
+    def counting(prepared, names):
+        calls.append(list(names))
+        return original(prepared, names)
+
+    backend.max_scores = counting
+    index = PurposeSimilarityIndex(backend, LABELS)
+
+    first = index.score_many(["_ga", "analytics_id", "_ga"])
+    assert index.score("analytics_id") == first["analytics_id"]
+    index.score_many(["analytics_id", "preferences"])
+
+    assert calls == [["_ga", "analytics_id"], ["preferences"]]
+    assert index.get_stats()["size"] == 3
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_similarity_backend("word2vec")
@@ -0,0 +1,164 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from src.exceptions.custom_exceptions import TranslationError
+from src.utils.concurrency_utils import RateLimiter
+from src.utils.translation_utils import TranslationManager
+
+
+class FakeTranslator:
+    """Synchronous translate_func that upper-cases text and records every request"""
+
+    def __init__(self, fail: bool = False):
+        self.requests = []
+        self.fail = fail
+
+    def __call__(self, text, source_lang, target_lang):
+        self.requests.append(text)
+        if self.fail:
+            raise RuntimeError("translator unavailable")
+        return text.upper()
+
+
+def make_manager(translator, **kwargs):
+    kwargs.setdefault("rate_per_second", 0)
+    return TranslationManager(translate_func=translator, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_long_paragraphs_are_split_on_sentences_within_chunk_size():
+    translator = FakeTranslator()
+    manager = make_manager(translator, chunk_size=40)
+    paragraph = "First sentence is here. Second sentence follows it. Third one closes the paragraph."
+
+    result = await manager.translate(paragraph)
+
+    assert result == paragraph.upper()
+    assert all(len(request) <= 40 for request in translator.requests)
+    assert all(not request.startswith(" ") for request in translator.requests)
+
+
+@pytest.mark.asyncio
+async def test_repeated_paragraphs_are_translated_once():
+    translator = FakeTranslator()
+    manager = make_manager(translator, chunk_size=4000)
+    content = "Cookie banner\nWe use cookies.\n\nCookie banner\n123 - 456\nWe use cookies."
+
+    result = await manager.translate(content)
+
+    assert result == "COOKIE BANNER\nWE USE COOKIES.\n\nCOOKIE BANNER\n123 - 456\nWE USE COOKIES."
+    assert translator.requests == ["Cookie banner\nWe use cookies."]
+    assert manager.get_metrics()["deduplicated_paragraphs"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    translator = FakeTranslator()
+    manager = make_manager(translator)
+
+    results = await asyncio.gather(*[manager.translate("Politique de confidentialité") for _ in range(5)])
+
+    assert set(results) == {"POLITIQUE DE CONFIDENTIALITÉ"}
+    assert len(translator.requests) == 1
+    assert manager.get_metrics()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_second_request_is_served_from_memory():
+    translator = FakeTranslator()
+    manager = make_manager(translator)
+
+    await manager.translate("Datenschutz")
+    await manager.translate("  Datenschutz  ")
+
+    assert len(translator.requests) == 1
+    assert manager.get_metrics()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_is_checked_before_translating():
+    translator = FakeTranslator()
+    repository = AsyncMock()
+    repository.get_translation.return_value = {"translated": "From Mongo"}
+    manager = make_manager(translator, repository=repository)
+
+    assert await manager.translate("Aus Mongo") == "From Mongo"
+    assert translator.requests == []
+    repository.get_translation.assert_awaited_once_with(manager.build_key("Aus Mongo", "auto", "en"))
+    repository.save_translation.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_new_translations_are_persisted_with_language_pair():
+    translator = FakeTranslator()
+    repository = AsyncMock()
+    repository.get_translation.return_value = None
+    manager = make_manager(translator, repository=repository, persistent_ttl_seconds=60)
+
+    await manager.translate("hola", source_lang="es", target_lang="en")
+
+    repository.save_translation.assert_awaited_once_with(manager.build_key("hola", "es", "en"), "HOLA", "es", "en", 60)
+    assert manager.build_key("hola", "es", "en") != manager.build_key("hola", "es", "fr")
+
+
+@pytest.mark.asyncio
+async def test_failed_translation_returns_original_and_is_not_cached():
+    translator = FakeTranslator(fail=True)
+    repository = AsyncMock()
+    repository.get_translation.return_value = None
+    manager = make_manager(translator, repository=repository)
+
+    assert await manager.translate("Sin traducción") == "Sin traducción"
+    translator.fail = False
+    assert await manager.translate("Sin traducción") == "SIN TRADUCCIÓN"
+    assert manager.get_metrics()["errors"] == 1
+    repository.save_translation.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_strict_translation_raises_instead_of_returning_the_original():
+    translator = FakeTranslator(fail=True)
+    manager = make_manager(translator)
+
+    with pytest.raises(TranslationError):
+        await manager.translate("Sin traducción", strict=True)
+
+    # Translator trả về None cũng là lỗi, không được lưu như bản dịch
+    manager = make_manager(lambda text, source_lang, target_lang: None)
+    with pytest.raises(TranslationError):
+        await manager.translate("Sin traducción", strict=True)
+    assert await manager.translate("Sin traducción") == "Sin traducción"
+    assert manager.get_metrics()["memory"]["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_falls_back_to_per_unit_requests_when_lines_are_merged():
+    requests = []
+
+    def merging_translator(text, source_lang, target_lang):
+        requests.append(text)
+        return text.replace("\n", " ").upper()
+
+    manager = make_manager(merging_translator)
+
+    assert await manager.translate("one\ntwo") == "ONE\nTWO"
+    assert requests == ["one\ntwo", "one", "two"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_after_burst(monkeypatch):
+    now = [0.0]
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(rate_per_second=2, burst=2, clock=lambda: now[0])
+    for _ in range(4):
+        await limiter.acquire()
+
+    assert sleeps == [0.5, 0.5]
+    assert limiter.waited_seconds_total == 1.0